@@ -0,0 +1,169 @@
+"""Zapisy gry w tle.
+
+W wątku gry powstaje tylko migawka stanu - słownik zapisu zebrany przez
+to_dict() i zamrożony przez pickle (ułamek milisekundy). Serializacja do
+JSON, kompresja, suma kontrolna i rotacja backupów działają w osobnym
+wątku. Zapisy do tego samego pliku (klucza) nigdy się nie nakładają:
+na klucz przypada co najwyżej jeden wątek, a migawka zlecona w trakcie
+zapisu czeka na swoją kolej - nowsza zastępuje starszą, która jeszcze
+nie ruszyła. Zapis synchroniczny (run) czeka na trwający zapis w tle
+i unieważnia czekającą migawkę, bo sam jest od niej nowszy.
+
+EventBus nie jest bezpieczny wątkowo, więc wydarzenia 'save_progress'
+i 'save_completed' są kolejkowane i emitowane w wątku gry przez
+dispatch_events() (wywoływane w GameState.update).
+"""
+
+import pickle
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Set, Tuple
+
+# Zapis: (dane zapisu, progress(etap, ułamek)) -> wynik
+SaveWriter = Callable[[Dict[str, Any], Callable[[str, float], None]], Any]
+
+
+class BackgroundSaver:
+    """Kolejka zapisów w tle z wyłącznością per plik zapisu.
+
+    Przykład:
+        background_saver.submit("saves/save_5.json", save_data, write, slot=5)
+        ...
+        background_saver.dispatch_events()  # w pętli gry
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._slot_locks: Dict[str, threading.Lock] = {}
+        self._queued: Dict[str, Tuple[bytes, SaveWriter, Dict[str, Any], float]] = {}
+        self._running: Set[str] = set()
+        # (typ wydarzenia, dane) - emitowane w wątku gry
+        self.events: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.superseded = 0  # Migawki zastąpione nowszym zapisem przed startem
+
+    def _slot_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._slot_locks.get(key)
+            if lock is None:
+                lock = self._slot_locks[key] = threading.Lock()
+            return lock
+
+    def submit(self, key: str, save_data: Dict[str, Any], write: SaveWriter, **info) -> None:
+        """Zleć zapis w tle.
+
+        Args:
+            key: Plik zapisu - zapisy z tym samym kluczem nie nakładają się
+            save_data: Dane zapisu (zamrażane od razu, w wątku wywołującym)
+            write: Funkcja zapisu wywoływana w wątku tła
+            **info: Dane dołączane do wydarzeń (np. slot)
+        """
+        snapshot = pickle.dumps(save_data, protocol=pickle.HIGHEST_PROTOCOL)
+        info['path'] = key
+        self.events.append(('save_progress', dict(info, stage='snapshot', progress=0.0)))
+        with self._lock:
+            self._supersede(key)
+            self._queued[key] = (snapshot, write, info, time.perf_counter())
+            self.submitted += 1
+            if key in self._running:
+                return
+            self._running.add(key)
+        threading.Thread(target=self._worker, args=(key,), name=f"save-{key}").start()
+
+    def run(self, key: str, write: Callable[[], Any]) -> Any:
+        """Zapis synchroniczny - po trwającym zapisie w tle, zamiast czekającego."""
+        with self._lock:
+            self._supersede(key)
+        with self._slot_lock(key):
+            return write()
+
+    def _supersede(self, key: str) -> None:
+        """Porzuć czekającą migawkę klucza - nowszy zapis ją zastępuje (pod _lock)."""
+        job = self._queued.pop(key, None)
+        if job is not None:
+            self.superseded += 1
+            self.events.append(('save_completed', dict(
+                job[2], success=True, superseded=True, error=None,
+                seconds=time.perf_counter() - job[3])))
+
+    def _worker(self, key: str) -> None:
+        slot_lock = self._slot_lock(key)
+        while True:
+            with slot_lock:
+                with self._lock:
+                    job = self._queued.pop(key, None)
+                    if job is None:
+                        self._running.discard(key)
+                        self._idle.notify_all()
+                        return
+                self._execute(*job)
+
+    def _execute(self, snapshot: bytes, write: SaveWriter, info: Dict[str, Any],
+                 started: float) -> None:
+        def progress(stage: str, fraction: float) -> None:
+            self.events.append(('save_progress', dict(info, stage=stage, progress=fraction)))
+
+        error = None
+        try:
+            write(pickle.loads(snapshot), progress)
+        except Exception as e:
+            error = str(e)
+            print(f"✗ Błąd zapisu w tle ({info['path']}): {e}")
+        with self._lock:
+            if error is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+        self.events.append(('save_completed', dict(
+            info, success=error is None, superseded=False, error=error,
+            seconds=time.perf_counter() - started)))
+
+    def dispatch_events(self) -> int:
+        """Emituj zakolejkowane wydarzenia zapisów (tylko w wątku gry).
+
+        Returns:
+            Liczba wyemitowanych wydarzeń
+        """
+        from .event_bus import EventCategory, GameEvent, event_bus
+        emitted = 0
+        while self.events:
+            event_type, data = self.events.popleft()
+            event_bus.emit(GameEvent(event_type=event_type, category=EventCategory.SYSTEM,
+                                     data=data, source="save"))
+            emitted += 1
+        return emitted
+
+    def wait(self, key: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """Czekaj na zakończenie zapisów w tle (jednego pliku albo wszystkich).
+
+        Returns:
+            Czy zapisy się zakończyły przed upływem timeout
+        """
+        with self._idle:
+            return self._idle.wait_for(
+                lambda: (key not in self._running) if key is not None else not self._running,
+                timeout)
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._running)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Liczniki zapisów w tle."""
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'superseded': self.superseded,
+                'running': len(self._running),
+                'queued': len(self._queued),
+            }
+
+
+# Globalna kolejka zapisów w tle
+background_saver = BackgroundSaver()
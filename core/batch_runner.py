@@ -0,0 +1,225 @@
+"""Wsadowe symulacje wielu światów gry w puli procesów.
+
+Każdy świat to osobny proces z bezgłowym GameState i własnym ziarnem
+losowości. Metryki (ceny i podaż/popyt z Market.dane_rynkowe, questy,
+śmierci NPCów, wydarzenia) są próbkowane co sample_hours godzin gry
+i strumieniowane do pliku wyników w miarę kończenia kolejnych światów:
+Parquet (gdy zainstalowany pyarrow) albo CSV.
+"""
+
+import csv
+import multiprocessing
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - zależność opcjonalna
+    pyarrow = None
+    PYARROW_AVAILABLE = False
+
+
+# Przedmioty, których ceny są śledzone (jak w stanie świata GameState)
+DEFAULT_ITEMS = ('chleb', 'woda', 'mięso', 'ser', 'jabłko')
+
+BASE_COLUMNS = ('seed', 'day', 'game_hours', 'wall_seconds', 'events',
+                'active_quests', 'completed_quests', 'failed_quests',
+                'npcs_alive', 'npc_deaths')
+
+
+def metric_columns(items: Sequence[str] = DEFAULT_ITEMS) -> List[str]:
+    """Kolumny pliku wyników dla śledzonych przedmiotów."""
+    columns = list(BASE_COLUMNS)
+    for item_id in items:
+        columns.extend((f"price_{item_id}", f"supply_{item_id}", f"demand_{item_id}"))
+    return columns
+
+
+def _npc_dead(npc: Any) -> bool:
+    combat_stats = getattr(npc, 'combat_stats', None)
+    if combat_stats is not None and getattr(combat_stats, 'health', 1) <= 0:
+        return True
+    return getattr(npc, 'health', 1) <= 0
+
+
+def _market_metrics(economy: Any, items: Sequence[str]) -> Dict[str, Any]:
+    """Ceny (ostatnia cena) oraz podaż i popyt z Market.dane_rynkowe, sumowane po rynkach."""
+    metrics: Dict[str, Any] = {}
+    markets = list(economy.markets.values()) if economy is not None else []
+    for item_id in items:
+        prices = []
+        supply = demand = 0
+        for market in markets:
+            data = market.dane_rynkowe.get(item_id)
+            if data is None:
+                continue
+            supply += data.podaz
+            demand += data.popyt
+            if data.ostatnia_cena:
+                prices.append(data.ostatnia_cena)
+        metrics[f"price_{item_id}"] = sum(prices) / len(prices) if prices else None
+        metrics[f"supply_{item_id}"] = supply
+        metrics[f"demand_{item_id}"] = demand
+    return metrics
+
+
+def simulate_world(task: Tuple[int, float, float, Sequence[str], bool]) -> Dict[str, List[Any]]:
+    """Symuluj jeden świat (funkcja procesu roboczego).
+
+    Args:
+        task: (ziarno, godziny, co ile godzin próbka, śledzone przedmioty,
+            czy zarejestrować ziarna z create_quest_seed_library)
+
+    Returns:
+        Kolumny metryk świata (nazwa kolumny -> wartości kolejnych próbek)
+    """
+    seed, hours, sample_hours, items, emergent_seeds = task
+    from .game_state import GameState
+    from .headless import HeadlessSimulation
+
+    GameState._instance = None
+    state = GameState()
+    simulation = HeadlessSimulation(state, seed=seed)
+    simulation.initialize()
+    if emergent_seeds:
+        from quests.emergent_quests import create_quest_seed_library
+        for quest_seed in create_quest_seed_library().values():
+            state.quest_engine.register_seed(quest_seed)
+    if state.npc_manager is not None:
+        state.npc_manager.set_interaction_seed(seed)
+
+    columns: Dict[str, List[Any]] = {name: [] for name in metric_columns(items)}
+    start = time.perf_counter()
+    events = 0
+    simulated = 0.0
+    dead_at_start = sum(1 for npc in state.npc_manager.npcs.values() if _npc_dead(npc))
+    playing = True
+    while playing and simulated < hours:
+        sample_end = min(simulated + sample_hours, hours)
+        # Ekonomia nie jest częścią ticku GameState - aktualizowana co godzinę gry
+        while playing and simulated < sample_end:
+            step = min(1.0, sample_end - simulated)
+            report = simulation.run(step)
+            events += report['events']
+            simulated += report['game_hours']
+            playing = report['game_mode'] == 'playing'
+            if state.economy is not None:
+                state.economy.update(int(state.clock.minutes))
+
+        npcs = state.npc_manager.npcs.values()
+        dead = sum(1 for npc in npcs if _npc_dead(npc))
+        quest_engine = state.quest_engine
+        row = {
+            'seed': seed,
+            'day': state.clock.day,
+            'game_hours': simulated,
+            'wall_seconds': time.perf_counter() - start,
+            'events': events,
+            'active_quests': len(quest_engine.active_quests),
+            'completed_quests': len(quest_engine.completed_quests),
+            'failed_quests': len(quest_engine.failed_quests),
+            'npcs_alive': len(state.npc_manager.npcs) - dead,
+            'npc_deaths': dead - dead_at_start,
+        }
+        row.update(_market_metrics(state.economy, items))
+        for name, values in columns.items():
+            values.append(row[name])
+    return columns
+
+
+class ResultsWriter:
+    """Strumieniowy zapis kolumn metryk: Parquet (pyarrow) lub CSV.
+
+    Każdy świat to kolejna grupa wierszy (Parquet) lub kolejne wiersze (CSV),
+    dopisywane zaraz po zakończeniu świata.
+    """
+
+    def __init__(self, filepath: str, columns: Sequence[str]):
+        self.filepath = filepath
+        self.columns = list(columns)
+        self.rows = 0
+        self.parquet = filepath.endswith('.parquet')
+        if self.parquet and not PYARROW_AVAILABLE:
+            raise RuntimeError("Zapis Parquet wymaga pakietu pyarrow - użyj pliku .csv")
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._writer = None
+        self._file = None
+        if not self.parquet:
+            self._file = open(filepath, 'w', newline='', encoding='utf-8')
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(self.columns)
+
+    def write(self, columns: Dict[str, List[Any]]) -> None:
+        """Dopisz kolumny jednego świata."""
+        count = len(columns[self.columns[0]]) if self.columns else 0
+        if not count:
+            return
+        if self.parquet:
+            table = pyarrow.table({name: columns[name] for name in self.columns})
+            if self._writer is None:
+                self._writer = pyarrow.parquet.ParquetWriter(self.filepath, table.schema)
+            self._writer.write_table(table)
+        else:
+            self._csv.writerows(zip(*(columns[name] for name in self.columns)))
+            self._file.flush()
+        self.rows += count
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def run_batch(seeds: Iterable[int], hours: float, output: str,
+              processes: Optional[int] = None, sample_hours: float = 24.0,
+              items: Sequence[str] = DEFAULT_ITEMS,
+              emergent_seeds: bool = True) -> Dict[str, Any]:
+    """Symuluj wiele światów równolegle i zapisz metryki do pliku.
+
+    Każdy świat działa w świeżym procesie (maxtasksperchild=1), bo GameState
+    jest singletonem podpiętym do globalnego EventBus.
+
+    Args:
+        seeds: Ziarna losowości kolejnych światów
+        hours: Liczba godzin gry na świat
+        output: Plik wyników (.parquet - wymaga pyarrow, inaczej CSV)
+        processes: Liczba procesów (None - liczba rdzeni)
+        sample_hours: Co ile godzin gry zapisywać próbkę metryk
+        items: Przedmioty, których ceny są śledzone
+        emergent_seeds: Czy rejestrować ziarna z create_quest_seed_library
+
+    Returns:
+        Podsumowanie: liczba światów, wierszy, czas
+    """
+    if hours <= 0 or sample_hours <= 0:
+        raise ValueError("Czas symulacji i odstęp próbek muszą być dodatnie")
+    tasks = [(seed, hours, sample_hours, tuple(items), emergent_seeds) for seed in seeds]
+    start = time.perf_counter()
+    worlds = 0
+    with ResultsWriter(output, metric_columns(items)) as writer:
+        with multiprocessing.Pool(processes=processes, maxtasksperchild=1) as pool:
+            for columns in pool.imap_unordered(simulate_world, tasks):
+                writer.write(columns)
+                worlds += 1
+        rows = writer.rows
+    return {
+        'worlds': worlds,
+        'rows': rows,
+        'output': output,
+        'wall_seconds': time.perf_counter() - start,
+    }
@@ -0,0 +1,275 @@
+"""Prekompilowany, binarny pakiet treści gry.
+
+Krok budowania (scripts/build_content_bundle.py) parsuje wszystkie pliki
+JSON z data/ - przedmioty, lokacje, NPCów, receptury, dialogi, questy - i
+zapisuje je jako pickle niezmiennych widoków (FrozenDict) w jednym pliku.
+DataLoader mapuje pakiet w pamięci (mmap) i rozpakowuje pojedynczy plik
+dopiero przy jego pierwszym odczycie. Plik źródłowy zmieniony po
+zbudowaniu pakietu (inny czas modyfikacji lub rozmiar) jest czytany
+z JSON, więc nieaktualny pakiet nigdy nie podaje starych danych.
+
+Format pliku:
+    BUNDLE_MAGIC | wersja, długość nagłówka (struct '<HI') | nagłówek (marshal) | dane
+Nagłówek zawiera wersję Pythona, hash źródeł i manifest
+{ścieżka względna: (mtime_ns, rozmiar, sha256, przesunięcie, długość)}.
+"""
+
+import hashlib
+import logging
+import marshal
+import mmap
+import os
+import pickle
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .data_loader import MISSING, read_json_view
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_MAGIC = b'DSCB'
+BUNDLE_VERSION = 1  # Zmień przy każdej zmianie formatu lub klasy widoków
+BUNDLE_NAME = 'content.bundle'
+_PREAMBLE = struct.Struct('<HI')
+
+
+class BundleError(ValueError):
+    """Pakiet treści uszkodzony lub z innej wersji."""
+
+
+def default_bundle_path(data_root: Union[str, Path] = "data") -> str:
+    """Domyślne położenie pakietu treści (w katalogu danych)."""
+    return os.path.join(str(data_root), BUNDLE_NAME)
+
+
+def _python_tag() -> Tuple[int, int]:
+    return tuple(sys.version_info[:2])
+
+
+def _stat_version(path: Union[str, Path]) -> Tuple[int, int]:
+    """(mtime_ns, rozmiar) - ta sama wersja pliku co w DataLoader.load_file."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def source_files(data_root: Union[str, Path] = "data") -> List[str]:
+    """Posortowane ścieżki (względne, z '/') wszystkich plików JSON z danymi."""
+    root = Path(data_root)
+    return sorted(path.relative_to(root).as_posix() for path in root.rglob('*.json'))
+
+
+def source_hash(data_root: Union[str, Path] = "data",
+                files: Optional[List[str]] = None) -> str:
+    """Hash zawartości plików źródłowych - klucz pakietu."""
+    root = Path(data_root)
+    digest = hashlib.sha256()
+    for relpath in (files if files is not None else source_files(root)):
+        digest.update(relpath.encode('utf-8') + b'\0')
+        digest.update(hashlib.sha256((root / relpath).read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def read_bundle_header(path: Union[str, Path]) -> Dict[str, Any]:
+    """Wczytuje sam nagłówek pakietu (bez danych)."""
+    with open(path, 'rb') as f:
+        return _parse_header(f.read(len(BUNDLE_MAGIC) + _PREAMBLE.size), f.read)[0]
+
+
+def _parse_header(preamble: bytes, read) -> Tuple[Dict[str, Any], int]:
+    if len(preamble) < len(BUNDLE_MAGIC) + _PREAMBLE.size or not preamble.startswith(BUNDLE_MAGIC):
+        raise BundleError("To nie jest pakiet treści")
+    version, header_length = _PREAMBLE.unpack_from(preamble, len(BUNDLE_MAGIC))
+    if version != BUNDLE_VERSION:
+        raise BundleError(f"Wersja pakietu {version}, oczekiwano {BUNDLE_VERSION}")
+    try:
+        header = marshal.loads(read(header_length))
+    except (EOFError, ValueError, TypeError) as e:
+        raise BundleError(f"Uszkodzony nagłówek pakietu: {e}")
+    if tuple(header.get('python', ())) != _python_tag():
+        raise BundleError("Pakiet zbudowany inną wersją Pythona")
+    return header, len(preamble) + header_length
+
+
+def build_bundle(data_root: Union[str, Path] = "data", output: Optional[str] = None,
+                 force: bool = False) -> Dict[str, Any]:
+    """Buduje pakiet treści ze wszystkich plików JSON w data_root.
+
+    Aktualny pakiet (ten sam hash źródeł i czasy modyfikacji plików) nie
+    jest przepisywany, chyba że force=True. Po zmianie samych czasów
+    modyfikacji (np. świeży checkout) pakiet jest budowany od nowa.
+
+    Args:
+        data_root: Katalog z danymi gry
+        output: Plik pakietu (domyślnie data_root/content.bundle)
+        force: Zbuduj nawet przy niezmienionych źródłach
+
+    Returns:
+        Podsumowanie: ścieżka, liczba plików, rozmiar, hash, czy przebudowano
+    """
+    root = Path(data_root)
+    output = output or default_bundle_path(root)
+    start = time.perf_counter()
+    files = source_files(root)
+    digest = source_hash(root, files)
+
+    if not force and os.path.exists(output):
+        try:
+            current = read_bundle_header(output)
+        except (BundleError, OSError):
+            current = None
+        if current is not None and current['source_hash'] == digest \
+                and sorted(current['files']) == files \
+                and all(current['files'][relpath][:2] == _stat_version(root / relpath)
+                        for relpath in files):
+            return {
+                'path': output,
+                'files': len(files),
+                'skipped': [],
+                'bytes': os.path.getsize(output),
+                'source_hash': digest,
+                'seconds': time.perf_counter() - start,
+                'rebuilt': False,
+            }
+
+    blobs = []
+    manifest = {}
+    offset = 0
+    skipped = []
+    for relpath in files:
+        path = root / relpath
+        raw = path.read_bytes()
+        try:
+            view = read_json_view(path)
+        except ValueError as e:
+            # Uszkodzony JSON zostaje poza pakietem - DataLoader zgłosi błąd przy odczycie
+            logger.warning(f"Pomijam {relpath} w pakiecie: {e}")
+            skipped.append(relpath)
+            continue
+        blob = pickle.dumps(view, protocol=pickle.HIGHEST_PROTOCOL)
+        manifest[relpath] = _stat_version(path) + (hashlib.sha256(raw).hexdigest(),
+                                                   offset, len(blob))
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = marshal.dumps({
+        'python': _python_tag(),
+        'source_hash': digest,
+        'built_at': time.time(),
+        'files': manifest,
+    })
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{output}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(BUNDLE_MAGIC)
+        f.write(_PREAMBLE.pack(BUNDLE_VERSION, len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(temp_path, output)
+
+    return {
+        'path': output,
+        'files': len(manifest),
+        'skipped': skipped,
+        'bytes': os.path.getsize(output),
+        'source_hash': digest,
+        'seconds': time.perf_counter() - start,
+        'rebuilt': True,
+    }
+
+
+class ContentBundle:
+    """Otwarty, zmapowany w pamięci pakiet treści.
+
+    Przykład:
+        bundle = ContentBundle("data/content.bundle", "data")
+        view = bundle.get(os.path.abspath("data/items.json"))
+    """
+
+    def __init__(self, path: Union[str, Path], data_root: Union[str, Path] = "data"):
+        """Otwiera pakiet.
+
+        Raises:
+            BundleError: Gdy plik nie jest pakietem tej wersji
+        """
+        self.path = str(path)
+        self.data_root = os.path.abspath(data_root)
+        self._map = None
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise BundleError("Pusty plik pakietu")
+        try:
+            preamble = self._map[:len(BUNDLE_MAGIC) + _PREAMBLE.size]
+            cursor = [len(preamble)]
+
+            def read(count: int) -> bytes:
+                data = self._map[cursor[0]:cursor[0] + count]
+                cursor[0] += count
+                return data
+
+            header, self._data_offset = _parse_header(preamble, read)
+        except BundleError:
+            self.close()
+            raise
+        self.source_hash: str = header['source_hash']
+        self.files: Dict[str, tuple] = header['files']
+        self.loads = 0
+
+    def get(self, filepath: Union[str, Path], version: Optional[Tuple[int, int]] = None) -> Any:
+        """Widok pliku z pakietu.
+
+        Args:
+            filepath: Ścieżka pliku źródłowego
+            version: (mtime_ns, rozmiar) pliku źródłowego, jeśli już znane
+
+        Returns:
+            Widok danych albo MISSING, gdy pliku nie ma w pakiecie lub zmienił
+            się od zbudowania pakietu
+        """
+        if self._map is None:
+            return MISSING
+        path = os.path.abspath(filepath)
+        relpath = os.path.relpath(path, self.data_root).replace(os.sep, '/')
+        entry = self.files.get(relpath)
+        if entry is None:
+            return MISSING
+        if version is None:
+            try:
+                version = _stat_version(path)
+            except OSError:
+                return MISSING
+        if (entry[0], entry[1]) != version:
+            return MISSING
+        start = self._data_offset + entry[3]
+        self.loads += 1
+        return pickle.loads(self._map[start:start + entry[4]])
+
+    def is_current(self) -> bool:
+        """Czy wszystkie pliki źródłowe są niezmienione (i nie doszły nowe)."""
+        root = Path(self.data_root)
+        if sorted(self.files) != source_files(root):
+            return False
+        return all((entry[0], entry[1]) == _stat_version(root / relpath)
+                   for relpath, entry in self.files.items())
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:  # pragma: no cover - zamykanie przy wyłączaniu interpretera
+            pass
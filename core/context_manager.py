@@ -77,34 +77,34 @@ class ContextManager:
         
         current_loc = self.game_state.current_location
         
-        for npc_id, npc in self.game_state.npc_manager.npcs.items():
-            # Sprawdź czy NPC jest w tej lokacji
-            if hasattr(npc, 'current_location') and npc.current_location == current_loc:
-                # Utwórz różne warianty nazwy do rozpoznawania
-                base_name = npc.name.lower()
-                first_name = base_name.split()[0] if ' ' in base_name else base_name
-                
-                entity = ContextualEntity(
-                    id=npc_id,
-                    name=base_name,
-                    display_name=npc.name,
-                    type='npc',
-                    location=current_loc,
-                    available=True,
-                    interaction_commands=[
-                        f"rozmawiaj {base_name}",
-                        f"rozmawiaj {first_name}",
-                        f"rozmawiaj {npc_id}",
-                        f"zbadaj {base_name}",
-                        f"zbadaj {first_name}",
-                        f"atakuj {base_name}",
-                        f"atakuj {first_name}"
-                    ]
-                )
-                npcs.append(entity)
-                self._entity_cache[npc_id] = entity
-                self._entity_cache[base_name] = entity
-                self._entity_cache[first_name] = entity
+        # Indeks przestrzenny managera - koszt zależy od liczby obecnych NPCów
+        for npc in self.game_state.npc_manager.get_npcs_in_location(current_loc):
+            npc_id = npc.id
+            # Utwórz różne warianty nazwy do rozpoznawania
+            base_name = npc.name.lower()
+            first_name = base_name.split()[0] if ' ' in base_name else base_name
+            
+            entity = ContextualEntity(
+                id=npc_id,
+                name=base_name,
+                display_name=npc.name,
+                type='npc',
+                location=current_loc,
+                available=True,
+                interaction_commands=[
+                    f"rozmawiaj {base_name}",
+                    f"rozmawiaj {first_name}",
+                    f"rozmawiaj {npc_id}",
+                    f"zbadaj {base_name}",
+                    f"zbadaj {first_name}",
+                    f"atakuj {base_name}",
+                    f"atakuj {first_name}"
+                ]
+            )
+            npcs.append(entity)
+            self._entity_cache[npc_id] = entity
+            self._entity_cache[base_name] = entity
+            self._entity_cache[first_name] = entity
         
         return npcs
     
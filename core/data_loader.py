@@ -3,15 +3,81 @@ Centralny system ładowania danych z hierarchicznej struktury JSON.
 
 Używa wzorca Singleton i cache'uje załadowane dane.
 Wspiera zarówno starą (flat) jak i nową (hierarchiczną) strukturę.
+
+Pliki treści współdzielone przez wiele podsystemów (npc_complete.json,
+dialogues.json) idą przez load_file: każdy plik jest parsowany raz na
+proces, a wszyscy dostają ten sam niezmienny widok (FrozenDict), ważny
+dopóki nie zmieni się czas modyfikacji pliku.
 """
 
 import json
 import logging
+import os
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+MISSING = object()  # Brak pliku w pakiecie treści
+
+
+class FrozenDict(dict):
+    """Niezmienny słownik - współdzielony widok danych z DataLoader.
+
+    Dziedziczy po dict, więc działa z isinstance(..., dict) i json.dump,
+    ale każda próba modyfikacji rzuca TypeError. Listy w widoku są krotkami.
+    Kopię do edycji daje thaw().
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Dane z DataLoader są tylko do odczytu - użyj thaw() aby dostać kopię")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def _freeze_list(values: list) -> tuple:
+    return tuple(_freeze_list(v) if type(v) is list else v for v in values)
+
+
+def _freeze_pairs(pairs: List[Tuple[str, Any]]) -> FrozenDict:
+    """object_pairs_hook dla json - zamraża obiekty już podczas parsowania."""
+    return FrozenDict((k, _freeze_list(v) if type(v) is list else v) for k, v in pairs)
+
+
+def read_json_view(filepath: Union[str, Path]) -> Any:
+    """Parsuje plik JSON od razu do niezmiennego widoku (FrozenDict / krotki)."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f, object_pairs_hook=_freeze_pairs)
+    return _freeze_list(data) if type(data) is list else data
+
+
+def freeze(value: Any) -> Any:
+    """Niezmienna kopia danych JSON (dict -> FrozenDict, list -> tuple)."""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Modyfikowalna głęboka kopia widoku (FrozenDict -> dict, tuple -> list).
+
+    Dla podsystemów, które zmieniają wczytane dane (np. ekwipunek NPCa) -
+    kopiowanie gotowego widoku jest tańsze niż ponowne parsowanie pliku.
+    """
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    return value
+
 
 class DataLoader:
     """
@@ -35,15 +101,26 @@ class DataLoader:
         npcs = data_loader.load_npcs(group='prison')
     """
 
-    def __init__(self, data_root: str = "data"):
+    def __init__(self, data_root: str = "data", bundle_path: Optional[str] = None,
+                 use_bundle: bool = True):
         """
         Inicjalizuje DataLoader.
 
         Args:
             data_root: Ścieżka do głównego folderu data/
+            bundle_path: Ścieżka pakietu treści (domyślnie data/content.bundle)
+            use_bundle: Czy czytać treść z pakietu, gdy jest aktualny
         """
         self.data_root = Path(data_root)
         self._cache = {}
+        # Współdzielone pliki: ścieżka -> ((mtime_ns, rozmiar), widok)
+        self._files: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self.parse_count = 0
+        self.bundle_hits = 0
+        self.bundle_path = bundle_path
+        self.use_bundle = use_bundle
+        self._bundle = None
+        self._bundle_checked = False
         self._use_new_structure = True  # Preferuj nową strukturę
 
         logger.info(f"DataLoader zainicjalizowany: {self.data_root}")
@@ -51,8 +128,75 @@ class DataLoader:
     def clear_cache(self):
         """Czyści cache załadowanych danych"""
         self._cache = {}
+        self._files = {}
+        self.close_bundle()
         logger.info("Cache danych wyczyszczony")
 
+    def load_file(self, filepath: Union[str, Path]) -> Any:
+        """
+        Wczytuje plik JSON jako współdzielony, niezmienny widok.
+
+        Plik jest parsowany raz na proces; kolejne wywołania (z dowolnego
+        podsystemu) zwracają ten sam obiekt, dopóki nie zmieni się czas
+        modyfikacji lub rozmiar pliku. Jeśli istnieje aktualny pakiet treści
+        (core.content_bundle), widok jest rozpakowywany z niego zamiast z JSON.
+
+        Args:
+            filepath: Ścieżka do pliku (względna wobec katalogu roboczego)
+
+        Returns:
+            FrozenDict (lub krotka) z danymi z JSONa
+
+        Raises:
+            FileNotFoundError: Gdy plik nie istnieje
+            json.JSONDecodeError: Gdy JSON jest nieprawidłowy
+        """
+        path = os.path.abspath(filepath)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        bundle = self._get_bundle()
+        data = bundle.get(path, version) if bundle is not None else MISSING
+        if data is not MISSING:
+            self.bundle_hits += 1
+        else:
+            try:
+                data = read_json_view(path)
+            except json.JSONDecodeError as e:
+                logger.error(f"Błąd parsowania JSON w {filepath}: {e}")
+                raise
+            self.parse_count += 1
+        self._files[path] = (version, data)
+        logger.debug(f"Załadowano (współdzielone): {filepath}")
+        return data
+
+    def _get_bundle(self):
+        """Pakiet treści (otwierany leniwie przy pierwszym odczycie, None - brak)."""
+        if self._bundle is None and self.use_bundle and not self._bundle_checked:
+            self._bundle_checked = True
+            from .content_bundle import BundleError, ContentBundle, default_bundle_path
+            path = self.bundle_path or default_bundle_path(self.data_root)
+            if os.path.exists(path):
+                try:
+                    self._bundle = ContentBundle(path, self.data_root)
+                except BundleError as e:
+                    logger.warning(f"Pomijam pakiet treści {path}: {e}")
+        return self._bundle
+
+    def close_bundle(self):
+        """Zamyka pakiet treści (kolejne odczyty otworzą go ponownie)."""
+        if self._bundle is not None:
+            self._bundle.close()
+        self._bundle = None
+        self._bundle_checked = False
+
+    def load_npc_complete(self) -> FrozenDict:
+        """Ładuje kompletne dane NPCów (npc_complete.json) jako współdzielony widok"""
+        return self.load_file(self.data_root / 'npc_complete.json')
+
     def _load_json(self, filepath: Path) -> Dict:
         """
         Wczytuje plik JSON.
@@ -279,19 +423,12 @@ class DataLoader:
         self._cache[cache_key] = texts
         return texts
 
-    def load_dialogues(self) -> Dict[str, Any]:
-        """Ładuje dialogi"""
-        cache_key = "dialogues"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-
+    def load_dialogues(self) -> FrozenDict:
+        """Ładuje dialogi jako współdzielony widok"""
         filepath = self.data_root / 'dialogue' / 'dialogues.json'
         if not filepath.exists():
             filepath = self.data_root / 'dialogues.json'
-
-        dialogues = self._load_json(filepath)
-        self._cache[cache_key] = dialogues
-        return dialogues
+        return self.load_file(filepath)
 
     def get_item(self, item_id: str) -> Optional[Dict[str, Any]]:
         """Pobiera pojedynczy item po ID"""
@@ -0,0 +1,180 @@
+"""Odroczone handlery wydarzeń - wykonywane w puli wątków poza ścieżką emisji."""
+
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+
+class DeferredHandler:
+    """Handler wykonywany w puli wątków DeferredExecutor.
+
+    Każdy subskrybent ma własną kolejkę FIFO i w danej chwili co najwyżej
+    jedno zadanie w puli, więc widzi wydarzenia w kolejności emisji.
+    Odroczony handler nie powinien emitować wydarzeń - EventBus nie jest
+    bezpieczny wątkowo.
+    """
+
+    __slots__ = ('handler', 'executor', 'queue', 'scheduled', 'submitted', 'completed',
+                 'errors', 'max_depth', 'blocked', 'blocked_time', 'latency')
+
+    def __init__(self, handler: Callable, executor: 'DeferredExecutor'):
+        self.handler = handler
+        self.executor = executor
+        self.queue: Deque[Tuple[float, Any]] = deque()
+        self.scheduled = False  # Czy zadanie opróżniające kolejkę jest w puli
+        self.submitted = 0
+        self.completed = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.blocked = 0
+        self.blocked_time = 0.0
+        self.latency = 0.0  # Suma czasów od emisji do zakończenia handlera
+
+    def __call__(self, event: Any) -> None:
+        self.executor.submit(self, event)
+
+    @property
+    def name(self) -> str:
+        return getattr(self.handler, '__qualname__', repr(self.handler))
+
+    def stats(self) -> Dict[str, Any]:
+        """Metryki subskrybenta (w tym backpressure)."""
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'pending': len(self.queue),
+            'errors': self.errors,
+            'max_depth': self.max_depth,
+            'blocked': self.blocked,
+            'blocked_ms': self.blocked_time * 1000,
+            'mean_latency_ms': self.latency / self.completed * 1000 if self.completed else 0.0,
+        }
+
+
+class DeferredExecutor:
+    """Ograniczona pula wątków dla odroczonych handlerów EventBus.
+
+    Backpressure: gdy kolejka subskrybenta osiągnie max_pending, emitujący
+    wątek czeka na zwolnienie miejsca (czas oczekiwania trafia do metryk).
+    flush() jest barierą - wraca, gdy wszystkie przyjęte wydarzenia zostały
+    obsłużone.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 1000):
+        """Inicjalizacja puli.
+
+        Args:
+            max_workers: Liczba wątków roboczych
+            max_pending: Maksymalna liczba oczekujących wydarzeń na subskrybenta
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool: Optional['ThreadPoolExecutor'] = None
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._pending = 0
+        self.handlers: Dict[Callable, DeferredHandler] = {}
+
+    def wrap(self, handler: Callable) -> DeferredHandler:
+        """Odroczony handler dla funkcji (jeden na funkcję, wspólna kolejka)."""
+        deferred = self.handlers.get(handler)
+        if deferred is None:
+            deferred = self.handlers[handler] = DeferredHandler(handler, self)
+        return deferred
+
+    def submit(self, deferred: DeferredHandler, item: Any) -> None:
+        """Dodaj wydarzenie do kolejki subskrybenta.
+
+        Args:
+            deferred: Odroczony handler
+            item: Wydarzenie (lub bezargumentowa funkcja dla deferred=None)
+        """
+        with self._changed:
+            if len(deferred.queue) >= self.max_pending:
+                deferred.blocked += 1
+                start = time.perf_counter()
+                while len(deferred.queue) >= self.max_pending:
+                    self._changed.wait()
+                deferred.blocked_time += time.perf_counter() - start
+            deferred.queue.append((time.perf_counter(), item))
+            deferred.submitted += 1
+            self._pending += 1
+            if len(deferred.queue) > deferred.max_depth:
+                deferred.max_depth = len(deferred.queue)
+            if deferred.scheduled:
+                return
+            deferred.scheduled = True
+            if self._pool is None:
+                # Import leniwy - pula (i concurrent.futures) dopiero przy pierwszym użyciu
+                from concurrent.futures import ThreadPoolExecutor
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="event-deferred")
+        self._pool.submit(self._drain, deferred)
+
+    def call(self, func: Callable[[], Any]) -> None:
+        """Wykonaj jednorazową funkcję w puli (np. zapis historii na dysk)."""
+        self.submit(self.wrap(_call), func)
+
+    def _drain(self, deferred: DeferredHandler) -> None:
+        """Obsłuż kolejkę subskrybenta (co najwyżej jeden _drain na subskrybenta)."""
+        handler = deferred.handler
+        while True:
+            with self._changed:
+                if not deferred.queue:
+                    deferred.scheduled = False
+                    self._changed.notify_all()
+                    return
+                enqueued, item = deferred.queue[0]
+            try:
+                handler(item)
+            except Exception as e:
+                deferred.errors += 1
+                print(f"[EventBus] Błąd w odroczonym handlerze {deferred.name}: {e}")
+            with self._changed:
+                deferred.queue.popleft()
+                deferred.completed += 1
+                deferred.latency += time.perf_counter() - enqueued
+                self._pending -= 1
+                self._changed.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Bariera - czekaj na obsłużenie wszystkich przyjętych wydarzeń.
+
+        Args:
+            timeout: Maksymalny czas oczekiwania w sekundach (None - bez limitu)
+
+        Returns:
+            Czy wszystkie wydarzenia zostały obsłużone
+        """
+        with self._changed:
+            return self._changed.wait_for(lambda: self._pending == 0, timeout)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Metryki puli i poszczególnych subskrybentów."""
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'pending': self._pending,
+                'handlers': {deferred.name: deferred.stats() for deferred in self.handlers.values()},
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Zatrzymaj pulę wątków (po flush, jeśli wait)."""
+        if wait:
+            self.flush()
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+
+def _call(func: Callable[[], Any]) -> None:
+    func()
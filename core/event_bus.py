@@ -1,10 +1,16 @@
 """System event bus dla komunikacji między modułami gry."""
 
-from typing import Dict, List, Callable, Any, Optional
+from typing import Deque, Dict, List, Callable, Any, Optional, Tuple
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from itertools import count, islice
+import heapq
 import json
+import time
+
+from .deferred import DeferredExecutor
 
 
 class EventPriority(Enum):
@@ -59,53 +65,129 @@ class GameEvent:
         }
 
 
-class EventBus:
-    """Centralny system komunikacji wydarzeń."""
+class EventCounters:
+    """Liczniki wydarzeń EventBus (opcjonalne - EventBus(collect_stats=False) je pomija)."""
+    
+    __slots__ = ('total_events', 'events_by_category', 'events_by_type', 'processing_time')
     
     def __init__(self):
-        """Inicjalizacja event bus."""
+        self.total_events = 0
+        self.events_by_category: Dict[EventCategory, int] = {cat: 0 for cat in EventCategory}
+        self.events_by_type: Dict[str, int] = {}
+        self.processing_time = 0.0
+    
+    def record(self, event: GameEvent, elapsed: float) -> None:
+        """Zlicz przetworzone wydarzenie.
+        
+        Args:
+            event: Przetworzone wydarzenie
+            elapsed: Czas przetwarzania w sekundach
+        """
+        self.total_events += 1
+        self.events_by_category[event.category] += 1
+        by_type = self.events_by_type
+        by_type[event.event_type] = by_type.get(event.event_type, 0) + 1
+        self.processing_time += elapsed
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Statystyki w formacie słownika EventBus.stats."""
+        return {
+            'total_events': self.total_events,
+            'events_by_category': dict(self.events_by_category),
+            'events_by_type': dict(self.events_by_type),
+            'processing_time': self.processing_time
+        }
+
+
+class EventBus:
+    """Centralny system komunikacji wydarzeń.
+    
+    Handlery typu i kategorii są łączone w zamrożoną krotkę dla pary
+    (typ, kategoria) przy pierwszym wydarzeniu tej pary i przebudowywane
+    dopiero po zmianie subskrypcji. Handlery subskrybowane z deferred=True
+    działają w puli wątków (DeferredExecutor); flush() czeka na ich zakończenie.
+    """
+    
+    def __init__(self, collect_stats: bool = True, deferred_workers: int = 2,
+                 max_deferred_pending: int = 1000):
+        """Inicjalizacja event bus.
+        
+        Args:
+            collect_stats: Czy zliczać wydarzenia i czas przetwarzania
+            deferred_workers: Liczba wątków dla odroczonych handlerów
+            max_deferred_pending: Limit oczekujących wydarzeń na odroczony handler
+        """
         self.listeners: Dict[str, List[Callable]] = {}
         self.category_listeners: Dict[EventCategory, List[Callable]] = {}
-        self.event_queue: List[GameEvent] = []
-        self.event_history: List[GameEvent] = []
-        self.history_limit = 1000
+        # (typ, kategoria) -> handlery typu, potem kategorii
+        self._dispatch: Dict[Tuple[str, EventCategory], Tuple[Callable, ...]] = {}
+        # Kopiec (-priorytet, numer kolejny, wydarzenie) - równe priorytety w kolejności emisji
+        self.event_queue: List[Tuple[int, int, GameEvent]] = []
+        self._sequence = count()
+        # Bufor cykliczny - najstarsze wydarzenia wypadają same
+        self.event_history: Deque[GameEvent] = deque(maxlen=1000)
         self.processing = False
         self.batch_mode = False  # For batching multiple events
         self.debug_mode = False
         
         # Statystyki
-        self.stats = {
-            'total_events': 0,
-            'events_by_category': {cat: 0 for cat in EventCategory},
-            'events_by_type': {},
-            'processing_time': 0
-        }
+        self.counters: Optional[EventCounters] = EventCounters() if collect_stats else None
+        
+        # Odroczone handlery (pula tworzy wątki przy pierwszym wydarzeniu)
+        self.executor = DeferredExecutor(deferred_workers, max_deferred_pending)
+        
+        # Binarny dziennik wydarzeń (core.event_journal.EventJournal)
+        self.journal: Optional[Any] = None
     
-    def subscribe(self, event_type: str, handler: Callable) -> None:
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Statystyki wydarzeń (zerowe gdy liczniki są wyłączone)."""
+        counters = self.counters if self.counters is not None else EventCounters()
+        return counters.as_dict()
+    
+    @property
+    def history_limit(self) -> int:
+        """Maksymalna liczba wydarzeń w historii."""
+        return self.event_history.maxlen
+
+    @history_limit.setter
+    def history_limit(self, limit: int) -> None:
+        self.event_history = deque(self.event_history, maxlen=limit)
+    
+    def subscribe(self, event_type: str, handler: Callable, deferred: bool = False) -> None:
         """Subskrypcja na konkretny typ wydarzenia.
         
         Args:
             event_type: Typ wydarzenia do nasłuchiwania
             handler: Funkcja obsługująca wydarzenie
+            deferred: Czy wykonywać handler w puli wątków (poza ścieżką emisji)
         """
+        if deferred:
+            handler = self.executor.wrap(handler)
         if event_type not in self.listeners:
             self.listeners[event_type] = []
         if handler not in self.listeners[event_type]:
             self.listeners[event_type].append(handler)
+            self._dispatch.clear()
             if self.debug_mode:
                 print(f"[EventBus] Zarejestrowano handler dla {event_type}")
     
-    def subscribe_category(self, category: EventCategory, handler: Callable) -> None:
+    def subscribe_category(self, category: EventCategory, handler: Callable,
+                           deferred: bool = False) -> None:
         """Subskrypcja na całą kategorię wydarzeń.
         
         Args:
             category: Kategoria wydarzeń
             handler: Funkcja obsługująca
+            deferred: Czy wykonywać handler w puli wątków (poza ścieżką emisji)
         """
+        if deferred:
+            handler = self.executor.wrap(handler)
         if category not in self.category_listeners:
             self.category_listeners[category] = []
         if handler not in self.category_listeners[category]:
             self.category_listeners[category].append(handler)
+            self._dispatch.clear()
     
     def unsubscribe(self, event_type: str, handler: Callable) -> None:
         """Anulowanie subskrypcji.
@@ -114,21 +196,90 @@ class EventBus:
             event_type: Typ wydarzenia
             handler: Handler do usunięcia
         """
-        if event_type in self.listeners and handler in self.listeners[event_type]:
-            self.listeners[event_type].remove(handler)
+        handlers = self.listeners.get(event_type)
+        if handlers is None:
+            return
+        handler = self._subscribed(handlers, handler)
+        if handler is not None:
+            handlers.remove(handler)
+            self._dispatch.clear()
+
+    def unsubscribe_category(self, category: EventCategory, handler: Callable) -> None:
+        """Anulowanie subskrypcji kategorii.
+
+        Args:
+            category: Kategoria wydarzeń
+            handler: Handler do usunięcia
+        """
+        handlers = self.category_listeners.get(category)
+        if handlers is None:
+            return
+        handler = self._subscribed(handlers, handler)
+        if handler is not None:
+            handlers.remove(handler)
+            self._dispatch.clear()
     
+    def _subscribed(self, handlers: List[Callable], handler: Callable) -> Optional[Callable]:
+        """Handler z listy - sam handler albo jego odroczona wersja."""
+        if handler in handlers:
+            return handler
+        deferred = self.executor.handlers.get(handler)
+        if deferred is not None and deferred in handlers:
+            return deferred
+        return None
+    
+    def attach_journal(self, journal: Any) -> None:
+        """Podłącz dziennik - każde przetworzone wydarzenie jest do niego dopisywane.
+        
+        Args:
+            journal: Obiekt z metodą append(event), np. EventJournal
+        """
+        self.journal = journal
+    
+    def detach_journal(self) -> Optional[Any]:
+        """Odłącz dziennik (bufor zapisywany na dysk).
+        
+        Returns:
+            Odłączony dziennik lub None
+        """
+        journal, self.journal = self.journal, None
+        if journal is not None and hasattr(journal, 'flush'):
+            journal.flush()
+        return journal
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Bariera - czekaj aż odroczone handlery obsłużą wszystkie wydarzenia.
+        
+        Args:
+            timeout: Maksymalny czas oczekiwania w sekundach (None - bez limitu)
+            
+        Returns:
+            Czy wszystkie odroczone wydarzenia zostały obsłużone
+        """
+        return self.executor.flush(timeout)
+
     def emit(self, event: GameEvent) -> None:
         """Emisja wydarzenia.
         
         Args:
             event: Wydarzenie do wyemitowania
         """
-        # Dodaj do kolejki
-        self.event_queue.append(event)
+        if self.processing or self.batch_mode or self.event_queue:
+            # Dodaj do kolejki
+            heapq.heappush(self.event_queue, (-event.priority.value, next(self._sequence), event))
+            
+            # Jeśli nie przetwarzamy już wydarzeń i nie jesteśmy w trybie batch, rozpocznij przetwarzanie
+            if not self.processing and not self.batch_mode:
+                self._process_queue()
+            return
         
-        # Jeśli nie przetwarzamy już wydarzeń i nie jesteśmy w trybie batch, rozpocznij przetwarzanie
-        if not self.processing and not self.batch_mode:
-            self._process_queue()
+        # Pusta kolejka - wydarzenie jest od razu pierwsze, bez kopca
+        self.processing = True
+        if event.propagate:
+            self._process_event(event)
+        if self.event_queue:
+            self._drain_queue()
+        self.processing = False
     
     def emit_immediate(self, event: GameEvent) -> None:
         """Natychmiastowa emisja wydarzenia (omija kolejkę).
@@ -151,18 +302,25 @@ class EventBus:
     def _process_queue(self) -> None:
         """Przetwarzanie kolejki wydarzeń."""
         self.processing = True
-        
-        # Sortuj całą kolejkę według priorytetu przed przetwarzaniem
-        self.event_queue.sort(key=lambda e: e.priority.value, reverse=True)
-        
-        # Przetwórz wszystkie wydarzenia w kolejności
-        while self.event_queue:
-            event = self.event_queue.pop(0)
+        self._drain_queue()
+        self.processing = False
+    
+    def _drain_queue(self) -> None:
+        """Przetwórz wszystkie wydarzenia w kolejności priorytetów (także te
+        wyemitowane przez handlery w trakcie przetwarzania)."""
+        queue = self.event_queue
+        while queue:
+            event = heapq.heappop(queue)[2]
             
             if event.propagate:
                 self._process_event(event)
-        
-        self.processing = False
+    
+    def _build_dispatch(self, event_type: str, category: EventCategory) -> Tuple[Callable, ...]:
+        """Buduje krotkę handlerów dla pary (typ, kategoria)."""
+        handlers = tuple(self.listeners.get(event_type, ())) + \
+            tuple(self.category_listeners.get(category, ()))
+        self._dispatch[(event_type, category)] = handlers
+        return handlers
     
     def _process_event(self, event: GameEvent) -> None:
         """Przetworzenie pojedynczego wydarzenia.
@@ -170,37 +328,34 @@ class EventBus:
         Args:
             event: Wydarzenie do przetworzenia
         """
-        # Aktualizuj statystyki
-        self.stats['total_events'] += 1
-        self.stats['events_by_category'][event.category] += 1
-        if event.event_type not in self.stats['events_by_type']:
-            self.stats['events_by_type'][event.event_type] = 0
-        self.stats['events_by_type'][event.event_type] += 1
+        counters = self.counters
+        if counters is not None:
+            start = time.perf_counter()
         
         # Dodaj do historii
         self.event_history.append(event)
-        if len(self.event_history) > self.history_limit:
-            self.event_history.pop(0)
+        if self.journal is not None:
+            self.journal.append(event)
         
         # Debug
         if self.debug_mode:
             print(f"[EventBus] Przetwarzanie: {event.event_type} [{event.category.value}]")
         
-        # Wywołaj handlery dla konkretnego typu
-        if event.event_type in self.listeners:
-            for handler in self.listeners[event.event_type]:
-                try:
-                    handler(event)
-                except Exception as e:
+        # Wywołaj handlery typu, potem kategorii
+        handlers = self._dispatch.get((event.event_type, event.category))
+        if handlers is None:
+            handlers = self._build_dispatch(event.event_type, event.category)
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                if handler in self.listeners.get(event.event_type, ()):
                     print(f"[EventBus] Błąd w handlerze dla {event.event_type}: {e}")
-        
-        # Wywołaj handlery dla kategorii
-        if event.category in self.category_listeners:
-            for handler in self.category_listeners[event.category]:
-                try:
-                    handler(event)
-                except Exception as e:
+                else:
                     print(f"[EventBus] Błąd w handlerze kategorii {event.category}: {e}")
+        
+        if counters is not None:
+            counters.record(event, time.perf_counter() - start)
     
     def get_history(self, category: Optional[EventCategory] = None,
                     event_type: Optional[str] = None,
@@ -215,7 +370,7 @@ class EventBus:
         Returns:
             Lista wydarzeń z historii
         """
-        history = self.event_history[-limit:]
+        history = list(islice(self.event_history, max(0, len(self.event_history) - limit), None))
         
         if category:
             history = [e for e in history if e.category == category]
@@ -234,15 +389,24 @@ class EventBus:
         Returns:
             Słownik ze statystykami
         """
-        return self.stats.copy()
+        return self.stats
     
-    def save_history(self, filepath: str) -> None:
+    def save_history(self, filepath: str, deferred: bool = False) -> None:
         """Zapisz historię do pliku.
         
         Args:
             filepath: Ścieżka do pliku
+            deferred: Czy zapisać w puli wątków (kopia historii z chwili wywołania)
         """
-        history_data = [event.to_dict() for event in self.event_history]
+        if deferred:
+            events = list(self.event_history)
+            self.executor.call(lambda: self._write_history(filepath, events))
+        else:
+            self._write_history(filepath, self.event_history)
+    
+    @staticmethod
+    def _write_history(filepath: str, events) -> None:
+        history_data = [event.to_dict() for event in events]
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(history_data, f, ensure_ascii=False, indent=2)
 
@@ -0,0 +1,216 @@
+"""Binarny dziennik wydarzeń EventBus - zapis całych sesji i odtwarzanie.
+
+Format pliku: nagłówek (MAGIC, wersja, kodek), potem rekordy
+    <I długość danych> <d timestamp> <B priorytet> <dane>
+gdzie dane to [typ, kategoria, źródło, cel, propagate, data] zakodowane
+msgpack (jeśli zainstalowany) lub zwartym JSON. Plik jest tylko dopisywany,
+więc przerwany zapis psuje co najwyżej ostatni rekord.
+"""
+
+import json
+import mmap
+import os
+import struct
+from datetime import datetime
+from typing import Any, Iterator, Optional
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:  # pragma: no cover - zależność opcjonalna
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+from .event_bus import EventCategory, EventPriority, GameEvent
+
+
+MAGIC = b"DSEJ"
+VERSION = 1
+CODEC_JSON = ord("j")
+CODEC_MSGPACK = ord("m")
+
+_FILE_HEADER = struct.Struct("<4sBB")
+_RECORD_HEADER = struct.Struct("<IdB")
+_PRIORITIES = {priority.value: priority for priority in EventPriority}
+
+
+def _encode_json(payload: list) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _decode_json(data) -> list:
+    return json.loads(bytes(data).decode("utf-8"))
+
+
+def _encode_msgpack(payload: list) -> bytes:
+    return msgpack.packb(payload, default=str, use_bin_type=True)
+
+
+def _decode_msgpack(data) -> list:
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+class EventJournal:
+    """Dopisywany plik z rekordami wydarzeń, buforowany w pamięci.
+
+    Rekordy trafiają do bufora i na dysk, gdy bufor przekroczy
+    buffer_bytes - pamięć zajęta przez dziennik nie rośnie z długością sesji.
+    """
+
+    def __init__(self, filepath: str, buffer_bytes: int = 64 * 1024,
+                 use_msgpack: Optional[bool] = None):
+        """Otwórz dziennik do dopisywania.
+
+        Args:
+            filepath: Ścieżka do pliku dziennika
+            buffer_bytes: Rozmiar bufora przed zapisem na dysk
+            use_msgpack: Kodek nowego pliku (None - msgpack, jeśli dostępny);
+                istniejący plik zachowuje swój kodek
+        """
+        self.filepath = filepath
+        self.buffer_bytes = buffer_bytes
+        self.records = 0
+        self._buffer = bytearray()
+
+        codec = _read_codec(filepath)
+        if codec is None:
+            if use_msgpack is None:
+                use_msgpack = MSGPACK_AVAILABLE
+            codec = CODEC_MSGPACK if use_msgpack else CODEC_JSON
+            directory = os.path.dirname(filepath)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(filepath, "wb") as f:
+                f.write(_FILE_HEADER.pack(MAGIC, VERSION, codec))
+        if codec == CODEC_MSGPACK and not MSGPACK_AVAILABLE:
+            raise RuntimeError("Dziennik zapisany w msgpack - zainstaluj pakiet msgpack")
+        self.codec = codec
+        self._encode = _encode_msgpack if codec == CODEC_MSGPACK else _encode_json
+        self._file = open(filepath, "ab")
+
+    def append(self, event: GameEvent) -> None:
+        """Dopisz wydarzenie do dziennika."""
+        payload = self._encode([event.event_type, event.category.value, event.source,
+                                event.target, event.propagate, event.data])
+        self._buffer += _RECORD_HEADER.pack(len(payload), event.timestamp.timestamp(),
+                                            event.priority.value)
+        self._buffer += payload
+        self.records += 1
+        if len(self._buffer) >= self.buffer_bytes:
+            self.flush()
+
+    __call__ = append
+
+    def flush(self) -> None:
+        """Zapisz bufor na dysk."""
+        if self._buffer and self._file is not None:
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._buffer.clear()
+
+    def close(self) -> None:
+        """Zapisz bufor i zamknij plik."""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _read_codec(filepath: str) -> Optional[int]:
+    """Kodek istniejącego dziennika (None - brak pliku lub pusty plik)."""
+    if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
+        return None
+    with open(filepath, "rb") as f:
+        header = f.read(_FILE_HEADER.size)
+    return _check_header(header, filepath)
+
+
+def _check_header(header: bytes, filepath: str) -> int:
+    if len(header) < _FILE_HEADER.size:
+        raise ValueError(f"Uszkodzony nagłówek dziennika: {filepath}")
+    magic, version, codec = _FILE_HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION or codec not in (CODEC_JSON, CODEC_MSGPACK):
+        raise ValueError(f"Nieobsługiwany plik dziennika: {filepath}")
+    return codec
+
+
+def read_journal(filepath: str) -> Iterator[GameEvent]:
+    """Czytaj wydarzenia z dziennika (plik mapowany do pamięci).
+
+    Niekompletny ostatni rekord (przerwany zapis) jest pomijany.
+
+    Args:
+        filepath: Ścieżka do pliku dziennika
+
+    Yields:
+        Kolejne wydarzenia w kolejności zapisu
+    """
+    if os.path.getsize(filepath) == 0:
+        return
+    with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        codec = _check_header(data[:_FILE_HEADER.size], filepath)
+        if codec == CODEC_MSGPACK and not MSGPACK_AVAILABLE:
+            raise RuntimeError("Dziennik zapisany w msgpack - zainstaluj pakiet msgpack")
+        decode = _decode_msgpack if codec == CODEC_MSGPACK else _decode_json
+        view = memoryview(data)
+        try:
+            offset = _FILE_HEADER.size
+            end = len(data)
+            header_size = _RECORD_HEADER.size
+            while offset + header_size <= end:
+                length, timestamp, priority = _RECORD_HEADER.unpack_from(data, offset)
+                start = offset + header_size
+                if start + length > end:
+                    break
+                event_type, category, source, target, propagate, event_data = \
+                    decode(view[start:start + length])
+                offset = start + length
+                yield GameEvent(
+                    event_type=event_type,
+                    category=EventCategory(category),
+                    data=event_data,
+                    priority=_PRIORITIES.get(priority, EventPriority.NORMAL),
+                    timestamp=datetime.fromtimestamp(timestamp),
+                    source=source,
+                    target=target,
+                    propagate=propagate
+                )
+        finally:
+            view.release()
+
+
+def replay_journal(filepath: str, bus: Any) -> int:
+    """Odtwórz dziennik przez EventBus (np. do świeżego GameState).
+
+    Dziennik podpięty do bus na czas odtwarzania jest odłączany, żeby
+    odtwarzane wydarzenia nie trafiły do niego ponownie.
+
+    Args:
+        filepath: Ścieżka do pliku dziennika
+        bus: EventBus, przez który emitowane są wydarzenia
+
+    Returns:
+        Liczba odtworzonych wydarzeń
+    """
+    journal = bus.detach_journal()
+    count = 0
+    try:
+        for event in read_journal(filepath):
+            bus.emit(event)
+            count += 1
+        bus.flush()
+    finally:
+        if journal is not None:
+            bus.attach_journal(journal)
+    return count
@@ -0,0 +1,91 @@
+"""Zegar czasu gry - jedno źródło czasu dla wszystkich podsystemów."""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+GAME_EPOCH = datetime(1000, 1, 1, 0, 0)  # Północ pierwszego dnia świata gry
+MINUTES_PER_DAY = 24 * 60
+
+
+class GameClock:
+    """Monotoniczny zegar gry liczony w minutach od GAME_EPOCH.
+
+    Czas płynie wyłącznie przez advance(), więc symulację można przewijać
+    z prędkością procesora, a wyniki nie zależą od zegara systemowego.
+    Podsystemy czytają czas w formie, której używają:
+    now() - datetime (questy, konsekwencje), time() - sekundy gry (NPCe,
+    zamiast time.time()), minutes / day / minute_of_day - GameState.
+    """
+
+    __slots__ = ('_minutes',)
+
+    def __init__(self, minutes: float = 0.0):
+        self._minutes = float(minutes)
+
+    @property
+    def minutes(self) -> float:
+        """Minuty od początku świata gry."""
+        return self._minutes
+
+    @property
+    def day(self) -> int:
+        """Numer dnia (od 1)."""
+        return int(self._minutes // MINUTES_PER_DAY) + 1
+
+    @property
+    def minute_of_day(self) -> float:
+        return self._minutes % MINUTES_PER_DAY
+
+    @property
+    def hour(self) -> int:
+        return int(self.minute_of_day // 60)
+
+    def now(self) -> datetime:
+        """Bieżący czas gry jako datetime."""
+        return self.to_datetime(self._minutes)
+
+    def time(self) -> float:
+        """Bieżący czas gry w sekundach (odpowiednik time.time())."""
+        return self._minutes * 60
+
+    def advance(self, minutes: float) -> float:
+        """Przesuń zegar do przodu.
+
+        Args:
+            minutes: Liczba minut gry (nieujemna)
+
+        Returns:
+            Nowy czas w minutach
+        """
+        if minutes < 0:
+            raise ValueError("Zegar gry nie może się cofać")
+        self._minutes += minutes
+        return self._minutes
+
+    def set(self, minutes: float) -> None:
+        """Ustaw czas bezwzględnie (nowa gra, wczytanie zapisu)."""
+        self._minutes = float(minutes)
+
+    def set_day_time(self, day: int, minute_of_day: float) -> None:
+        """Ustaw czas z numeru dnia i minuty dnia (format zapisów GameState)."""
+        self.set((day - 1) * MINUTES_PER_DAY + minute_of_day)
+
+    @staticmethod
+    def to_datetime(minutes: float) -> datetime:
+        """Datetime dla czasu gry w minutach."""
+        return GAME_EPOCH + timedelta(minutes=minutes)
+
+    @staticmethod
+    def hour_at(seconds: float) -> int:
+        """Godzina dnia dla czasu z time()."""
+        return int(seconds // 3600) % 24
+
+    def __repr__(self) -> str:
+        return (f"GameClock(dzień {self.day}, "
+                f"{int(self.minute_of_day // 60):02d}:{int(self.minute_of_day % 60):02d})")
+
+
+def clock_now(clock: Optional[GameClock]) -> datetime:
+    """Czas gry z zegara albo czas systemowy, gdy zegar nie jest podpięty."""
+    return clock.now() if clock is not None else datetime.now()
@@ -1,20 +1,24 @@
 """Globalny stan gry - zarządzanie wszystkimi systemami."""
 
-from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
+from typing import Dict, Any, Callable, Optional, List, Tuple, TYPE_CHECKING
 from dataclasses import dataclass, field
 from datetime import datetime
+import atexit
 import json
 import os
 from enum import Enum
 
 from .event_bus import event_bus, EventCategory, GameEvent, EventPriority
+from .background_save import background_saver
+from .game_clock import GameClock
+from .profiler import TickProfiler
+from .world_state import WorldState
 from world.locations.prison import Prison
 from world.time_system import TimeSystem
 from world.weather import WeatherSystem
 from player.character import Player, CharacterState
 from npcs.npc_manager import NPCManager
 from mechanics.economy import Economy
-from mechanics.crafting import CraftingSystem
 from mechanics.combat import combat_system as _combat_system_singleton
 # UWAGA: Import dialogue_controller jest lazy (wewnątrz metod) aby uniknąć circular import
 
@@ -22,6 +26,7 @@ from mechanics.combat import combat_system as _combat_system_singleton
 if TYPE_CHECKING:
     from quests.quest_engine import QuestEngine, QuestState, RewardSystem
     from quests.consequences import ConsequenceManager
+    from mechanics.crafting import CraftingSystem
 
 
 class GameMode(Enum):
@@ -53,6 +58,11 @@ class GameState:
     
     _instance = None
     
+    # Co ile odświeżeń stanu świata reputacja jest przeliczana bez wydarzenia
+    REPUTATION_RESYNC_TICKS = 60
+    # Przedmioty w economy.average_prices (Economy.get_average_prices)
+    ECONOMY_ITEMS = ('chleb', 'woda', 'mięso', 'ser', 'jabłko')
+    
     def __new__(cls):
         """Singleton pattern."""
         if cls._instance is None:
@@ -76,6 +86,10 @@ class GameState:
         # Czas gry
         self.game_time = 420  # 7:00 rano start
         self.day = 1
+        # Jedyne źródło czasu podsystemów (questy, konsekwencje, NPCe);
+        # game_time i day to minuta dnia i numer dnia tego samego czasu
+        self.clock = GameClock()
+        self.clock.set_day_time(self.day, self.game_time)
         self.total_playtime = 0
         self.session_start = datetime.now()
         
@@ -86,7 +100,7 @@ class GameState:
         self.weather_system: Optional[WeatherSystem] = None
         self.npc_manager: Optional[NPCManager] = None
         self.economy: Optional[Economy] = None
-        self.crafting_system: Optional[CraftingSystem] = None
+        self._crafting: Optional['CraftingSystem'] = None  # Budowany leniwie (crafting_system)
         self.combat_system = _combat_system_singleton  # Singleton systemu walki
         self.quest_engine: Optional['QuestEngine'] = None
         self.consequence_manager: Optional['ConsequenceManager'] = None
@@ -105,6 +119,16 @@ class GameState:
         self.auto_save_enabled = True
         self.last_auto_save = 0
 
+        # Profiler ticku - czasy podsystemów (komenda "profil")
+        self.profiler = TickProfiler(event_bus)
+        
+        # Stan świata dla questów - aktualizowany przyrostowo, nie kopiowany co tick
+        self.world = WorldState()
+        self._reputation_dirty = True
+        self._ticks_since_reputation = 0
+        self._economy_fingerprint = None
+        self._quest_world_reader = self.world.reader()
+
         # Tutorial system
         self.tutorial_manager = None  # Przypisywane przez main.py
         self.first_time_commands = set()  # Tracking użycia komend po raz pierwszy
@@ -139,11 +163,43 @@ class GameState:
         # Questy
         event_bus.subscribe("quest_completed", self._handle_quest_completed)
         
-        # Statystyki
+        # Reputacja gracza w stanie świata - przeliczana po interakcjach z graczem
+        event_bus.subscribe("reputation_changed", self._mark_reputation_dirty)
+        for category in (EventCategory.COMBAT, EventCategory.DIALOGUE, EventCategory.TRADE,
+                         EventCategory.NPC_ACTION):
+            event_bus.subscribe_category(category, self._on_player_interaction)
+        
+        # Statystyki - proste liczniki, synchronicznie (czytane w trakcie ticku)
         event_bus.subscribe_category(EventCategory.COMBAT, self._update_combat_stats)
         event_bus.subscribe_category(EventCategory.TRADE, self._update_trade_stats)
         event_bus.subscribe_category(EventCategory.CRAFT, self._update_craft_stats)
     
+    @property
+    def crafting_system(self) -> Optional['CraftingSystem']:
+        """System craftingu - budowany przy pierwszym użyciu w trwającej grze.
+
+        Wczytanie przedmiotów, receptur i stacji nie opóźnia startu gry;
+        podstawowe receptury są odkrywane dla gracza przy budowie.
+        """
+        if self._crafting is None and self.player is not None:
+            from mechanics.crafting import CraftingSystem
+            self._crafting = CraftingSystem()
+            # Auto-odkrycie podstawowych receptur dla gracza
+            self._crafting.auto_discover_basic_recipes(self.player)
+        return self._crafting
+
+    @crafting_system.setter
+    def crafting_system(self, crafting: Optional['CraftingSystem']):
+        self._crafting = crafting
+
+    # crafting jest aliasem dla crafting_system
+    crafting = crafting_system
+
+    @property
+    def crafting_ready(self) -> bool:
+        """Czy system craftingu został już zbudowany."""
+        return self._crafting is not None
+
     def init_game(self, player_name: str = "Mahan", difficulty: str = "normal", 
                    player_class: Optional[str] = None):
         """Inicjalizacja nowej gry.
@@ -181,10 +237,19 @@ class GameState:
         self.prison = Prison()
         self.time_system = TimeSystem()
         self.weather_system = WeatherSystem()
+        self.clock.set_day_time(self.day, self.game_time)
         
         # Inicjalizacja NPCów
         print("Ożywianie NPCów...")
+        if self.npc_manager:
+            self.npc_manager.disable_wakeups()
         self.npc_manager = NPCManager("data/npc_complete.json")
+        self.npc_manager.set_clock(self.clock)
+        # Mapa świata dla poziomów szczegółowości symulacji NPCów
+        self.npc_manager.world_locations = self.prison.locations
+        # Behavior trees tylko po wybudzeniu (harmonogram, potrzeby, zdarzenia)
+        self.npc_manager.enable_wakeups(event_bus)
+        self.npc_manager.attach_profiler(self.profiler)
         
         # NPCe są już umieszczone w lokacjach przez npc_complete.json
         # Ten kod był duplikacją - usunięto aby uniknąć podwójnych NPCów
@@ -196,10 +261,8 @@ class GameState:
         # Połącz ekonomię z NPC Manager dla kontekstu ekonomicznego
         self.npc_manager.economy = self.economy
 
-        # Inicjalizacja craftingu
-        print("Przygotowywanie warsztatu...")
-        from mechanics.crafting import CraftingSystem
-        self.crafting = CraftingSystem()
+        # Crafting budowany przy pierwszym użyciu (crafting_system)
+        self._crafting = None
         
         # Dodaj NPCów do ekonomii
         for npc_id, npc in self.npc_manager.npcs.items():
@@ -209,12 +272,7 @@ class GameState:
                 personality='normal',
                 starting_gold=npc.gold if hasattr(npc, 'gold') else 10
             )
-        
-        # crafting_system jest aliasem dla crafting
-        self.crafting_system = self.crafting
 
-        # Auto-odkrycie podstawowych receptur dla gracza
-        self.crafting.auto_discover_basic_recipes(self.player)
 
         # Inicjalizacja questów (lazy import - unika circular import)
         from quests.quest_engine import QuestEngine, RewardSystem
@@ -222,6 +280,11 @@ class GameState:
         print("Aktywacja questów emergentnych...")
         self.quest_engine = QuestEngine()
         self.quest_engine.reward_system = RewardSystem()  # Inicjalizacja systemu nagród
+        self.world.replace({})
+        self._reputation_dirty = True
+        self._economy_fingerprint = None
+        self.quest_engine.world_state = self.world
+        self.quest_engine.clock = self.clock
         self.consequence_manager = ConsequenceManager()
 
         # Ładowanie questów z JSON (nowy system)
@@ -308,7 +371,7 @@ class GameState:
         # Ustaw lokację
         rat.current_location = "cela_1"
         
-        # Dodaj do managera NPCów
+        # Dodaj do managera NPCów (rejestr podpina zegar gry)
         self.npc_manager.npcs["rat_1"] = rat
         
         # Dodaj do lokacji w więzieniu
@@ -333,12 +396,31 @@ class GameState:
         Args:
             delta_time: Czas od ostatniej aktualizacji (minuty w grze)
         """
+        # Wydarzenia zapisów w tle (EventBus obsługuje się tylko w wątku gry)
+        if background_saver.events:
+            background_saver.dispatch_events()
+        
         if self.game_mode != GameMode.PLAYING:
             return
         
+        profiler = self.profiler
+        profiler.begin_tick()
+        try:
+            self._update_systems(delta_time, profiler)
+        finally:
+            profiler.end_tick()
+    
+    def _update_systems(self, delta_time: float, profiler: TickProfiler):
+        """Aktualizacja podsystemów w jednym ticku (każdy mierzony przez profiler).
+        
+        Args:
+            delta_time: Czas od ostatniej aktualizacji (minuty w grze)
+            profiler: Profiler ticku
+        """
         # Aktualizuj czas
         old_time = self.game_time
         self.game_time += delta_time
+        self.clock.advance(delta_time)
         
         # Nowy dzień?
         if self.game_time >= 1440:  # 24 * 60
@@ -352,36 +434,46 @@ class GameState:
         
         # Aktualizuj systemy
         if self.time_system:
-            self.time_system.update(self.game_time)
+            with profiler.section("time_system"):
+                self.time_system.update(self.game_time)
         
         if self.weather_system:
-            self.weather_system.update(delta_time)  # Przekazuj minuty które minęły
+            with profiler.section("weather_system"):
+                self.weather_system.update(delta_time)  # Przekazuj minuty które minęły
         
         if self.npc_manager:
-            self.npc_manager.update()
+            with profiler.section("npc_manager"):
+                self.npc_manager.player_location = self.current_location
+                self.npc_manager.update()
         
         if self.quest_engine:
-            # Przekaż aktualny stan świata do silnika questów
-            from datetime import datetime
-            self.quest_engine.world_state = self.get_world_state()
-            self.quest_engine.player_state = {
-                'skills': self.player.skills if self.player else {},
-                'inventory': self.player.inventory if self.player else [],
-                'reputation': self.get_world_state().get('player_reputation', {}),
-                'completed_quests': self.quest_engine.completed_quests
-            }
-            self.quest_engine.update(datetime.now())
+            with profiler.section("quest_engine"):
+                # Odśwież współdzielony stan świata (tylko zmienione klucze)
+                self.refresh_world_state()
+                if self.quest_engine.world_state is not self.world:
+                    self._adopt_quest_world_state()
+                self.quest_engine.player_state = {
+                    # Poziomy umiejętności (nie obiekt SkillSystem - stan trafia do zapisu)
+                    'skills': {skill_name.value: skill.level for skill_name, skill
+                               in self.player.skills.skills.items()} if self.player else {},
+                    'inventory': self.player.inventory if self.player else [],
+                    'reputation': self.world.view().get('player_reputation', {}),
+                    'completed_quests': self.quest_engine.completed_quests
+                }
+                self.quest_engine.update(self.clock.now())
 
-            # Synchronizuj zmiany world_state z powrotem do game_state
-            self._sync_world_state_from_quest_engine()
+                # Synchronizuj zmiany world_state z powrotem do game_state
+                self._sync_world_state_from_quest_engine()
 
         if self.consequence_manager:
-            self.consequence_manager.update(self.game_time)
+            with profiler.section("consequence_manager"):
+                self.consequence_manager.update(self.clock.minutes, self.world)
         
         # Regeneracja gracza i sprawdzenie stanu
         if self.player:
-            self.player.regenerate(delta_time)
-            self.player.update_state()
+            with profiler.section("player"):
+                self.player.regenerate(delta_time)
+                self.player.update_state()
             
             # Sprawdź czy gracz nie umarł
             if self.player.state == CharacterState.MARTWY:
@@ -428,62 +520,156 @@ class GameState:
         if not self.quest_engine:
             return
 
-        # Synchronizuj kluczowe zmienne stanu z quest_engine
-        quest_world = self.quest_engine.world_state
-        for key, value in quest_world.items():
-            # Synchronizuj tylko zmienne związane z questami
-            if key.startswith('quest_') or key.startswith('prison.') or key in [
-                'guard_keys_missing', 'player_reputation', 'npc_reactions'
-            ]:
-                # Aktualizuj npc_manager jeśli są reakcje NPC
-                if key == 'npc_reactions' and self.npc_manager:
-                    for npc_id, reaction in value.items():
-                        if npc_id in self.npc_manager.npcs:
-                            npc = self.npc_manager.npcs[npc_id]
-                            if hasattr(npc, 'memory'):
-                                npc.memory.add_episodic_memory(
-                                    event_type='quest_consequence',
-                                    description=reaction,
-                                    emotional_impact={'surprise': 0.3}
-                                )
+        # Tylko ścieżki zmienione od poprzedniego ticku
+        changes = self._quest_world_reader.poll()
+        if not changes or not self.npc_manager:
+            return
+        reactions = self.world.get('npc_reactions')
+        if not isinstance(reactions, dict):
+            return
+        if 'npc_reactions' in changes:
+            changed_npcs = list(reactions)
+        else:
+            changed_npcs = [path[len('npc_reactions.'):] for path in changes
+                            if path.startswith('npc_reactions.')]
+        
+        # Aktualizuj npc_manager jeśli są nowe reakcje NPC
+        for npc_id in changed_npcs:
+            reaction = reactions.get(npc_id)
+            npc = self.npc_manager.npcs.get(npc_id)
+            if reaction is not None and npc is not None and hasattr(npc, 'memory'):
+                npc.memory.add_episodic_memory(
+                    event_type='quest_consequence',
+                    description=reaction,
+                    emotional_impact={'surprise': 0.3}
+                )
+    
+    def _adopt_quest_world_state(self):
+        """Przejmij słownik world_state ustawiony w quest_engine (np. po load_state)."""
+        self.world.replace(self.quest_engine.world_state)
+        self.quest_engine.world_state = self.world
+        self._reputation_dirty = True
+        self._economy_fingerprint = None
+        self.refresh_world_state()
+        # Wczytane reakcje NPC nie są nowe
+        self._quest_world_reader.poll()
+    
+    def _mark_reputation_dirty(self, event: GameEvent = None):
+        """Reputacja gracza do przeliczenia przy następnym odświeżeniu stanu świata."""
+        self._reputation_dirty = True
+    
+    def _on_player_interaction(self, event: GameEvent):
+        """Wydarzenie z udziałem gracza może zmienić relacje NPCów z graczem."""
+        if event.source == "player" or event.target == "player":
+            self._reputation_dirty = True
+    
+    def set_flag(self, flag: str, value: Any = True):
+        """Ustaw flagę postępu (widoczną w stanie świata jako game_flags.<flaga>)."""
+        self.game_flags[flag] = value
+        if self.world.get('game_flags') is self.game_flags:
+            self.world.mark(f"game_flags.{flag}")
+    
+    def set_variable(self, name: str, value: Any):
+        """Ustaw zmienną globalną (widoczną w stanie świata jako global_variables.<nazwa>)."""
+        self.global_variables[name] = value
+        if self.world.get('global_variables') is self.global_variables:
+            self.world.mark(f"global_variables.{name}")
+    
+    def refresh_world_state(self) -> WorldState:
+        """Odśwież stan świata - zapisywane są tylko klucze, które się zmieniły.
+        
+        Reputacja gracza jest przeliczana po wydarzeniach z udziałem gracza
+        (i co REPUTATION_RESYNC_TICKS odświeżeń), ceny - tylko gdy zmieni się
+        podaż, popyt lub modyfikator cen rynku.
+        
+        Returns:
+            Współdzielony WorldState
+        """
+        world = self.world
+        world.set('game_time', self.game_time)
+        world.set('day', self.day)
+        world.set('player_location', self.current_location)
+        world.set('player_health', self.player.health if self.player else 100)
+        
+        secrets = world.get('discovered_secrets')
+        if secrets is None or len(secrets) != len(self.discovered_secrets) \
+                or not self.discovered_secrets.issuperset(secrets):
+            world['discovered_secrets'] = list(self.discovered_secrets)
+        # Flagi i zmienne są współdzielone (zmiany przez set_flag/set_variable)
+        if world.get('game_flags') is not self.game_flags:
+            world['game_flags'] = self.game_flags
+        if world.get('global_variables') is not self.global_variables:
+            world['global_variables'] = self.global_variables
+        
+        self._ticks_since_reputation += 1
+        if self._ticks_since_reputation >= self.REPUTATION_RESYNC_TICKS:
+            self._reputation_dirty = True
+        if self._reputation_dirty or 'player_reputation' not in world:
+            self._refresh_reputation()
+        
+        if self.economy:
+            self._refresh_economy()
+        return world
+    
+    def _refresh_reputation(self):
+        """Przelicz reputację gracza i zapisz tylko zmienione wpisy."""
+        world = self.world
+        self._reputation_dirty = False
+        self._ticks_since_reputation = 0
+        if not isinstance(world.get('player_reputation'), dict):
+            world['player_reputation'] = {}
+        current = {}
+        if self.npc_manager:
+            for npc_id, npc in self.npc_manager.npcs.items():
+                relationships = getattr(npc, 'relationships', None)
+                if relationships and 'player' in relationships:
+                    current[npc_id] = relationships['player'].get_overall_disposition()
+        for npc_id, disposition in current.items():
+            world.set_nested('player_reputation', npc_id, disposition)
+        for npc_id in [npc_id for npc_id in world['player_reputation'] if npc_id not in current]:
+            world.delete_nested('player_reputation', npc_id)
+    
+    def _refresh_economy(self):
+        """Przelicz ceny tylko po zmianie podaży, popytu lub modyfikatora rynku."""
+        fingerprint = self._market_fingerprint()
+        if fingerprint is not None and fingerprint == self._economy_fingerprint \
+                and 'economy' in self.world:
+            return
+        average_prices = self.economy.get_average_prices()
+        prison_market = self.economy.markets.get('prison')
+        food_supply = 0
+        if prison_market and hasattr(prison_market, 'dane_rynkowe'):
+            food_data = prison_market.dane_rynkowe.get('chleb')
+            if food_data:
+                food_supply = food_data.podaz
+        # Wycena dodaje brakujące dane rynkowe - odcisk po wycenie
+        self._economy_fingerprint = self._market_fingerprint()
+        self.world['economy'] = {
+            'food_supply': food_supply,
+            'average_prices': average_prices
+        }
+    
+    def _market_fingerprint(self) -> Optional[tuple]:
+        """Podaż, popyt i modyfikator cen rynku więziennego (None - brak rynku)."""
+        prison_market = self.economy.markets.get('prison')
+        if not prison_market or not hasattr(prison_market, 'dane_rynkowe'):
+            return None
+        market_data = prison_market.dane_rynkowe
+        return (id(prison_market), prison_market.modyfikator_cen, tuple(
+            (data.podaz, data.popyt) if data is not None else None
+            for data in map(market_data.get, self.ECONOMY_ITEMS)))
 
     def get_world_state(self) -> Dict[str, Any]:
         """Pobierz aktualny stan świata dla innych systemów.
 
         Returns:
-            Słownik ze stanem świata
+            Słownik ze stanem świata (kopia - do odczytu bez kopiowania
+            służy self.world.view())
         """
-        state = {
-            'game_time': self.game_time,
-            'day': self.day,
-            'player_location': self.current_location,
-            'player_health': self.player.health if self.player else 100,
-            'player_reputation': {},
-            'discovered_secrets': list(self.discovered_secrets),
-            'game_flags': self.game_flags.copy(),
-            'global_variables': self.global_variables.copy()
-        }
-        
-        # Dodaj reputację gracza
-        if self.npc_manager:
-            for npc_id, npc in self.npc_manager.npcs.items():
-                if hasattr(npc, 'relationships') and 'player' in npc.relationships:
-                    state['player_reputation'][npc_id] = npc.relationships['player'].get_overall_disposition()
-        
-        # Dodaj stan ekonomii
-        if self.economy:
-            prison_market = self.economy.markets.get('prison')
-            food_supply = 0
-            if prison_market and hasattr(prison_market, 'dane_rynkowe'):
-                food_data = prison_market.dane_rynkowe.get('chleb')
-                if food_data:
-                    food_supply = food_data.podaz
-            
-            state['economy'] = {
-                'food_supply': food_supply,
-                'average_prices': self.economy.get_average_prices()
-            }
-        
+        state = self.refresh_world_state().copy()
+        state['player_reputation'] = dict(state.get('player_reputation', {}))
+        state['game_flags'] = self.game_flags.copy()
+        state['global_variables'] = self.global_variables.copy()
         return state
     
     def move_player(self, direction: str) -> Tuple[bool, str]:
@@ -596,19 +782,42 @@ class GameState:
         if event.source == "player":
             self.statistics['items_crafted'] += 1
     
-    def save_game(self, slot: int = 1) -> bool:
+    def save_game(self, slot: int = 1, deferred: bool = False) -> bool:
         """Zapisz stan gry.
         
         Args:
             slot: Numer slotu zapisu (1-5)
+            deferred: Czy zapisać w tle - w wątku gry powstaje tylko migawka
+                stanu, wynik przychodzi wydarzeniem 'save_completed'
             
         Returns:
-            Czy zapis się powiódł
+            Czy zapis się powiódł (przy deferred - czy został zlecony)
         """
         if not self.player:
             return False
         
-        save_data = {
+        filepath = f"saves/save_{slot}.json"
+        try:
+            save_data = self._collect_save_data()
+            if deferred:
+                background_saver.submit(
+                    filepath, save_data,
+                    lambda data, progress: self._write_save_file(data, filepath, progress),
+                    slot=slot)
+                return True
+            background_saver.run(filepath, lambda: self._write_save_file(save_data, filepath))
+            print(f"Gra zapisana w slocie {slot}")
+            return True
+        except Exception as e:
+            print(f"Błąd zapisu: {e}")
+            return False
+    
+    def _collect_save_data(self) -> Dict[str, Any]:
+        """Zbierz stan gry do zapisu (w wątku gry)."""
+        # Bariera - odroczone handlery event_bus muszą zakończyć pracę przed zapisem
+        event_bus.flush()
+        
+        return {
             'version': self.save_version,
             'timestamp': datetime.now().isoformat(),
             'game_time': self.game_time,
@@ -630,24 +839,29 @@ class GameState:
             'economy': self.economy.save_state() if self.economy else None,
             'quests': self.quest_engine.save_state() if self.quest_engine else None,
             'consequences': self.consequence_manager.save_state() if self.consequence_manager else None,
-            'crafting': self.crafting_system.save_state() if self.crafting_system else None,
+            'crafting': self._crafting.save_state() if self._crafting else None,
             'combat': self.combat_system.save_state() if self.combat_system else None,
             'dialogue': self.dialogue_controller.save_state() if self.dialogue_controller else None
         }
+    
+    @staticmethod
+    def _write_save_file(save_data: Dict[str, Any], filepath: str,
+                         progress: Optional[Callable[[str, float], None]] = None):
+        """Serializuj i zapisz dane (także w wątku tła - bez dostępu do stanu gry)."""
+        progress = progress or (lambda stage, fraction: None)
         
         # Utwórz folder saves jeśli nie istnieje
-        os.makedirs('saves', exist_ok=True)
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
         
-        # Zapisz do pliku
-        filepath = f"saves/save_{slot}.json"
-        try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, ensure_ascii=False, indent=2)
-            print(f"Gra zapisana w slocie {slot}")
-            return True
-        except Exception as e:
-            print(f"Błąd zapisu: {e}")
-            return False
+        progress('serialize', 0.25)
+        json_data = json.dumps(save_data, ensure_ascii=False, indent=2)
+        
+        # Podmiana pliku - przerwany zapis nie niszczy poprzedniego
+        progress('write', 0.75)
+        temp_path = f"{filepath}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json_data)
+        os.replace(temp_path, filepath)
     
     def load_game(self, slot: int = 1) -> bool:
         """Wczytaj stan gry.
@@ -659,6 +873,8 @@ class GameState:
             Czy wczytywanie się powiodło
         """
         filepath = f"saves/save_{slot}.json"
+        # Zapis w tle do tego slotu musi się najpierw zakończyć
+        background_saver.wait(filepath)
         
         if not os.path.exists(filepath):
             print(f"Brak zapisu w slocie {slot}")
@@ -673,9 +889,13 @@ class GameState:
                 print(f"Niezgodna wersja zapisu!")
                 return False
             
+            # Odroczone handlery nie mogą nadpisać wczytanych statystyk
+            event_bus.flush()
+            
             # Wczytaj podstawowe dane
             self.game_time = save_data['game_time']
             self.day = save_data['day']
+            self.clock.set_day_time(self.day, self.game_time)
             self.total_playtime = save_data['total_playtime']
             self.current_location = save_data['current_location']
             self.discovered_locations = set(save_data['discovered_locations'])
@@ -703,6 +923,8 @@ class GameState:
             # Wczytaj NPCów
             if save_data['npcs'] and self.npc_manager:
                 self.npc_manager.load_state_from_dict(save_data['npcs'])
+            if self.npc_manager:
+                self.npc_manager.set_clock(self.clock)
             
             # Wczytaj ekonomię
             if save_data['economy'] and self.economy:
@@ -920,11 +1142,49 @@ class GameState:
         if self.quest_engine:
             self.quest_engine.register_seed(quest_seed)
     
+    def start_journal(self, filepath: str) -> None:
+        """Zapisuj wszystkie wydarzenia event_bus do binarnego dziennika.
+        
+        Args:
+            filepath: Ścieżka do pliku dziennika (istniejący jest dopisywany)
+        """
+        from .event_journal import EventJournal
+        self.stop_journal()
+        journal = EventJournal(filepath)
+        event_bus.attach_journal(journal)
+        # Bufor trafia na dysk przy flush - domknij dziennik także przy wyjściu
+        atexit.register(journal.close)
+    
+    def stop_journal(self) -> Optional[str]:
+        """Zakończ zapis dziennika.
+        
+        Returns:
+            Ścieżka zamkniętego dziennika lub None
+        """
+        journal = event_bus.detach_journal()
+        if journal is None:
+            return None
+        atexit.unregister(journal.close)
+        journal.close()
+        return journal.filepath
+    
+    def replay_journal(self, filepath: str) -> int:
+        """Odtwórz dziennik wydarzeń (debugowanie, testy regresji).
+        
+        Args:
+            filepath: Ścieżka do pliku dziennika
+            
+        Returns:
+            Liczba odtworzonych wydarzeń
+        """
+        from .event_journal import replay_journal
+        return replay_journal(filepath, event_bus)
+    
     def auto_save(self) -> bool:
-        """Automatyczny zapis gry.
+        """Automatyczny zapis gry (w tle - pętla gry nie czeka na dysk).
         
         Returns:
-            Czy zapis się powiódł
+            Czy zapis się powiódł (został zlecony)
         """
         if not self.auto_save_enabled:
             return False
@@ -932,7 +1192,7 @@ class GameState:
         # Auto-save co 5 minut gry (300 sekund)
         if self.game_time - self.last_auto_save >= 300:
             self.last_auto_save = self.game_time
-            return self.save_game(slot=0)  # Slot 0 dla auto-save
+            return self.save_game(slot=0, deferred=True)  # Slot 0 dla auto-save
         
         return True
     
@@ -0,0 +1,179 @@
+"""Symulacja bez interfejsu - przewijanie świata gry z prędkością procesora.
+
+Używana do balansowania ekonomii i długich testów AI NPCów: uruchamia
+GameState.init_game bez UI, wycisza wypisywanie na ekran i wykonuje ticki
+tak szybko, jak się da. Czas gry płynie wyłącznie przez GameClock, więc
+wynik dla tego samego ziarna losowości jest powtarzalny.
+"""
+
+import contextlib
+import random
+import time
+from typing import Any, Dict, Optional
+
+from .event_bus import EventCategory, event_bus
+
+
+class _NullWriter:
+    """Strumień wyjścia, który niczego nie zapisuje (tańszy niż StringIO)."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+class _EventCounter:
+    """Liczy wszystkie wydarzenia przechodzące przez EventBus."""
+
+    __slots__ = ('count',)
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, event) -> None:
+        self.count += 1
+
+
+class HeadlessSimulation:
+    """Przewijanie świata gry bez interfejsu użytkownika.
+
+    Przykład:
+        simulation = HeadlessSimulation(seed=42)
+        report = simulation.run(hours=24 * 30)
+        print(simulation.format_report(report))
+    """
+
+    def __init__(self, game_state: Any = None, seed: Optional[int] = None,
+                 tick_minutes: float = 1.0, quiet: bool = True,
+                 player_name: str = "Symulacja", difficulty: str = "normal"):
+        """Inicjalizacja symulacji.
+
+        Args:
+            game_state: Stan gry (domyślnie singleton core.game_state)
+            seed: Ziarno losowości (None - bez ustawiania)
+            tick_minutes: Długość ticku w minutach gry
+            quiet: Czy wyciszyć wypisywanie na ekran
+            player_name: Imię postaci gracza
+            difficulty: Poziom trudności
+        """
+        if tick_minutes <= 0:
+            raise ValueError("Długość ticku musi być dodatnia")
+        if game_state is None:
+            from .game_state import game_state
+        self.game_state = game_state
+        self.seed = seed
+        self.tick_minutes = tick_minutes
+        self.quiet = quiet
+        self.player_name = player_name
+        self.difficulty = difficulty
+        self.initialized = False
+        self.init_seconds = 0.0
+
+    def _output(self):
+        """Kontekst wyciszający stdout (lub nic, gdy quiet=False)."""
+        if self.quiet:
+            return contextlib.redirect_stdout(_NullWriter())
+        return contextlib.nullcontext()
+
+    def initialize(self) -> None:
+        """Uruchom nową grę bez interfejsu."""
+        if self.seed is not None:
+            random.seed(self.seed)
+        start = time.perf_counter()
+        with self._output():
+            self.game_state.init_game(self.player_name, self.difficulty)
+        self.init_seconds = time.perf_counter() - start
+        self.game_state.profiler.reset()
+        self.initialized = True
+
+    def run(self, hours: float) -> Dict[str, Any]:
+        """Przewiń świat o podaną liczbę godzin gry.
+
+        Symulacja kończy się wcześniej, jeśli gra opuści tryb rozgrywki
+        (np. śmierć postaci gracza).
+
+        Args:
+            hours: Liczba godzin gry
+
+        Returns:
+            Raport: ticki, czas gry, ticki/s, wydarzenia/s i czasy podsystemów
+        """
+        if not self.initialized:
+            self.initialize()
+
+        from .game_state import GameMode
+
+        state = self.game_state
+        ticks = max(0, int(round(hours * 60 / self.tick_minutes)))
+        counter = _EventCounter()
+        for category in EventCategory:
+            event_bus.subscribe_category(category, counter)
+
+        start_minutes = state.clock.minutes
+        done = 0
+        start = time.perf_counter()
+        try:
+            with self._output():
+                update = state.update
+                tick_minutes = self.tick_minutes
+                for done in range(1, ticks + 1):
+                    update(tick_minutes)
+                    if state.game_mode != GameMode.PLAYING:
+                        break
+                event_bus.flush()
+        finally:
+            elapsed = time.perf_counter() - start
+            for category in EventCategory:
+                event_bus.unsubscribe_category(category, counter)
+
+        game_minutes = state.clock.minutes - start_minutes
+        profile = state.profiler.report()
+        return {
+            'ticks': done,
+            'tick_minutes': self.tick_minutes,
+            'game_hours': game_minutes / 60,
+            'day': state.clock.day,
+            'game_mode': state.game_mode.value,
+            'seed': self.seed,
+            'init_seconds': self.init_seconds,
+            'wall_seconds': elapsed,
+            'ticks_per_second': done / elapsed if elapsed else 0.0,
+            'events': counter.count,
+            'events_per_second': counter.count / elapsed if elapsed else 0.0,
+            'speedup': game_minutes * 60 / elapsed if elapsed else 0.0,
+            'subsystems': {name: {'total_ms': stats['total_ms'], 'mean_ms': stats['mean_ms'],
+                                  'p95_ms': stats['p95_ms'], 'max_ms': stats['max_ms']}
+                           for name, stats in profile['sections'].items()},
+            'hot_npcs': profile['hot_npcs'],
+        }
+
+    @staticmethod
+    def format_report(report: Dict[str, Any]) -> str:
+        """Raport tekstowy symulacji."""
+        lines = [
+            f"=== SYMULACJA: {report['game_hours']:.1f} h gry, {report['ticks']} ticków "
+            f"po {report['tick_minutes']:g} min (dzień {report['day']}) ===",
+            f"Czas:        {report['wall_seconds']:.2f} s (inicjalizacja {report['init_seconds']:.2f} s), "
+            f"{report['speedup']:.0f}x szybciej niż czas gry",
+            f"Ticki/s:     {report['ticks_per_second']:.0f}",
+            f"Wydarzenia:  {report['events']} ({report['events_per_second']:.0f}/s)",
+        ]
+        if report['game_mode'] != 'playing':
+            lines.append(f"Przerwano - tryb gry: {report['game_mode']}")
+        lines.append(f"\n{'podsystem':<20} {'razem ms':>10} {'śr. ms':>8} {'p95 ms':>8} {'max ms':>8}")
+        for name, stats in sorted(report['subsystems'].items(), key=lambda item: -item[1]['total_ms']):
+            lines.append(f"{name:<20} {stats['total_ms']:10.1f} {stats['mean_ms']:8.3f} "
+                         f"{stats['p95_ms']:8.3f} {stats['max_ms']:8.3f}")
+        return "\n".join(lines)
+
+
+def run_headless(hours: float, seed: Optional[int] = None, tick_minutes: float = 1.0,
+                 quiet: bool = True) -> Dict[str, Any]:
+    """Nowa gra bez interfejsu przewinięta o podaną liczbę godzin.
+
+    Returns:
+        Raport HeadlessSimulation.run
+    """
+    return HeadlessSimulation(seed=seed, tick_minutes=tick_minutes, quiet=quiet).run(hours)
@@ -0,0 +1,348 @@
+"""Profiler ticku gry - czasy podsystemów, NPCów i węzłów behavior trees."""
+
+import heapq
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Liczba kubełków histogramu (kubełek i: czasy do 2**i mikrosekund)
+HISTOGRAM_BUCKETS = 32
+
+
+class TimingHistogram:
+    """Histogram czasów w kubełkach potęg dwójki (mikrosekundy).
+
+    Stała pamięć i O(1) na pomiar - percentyle są przybliżone do górnej
+    granicy kubełka.
+    """
+
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, seconds: float) -> None:
+        """Dodaj pomiar.
+
+        Args:
+            seconds: Zmierzony czas w sekundach
+        """
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        index = int(seconds * 1_000_000).bit_length()
+        self.buckets[index if index < HISTOGRAM_BUCKETS else HISTOGRAM_BUCKETS - 1] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Przybliżony percentyl w sekundach (górna granica kubełka).
+
+        Args:
+            fraction: Percentyl jako ułamek (0.95 = p95)
+        """
+        if not self.count:
+            return 0.0
+        threshold = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= threshold:
+                return min(self.max, (1 << index) / 1_000_000)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Podsumowanie w milisekundach."""
+        return {
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(0.50) * 1000,
+            'p95_ms': self.percentile(0.95) * 1000,
+            'p99_ms': self.percentile(0.99) * 1000,
+            'max_ms': self.max * 1000,
+        }
+
+
+class _Section:
+    """Mierzy czas bloku `with` i zapisuje go w histogramie profilera."""
+
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: TimingHistogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.add(time.perf_counter() - self.start)
+        return False
+
+
+class _NullSection:
+    """Pusta sekcja dla wyłączonego profilera."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class TickProfiler:
+    """Profiler ticku GameState.update.
+
+    Czas każdego podsystemu jest zawsze mierzony parą perf_counter (koszt
+    rzędu mikrosekund na tick), więc profiler może działać w produkcji.
+    Szczegóły - czasy poszczególnych NPCów i węzłów behavior trees - są
+    zbierane tylko w co sample_every-tym ticku (sampling).
+    """
+
+    def __init__(self, event_bus: Any = None, enabled: bool = True, sample_every: int = 10):
+        """Inicjalizacja profilera.
+
+        Args:
+            event_bus: Opcjonalny EventBus - przyrost stats['processing_time']
+                w ticku trafia do sekcji "event_bus"
+            enabled: Czy mierzyć czasy
+            sample_every: Co który tick zbierać czasy NPCów i węzłów (0 - nigdy)
+        """
+        self.event_bus = event_bus
+        self.enabled = enabled
+        self.sample_every = sample_every
+        self.sampling = False  # Czy bieżący tick zbiera szczegóły
+        self.ticks = 0
+        self.sampled_ticks = 0
+        self.sections: Dict[str, TimingHistogram] = {}
+        self.npc_times: Dict[str, List[float]] = {}   # id NPCa -> [suma, liczba]
+        self.node_times: Dict[str, List[float]] = {}  # węzeł -> [suma, liczba]
+        self._sections: Dict[str, _Section] = {}
+        self._wrappers: Dict[Tuple[Callable, str], Callable] = {}
+        self._tick_start = 0.0
+        self._event_time_start = 0.0
+
+    # ========== TICK ==========
+
+    def begin_tick(self) -> None:
+        """Rozpoczyna pomiar ticku i decyduje o samplingu szczegółów."""
+        if not self.enabled:
+            self.sampling = False
+            return
+        self.ticks += 1
+        self.sampling = bool(self.sample_every) and self.ticks % self.sample_every == 0
+        if self.sampling:
+            self.sampled_ticks += 1
+        if self.event_bus is not None:
+            self._event_time_start = self._event_time()
+        self._tick_start = time.perf_counter()
+
+    def end_tick(self) -> None:
+        """Kończy pomiar ticku."""
+        if not self.enabled:
+            return
+        self._histogram('tick').add(time.perf_counter() - self._tick_start)
+        if self.event_bus is not None:
+            spent = self._event_time() - self._event_time_start
+            self._histogram('event_bus').add(max(0.0, spent))
+        self.sampling = False
+
+    def _event_time(self) -> float:
+        """Łączny czas obsługi wydarzeń z liczników event_bus.
+
+        Bez kopii z EventBus.stats - ten buduje nowy słownik przy każdym odczycie.
+        """
+        counters = self.event_bus.counters
+        return counters.processing_time if counters is not None else 0.0
+
+    def section(self, name: str):
+        """Context manager mierzący czas podsystemu.
+
+        Args:
+            name: Nazwa podsystemu (np. "npc_manager")
+        """
+        if not self.enabled:
+            return _NULL_SECTION
+        section = self._sections.get(name)
+        if section is None:
+            section = self._sections[name] = _Section(self._histogram(name))
+        return section
+
+    def _histogram(self, name: str) -> TimingHistogram:
+        histogram = self.sections.get(name)
+        if histogram is None:
+            histogram = self.sections[name] = TimingHistogram()
+        return histogram
+
+    # ========== SZCZEGÓŁY (SAMPLING) ==========
+
+    def record_npc(self, npc_id: str, seconds: float) -> None:
+        """Zapisuje czas aktualizacji NPCa w próbkowanym ticku."""
+        entry = self.npc_times.get(npc_id)
+        if entry is None:
+            self.npc_times[npc_id] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def record_node(self, label: str, seconds: float) -> None:
+        """Zapisuje czas węzła behavior tree w próbkowanym ticku."""
+        entry = self.node_times.get(label)
+        if entry is None:
+            self.node_times[label] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def timed(self, func: Callable, label: str) -> Callable:
+        """Zwraca funkcję mierzącą czas wywołań func (jedna na parę func/label).
+
+        Ta sama opakowana funkcja jest współdzielona przez wszystkie drzewa,
+        więc pamięć warunków w obrębie ticku działa bez zmian.
+        """
+        key = (func, label)
+        wrapper = self._wrappers.get(key)
+        if wrapper is None:
+            record = self.record_node
+            perf_counter = time.perf_counter
+
+            def wrapper(npc, context):
+                start = perf_counter()
+                try:
+                    return func(npc, context)
+                finally:
+                    record(label, perf_counter() - start)
+
+            self._wrappers[key] = wrapper
+        return wrapper
+
+    # ========== RAPORT ==========
+
+    @staticmethod
+    def _top(times: Dict[str, List[float]], limit: int) -> List[Dict[str, Any]]:
+        top = heapq.nlargest(limit, times.items(), key=lambda item: item[1][0])
+        return [{'name': name, 'total_ms': total * 1000, 'calls': int(calls),
+                 'mean_us': total / calls * 1_000_000 if calls else 0.0}
+                for name, (total, calls) in top]
+
+    def report(self, limit: int = 10) -> Dict[str, Any]:
+        """Raport profilera.
+
+        Args:
+            limit: Liczba najdroższych NPCów i węzłów w raporcie
+
+        Returns:
+            Słownik z histogramami podsystemów i gorącymi punktami
+        """
+        return {
+            'ticks': self.ticks,
+            'sampled_ticks': self.sampled_ticks,
+            'sample_every': self.sample_every,
+            'sections': {name: histogram.to_dict() for name, histogram in self.sections.items()},
+            'hot_npcs': self._top(self.npc_times, limit),
+            'hot_nodes': self._top(self.node_times, limit),
+        }
+
+    def format_report(self, limit: int = 5) -> str:
+        """Raport tekstowy dla komendy debugowania."""
+        if not self.ticks:
+            return "Profiler nie zebrał jeszcze żadnych ticków."
+        data = self.report(limit)
+        lines = [f"=== PROFIL TICKU ({data['ticks']} ticków, "
+                 f"szczegóły co {self.sample_every}.) ===",
+                 f"{'podsystem':<20} {'śr. ms':>8} {'p95 ms':>8} {'max ms':>8}"]
+        for name, stats in sorted(data['sections'].items(), key=lambda item: -item[1]['total_ms']):
+            lines.append(f"{name:<20} {stats['mean_ms']:8.3f} {stats['p95_ms']:8.3f} {stats['max_ms']:8.3f}")
+        for title, key in (("Najdroższe NPCe", 'hot_npcs'), ("Najdroższe węzły", 'hot_nodes')):
+            if data[key]:
+                lines.append(f"\n{title}:")
+                for entry in data[key]:
+                    lines.append(f"  {entry['name']:<30} {entry['total_ms']:8.2f} ms "
+                                 f"({entry['calls']} wywołań)")
+        return "\n".join(lines)
+
+    def dump_json(self, filepath: str, limit: int = 50) -> None:
+        """Zapisz raport do pliku JSON.
+
+        Args:
+            filepath: Ścieżka do pliku
+            limit: Liczba najdroższych NPCów i węzłów w raporcie
+        """
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(self.report(limit), f, ensure_ascii=False, indent=2)
+
+    def reset(self) -> None:
+        """Wyczyść zebrane pomiary."""
+        self.ticks = 0
+        self.sampled_ticks = 0
+        self.sections.clear()
+        self._sections.clear()
+        self.npc_times.clear()
+        self.node_times.clear()
+
+
+def parse_importtime(output: str) -> Dict[str, Tuple[int, int]]:
+    """Czasy importów z wyjścia `python -X importtime`.
+
+    Args:
+        output: Tekst ze stderr interpretera
+
+    Returns:
+        Moduł -> (czas własny, czas łączny z zależnościami) w mikrosekundach
+    """
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not own.strip().isdigit():
+            continue  # Nagłówek tabeli
+        modules[name.strip()] = (int(own), int(cumulative))
+    return modules
+
+
+def import_time_report(module: str, cwd: Optional[str] = None,
+                       python: Optional[str] = None) -> Dict[str, Any]:
+    """Mierzy import modułu w świeżym interpreterze (`-X importtime`).
+
+    Args:
+        module: Nazwa importowanego modułu (np. 'main')
+        cwd: Katalog roboczy interpretera
+        python: Interpreter (domyślnie bieżący)
+
+    Returns:
+        Raport: łączny czas importu modułu (ms) i czasy wszystkich modułów
+    """
+    import subprocess
+    import sys
+    result = subprocess.run([python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Import {module} nie powiódł się: {result.stderr.strip().splitlines()[-1]}")
+    modules = parse_importtime(result.stderr)
+    return {
+        'module': module,
+        'total_ms': modules.get(module, (0, 0))[1] / 1000,
+        'modules': modules,
+    }
+
+
+def format_import_report(report: Dict[str, Any], limit: int = 20) -> str:
+    """Raport tekstowy najdroższych importów (czas własny)."""
+    lines = [f"=== IMPORT {report['module']}: {report['total_ms']:.1f} ms, "
+             f"{len(report['modules'])} modułów ===",
+             f"{'moduł':<45} {'własny ms':>10} {'łączny ms':>10}"]
+    slowest = sorted(report['modules'].items(), key=lambda item: -item[1][0])[:limit]
+    for name, (own, cumulative) in slowest:
+        lines.append(f"{name:<45} {own / 1000:10.2f} {cumulative / 1000:10.2f}")
+    return "\n".join(lines)
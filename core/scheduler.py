@@ -0,0 +1,123 @@
+"""Harmonogram zadań według czasu gry - kopiec z leniwym anulowaniem."""
+
+import heapq
+import itertools
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class Scheduler:
+    """Kolejka zadań uporządkowana według czasu wykonania.
+
+    schedule() kosztuje O(log n), cancel() O(1), a pop_due() dotyka tylko
+    zadań, których czas nadszedł. Anulowane i przeplanowane wpisy zostają
+    w kopcu jako nieaktualne - są pomijane przy zdejmowaniu i okresowo
+    usuwane. Zadanie z interwałem po wykonaniu wraca do kolejki.
+
+    Czas może być dowolnym porównywalnym typem (datetime, minuty gry),
+    interwał - typem, który da się do niego dodać (timedelta, liczba).
+    """
+
+    __slots__ = ('_heap', '_entries', '_counter')
+
+    def __init__(self):
+        self._heap: List[Tuple[Any, int, list]] = []
+        self._entries: Dict[Hashable, list] = {}  # klucz -> [czas, klucz, element, interwał]
+        self._counter = itertools.count()
+
+    def schedule(self, key: Hashable, due: Any, item: Any = None,
+                 interval: Any = None) -> None:
+        """Zaplanuj zadanie (wcześniejsze zadanie o tym kluczu jest zastępowane).
+
+        Args:
+            key: Unikalny klucz zadania
+            due: Czas wykonania
+            item: Element zwracany przez pop_due()
+            interval: Odstęp między kolejnymi wykonaniami (None - jednorazowe)
+        """
+        if interval is not None and not due + interval > due:
+            raise ValueError("Interwał zadania cyklicznego musi być dodatni")
+        entry = [due, key, item, interval]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, (due, next(self._counter), entry))
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._compact()
+
+    def cancel(self, key: Hashable) -> bool:
+        """Anuluj zadanie.
+
+        Returns:
+            Czy zadanie było zaplanowane
+        """
+        return self._entries.pop(key, None) is not None
+
+    def pop_due(self, now: Any) -> List[Tuple[Any, Hashable, Any]]:
+        """Zdejmij zadania z czasem <= now, w kolejności czasu.
+
+        Zadanie cykliczne jest od razu planowane ponownie (czas + interwał),
+        więc po dużym skoku czasu pojawia się raz na każde minione wystąpienie.
+
+        Returns:
+            Lista (czas, klucz, element)
+        """
+        heap = self._heap
+        entries = self._entries
+        due_items = []
+        while heap and heap[0][0] <= now:
+            due, _, entry = heapq.heappop(heap)
+            key = entry[1]
+            if entries.get(key) is not entry:
+                continue  # Anulowane lub przeplanowane
+            due_items.append((due, key, entry[2]))
+            interval = entry[3]
+            if interval is None:
+                del entries[key]
+            else:
+                entry[0] = due + interval
+                heapq.heappush(heap, (entry[0], next(self._counter), entry))
+        return due_items
+
+    def next_due(self) -> Optional[Any]:
+        """Czas najbliższego zadania (None - kolejka pusta)."""
+        heap = self._heap
+        entries = self._entries
+        while heap:
+            entry = heap[0][2]
+            if entries.get(entry[1]) is entry:
+                return heap[0][0]
+            heapq.heappop(heap)
+        return None
+
+    def due_of(self, key: Hashable) -> Optional[Any]:
+        """Czas wykonania zadania (None - nie jest zaplanowane)."""
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Element zaplanowanego zadania."""
+        entry = self._entries.get(key)
+        return entry[2] if entry is not None else default
+
+    def items(self) -> List[Tuple[Any, Hashable, Any]]:
+        """Wszystkie zaplanowane zadania (czas, klucz, element) w kolejności czasu."""
+        return [(due, key, item) for due, key, item, _ in
+                sorted(self._entries.values(), key=_entry_order)]
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._entries.clear()
+
+    def _compact(self) -> None:
+        """Usuń nieaktualne wpisy z kopca."""
+        entries = self._entries
+        self._heap = [node for node in self._heap if entries.get(node[2][1]) is node[2]]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+def _entry_order(entry: list) -> Any:
+    return entry[0]
@@ -0,0 +1,159 @@
+"""Stan świata utrzymywany przyrostowo, ze zbiorem zmian dla konsumentów."""
+
+from collections.abc import MutableMapping
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Set
+
+
+class WorldState(MutableMapping):
+    """Słownik stanu świata z numerem wersji każdej zmienionej ścieżki.
+
+    Zapis klucza (lub set() z tą samą wartością - bez zmiany) podbija
+    wersję tylko gdy wartość się zmieniła. Zmiany zagnieżdżone są
+    zgłaszane ścieżkami z kropkami ("player_reputation.straznik_marek").
+    Konsumenci czytają view() i changes_since(wersja) albo korzystają
+    z WorldStateReader, który pamięta wersję ostatniego odczytu.
+    """
+
+    def __init__(self, data: Optional[Mapping[str, Any]] = None):
+        self._data: Dict[str, Any] = dict(data or {})
+        self._view = MappingProxyType(self._data)
+        self.version = 0
+        self._changed: Dict[str, int] = {}  # ścieżka -> wersja ostatniej zmiany
+        for key in self._data:
+            self.mark(key)
+
+    # ========== MutableMapping ==========
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._data[key] = value
+        self.mark(key)
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+        self.mark(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self._data)
+
+    # ========== ZMIANY ==========
+
+    def mark(self, path: str) -> None:
+        """Zgłoś zmianę ścieżki (np. po modyfikacji zagnieżdżonego słownika)."""
+        self.version += 1
+        self._changed[path] = self.version
+
+    def set(self, key: str, value: Any) -> bool:
+        """Ustaw klucz tylko gdy wartość się zmieniła.
+
+        Returns:
+            Czy wartość została zmieniona
+        """
+        if key in self._data and self._data[key] == value:
+            return False
+        self[key] = value
+        return True
+
+    def set_nested(self, key: str, subkey: str, value: Any) -> bool:
+        """Ustaw wpis zagnieżdżonego słownika (zmiana zgłaszana jako "key.subkey").
+
+        Returns:
+            Czy wartość została zmieniona
+        """
+        nested = self._data.get(key)
+        if not isinstance(nested, dict):
+            nested = self._data[key] = {}
+            self.mark(key)
+        elif subkey in nested and nested[subkey] == value:
+            return False
+        nested[subkey] = value
+        self.mark(f"{key}.{subkey}")
+        return True
+
+    def delete_nested(self, key: str, subkey: str) -> bool:
+        """Usuń wpis zagnieżdżonego słownika.
+
+        Returns:
+            Czy wpis istniał
+        """
+        nested = self._data.get(key)
+        if not isinstance(nested, dict) or subkey not in nested:
+            return False
+        del nested[subkey]
+        self.mark(f"{key}.{subkey}")
+        return True
+
+    def changes_since(self, version: int) -> Set[str]:
+        """Ścieżki zmienione po danej wersji."""
+        if version >= self.version:
+            return set()
+        return {path for path, changed in self._changed.items() if changed > version}
+
+    def changed_since(self, version: int, paths: Iterable[str]) -> bool:
+        """Czy któraś ze ścieżek (lub jej rodzic albo potomek) zmieniła się po wersji."""
+        if version >= self.version:
+            return False
+        changes = self.changes_since(version)
+        return any(paths_overlap(path, change) for path in paths for change in changes)
+
+    def view(self) -> Mapping[str, Any]:
+        """Widok tylko do odczytu (bez kopiowania)."""
+        return self._view
+
+    def reader(self) -> 'WorldStateReader':
+        """Nowy konsument zmian (pierwszy odczyt zwraca wszystkie ścieżki)."""
+        return WorldStateReader(self)
+
+    def replace(self, data: Mapping[str, Any]) -> None:
+        """Zastąp całą zawartość (np. po wczytaniu zapisu)."""
+        for key in list(self._data):
+            if key not in data:
+                del self[key]
+        for key, value in data.items():
+            self[key] = value
+
+
+class WorldStateReader:
+    """Konsument WorldState pamiętający wersję ostatniego odczytu."""
+
+    __slots__ = ('world', 'version')
+
+    def __init__(self, world: WorldState):
+        self.world = world
+        self.version = -1
+
+    def poll(self) -> Set[str]:
+        """Ścieżki zmienione od poprzedniego odczytu (pusty zbiór - nic nowego)."""
+        world = self.world
+        changes = world.changes_since(self.version)
+        self.version = world.version
+        return changes
+
+    @property
+    def pending(self) -> bool:
+        """Czy od ostatniego odczytu coś się zmieniło."""
+        return self.version < self.world.version
+
+
+def paths_overlap(path: str, change: str) -> bool:
+    """Czy zmiana ścieżki change dotyczy ścieżki path (równe, rodzic lub potomek)."""
+    if path == change:
+        return True
+    if len(change) < len(path):
+        return path.startswith(change) and path[len(change)] == '.'
+    return change.startswith(path) and change[len(path)] == '.'
@@ -17,7 +17,6 @@ from core.game_state import game_state, GameMode
 from core.event_bus import event_bus
 from ui.commands import CommandParser
 from ui.interface import GameInterface
-from ui.smart_interface import create_smart_interface
 from ui.prologue_interface import create_prologue_interface
 from ui.cutscene_manager import CutsceneManager, TutorialManager, create_prison_intro_cutscene
 from npcs.dialogue.dialogue_controller import DialogueResult  # Nowy system dialogów
@@ -50,9 +49,11 @@ class DrogaSzamanaRPG:
         # Ustawienia
         self.auto_save_interval = 300  # 5 minut
         self.last_save_time = time.time()
+        # Autozapis działa w tle - komunikat po wydarzeniu zakończenia
+        event_bus.subscribe("save_completed", self._on_save_completed)
 
-        # Importuj wszystkie pluginy
-        self._load_plugins()
+        # Pluginy smart interface - importowane leniwie przy jego pierwszym użyciu
+        self.available_plugins = None
         
     def start(self):
         """Uruchom grę."""
@@ -85,6 +86,9 @@ class DrogaSzamanaRPG:
                 traceback.print_exc()
                 self.running = False
                 break
+        
+        # Domknij dziennik wydarzeń (bufor może nie być jeszcze na dysku)
+        self.game_state.stop_journal()
     
     def show_intro(self):
         """Pokaż intro gry."""
@@ -231,6 +235,9 @@ class DrogaSzamanaRPG:
 
         # OPCJA 2: Użyj Smart Interface (zaawansowany)
         if self.use_smart and not self.smart_interface:
+            from ui.smart_interface import create_smart_interface
+            if self.available_plugins is None:
+                self._load_plugins()
             self.smart_interface = create_smart_interface(self.game_state, self.available_plugins)
 
         if self.use_smart:
@@ -565,9 +572,17 @@ class DrogaSzamanaRPG:
             return True
     
     def auto_save(self):
-        """Automatyczny zapis gry."""
-        self.game_state.save_game(5)  # Slot 5 dla auto-save
-        self.interface.print("\n[Gra zapisana automatycznie]")
+        """Automatyczny zapis gry (w tle - pętla gry nie czeka na dysk)."""
+        self.game_state.save_game(5, deferred=True)  # Slot 5 dla auto-save
+    
+    def _on_save_completed(self, event):
+        """Komunikat o zakończeniu autozapisu w tle."""
+        if event.data.get('slot') != 5 or event.data.get('superseded'):
+            return
+        if event.data.get('success'):
+            self.interface.print("\n[Gra zapisana automatycznie]")
+        else:
+            self.interface.print(f"\n[Błąd autozapisu: {event.data.get('error')}]")
     
     def check_emergent_events(self):
         """Sprawdź czy pojawiły się nowe emergentne wydarzenia."""
@@ -1,8 +1,28 @@
 """Mechanics module - systemy mechanik gry."""
 
+import importlib
+
 from .combat import CombatSystem, CombatStats, combat_system
 from .economy import Economy, Item, Market
-from .crafting import CraftingSystem
+
+# Leniwe eksporty: nazwa -> moduł (crafting budowany przy pierwszym użyciu)
+_LAZY_EXPORTS = {
+    'CraftingSystem': 'mechanics.crafting',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     'CombatSystem',
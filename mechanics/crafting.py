@@ -3,7 +3,6 @@ System craftingu dla Droga Szamana RPG
 Zawiera kompletną implementację craftingu z recepturami, umiejętnościami i jakością
 """
 
-import json
 import random
 import time
 import math
@@ -143,9 +142,9 @@ class CraftingSystem:
     
     def _load_stations_db(self, path: str) -> Dict:
         """Wczytuje dane stacji craftingowych z JSON"""
+        from core.data_loader import data_loader
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return data_loader.load_file(path)
         except FileNotFoundError:
             print(f"Ostrzeżenie: Nie znaleziono pliku {path}")
             return {'stations': {}, 'portable_stations': {}}
@@ -170,14 +169,14 @@ class CraftingSystem:
         return self.recipes_db
     
     def _load_items_db(self, path: str) -> Dict[str, dict]:
-        """Ładuje bazę danych przedmiotów"""
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """Ładuje bazę danych przedmiotów (współdzielony widok DataLoader)"""
+        from core.data_loader import data_loader
+        return data_loader.load_file(path)
     
     def _load_recipes_db(self, path: str) -> Dict[str, Recipe]:
         """Ładuje receptury z pliku JSON"""
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        from core.data_loader import data_loader
+        data = data_loader.load_file(path)
         
         recipes = {}
         for recipe_id, recipe_data in data.items():
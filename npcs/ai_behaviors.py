@@ -36,6 +36,22 @@ except ImportError:
     create_emotional_reaction_system = None
 
 
+def context_time(context: Dict) -> float:
+    """Bieżący czas z kontekstu świata (czas gry, gdy NPCManager ma zegar)."""
+    current_time = context.get("time")
+    return time.time() if current_time is None else current_time
+
+
+def context_minute(context: Dict) -> float:
+    """Minuta gry w jednostkach context_time.
+
+    Cooldowny węzłów i pilność celów są dobrane pod czas systemowy przy
+    time_scale=60 (sekunda to minuta gry); z zegarem gry NPCManager podaje
+    w kontekście czas w sekundach gry i game_minute=60.
+    """
+    return context.get("game_minute", 1.0)
+
+
 class NodeStatus(Enum):
     """Status wykonania węzła"""
     SUCCESS = "success"
@@ -363,8 +379,9 @@ def needs_medical_attention(npc: Any, context: Dict) -> bool:
 
 def has_urgent_goal(npc: Any, context: Dict) -> bool:
     """Sprawdza czy NPC ma pilny cel"""
-    current_time = time.time()
-    return any(goal.is_urgent(current_time) for goal in npc.goals if goal.active)
+    current_time = context_time(context)
+    minute = context_minute(context)
+    return any(goal.is_urgent(current_time, minute) for goal in npc.goals if goal.active)
 
 
 def pursue_urgent_goal(npc: Any, context: Dict) -> NodeStatus:
@@ -372,8 +389,9 @@ def pursue_urgent_goal(npc: Any, context: Dict) -> NodeStatus:
     if not hasattr(npc, 'goals'):
         return NodeStatus.FAILURE
     
-    current_time = time.time()
-    urgent_goals = [g for g in npc.goals if g.active and g.is_urgent(current_time)]
+    current_time = context_time(context)
+    minute = context_minute(context)
+    urgent_goals = [g for g in npc.goals if g.active and g.is_urgent(current_time, minute)]
     
     if not urgent_goals:
         return NodeStatus.FAILURE
@@ -796,7 +814,7 @@ def gather_information(npc: Any, context: Dict) -> NodeStatus:
                 
                 npc.semantic_memory[f"{info_type}_{other.id}"] = {
                     "source": other.id,
-                    "timestamp": time.time(),
+                    "timestamp": context_time(context),
                     "reliability": random.uniform(0.3, 0.9)
                 }
                 
@@ -1497,7 +1515,7 @@ def evening_routine(npc: Any, context: Dict) -> NodeStatus:
     
     if "paranoid" in npc.personality:
         # Sprawdź zabezpieczenia
-        npc.semantic_memory["security_checked"] = time.time()
+        npc.semantic_memory["security_checked"] = context_time(context)
     
     # Higiena
     if random.random() < 0.7:
@@ -1570,7 +1588,7 @@ def morning_routine(npc: Any, context: Dict) -> NodeStatus:
         # Sprawdzenie celi
         if has_contraband(npc, context):
             # Ukryj przedmioty
-            npc.semantic_memory["contraband_hidden"] = time.time()
+            npc.semantic_memory["contraband_hidden"] = context_time(context)
     
     # Higiena poranna
     if random.random() < 0.8:
@@ -1991,8 +2009,9 @@ class CooldownNode(DecoratorNode):
         self.last_execution = 0
     
     def execute(self, npc: Any, context: Dict) -> NodeStatus:
-        current_time = time.time()
-        if current_time - self.last_execution < self.cooldown_seconds:
+        current_time = context_time(context)
+        # cooldown_seconds to sekundy przy time_scale=60, czyli minuty gry
+        if current_time - self.last_execution < self.cooldown_seconds * context_minute(context):
             return NodeStatus.FAILURE
         
         result = self.child.execute(npc, context)
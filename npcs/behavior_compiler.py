@@ -0,0 +1,578 @@
+"""
+Kompilator behavior trees do płaskiej listy instrukcji dla gry Droga Szamana RPG
+Drzewo z ai_behaviors jest spłaszczane raz, a potem wykonywane bez wywołań
+wirtualnych execute, z pamięcią podręczną warunków w obrębie ticku
+"""
+
+import logging
+import random
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .ai_behaviors import (
+    BehaviorNode, NodeStatus,
+    SelectorNode, SequenceNode, RandomSelectorNode, PriorityNode,
+    InverterNode, RepeatNode, ConditionalNode, ActionNode,
+    ParallelNode, InterruptableSequenceNode, BlackboardNode,
+    TimeGatedNode, CooldownNode, ProbabilityNode,
+    create_behavior_tree
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Kody operacji
+OP_CONDITION = 0      # arg=(funkcja, nazwa, czy_cache)
+OP_ACTION = 1         # arg=(funkcja, nazwa)
+OP_TIME_GATE = 2      # arg=(start, koniec, wejście dziecka)
+OP_CHANCE = 3         # arg=(prawdopodobieństwo, wejście dziecka)
+OP_COOLDOWN = 4       # arg=(slot, cooldown, wejście dziecka)
+OP_COOLDOWN_MARK = 5  # arg=slot - zapis czasu po sukcesie dziecka
+OP_BLACKBOARD = 6     # arg=(slot, wejście dziecka lub None)
+OP_INTERRUPT = 7      # arg=(slot, interrupt_checker, wejścia dzieci)
+OP_SET_SLOT = 8       # arg=(slot, wartość)
+OP_PARALLEL = 9       # arg=(slot, wejście pierwszego dziecka)
+OP_COUNT = 10         # arg=(slot, 0=sukces/1=porażka/2=w toku)
+OP_PARALLEL_END = 11  # arg=(slot, próg sukcesu, próg porażki)
+OP_SHUFFLE = 12       # arg=(slot, wejścia dzieci)
+OP_NEXT_CHILD = 13    # arg=slot - kolejne dziecko z przetasowanej listy
+OP_REPEAT = 14        # arg=(slot, liczba powtórzeń)
+OP_REPEAT_NEXT = 15   # arg=(slot, wejście dziecka)
+OP_CALL = 16          # arg=węzeł - nieznany typ węzła, zwykłe execute
+
+OPCODE_NAMES = {
+    OP_CONDITION: "CONDITION", OP_ACTION: "ACTION", OP_TIME_GATE: "TIME_GATE",
+    OP_CHANCE: "CHANCE", OP_COOLDOWN: "COOLDOWN", OP_COOLDOWN_MARK: "COOLDOWN_MARK",
+    OP_BLACKBOARD: "BLACKBOARD", OP_INTERRUPT: "INTERRUPT", OP_SET_SLOT: "SET_SLOT",
+    OP_PARALLEL: "PARALLEL", OP_COUNT: "COUNT", OP_PARALLEL_END: "PARALLEL_END",
+    OP_SHUFFLE: "SHUFFLE", OP_NEXT_CHILD: "NEXT_CHILD", OP_REPEAT: "REPEAT",
+    OP_REPEAT_NEXT: "REPEAT_NEXT", OP_CALL: "CALL",
+}
+
+# Skoki poza program - zakończenie wykonania z danym wynikiem
+RET_SUCCESS = -1
+RET_FAILURE = -2
+RET_RUNNING = -3
+RET_RESULT = -4       # Surowy wynik ostatniej akcji (np. True zamiast NodeStatus)
+
+_MISSING = object()
+
+# Instrukcja: (opcode, argument, skok_sukces, skok_porażka, skok_w_toku, skok_inny)
+Instruction = Tuple[int, Any, int, int, int, int]
+
+
+def _is_cacheable(condition: Callable) -> bool:
+    """Czy wynik warunku można zapamiętać w obrębie ticku.
+
+    Cache'owane są tylko nazwane funkcje (is_hungry, sees_player...).
+    Lambdy bywają losowe (random.random() < 0.3), więc są liczone zawsze.
+    """
+    name = getattr(condition, '__name__', '')
+    return bool(name) and name != '<lambda>'
+
+
+class ConditionMemo:
+    """Pamięć wyników warunków w obrębie jednego ticku, kluczowana (NPC, warunek).
+
+    Aktywna tylko wewnątrz ``with memo.tick():`` (NPCManager.update). Poza
+    tickiem każde wykonanie drzewa dostaje własną, pustą pamięć. Wpisy NPCa
+    są kasowane po każdej jego akcji, bo akcja zmienia stan, od którego
+    zależą warunki.
+    """
+
+    def __init__(self):
+        self.active = False
+        self._entries: Dict[str, Dict[Callable, bool]] = {}
+
+    @contextmanager
+    def tick(self):
+        """Otwiera tick - wyniki warunków są współdzielone do jego końca."""
+        self._entries.clear()
+        self.active = True
+        try:
+            yield self
+        finally:
+            self.active = False
+            self._entries.clear()
+
+    def entries_for(self, npc_id: str) -> Dict[Callable, bool]:
+        """Zwraca słownik warunek -> wynik dla NPCa."""
+        entries = self._entries.get(npc_id)
+        if entries is None:
+            entries = self._entries[npc_id] = {}
+        return entries
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+
+class BehaviorState:
+    """Stan wykonania drzewa należący do jednego NPCa.
+
+    Skompilowane drzewo jest współdzielone przez wielu NPCów, więc stan
+    węzłów (cooldowny, indeks przerwanej sekwencji, blackboard) trzymany
+    jest tutaj, a nie w węzłach jak w interpreterze.
+    """
+
+    __slots__ = ('tree', 'slots')
+
+    def __init__(self, tree: 'CompiledBehaviorTree'):
+        self.tree = tree
+        self.slots: Dict[int, Any] = {}
+
+
+class CompiledBehaviorTree(BehaviorNode):
+    """Behavior tree spłaszczone do listy instrukcji ze skokami.
+
+    Węzły złożone (Selector, Sequence, Priority, Inverter) nie generują
+    instrukcji - zamieniają się w adresy skoków liści. Każdy liść zna adres
+    następnej instrukcji dla wyniku SUCCESS, FAILURE, RUNNING oraz dla
+    innej wartości zwróconej przez akcję. Kolejność dzieci PriorityNode jest
+    ustalana raz przy kompilacji.
+
+    Wynik i efekty uboczne są takie same jak przy interpretacji źródłowego
+    drzewa (łącznie ze zużyciem generatora random).
+    """
+
+    def __init__(self, source: BehaviorNode, code: List[Instruction], entry: int,
+                 slot_count: int, fallback_count: int,
+                 memo: Optional[ConditionMemo] = None):
+        super().__init__(source.name)
+        self.source = source
+        self.code = code
+        self.entry = entry
+        self.slot_count = slot_count
+        self.fallback_count = fallback_count
+        self.memo = memo if memo is not None else ConditionMemo()
+        # Opcjonalny profiler (core.profiler.TickProfiler) - w próbkowanych
+        # tickach warunki i akcje są wykonywane przez funkcje mierzące czas
+        self.profiler = None
+        self._profiled: Optional[Tuple[Any, List[Instruction]]] = None
+
+    @property
+    def shareable(self) -> bool:
+        """Czy drzewo może być współdzielone przez wielu NPCów.
+
+        Węzły nieznanego typu wykonywane są przez OP_CALL i trzymają stan
+        w sobie, więc takie drzewo musi mieć osobną instancję na NPCa.
+        """
+        return self.fallback_count == 0
+
+    def state_for(self, npc: Any) -> BehaviorState:
+        """Zwraca (tworząc w razie potrzeby) stan drzewa dla NPCa."""
+        state = getattr(npc, '_behavior_state', None)
+        if state is None or state.tree is not self:
+            state = BehaviorState(self)
+            npc._behavior_state = state
+        return state
+
+    def _profiled_code(self, profiler: Any) -> List[Instruction]:
+        """Kod z warunkami i akcjami opakowanymi w pomiar czasu profilera."""
+        if self._profiled is not None and self._profiled[0] is profiler:
+            return self._profiled[1]
+        code = []
+        for op, arg, *targets in self.code:
+            if op == OP_CONDITION:
+                func, name, cacheable = arg
+                arg = (profiler.timed(func, f"warunek:{name}"), name, cacheable)
+            elif op == OP_ACTION:
+                func, name = arg
+                arg = (profiler.timed(func, f"akcja:{name}"), name)
+            code.append((op, arg, *targets))
+        self._profiled = (profiler, code)
+        return code
+
+    def execute(self, npc: Any, context: Dict) -> NodeStatus:
+        slots = self.state_for(npc).slots
+        memo = self.memo.entries_for(npc.id) if self.memo.active else {}
+        registers: Dict[int, Any] = {}
+        profiler = self.profiler
+        code = self.code if profiler is None or not profiler.sampling else self._profiled_code(profiler)
+        result = None
+        pc = self.entry
+
+        while pc >= 0:
+            op, arg, on_success, on_failure, on_running, on_other = code[pc]
+
+            if op == OP_CONDITION:
+                func, name, cacheable = arg
+                value = memo.get(func, _MISSING) if cacheable else _MISSING
+                if value is _MISSING:
+                    try:
+                        value = bool(func(npc, context))
+                    except Exception as e:
+                        logger.error(f"Błąd w warunku {name}: {e}")
+                        pc = on_failure
+                        continue
+                    if cacheable:
+                        memo[func] = value
+                pc = on_success if value else on_failure
+
+            elif op == OP_ACTION:
+                func, name = arg
+                try:
+                    result = func(npc, context)
+                except Exception as e:
+                    logger.error(f"Błąd w akcji {name}: {e}")
+                    result = NodeStatus.FAILURE
+                memo.clear()
+                if result is None:
+                    result = NodeStatus.SUCCESS
+                if result is NodeStatus.SUCCESS:
+                    pc = on_success
+                elif result is NodeStatus.FAILURE:
+                    pc = on_failure
+                elif result is NodeStatus.RUNNING:
+                    pc = on_running
+                else:
+                    pc = on_other
+
+            elif op == OP_TIME_GATE:
+                start, end, child = arg
+                hour = context.get("hour", 12)
+                if start > end:
+                    inside = hour >= start or hour < end
+                else:
+                    inside = start <= hour < end
+                pc = child if inside else on_failure
+
+            elif op == OP_CHANCE:
+                probability, child = arg
+                pc = child if random.random() < probability else on_failure
+
+            elif op == OP_COOLDOWN:
+                slot, cooldown, child = arg
+                now = context.get("time")
+                if now is None:
+                    now = time.time()
+                # Jak CooldownNode - cooldown w minutach gry (context_minute)
+                if now - slots.get(slot, 0) < cooldown * context.get("game_minute", 1.0):
+                    pc = on_failure
+                else:
+                    registers[slot] = now
+                    pc = child
+
+            elif op == OP_COOLDOWN_MARK:
+                slots[arg] = registers[arg]
+                pc = on_success
+
+            elif op == OP_BLACKBOARD:
+                slot, child = arg
+                blackboard = slots.get(slot)
+                if blackboard is None:
+                    blackboard = slots[slot] = {}
+                context['blackboard'] = blackboard
+                pc = child if child is not None else on_success
+
+            elif op == OP_INTERRUPT:
+                slot, checker, children = arg
+                if checker and checker(npc, context):
+                    slots[slot] = 0
+                    pc = on_failure
+                else:
+                    index = slots.get(slot, 0)
+                    if index < len(children):
+                        pc = children[index]
+                    else:
+                        slots[slot] = 0
+                        pc = on_success
+
+            elif op == OP_SET_SLOT:
+                slot, value = arg
+                slots[slot] = value
+                pc = on_success
+
+            elif op == OP_PARALLEL:
+                slot, child = arg
+                registers[slot] = [0, 0, 0]
+                pc = child
+
+            elif op == OP_COUNT:
+                slot, kind = arg
+                registers[slot][kind] += 1
+                pc = on_success
+
+            elif op == OP_PARALLEL_END:
+                slot, success_threshold, failure_threshold = arg
+                successes, failures, running = registers[slot]
+                if successes >= success_threshold:
+                    pc = on_success
+                elif failures >= failure_threshold:
+                    pc = on_failure
+                elif running > 0:
+                    pc = on_running
+                else:
+                    pc = on_failure
+
+            elif op == OP_SHUFFLE:
+                slot, children = arg
+                shuffled = list(children)
+                random.shuffle(shuffled)
+                registers[slot] = iter(shuffled)
+                pc = on_success
+
+            elif op == OP_NEXT_CHILD:
+                pc = next(registers[arg], on_failure)
+
+            elif op == OP_REPEAT:
+                slot, times = arg
+                registers[slot] = times
+                pc = on_success
+
+            elif op == OP_REPEAT_NEXT:
+                slot, child = arg
+                if registers[slot] > 0:
+                    registers[slot] -= 1
+                    pc = child
+                else:
+                    pc = on_success
+
+            else:  # OP_CALL
+                result = arg.execute(npc, context)
+                memo.clear()
+                if result is NodeStatus.SUCCESS:
+                    pc = on_success
+                elif result is NodeStatus.FAILURE:
+                    pc = on_failure
+                elif result is NodeStatus.RUNNING:
+                    pc = on_running
+                else:
+                    pc = on_other
+
+        if pc == RET_SUCCESS:
+            return NodeStatus.SUCCESS
+        if pc == RET_FAILURE:
+            return NodeStatus.FAILURE
+        if pc == RET_RUNNING:
+            return NodeStatus.RUNNING
+        return result
+
+    def disassemble(self) -> List[str]:
+        """Czytelny listing programu (do debugowania)."""
+        lines = [f"entry -> {self.entry}"]
+        for pc, (op, arg, on_success, on_failure, on_running, on_other) in enumerate(self.code):
+            if op in (OP_CONDITION, OP_ACTION):
+                detail = arg[1]
+            elif op == OP_CALL:
+                detail = f"{type(arg).__name__}({arg.name})"
+            else:
+                detail = repr(arg)
+            lines.append(f"{pc:4d} {OPCODE_NAMES[op]:<14} {detail:<32} "
+                         f"S={on_success} F={on_failure} R={on_running} O={on_other}")
+        return lines
+
+
+class BehaviorTreeCompiler:
+    """Spłaszcza drzewo węzłów BehaviorNode do CompiledBehaviorTree.
+
+    Dzieci emitowane są od ostatniego, dzięki czemu adres następnego
+    rodzeństwa jest znany w chwili emitowania poprzedniego.
+    """
+
+    def __init__(self):
+        self.code: List[Instruction] = []
+        self.slot_count = 0
+        self.fallback_count = 0
+
+    def compile(self, root: BehaviorNode,
+                memo: Optional[ConditionMemo] = None) -> CompiledBehaviorTree:
+        self.code = []
+        self.slot_count = 0
+        self.fallback_count = 0
+        entry = self._emit(root, RET_SUCCESS, RET_FAILURE, RET_RUNNING, RET_RESULT)
+        return CompiledBehaviorTree(root, self.code, entry, self.slot_count,
+                                    self.fallback_count, memo)
+
+    def _instruction(self, op: int, arg: Any = None, on_success: int = RET_SUCCESS,
+                     on_failure: int = RET_FAILURE, on_running: int = RET_RUNNING,
+                     on_other: int = RET_RESULT) -> int:
+        self.code.append((op, arg, on_success, on_failure, on_running, on_other))
+        return len(self.code) - 1
+
+    def _slot(self) -> int:
+        self.slot_count += 1
+        return self.slot_count - 1
+
+    def _emit(self, node: BehaviorNode, s: int, f: int, r: int, o: int) -> int:
+        """Emituje kod węzła i zwraca adres jego wejścia.
+
+        s/f/r/o to adresy, pod które węzeł przekazuje sterowanie po zwróceniu
+        SUCCESS/FAILURE/RUNNING lub innej wartości.
+        """
+        kind = type(node)
+
+        if kind is ConditionalNode:
+            return self._instruction(
+                OP_CONDITION,
+                (node.condition_func, node.name, _is_cacheable(node.condition_func)),
+                s, f, r, o)
+
+        if kind is ActionNode:
+            return self._instruction(OP_ACTION, (node.action_func, node.name), s, f, r, o)
+
+        if kind is SequenceNode:
+            return self._emit_chain(node.children, s, f, r, continue_on_success=True)
+
+        if kind is SelectorNode:
+            return self._emit_chain(node.children, s, f, r, continue_on_success=False)
+
+        if kind is PriorityNode:
+            ordered = sorted(node.children,
+                             key=lambda c: node.priorities.get(c, 0),
+                             reverse=True)
+            return self._emit_chain(ordered, s, f, r, continue_on_success=False)
+
+        if kind is InverterNode:
+            return self._emit(node.child, f, s, r, r)
+
+        if kind is TimeGatedNode:
+            child = self._emit(node.child, s, f, r, o)
+            return self._instruction(OP_TIME_GATE, (node.start_hour, node.end_hour, child),
+                                     on_failure=f)
+
+        if kind is ProbabilityNode:
+            child = self._emit(node.child, s, f, r, o)
+            return self._instruction(OP_CHANCE, (node.probability, child), on_failure=f)
+
+        if kind is CooldownNode:
+            slot = self._slot()
+            mark = self._instruction(OP_COOLDOWN_MARK, slot, on_success=s)
+            child = self._emit(node.child, mark, f, r, o)
+            return self._instruction(OP_COOLDOWN, (slot, node.cooldown_seconds, child),
+                                     on_failure=f)
+
+        if kind is BlackboardNode:
+            slot = self._slot()
+            child = self._emit(node.children[0], s, f, r, o) if node.children else None
+            return self._instruction(OP_BLACKBOARD, (slot, child), on_success=s)
+
+        if kind is InterruptableSequenceNode:
+            return self._emit_interruptable(node, s, f, r)
+
+        if kind is ParallelNode:
+            return self._emit_parallel(node, s, f, r)
+
+        if kind is RandomSelectorNode:
+            slot = self._slot()
+            next_child = self._instruction(OP_NEXT_CHILD, slot, on_failure=f)
+            children = tuple(self._emit(child, s, next_child, r, next_child)
+                             for child in node.children)
+            return self._instruction(OP_SHUFFLE, (slot, children), on_success=next_child)
+
+        if kind is RepeatNode:
+            slot = self._slot()
+            loop = self._instruction(OP_REPEAT_NEXT, None, on_success=s)
+            child = self._emit(node.child, loop, f, r, loop)
+            self.code[loop] = (OP_REPEAT_NEXT, (slot, child), s, f, r, o)
+            return self._instruction(OP_REPEAT, (slot, node.times), on_success=loop)
+
+        # Nieznany typ węzła - wykonaj go interpretowanym execute
+        self.fallback_count += 1
+        return self._instruction(OP_CALL, node, s, f, r, o)
+
+    def _emit_chain(self, children: Sequence[BehaviorNode], s: int, f: int, r: int,
+                    continue_on_success: bool) -> int:
+        """Sekwencja (dalej po sukcesie) lub selektor (dalej po porażce).
+
+        Wartość inna niż NodeStatus przechodzi do następnego dziecka
+        w obu przypadkach - tak jak w interpreterze.
+        """
+        following = s if continue_on_success else f
+        for child in reversed(children):
+            if continue_on_success:
+                following = self._emit(child, following, f, r, following)
+            else:
+                following = self._emit(child, s, following, r, following)
+        return following
+
+    def _emit_interruptable(self, node: InterruptableSequenceNode,
+                            s: int, f: int, r: int) -> int:
+        slot = self._slot()
+        reset = self._instruction(OP_SET_SLOT, (slot, 0), on_success=f)
+        following = self._instruction(OP_SET_SLOT, (slot, 0), on_success=s)
+        entries = []
+        for index in range(len(node.children) - 1, -1, -1):
+            entry = self._emit(node.children[index], following, reset, r, following)
+            entries.append(entry)
+            if index > 0:
+                following = self._instruction(OP_SET_SLOT, (slot, index), on_success=entry)
+        entries.reverse()
+        return self._instruction(OP_INTERRUPT, (slot, node.interrupt_checker, tuple(entries)),
+                                 on_success=s, on_failure=f)
+
+    def _emit_parallel(self, node: ParallelNode, s: int, f: int, r: int) -> int:
+        slot = self._slot()
+        following = self._instruction(
+            OP_PARALLEL_END, (slot, node.success_threshold, node.failure_threshold), s, f, r)
+        for child in reversed(node.children):
+            on_success = self._instruction(OP_COUNT, (slot, 0), on_success=following)
+            on_failure = self._instruction(OP_COUNT, (slot, 1), on_success=following)
+            on_running = self._instruction(OP_COUNT, (slot, 2), on_success=following)
+            following = self._emit(child, on_success, on_failure, on_running, on_running)
+        return self._instruction(OP_PARALLEL, (slot, following))
+
+
+def compile_behavior_tree(root: BehaviorNode,
+                          memo: Optional[ConditionMemo] = None) -> CompiledBehaviorTree:
+    """Kompiluje drzewo do płaskiej listy instrukcji."""
+    if isinstance(root, CompiledBehaviorTree):
+        return root
+    return BehaviorTreeCompiler().compile(root, memo)
+
+
+class BehaviorTreeCache:
+    """Współdzielone skompilowane drzewa kluczowane (rola, osobowość).
+
+    NPCe o tej samej roli i cechach dostają ten sam obiekt drzewa, a ich
+    indywidualny stan żyje w BehaviorState. Wszystkie drzewa z cache używają
+    wspólnej ConditionMemo.
+    """
+
+    def __init__(self, builder: Callable[[str, List[str]], BehaviorNode] = create_behavior_tree):
+        self.builder = builder
+        self.memo = ConditionMemo()
+        self._trees: Dict[Tuple[str, Tuple[str, ...]], CompiledBehaviorTree] = {}
+        self._unshared: "weakref.WeakSet[CompiledBehaviorTree]" = weakref.WeakSet()
+        self.profiler = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, role: str, personality: Optional[List[str]]) -> CompiledBehaviorTree:
+        """Zwraca skompilowane drzewo dla roli i osobowości."""
+        traits = tuple(personality or ())
+        key = (role, traits)
+        tree = self._trees.get(key)
+        if tree is not None:
+            self.hits += 1
+            return tree
+        self.misses += 1
+        tree = compile_behavior_tree(self.builder(role, list(traits)), self.memo)
+        tree.profiler = self.profiler
+        if tree.shareable:
+            self._trees[key] = tree
+        else:
+            self._unshared.add(tree)
+        return tree
+
+    def set_profiler(self, profiler: Any):
+        """Podpina profiler (lub None) do wszystkich wydanych drzew."""
+        self.profiler = profiler
+        for tree in list(self._trees.values()) + list(self._unshared):
+            tree.profiler = profiler
+
+    def clear(self):
+        """Usuwa skompilowane drzewa (np. po przeładowaniu zachowań)."""
+        self._trees.clear()
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "trees": len(self._trees),
+            "hits": self.hits,
+            "misses": self.misses,
+            "instructions": sum(len(tree.code) for tree in self._trees.values()),
+        }
@@ -26,6 +26,7 @@ from core.event_bus import (
     EventCategory,
     EventPriority
 )
+from core.data_loader import data_loader
 
 
 class DialogueResult(Enum):
@@ -309,9 +310,8 @@ class DialogueController:
         """Wczytaj wszystkie dialogi z plików JSON."""
         # Główny plik dialogów
         try:
-            with open('data/dialogues.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self._parse_dialogue_data(data.get('dialogue_trees', {}))
+            data = data_loader.load_file('data/dialogues.json')
+            self._parse_dialogue_data(data.get('dialogue_trees', {}))
         except FileNotFoundError:
             print("[DialogueController] Nie znaleziono data/dialogues.json")
 
@@ -322,9 +322,8 @@ class DialogueController:
                 if filename.endswith('.json'):
                     filepath = os.path.join(dialogues_dir, filename)
                     try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            self._parse_dialogue_data(data.get('dialogue_trees', {}))
+                        data = data_loader.load_file(filepath)
+                        self._parse_dialogue_data(data.get('dialogue_trees', {}))
                     except (FileNotFoundError, json.JSONDecodeError) as e:
                         print(f"[DialogueController] Błąd wczytywania {filepath}: {e}")
 
@@ -380,21 +379,20 @@ class DialogueController:
     def _load_npc_mapping(self) -> None:
         """Wczytaj mapowanie NPC -> dialogi."""
         try:
-            with open('data/npc_complete.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = data_loader.load_file('data/npc_complete.json')
 
-                for npc_id, npc_data in data.get('npcs', {}).items():
-                    dialogue_id = npc_data.get('dialogue_id', npc_id)
-                    self.npc_dialogue_mapping[npc_id] = dialogue_id
-                    self.npc_dialogue_mapping[dialogue_id] = dialogue_id
+            for npc_id, npc_data in data.get('npcs', {}).items():
+                dialogue_id = npc_data.get('dialogue_id', npc_id)
+                self.npc_dialogue_mapping[npc_id] = dialogue_id
+                self.npc_dialogue_mapping[dialogue_id] = dialogue_id
 
-                    if 'dialogue_tree' in npc_data:
-                        self.npc_dialogue_mapping[npc_data['dialogue_tree']] = npc_data['dialogue_tree']
+                if 'dialogue_tree' in npc_data:
+                    self.npc_dialogue_mapping[npc_data['dialogue_tree']] = npc_data['dialogue_tree']
 
-                for dialogue_id, map_data in data.get('dialogue_mappings', {}).items():
-                    self.npc_dialogue_mapping[dialogue_id] = dialogue_id
-                    if 'npc_id' in map_data:
-                        self.npc_dialogue_mapping[map_data['npc_id']] = dialogue_id
+            for dialogue_id, map_data in data.get('dialogue_mappings', {}).items():
+                self.npc_dialogue_mapping[dialogue_id] = dialogue_id
+                if 'npc_id' in map_data:
+                    self.npc_dialogue_mapping[map_data['npc_id']] = dialogue_id
 
         except FileNotFoundError:
             # Fallback mapping
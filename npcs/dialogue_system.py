@@ -7,7 +7,6 @@ from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import random
-import json
 
 
 class DialogueResult(Enum):
@@ -81,53 +80,52 @@ class DialogueSystem:
         self.npc_complete_data = self._load_npc_complete()
     
     def _load_npc_complete(self) -> Dict:
-        """Wczytaj kompletne dane NPCów z nowego pliku."""
+        """Wczytaj kompletne dane NPCów z nowego pliku (współdzielony widok)."""
+        from core.data_loader import data_loader
         try:
-            with open('data/npc_complete.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return data_loader.load_file('data/npc_complete.json')
         except FileNotFoundError:
             print("Ostrzeżenie: Nie znaleziono pliku npc_complete.json")
             return {'npcs': {}, 'dialogue_mappings': {}}
     
     def _load_npc_mapping(self) -> Dict:
         """Wczytaj mapowanie NPCów z pliku JSON."""
+        from core.data_loader import data_loader
         try:
             # Najpierw spróbuj z nowego pliku kompletnego
-            with open('data/npc_complete.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                # Stwórz mapowanie ID -> dialogue_id
-                mapping = {}
-                
-                # Z danych NPCów
-                for npc_id, npc_data in data.get('npcs', {}).items():
-                    dialogue_id = npc_data.get('dialogue_id', npc_id)
-                    mapping[npc_id] = dialogue_id
-                    # Dodaj też mapowanie dla samego dialogue_id
-                    mapping[dialogue_id] = dialogue_id
-                    
-                    # Dodaj mapowanie dla dialogue_tree jeśli różne
-                    if 'dialogue_tree' in npc_data:
-                        mapping[npc_data['dialogue_tree']] = npc_data['dialogue_tree']
-                
-                # Z dialogue_mappings jeśli istnieją
-                for dialogue_id, map_data in data.get('dialogue_mappings', {}).items():
-                    mapping[dialogue_id] = dialogue_id
-                    if 'npc_id' in map_data:
-                        mapping[map_data['npc_id']] = dialogue_id
+            data = data_loader.load_file('data/npc_complete.json')
+            
+            # Stwórz mapowanie ID -> dialogue_id
+            mapping = {}
+            
+            # Z danych NPCów
+            for npc_id, npc_data in data.get('npcs', {}).items():
+                dialogue_id = npc_data.get('dialogue_id', npc_id)
+                mapping[npc_id] = dialogue_id
+                # Dodaj też mapowanie dla samego dialogue_id
+                mapping[dialogue_id] = dialogue_id
                 
-                return mapping
+                # Dodaj mapowanie dla dialogue_tree jeśli różne
+                if 'dialogue_tree' in npc_data:
+                    mapping[npc_data['dialogue_tree']] = npc_data['dialogue_tree']
+            
+            # Z dialogue_mappings jeśli istnieją
+            for dialogue_id, map_data in data.get('dialogue_mappings', {}).items():
+                mapping[dialogue_id] = dialogue_id
+                if 'npc_id' in map_data:
+                    mapping[map_data['npc_id']] = dialogue_id
+            
+            return mapping
                 
         except FileNotFoundError:
             # Fallback do starego pliku jeśli nowy nie istnieje
             try:
-                with open('data/npc_mapping.json', 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    mapping = {}
-                    for npc_id, info in data['npc_mapping']['mappings'].items():
-                        mapping[npc_id] = info['dialogue_id']
-                        mapping[info['dialogue_id']] = info['dialogue_id']
-                    return mapping
+                data = data_loader.load_file('data/npc_mapping.json')
+                mapping = {}
+                for npc_id, info in data['npc_mapping']['mappings'].items():
+                    mapping[npc_id] = info['dialogue_id']
+                    mapping[info['dialogue_id']] = info['dialogue_id']
+                return mapping
             except FileNotFoundError:
                 print("Ostrzeżenie: Nie znaleziono plików mapowania, używam domyślnego")
                 # Zwróć domyślne mapowanie
@@ -145,10 +143,10 @@ class DialogueSystem:
                 }
     
     def _load_dialogues_from_json(self) -> Dict:
-        """Wczytaj dialogi z pliku JSON."""
+        """Wczytaj dialogi z pliku JSON (współdzielony widok)."""
+        from core.data_loader import data_loader
         try:
-            with open('data/dialogues.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return data_loader.load_file('data/dialogues.json')
         except FileNotFoundError:
             print("Ostrzeżenie: Nie znaleziono pliku dialogues.json")
             return {'dialogue_trees': {}}
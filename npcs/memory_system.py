@@ -6,51 +6,194 @@ Implementacja pamięci epizodycznej, semantycznej, proceduralnej i emocjonalnej
 import time
 import json
 import heapq
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Set, Tuple, Any
 from dataclasses import dataclass, field
 from collections import defaultdict
+from itertools import islice
 import random
 import logging
+import zlib
 
 logger = logging.getLogger(__name__)
 
 
+class DecayQueue:
+    """Kolejka priorytetowa przewidywanych momentów wygaśnięcia wspomnień
+
+    Zamiast co tick sprawdzać siłę każdego wspomnienia, przy zapisie siły
+    wylicza się (w formie zamkniętej) moment spadku poniżej progu i wstawia
+    go do kopca. pop_due zdejmuje tylko wpisy, których czas minął. Ponowne
+    zaplanowanie lub anulowanie klucza unieważnia poprzedni wpis (leniwe
+    usuwanie).
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Any, Any]] = []
+        self._current: Dict[Any, int] = {}  # klucz -> numer aktualnego wpisu
+        self._seq = 0
+
+    def schedule(self, key: Any, due: float, item: Any = None):
+        """Planuje wygaśnięcie klucza na czas due (item jest zwracany przez pop_due)."""
+        self._seq += 1
+        self._current[key] = self._seq
+        heapq.heappush(self._heap, (due, self._seq, key, key if item is None else item))
+        if len(self._heap) > 2 * len(self._current) + 64:
+            self._compact()
+
+    def cancel(self, key: Any):
+        """Anuluje zaplanowane wygaśnięcie klucza."""
+        self._current.pop(key, None)
+
+    def pop_due(self, now: float) -> List[Any]:
+        """Zdejmuje i zwraca elementy, których czas wygaśnięcia już minął."""
+        heap = self._heap
+        due_items = []
+        while heap and heap[0][0] <= now:
+            _, seq, key, item = heapq.heappop(heap)
+            if self._current.get(key) == seq:
+                del self._current[key]
+                due_items.append(item)
+        return due_items
+
+    def next_due(self) -> Optional[float]:
+        """Najbliższy zaplanowany czas wygaśnięcia (None gdy kolejka pusta)."""
+        heap = self._heap
+        while heap and self._current.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def clear(self):
+        self._heap.clear()
+        self._current.clear()
+
+    def _compact(self):
+        """Usuwa z kopca unieważnione wpisy."""
+        self._heap = [entry for entry in self._heap if self._current.get(entry[2]) == entry[1]]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._current
+
+
 @dataclass
 class MemoryTrace:
-    """Ślad pamięciowy z mechanizmem konsolidacji"""
+    """Ślad pamięciowy z mechanizmem konsolidacji
+
+    Zanik jest liczony leniwie: strength to siła w chwili last_update,
+    a strength_at(t) wylicza siłę w dowolnym momencie w formie zamkniętej.
+    Siła jest utrwalana (settle) tylko przy dostępie i wzmocnieniu.
+    """
     content: Any
     strength: float = 1.0
     last_access: float = field(default_factory=time.time)
     access_count: int = 0
     creation_time: float = field(default_factory=time.time)
+    decay_rate: float = 0.001
+    last_update: float = field(default_factory=time.time)
+    
+    def _adjusted_rate(self) -> float:
+        # Pamięci często używane wolniej zanikają
+        return self.decay_rate / (1 + self.access_count * 0.1)
+    
+    def strength_at(self, current_time: float) -> float:
+        """Siła śladu w chwili current_time"""
+        elapsed = max(0.0, current_time - self.last_update)
+        return max(0.0, self.strength * (1 - self._adjusted_rate() * elapsed))
+    
+    def settle(self, current_time: float):
+        """Utrwala zanik do chwili current_time"""
+        if current_time > self.last_update:
+            self.strength = self.strength_at(current_time)
+            self.last_update = current_time
+    
+    def expiry_time(self, threshold: float) -> float:
+        """Moment, w którym siła spadnie poniżej progu (inf gdy nigdy)"""
+        if self.strength < threshold:
+            return self.last_update
+        rate = self._adjusted_rate()
+        if rate <= 0:
+            return float("inf")
+        return self.last_update + (1 - threshold / self.strength) / rate
+    
+    def reinforce(self, amount: float, current_time: Optional[float] = None):
+        """Wzmacnia ślad (po utrwaleniu dotychczasowego zaniku)"""
+        self.settle(time.time() if current_time is None else current_time)
+        self.strength = min(1.0, self.strength + amount)
     
     def access(self):
         """Zwiększa siłę pamięci przy dostępie"""
-        self.last_access = time.time()
+        now = time.time()
+        self.settle(now)
+        self.last_access = now
         self.access_count += 1
         # Każdy dostęp wzmacnia pamięć
         self.strength = min(1.0, self.strength + 0.05)
     
-    def decay(self, current_time: float, decay_rate: float = 0.001):
-        """Osłabia pamięć z czasem"""
-        time_since_access = current_time - self.last_access
-        # Pamięci często używane wolniej zanikają
-        adjusted_decay = decay_rate / (1 + self.access_count * 0.1)
-        self.strength *= (1 - adjusted_decay * time_since_access)
-        self.strength = max(0.0, self.strength)
+    def decay(self, current_time: float, decay_rate: Optional[float] = None):
+        """Osłabia pamięć z czasem (utrwala leniwy zanik do current_time)"""
+        self.settle(current_time)
+        if decay_rate is not None:
+            self.decay_rate = decay_rate
 
 
 class EpisodicMemory:
-    """System pamięci epizodycznej - konkretne wydarzenia"""
+    """System pamięci epizodycznej - konkretne wydarzenia
+
+    Wspomnienia mają stabilne identyfikatory ("memory_id") zamiast pozycji
+    na liście, więc usunięcie wspomnienia nie wymaga przepisywania powiązań
+    ani przebudowy indeksów. Słownik _memories zachowuje kolejność dodania
+    (indeks czasowy), memory_index mapuje typ/uczestnika/lokację na zbiory
+    identyfikatorów, a kopiec _strength_heap wskazuje najsłabsze wspomnienie
+    do zapomnienia w O(log n).
+    """
+    
+    # Pola, dla których zapytanie z wartością None pasuje do wspomnień bez tego pola
+    _UNSET_FIELDS = ("event_type", "location")
     
     def __init__(self, capacity: int = 1000):
         self.capacity = capacity
-        self.memories: List[Dict] = []
-        self.memory_index: Dict[str, List[int]] = defaultdict(list)  # Indeks dla szybkiego wyszukiwania
+        self._memories: Dict[int, Dict] = {}  # memory_id -> wspomnienie, w kolejności dodania
+        self._next_id = 0
+        self.memory_index: Dict[str, Set[int]] = defaultdict(set)  # Indeks dla szybkiego wyszukiwania
+        self._unset_index: Dict[str, Set[int]] = {name: set() for name in self._UNSET_FIELDS}
+        # Kopiec (siła * ważność, memory_id, wersja) z leniwym usuwaniem
+        self._strength_heap: List[Tuple[float, int, int]] = []
+        self._heap_versions: Dict[int, int] = {}
         self.importance_threshold = 0.1
         self.consolidation_interval = 3600  # Co godzinę konsolidacja
         self.last_consolidation = time.time()
     
+    @property
+    def memories(self) -> List[Dict]:
+        """Wspomnienia w kolejności dodania (kopia listy)."""
+        return list(self._memories.values())
+    
+    @memories.setter
+    def memories(self, memories: List[Dict]):
+        """Zastępuje wszystkie wspomnienia (np. przy wczytywaniu zapisu)."""
+        self._memories = {}
+        self._next_id = 0
+        for position, memory in enumerate(memories):
+            memory.setdefault("memory_id", position)
+            self._memories[memory["memory_id"]] = memory
+            self._next_id = max(self._next_id, memory["memory_id"] + 1)
+        # Zapisy sprzed stabilnych identyfikatorów trzymały pozycje na liście
+        for memory in self._memories.values():
+            for assoc in memory.get("associations", []):
+                if "memory_idx" in assoc:
+                    assoc["memory_id"] = assoc.pop("memory_idx")
+        self._rebuild_index()
+    
+    def __len__(self) -> int:
+        return len(self._memories)
+    
+    def get_memory(self, memory_id: int) -> Optional[Dict]:
+        """Zwraca wspomnienie o danym identyfikatorze (None jeśli zapomniane)."""
+        return self._memories.get(memory_id)
+    
     def add_memory(self, event: Dict):
         """Dodaje nowe wspomnienie"""
         # Dodaj metadane
@@ -58,25 +201,19 @@ class EpisodicMemory:
         event["strength"] = event.get("importance", 0.5)
         event["access_count"] = 0
         event["associations"] = []
+        event["memory_id"] = self._next_id
+        self._next_id += 1
         
         # Znajdź powiązania z istniejącymi wspomnieniami
         self._create_associations(event)
         
-        # Dodaj do pamięci
-        self.memories.append(event)
-        memory_idx = len(self.memories) - 1
-        
-        # Indeksuj według typu i uczestników
-        self.memory_index[event.get("event_type", "unknown")].append(memory_idx)
-        for participant in event.get("participants", []):
-            self.memory_index[f"participant_{participant}"].append(memory_idx)
-        
-        # Indeksuj według lokacji
-        if "location" in event:
-            self.memory_index[f"location_{event['location']}"].append(memory_idx)
+        # Dodaj do pamięci i indeksów
+        self._memories[event["memory_id"]] = event
+        self._index_memory(event)
+        self._push_strength(event)
         
         # Sprawdź pojemność
-        if len(self.memories) > self.capacity:
+        if len(self._memories) > self.capacity:
             self._forget_weakest()
         
         # Konsoliduj jeśli minął czas
@@ -84,15 +221,46 @@ class EpisodicMemory:
         if current_time - self.last_consolidation > self.consolidation_interval:
             self.consolidate()
     
+    def _index_keys(self, memory: Dict) -> List[str]:
+        """Klucze indeksu odwróconego dla wspomnienia."""
+        keys = [memory.get("event_type", "unknown")]
+        keys.extend(f"participant_{participant}" for participant in memory.get("participants", []))
+        if "location" in memory:
+            keys.append(f"location_{memory['location']}")
+        return keys
+    
+    def _index_memory(self, memory: Dict):
+        """Dopisuje wspomnienie do indeksów."""
+        memory_id = memory["memory_id"]
+        for key in self._index_keys(memory):
+            self.memory_index[key].add(memory_id)
+        for name in self._UNSET_FIELDS:
+            if memory.get(name) is None:
+                self._unset_index[name].add(memory_id)
+    
+    def _unindex_memory(self, memory: Dict):
+        """Usuwa wspomnienie z indeksów."""
+        memory_id = memory["memory_id"]
+        for key in self._index_keys(memory):
+            ids = self.memory_index.get(key)
+            if ids is not None:
+                ids.discard(memory_id)
+                if not ids:
+                    del self.memory_index[key]
+        for name in self._UNSET_FIELDS:
+            self._unset_index[name].discard(memory_id)
+    
     def _create_associations(self, new_event: Dict):
         """Tworzy powiązania między wspomnieniami"""
         associations = []
         
-        for idx, memory in enumerate(self.memories[-20:]):  # Sprawdź ostatnie 20 wspomnień
+        # Sprawdź ostatnie 20 wspomnień (od najstarszego)
+        recent = list(islice(reversed(self._memories.values()), 20))
+        for memory in reversed(recent):
             similarity = self._calculate_similarity(new_event, memory)
             if similarity > 0.3:  # Próg podobieństwa
                 associations.append({
-                    "memory_idx": len(self.memories) - 20 + idx,
+                    "memory_id": memory["memory_id"],
                     "strength": similarity,
                     "type": self._determine_association_type(new_event, memory)
                 })
@@ -100,7 +268,7 @@ class EpisodicMemory:
                 # Dodaj wzajemne powiązanie
                 if "associations" in memory:
                     memory["associations"].append({
-                        "memory_idx": len(self.memories),  # Indeks nowego wspomnienia
+                        "memory_id": new_event["memory_id"],
                         "strength": similarity,
                         "type": self._determine_association_type(memory, new_event)
                     })
@@ -156,44 +324,47 @@ class EpisodicMemory:
     def recall(self, query: Dict, limit: int = 10) -> List[Dict]:
         """Przywołuje wspomnienia na podstawie zapytania"""
         current_time = time.time()
-        candidates = []
         
         # Użyj indeksu do szybkiego wyszukiwania
-        relevant_indices = set()
+        relevant_ids = set()
         
         if "event_type" in query:
-            relevant_indices.update(self.memory_index.get(query["event_type"], []))
+            relevant_ids.update(self.memory_index.get(query["event_type"], ()))
         
         if "participant" in query:
-            relevant_indices.update(self.memory_index.get(f"participant_{query['participant']}", []))
+            relevant_ids.update(self.memory_index.get(f"participant_{query['participant']}", ()))
         
         if "location" in query:
-            relevant_indices.update(self.memory_index.get(f"location_{query['location']}", []))
+            relevant_ids.update(self.memory_index.get(f"location_{query['location']}", ()))
         
-        # Jeśli nie ma specyficznych kryteriów, przeszukaj wszystkie
-        if not relevant_indices:
-            relevant_indices = range(len(self.memories))
+        # Bez trafień w indeksie wynik > 0 mogą dać tylko wspomnienia bez
+        # pola, o które pytamy wartością None - nie trzeba skanować wszystkich
+        if not relevant_ids:
+            for name in self._UNSET_FIELDS:
+                if name in query and query[name] is None:
+                    relevant_ids.update(self._unset_index[name])
         
         # Oblicz relevance score dla każdego kandydata
-        for idx in relevant_indices:
-            if idx < len(self.memories):
-                memory = self.memories[idx]
+        candidates = []
+        for memory_id in relevant_ids:
+            memory = self._memories.get(memory_id)
+            if memory is not None:
                 relevance = self._calculate_relevance(memory, query, current_time)
                 if relevance > 0:
-                    candidates.append((relevance, idx, memory))
+                    candidates.append((relevance, memory_id, memory))
         
-        # Sortuj według relevance i zwróć top N
-        candidates.sort(key=lambda x: x[0], reverse=True)
+        # Top N według relevance (starsze wspomnienia wygrywają remisy)
+        top = heapq.nsmallest(limit, candidates, key=lambda x: (-x[0], x[1]))
         
         # Zwiększ licznik dostępu dla przywołanych wspomnień
         results = []
-        for relevance, idx, memory in candidates[:limit]:
+        for relevance, memory_id, memory in top:
             memory["access_count"] = memory.get("access_count", 0) + 1
             memory["last_access"] = current_time
             memory["strength"] = min(1.0, memory.get("strength", 0.5) + 0.02)
             
             # Aktywuj powiązane wspomnienia (spreading activation)
-            self._spread_activation(idx, strength=0.5)
+            self._spread_activation(memory_id, strength=0.5)
             
             results.append(memory)
         
@@ -229,17 +400,15 @@ class EpisodicMemory:
         
         return relevance
     
-    def _spread_activation(self, memory_idx: int, strength: float = 0.5):
+    def _spread_activation(self, memory_id: int, strength: float = 0.5):
         """Rozprzestrzenia aktywację na powiązane wspomnienia"""
-        if memory_idx >= len(self.memories):
+        memory = self._memories.get(memory_id)
+        if memory is None:
             return
         
-        memory = self.memories[memory_idx]
-        associations = memory.get("associations", [])
-        
-        for assoc in associations:
-            if assoc["memory_idx"] < len(self.memories):
-                associated_memory = self.memories[assoc["memory_idx"]]
+        for assoc in memory.get("associations", []):
+            associated_memory = self._memories.get(assoc["memory_id"])
+            if associated_memory is not None:
                 # Wzmocnij powiązane wspomnienie
                 boost = strength * assoc["strength"] * 0.1
                 associated_memory["strength"] = min(1.0, associated_memory.get("strength", 0.5) + boost)
@@ -248,7 +417,7 @@ class EpisodicMemory:
         """Konsoliduje pamięć - wzmacnia ważne, osłabia nieważne"""
         current_time = time.time()
         
-        for memory in self.memories:
+        for memory in self._memories.values():
             # Osłab wspomnienia z czasem
             age = current_time - memory.get("timestamp", current_time)
             decay_rate = 0.001 * (1.0 / max(0.1, memory.get("importance", 0.5)))
@@ -260,86 +429,110 @@ class EpisodicMemory:
         
         self.last_consolidation = current_time
         
+        # Siły spadły - kopiec trzeba zbudować od nowa
+        self._rebuild_strength_heap()
+        
         # Usuń bardzo słabe wspomnienia
         self._forget_weakest()
     
+    @staticmethod
+    def _retention_score(memory: Dict) -> float:
+        """Wynik decydujący o zapomnieniu (najniższy odpada pierwszy)."""
+        return memory.get("strength", 0.5) * memory.get("importance", 0.5)
+    
+    def _push_strength(self, memory: Dict):
+        """Dodaje aktualny wynik wspomnienia do kopca (poprzednie wpisy tracą ważność).
+        
+        Wywoływane po dodaniu wspomnienia i po każdym osłabieniu. Wzmocnienia
+        (recall, spreading activation) nie wymagają wpisu - nieaktualny, zbyt
+        niski wynik zostanie poprawiony przy zdjęciu z kopca.
+        """
+        memory_id = memory["memory_id"]
+        version = self._heap_versions.get(memory_id, 0) + 1
+        self._heap_versions[memory_id] = version
+        heapq.heappush(self._strength_heap, (self._retention_score(memory), memory_id, version))
+    
+    def _rebuild_strength_heap(self):
+        """Buduje kopiec sił od nowa (O(n)), usuwając nieaktualne wpisy."""
+        self._heap_versions = {memory_id: 0 for memory_id in self._memories}
+        self._strength_heap = [(self._retention_score(memory), memory_id, 0)
+                               for memory_id, memory in self._memories.items()]
+        heapq.heapify(self._strength_heap)
+    
+    def _pop_weakest(self) -> Optional[Dict]:
+        """Zdejmuje z kopca wspomnienie o najniższym aktualnym wyniku."""
+        heap = self._strength_heap
+        while heap:
+            score, memory_id, version = heapq.heappop(heap)
+            memory = self._memories.get(memory_id)
+            if memory is None or self._heap_versions.get(memory_id) != version:
+                continue  # Leniwe usuwanie - wpis zapomnianego lub nadpisanego wspomnienia
+            current = self._retention_score(memory)
+            if current != score:
+                # Wspomnienie zostało wzmocnione od czasu wpisu
+                heapq.heappush(heap, (current, memory_id, version))
+                continue
+            return memory
+        return None
+    
     def _forget_weakest(self):
         """Usuwa najsłabsze wspomnienia gdy przekroczona jest pojemność"""
-        if len(self.memories) <= self.capacity:
+        to_remove = len(self._memories) - self.capacity
+        if to_remove <= 0:
             return
         
-        # Znajdź wspomnienia do usunięcia
-        memories_with_strength = [
-            (m.get("strength", 0.5) * m.get("importance", 0.5), idx, m) 
-            for idx, m in enumerate(self.memories)
-        ]
-        memories_with_strength.sort(key=lambda x: x[0])
-        
-        # Usuń najsłabsze 10%
-        to_remove = len(self.memories) - self.capacity
-        indices_to_remove = set(idx for _, idx, _ in memories_with_strength[:to_remove])
-        
-        # Przebuduj pamięć bez usuniętych
-        new_memories = []
-        index_mapping = {}  # Stare indeksy -> nowe indeksy
-        
-        for old_idx, memory in enumerate(self.memories):
-            if old_idx not in indices_to_remove:
-                new_idx = len(new_memories)
-                index_mapping[old_idx] = new_idx
-                new_memories.append(memory)
-        
-        # Zaktualizuj powiązania
-        for memory in new_memories:
-            if "associations" in memory:
-                new_associations = []
-                for assoc in memory["associations"]:
-                    if assoc["memory_idx"] in index_mapping:
-                        assoc["memory_idx"] = index_mapping[assoc["memory_idx"]]
-                        new_associations.append(assoc)
-                memory["associations"] = new_associations
-        
-        # Przebuduj indeks
-        self.memories = new_memories
-        self._rebuild_index()
+        for _ in range(to_remove):
+            memory = self._pop_weakest()
+            if memory is None:
+                break
+            self._remove_memory(memory)
+        
+        # Nieaktualne wpisy nie mogą rosnąć bez końca
+        if len(self._strength_heap) > 2 * len(self._memories) + 64:
+            self._rebuild_strength_heap()
         
         logger.debug(f"Usunięto {to_remove} słabych wspomnień")
     
+    def _remove_memory(self, memory: Dict):
+        """Usuwa wspomnienie wraz z wpisami w indeksach i wzajemnymi powiązaniami."""
+        memory_id = memory["memory_id"]
+        del self._memories[memory_id]
+        self._heap_versions.pop(memory_id, None)
+        self._unindex_memory(memory)
+        for assoc in memory.get("associations", []):
+            linked = self._memories.get(assoc["memory_id"])
+            if linked is not None and "associations" in linked:
+                linked["associations"] = [a for a in linked["associations"]
+                                          if a["memory_id"] != memory_id]
+    
     def _rebuild_index(self):
-        """Przebudowuje indeks pamięci"""
+        """Przebudowuje indeksy pamięci i kopiec sił"""
         self.memory_index.clear()
+        for ids in self._unset_index.values():
+            ids.clear()
         
-        for idx, memory in enumerate(self.memories):
-            # Indeksuj według typu
-            self.memory_index[memory.get("event_type", "unknown")].append(idx)
-            
-            # Indeksuj według uczestników
-            for participant in memory.get("participants", []):
-                self.memory_index[f"participant_{participant}"].append(idx)
-            
-            # Indeksuj według lokacji
-            if "location" in memory:
-                self.memory_index[f"location_{memory['location']}"].append(idx)
+        for memory in self._memories.values():
+            self._index_memory(memory)
+        self._rebuild_strength_heap()
     
     def get_summary(self) -> Dict:
         """Zwraca podsumowanie stanu pamięci"""
-        current_time = time.time()
+        memories = self._memories.values()
         
         # Statystyki
-        total_memories = len(self.memories)
-        avg_strength = sum(m.get("strength", 0.5) for m in self.memories) / max(1, total_memories)
+        total_memories = len(self._memories)
+        avg_strength = sum(m.get("strength", 0.5) for m in memories) / max(1, total_memories)
         
         # Najczęstsze typy wydarzeń
         event_types = defaultdict(int)
-        for memory in self.memories:
+        for memory in memories:
             event_types[memory.get("event_type", "unknown")] += 1
         
         # Najważniejsze wspomnienia
-        important_memories = sorted(
-            self.memories,
-            key=lambda m: m.get("importance", 0.5) * m.get("strength", 0.5),
-            reverse=True
-        )[:5]
+        important_memories = heapq.nlargest(
+            5, memories,
+            key=lambda m: m.get("importance", 0.5) * m.get("strength", 0.5)
+        )
         
         return {
             "total_memories": total_memories,
@@ -357,44 +550,182 @@ class EpisodicMemory:
         }
 
 
+class MinHashLSH:
+    """Indeks MinHash/LSH dla zbiorów tokenów konceptów
+
+    Sygnatura MinHash ma bands * rows wartości. Koncepty trafiające do tego
+    samego kubełka w co najmniej jednym paśmie są kandydatami do porównania.
+    Para o podobieństwie Jaccarda J zostaje kandydatem z prawdopodobieństwem
+    1 - (1 - J^rows)^bands, więc wyszukiwanie jest przybliżone - pomija
+    część słabo podobnych par w zamian za krótsze listy kandydatów przy
+    bardzo dużej bazie wiedzy z popularnymi tokenami.
+    """
+
+    _PRIME = (1 << 61) - 1
+
+    def __init__(self, bands: int = 16, rows: int = 2, seed: int = 1):
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        self._hash_params = [(rng.randrange(1, self._PRIME), rng.randrange(0, self._PRIME))
+                             for _ in range(bands * rows)]
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [defaultdict(set) for _ in range(bands)]
+        self._keys: Dict[str, List[Tuple[int, ...]]] = {}
+
+    def signature(self, tokens: Set[str]) -> List[int]:
+        """Sygnatura MinHash zbioru tokenów (stabilna między uruchomieniami)."""
+        values = [zlib.crc32(token.encode("utf-8")) for token in tokens]
+        prime = self._PRIME
+        return [min((a * value + b) % prime for value in values) for a, b in self._hash_params]
+
+    def _band_keys(self, tokens: Set[str]) -> List[Tuple[int, ...]]:
+        signature = self.signature(tokens)
+        rows = self.rows
+        return [tuple(signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def add(self, key: str, tokens: Set[str]):
+        self.remove(key)
+        band_keys = self._band_keys(tokens)
+        for buckets, band_key in zip(self._buckets, band_keys):
+            buckets[band_key].add(key)
+        self._keys[key] = band_keys
+
+    def remove(self, key: str):
+        band_keys = self._keys.pop(key, None)
+        if band_keys is None:
+            return
+        for buckets, band_key in zip(self._buckets, band_keys):
+            bucket = buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del buckets[band_key]
+
+    def candidates(self, tokens: Set[str]) -> Set[str]:
+        """Klucze dzielące z tokenami kubełek w co najmniej jednym paśmie."""
+        found: Set[str] = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(tokens)):
+            bucket = buckets.get(band_key)
+            if bucket:
+                found.update(bucket)
+        return found
+
+    def clear(self):
+        for buckets in self._buckets:
+            buckets.clear()
+        self._keys.clear()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
 class SemanticMemory:
-    """System pamięci semantycznej - wiedza ogólna"""
+    """System pamięci semantycznej - wiedza ogólna
+
+    Podobieństwo konceptów to współczynnik Jaccarda tokenów nazwy (podział
+    po "_"), więc porównywane są tylko koncepty dzielące choć jeden token -
+    indeks odwrócony token -> koncepty. Dla bardzo dużych baz wiedzy
+    use_lsh=True zastępuje go przybliżonym indeksem MinHash/LSH.
+    """
     
-    def __init__(self):
+    # Ślady słabsze od progu są zapominane
+    EXPIRY_THRESHOLD = 0.01
+    
+    def __init__(self, use_lsh: bool = False, lsh_bands: int = 16, lsh_rows: int = 2):
         self.knowledge: Dict[str, MemoryTrace] = {}
         self.categories: Dict[str, List[str]] = defaultdict(list)
         self.relationships: Dict[str, Dict[str, float]] = defaultdict(dict)  # Relacje między konceptami
+        self._expiry = DecayQueue()  # Przewidywane momenty zapomnienia konceptów
+        self._token_index: Dict[str, Set[str]] = defaultdict(set)  # token -> koncepty
+        self._concept_tokens: Dict[str, Set[str]] = {}
+        self._concept_rank: Dict[str, int] = {}  # Kolejność dodania (rozstrzyga remisy)
+        self._next_rank = 0
+        self._lsh = MinHashLSH(lsh_bands, lsh_rows) if use_lsh else None
     
     def add_knowledge(self, concept: str, information: Any, category: str = "general", strength: float = 1.0):
         """Dodaje lub aktualizuje wiedzę"""
         if concept in self.knowledge:
             # Wzmocnij istniejącą wiedzę
-            self.knowledge[concept].strength = min(1.0, self.knowledge[concept].strength + 0.1)
+            self.knowledge[concept].reinforce(0.1)
             self.knowledge[concept].access()
         else:
             # Dodaj nową wiedzę
             self.knowledge[concept] = MemoryTrace(content=information, strength=strength)
             self.categories[category].append(concept)
+            self._index_concept(concept)
+        self._schedule_expiry(concept)
         
         # Znajdź powiązania z istniejącą wiedzą
         self._create_semantic_links(concept)
     
+    @staticmethod
+    def _tokens(concept: str) -> Set[str]:
+        return set(concept.lower().split("_"))
+    
+    def _index_concept(self, concept: str):
+        """Dopisuje koncept do indeksu tokenów (i LSH)."""
+        tokens = self._tokens(concept)
+        self._concept_tokens[concept] = tokens
+        self._concept_rank[concept] = self._next_rank
+        self._next_rank += 1
+        for token in tokens:
+            self._token_index[token].add(concept)
+        if self._lsh is not None:
+            self._lsh.add(concept, tokens)
+    
+    def _unindex_concept(self, concept: str):
+        """Usuwa koncept z indeksu tokenów (i LSH)."""
+        self._concept_rank.pop(concept, None)
+        for token in self._concept_tokens.pop(concept, ()):
+            concepts = self._token_index.get(token)
+            if concepts is not None:
+                concepts.discard(concept)
+                if not concepts:
+                    del self._token_index[token]
+        if self._lsh is not None:
+            self._lsh.remove(concept)
+    
+    def _sync_index(self):
+        """Indeksuje koncepty wstawione do knowledge z pominięciem add_knowledge."""
+        if len(self._concept_tokens) == len(self.knowledge):
+            return
+        for concept in [c for c in self._concept_tokens if c not in self.knowledge]:
+            self._unindex_concept(concept)
+        for concept in self.knowledge:
+            if concept not in self._concept_tokens:
+                self._index_concept(concept)
+    
+    def _candidates(self, concept: str) -> List[str]:
+        """Koncepty, które mogą mieć niezerowe podobieństwo (w kolejności dodania)."""
+        self._sync_index()
+        tokens = self._tokens(concept)
+        if self._lsh is not None:
+            found = self._lsh.candidates(tokens)
+        else:
+            found = set()
+            for token in tokens:
+                found.update(self._token_index.get(token, ()))
+        found.discard(concept)
+        return sorted(found, key=self._concept_rank.__getitem__)
+    
     def _create_semantic_links(self, concept: str):
         """Tworzy powiązania semantyczne"""
-        # Znajdź podobne koncepty
-        for other_concept in self.knowledge:
-            if other_concept != concept:
-                similarity = self._calculate_semantic_similarity(concept, other_concept)
-                if similarity > 0.3:
-                    self.relationships[concept][other_concept] = similarity
-                    self.relationships[other_concept][concept] = similarity
+        # Porównaj tylko z konceptami dzielącymi token (podobieństwo > 0)
+        tokens = self._tokens(concept)
+        for other_concept in self._candidates(concept):
+            similarity = self._jaccard(tokens, self._concept_tokens[other_concept])
+            if similarity > 0.3:
+                self.relationships[concept][other_concept] = similarity
+                self.relationships[other_concept][concept] = similarity
     
     def _calculate_semantic_similarity(self, concept1: str, concept2: str) -> float:
         """Oblicza podobieństwo semantyczne między konceptami"""
         # Proste podobieństwo oparte na wspólnych słowach
-        words1 = set(concept1.lower().split("_"))
-        words2 = set(concept2.lower().split("_"))
-        
+        return self._jaccard(self._tokens(concept1), self._tokens(concept2))
+    
+    @staticmethod
+    def _jaccard(words1: Set[str], words2: Set[str]) -> float:
+        """Współczynnik Jaccarda dwóch zbiorów tokenów"""
         if not words1 or not words2:
             return 0.0
         
@@ -455,13 +786,15 @@ class SemanticMemory:
 
         trace = self.knowledge[concept]
         trace.access()
+        self._schedule_expiry(concept)
 
         # Rozprzestrzenij aktywację na powiązane koncepty
         if spread_activation:
+            now = trace.last_access
             for related, strength in self.relationships[concept].items():
                 if related in self.knowledge:
-                    self.knowledge[related].strength = min(1.0,
-                        self.knowledge[related].strength + strength * 0.05)
+                    self.knowledge[related].reinforce(strength * 0.05, now)
+                    self._schedule_expiry(related)
 
         return trace.content
     
@@ -470,8 +803,9 @@ class SemanticMemory:
         best_match = None
         best_similarity = 0.0
         
-        for concept in self.knowledge:
-            similarity = self._calculate_semantic_similarity(query, concept)
+        tokens = self._tokens(query)
+        for concept in self._candidates(query):
+            similarity = self._jaccard(tokens, self._concept_tokens[concept])
             if similarity > best_similarity:
                 best_similarity = similarity
                 best_match = concept
@@ -491,25 +825,50 @@ class SemanticMemory:
         
         return related[:limit]
     
+    def _schedule_expiry(self, concept: str):
+        """Planuje zapomnienie konceptu na moment spadku siły poniżej progu."""
+        due = self.knowledge[concept].expiry_time(self.EXPIRY_THRESHOLD)
+        if due == float("inf"):
+            self._expiry.cancel(concept)
+        else:
+            self._expiry.schedule(concept, due)
+    
     def decay_all(self, current_time: float):
-        """Osłabia wszystkie ślady pamięciowe"""
-        for trace in self.knowledge.values():
-            trace.decay(current_time)
-        
-        # Usuń bardzo słabe ślady
-        to_remove = [k for k, v in self.knowledge.items() if v.strength < 0.01]
-        for concept in to_remove:
-            del self.knowledge[concept]
-            # Usuń z kategorii
-            for category, concepts in self.categories.items():
-                if concept in concepts:
-                    concepts.remove(concept)
-            # Usuń relacje
-            if concept in self.relationships:
-                del self.relationships[concept]
-            for relations in self.relationships.values():
-                if concept in relations:
-                    del relations[concept]
+        """Osłabia wszystkie ślady pamięciowe
+        
+        Zanik liczony jest leniwie przy odczycie (MemoryTrace.strength_at),
+        więc tutaj usuwane są tylko ślady z kolejki wygaśnięć, których
+        przewidywany czas już minął - bez przeglądania całej wiedzy.
+        """
+        # Ślady dodane z pominięciem add_knowledge (np. przy wczytywaniu)
+        if len(self._expiry) != len(self.knowledge):
+            for concept in self.knowledge:
+                if concept not in self._expiry:
+                    self._schedule_expiry(concept)
+        
+        for concept in self._expiry.pop_due(current_time):
+            trace = self.knowledge.get(concept)
+            if trace is None:
+                continue
+            if trace.strength_at(current_time) >= self.EXPIRY_THRESHOLD:
+                self._schedule_expiry(concept)  # Zaokrąglenia - jeszcze nie teraz
+                continue
+            self._forget_concept(concept)
+    
+    def _forget_concept(self, concept: str):
+        """Usuwa koncept razem z kategoriami i relacjami."""
+        del self.knowledge[concept]
+        self._expiry.cancel(concept)
+        self._unindex_concept(concept)
+        # Usuń z kategorii
+        for concepts in self.categories.values():
+            if concept in concepts:
+                concepts.remove(concept)
+        # Usuń relacje (są zapisywane w obu kierunkach)
+        for other in self.relationships.pop(concept, {}):
+            relations = self.relationships.get(other)
+            if relations is not None:
+                relations.pop(concept, None)
 
 
 class ProceduralMemory:
@@ -1018,7 +1377,7 @@ class IntegratedMemorySystem:
                 "capacity": self.episodic.capacity
             },
             "semantic": {
-                "knowledge": {k: {"content": v.content, "strength": v.strength} 
+                "knowledge": {k: {"content": v.content, "strength": v.strength_at(time.time())}
                             for k, v in self.semantic.knowledge.items()},
                 "categories": dict(self.semantic.categories),
                 "relationships": dict(self.semantic.relationships)
@@ -1051,7 +1410,6 @@ class IntegratedMemorySystem:
             # Odtwórz pamięć epizodyczną
             self.episodic.memories = state["episodic"]["memories"]
             self.episodic.capacity = state["episodic"]["capacity"]
-            self.episodic._rebuild_index()
             
             # Odtwórz pamięć semantyczną
             for concept, data in state["semantic"]["knowledge"].items():
@@ -1059,6 +1417,7 @@ class IntegratedMemorySystem:
                     content=data["content"],
                     strength=data["strength"]
                 )
+                self.semantic._schedule_expiry(concept)
             self.semantic.categories = defaultdict(list, state["semantic"]["categories"])
             self.semantic.relationships = defaultdict(dict, state["semantic"]["relationships"])
             
@@ -3,11 +3,13 @@ System zarządzania NPCami dla gry Droga Szamana RPG
 Kompletny manager z obsługą behavior trees, pamięci i stanów emocjonalnych
 """
 
+import heapq
 import json
 import random
 import time
+from itertools import repeat
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
@@ -15,6 +17,12 @@ import logging
 # Import systemów walki
 from mechanics.combat import CombatStats, Injury, BodyPart, DamageType, CombatAction, combat_system
 from player.skills import SkillSystem, SkillName
+from .spatial_index import LocationIndex, NPCRegistry
+from .simulation_lod import SimulationLOD, SimulationLODConfig, SimulationTier
+from .vectorized_state import NUMPY_AVAILABLE, NPCStateArrays, SoAField
+from .behavior_compiler import BehaviorTreeCache
+from .wake_scheduler import WakeScheduler
+from .memory_system import DecayQueue
 
 # Konfiguracja loggera - tylko poważne błędy
 logging.basicConfig(level=logging.ERROR)
@@ -80,6 +88,16 @@ class Memory:
         strength = self.importance * max(0.1, 1.0 - decay)
         return strength
 
+    def expiry_time(self, threshold: float) -> float:
+        """Moment, od którego siła wspomnienia nie przekracza progu (inf gdy nigdy)"""
+        if self.importance <= threshold:
+            return self.timestamp
+        ratio = threshold / self.importance
+        # Siła nie spada poniżej 10% ważności
+        if ratio < 0.1 or self.decay_rate <= 0:
+            return float("inf")
+        return self.timestamp + (1.0 - ratio) / self.decay_rate
+
 
 @dataclass
 class Relationship:
@@ -98,11 +116,12 @@ class Relationship:
         return (self.trust * 0.3 + self.affection * 0.3 + 
                 self.respect * 0.2 - self.fear * 0.2) * (self.familiarity / 100)
     
-    def update_from_interaction(self, interaction_type: str, intensity: float = 1.0):
+    def update_from_interaction(self, interaction_type: str, intensity: float = 1.0,
+                                current_time: Optional[float] = None):
         """Aktualizuje relację na podstawie interakcji"""
         self.interaction_count += 1
         self.familiarity = min(100, self.familiarity + 2)
-        self.last_interaction = time.time()
+        self.last_interaction = time.time() if current_time is None else current_time
         
         # Różne typy interakcji wpływają na różne aspekty relacji
         if interaction_type == "help":
@@ -139,20 +158,41 @@ class Goal:
     prerequisites: List[str] = field(default_factory=list)
     active: bool = True
     
-    def is_urgent(self, current_time: float) -> bool:
-        """Sprawdza czy cel jest pilny"""
+    def is_urgent(self, current_time: float, game_minute: float = 1.0) -> bool:
+        """Sprawdza czy cel jest pilny
+        
+        Args:
+            current_time: Bieżący czas (jednostki NPC._now())
+            game_minute: Minuta gry w tych jednostkach (NPC._game_minute())
+        """
         if not self.deadline:
             return False
-        return (self.deadline - current_time) < 3600  # Mniej niż godzina
+        # 3600 sekund przy time_scale=60 - 60 godzin gry
+        return (self.deadline - current_time) < 3600 * game_minute
 
 
 class NPC:
     """Klasa reprezentująca pojedynczego NPCa"""
     
+    # Pola, które mogą być widokami na NPCStateArrays managera
+    hunger = SoAField()
+    thirst = SoAField()
+    energy = SoAField()
+    max_energy = SoAField()
+    
+    # Zegar gry (core.game_clock.GameClock) podpinany przez NPCManager.set_clock;
+    # bez niego NPC żyje w czasie systemowym
+    clock = None
+    
     def __init__(self, npc_data: Dict):
         self.id = npc_data["id"]
         self.name = npc_data["name"]
         self.role = npc_data["role"]
+        # Indeks przestrzenny managera (podpinany przez NPCRegistry)
+        self._location_index = None
+        # Zwektoryzowany stan potrzeb/emocji (podpinany przez NPCStateArrays)
+        self._soa = None
+        self._soa_row = -1
         # Użyj spawn_location (polskie nazwy) jeśli istnieje, fallback na location
         self.location = npc_data.get("spawn_location", npc_data.get("location", "cela_1"))
         self.personality = npc_data["personality"]
@@ -161,7 +201,7 @@ class NPC:
         self.gold = npc_data.get("gold", 0)
         
         # Stan
-        self.current_state = NPCState.IDLE
+        self._current_state = NPCState.IDLE
         self.emotional_states = {
             EmotionalState.HAPPY: 0.0,
             EmotionalState.ANGRY: 0.0,
@@ -182,6 +222,8 @@ class NPC:
         
         # Zachowaj kompatybilność wsteczną
         self.episodic_memory: List[Memory] = []
+        self._memory_expiry = DecayQueue()  # Przewidywane momenty zapomnienia wspomnień
+        self._tracked_memories = 0  # Ile wspomnień z episodic_memory jest w kolejce wygaśnięć
         # semantic_memory jest teraz property wskazujące na memory.semantic
         self.procedural_memory: Dict[str, float] = {}  # Wyuczone zachowania
         self.emotional_memory: Dict[str, Dict[str, float]] = {}  # Emocje związane z miejscami/osobami
@@ -242,10 +284,55 @@ class NPC:
         self.behavior_tree = None
         
         # Ostatnia aktualizacja
-        self.last_update = time.time()
+        self.last_update = self._now()
 
         logger.info(f"NPC {self.name} zainicjalizowany")
 
+    def _now(self) -> float:
+        """Bieżący czas w sekundach (czas gry, gdy podpięty jest zegar)."""
+        clock = self.clock
+        return clock.time() if clock is not None else time.time()
+
+    def _game_minute(self) -> float:
+        """Minuta gry w jednostkach _now().
+
+        Stałe czasowe NPCa (zanik wspomnień, cooldowny dialogów, pilność
+        celów) są dobrane pod czas systemowy przy time_scale=60, gdzie
+        sekunda to minuta gry. Z zegarem _now() liczy sekundy gry.
+        """
+        return 60.0 if self.clock is not None else 1.0
+
+    def _hour_at(self, current_time: float) -> int:
+        """Godzina dnia dla czasu z _now()."""
+        if self.clock is not None:
+            return self.clock.hour_at(current_time)
+        return datetime.fromtimestamp(current_time).hour
+
+    @property
+    def location(self) -> str:
+        """Aktualna lokacja NPCa."""
+        return self._location
+
+    @location.setter
+    def location(self, value: str):
+        """Zmienia lokację i aktualizuje indeks przestrzenny managera."""
+        old_location = self.__dict__.get('_location')
+        self._location = value
+        if self._location_index is not None and old_location != value:
+            self._location_index.move(self.id, old_location, value)
+
+    @property
+    def current_state(self) -> NPCState:
+        """Aktualny stan aktywności NPCa."""
+        return self._current_state
+
+    @current_state.setter
+    def current_state(self, value: NPCState):
+        """Zmienia stan i aktualizuje kod stanu w NPCStateArrays."""
+        self._current_state = value
+        if self._soa is not None:
+            self._soa.state_code[self._soa_row] = self._soa.code_for_state(value)
+
     @property
     def current_location(self) -> str:
         """Alias dla self.location dla kompatybilności wstecznej."""
@@ -358,15 +445,29 @@ class NPC:
                 schedule[hour] = "socializing"
         return schedule
     
-    def update(self, delta_time: float, world_context: Dict):
-        """Aktualizuje stan NPCa"""
-        current_time = time.time()
+    def update(self, delta_time: float, world_context: Dict, needs_updated: bool = False,
+               wake_scheduler: Optional[WakeScheduler] = None,
+               current_time: Optional[float] = None):
+        """Aktualizuje stan NPCa
         
-        # Aktualizuj potrzeby fizjologiczne
-        self._update_needs(delta_time)
+        Args:
+            delta_time: Czas od ostatniej aktualizacji
+            world_context: Kontekst świata dla behavior tree
+            needs_updated: Potrzeby i emocje zostały już zaktualizowane
+                zbiorczo (NPCStateArrays.step)
+            wake_scheduler: Gdy podany, behavior tree jest wykonywane tylko
+                po wybudzeniu NPCa
+            current_time: Bieżący czas (domyślnie _now())
+        """
+        if current_time is None:
+            current_time = self._now()
         
-        # Aktualizuj stany emocjonalne
-        self._decay_emotions(delta_time)
+        if not needs_updated:
+            # Aktualizuj potrzeby fizjologiczne
+            self._update_needs(delta_time)
+            
+            # Aktualizuj stany emocjonalne
+            self._decay_emotions(delta_time)
         
         # Sprawdź harmonogram
         self._check_schedule(current_time)
@@ -379,8 +480,37 @@ class NPC:
         
         # Wykonaj behavior tree
         if self.behavior_tree:
-            self.behavior_tree.execute(self, world_context)
+            if wake_scheduler is None:
+                self.behavior_tree.execute(self, world_context)
+            elif wake_scheduler.should_run(self):
+                status = self.behavior_tree.execute(self, world_context)
+                wake_scheduler.after_run(self, status)
+        
+        self.last_update = current_time
+    
+    def catch_up(self, delta_time: float, current_time: Optional[float] = None,
+                 needs_updated: bool = False):
+        """Nadrabia zaległy czas w jednym kroku (NPC wchodzący do pełnej symulacji).
         
+        Potrzeby rosną/spadają liniowo z obcięciem, więc ich stan jest liczony
+        dokładnie jak suma pojedynczych ticków przy stałym stanie aktywności.
+        Emocje wygasają o łączny spadek i są normalizowane raz - to przybliżenie
+        wielu małych kroków. Behavior tree nie jest wykonywane.
+        
+        Args:
+            delta_time: Łączny zaległy czas
+            current_time: Bieżący czas (domyślnie _now())
+            needs_updated: Potrzeby i emocje zostały już nadrobione zbiorczo
+        """
+        if delta_time <= 0:
+            return
+        if current_time is None:
+            current_time = self._now()
+        
+        if not needs_updated:
+            self._update_needs(delta_time)
+            self._decay_emotions(delta_time)
+        self._check_schedule(current_time)
         self.last_update = current_time
     
     def _update_needs(self, delta_time: float):
@@ -421,7 +551,7 @@ class NPC:
     
     def _check_schedule(self, current_time: float):
         """Sprawdza i aktualizuje aktywność według harmonogramu"""
-        current_hour = datetime.fromtimestamp(current_time).hour
+        current_hour = self._hour_at(current_time)
         
         # Dodaj losową wariację do harmonogramu
         if random.random() < self.schedule_variation:
@@ -446,25 +576,58 @@ class NPC:
             if new_state != self.current_state:
                 self.change_state(new_state)
     
+    # Wspomnienia o sile nie większej niż próg są zapominane
+    MEMORY_EXPIRY_THRESHOLD = 0.05
+    MEMORY_LIMIT = 1000
+
+    def _schedule_memory_expiry(self, memory: Memory):
+        """Wstawia wspomnienie do kolejki wygaśnięć (jeśli kiedykolwiek wygaśnie)."""
+        due = memory.expiry_time(self.MEMORY_EXPIRY_THRESHOLD)
+        if due != float("inf"):
+            self._memory_expiry.schedule(id(memory), due, memory)
+
     def _process_memories(self, current_time: float):
-        """Przetwarza i konsoliduje wspomnienia"""
+        """Przetwarza i konsoliduje wspomnienia
+
+        Siła wspomnienia jest liczona w formie zamkniętej (get_current_strength),
+        więc zamiast sprawdzać każde wspomnienie co tick zdejmujemy z kolejki
+        tylko te, których przewidywany moment wygaśnięcia już minął.
+        """
+        if len(self.episodic_memory) != self._tracked_memories:
+            # Lista zmieniona z pominięciem add_memory - zaplanuj od nowa
+            self._memory_expiry.clear()
+            for memory in self.episodic_memory:
+                self._schedule_memory_expiry(memory)
+
         # Usuń bardzo słabe wspomnienia
-        self.episodic_memory = [
-            mem for mem in self.episodic_memory 
-            if mem.get_current_strength(current_time) > 0.05
-        ]
-        
-        # Ogranicz liczbę wspomnień do 1000
-        if len(self.episodic_memory) > 1000:
-            # Zachowaj tylko najważniejsze
-            self.episodic_memory.sort(key=lambda m: m.get_current_strength(current_time), reverse=True)
-            self.episodic_memory = self.episodic_memory[:1000]
+        expired = set()
+        for memory in self._memory_expiry.pop_due(current_time):
+            if memory.get_current_strength(current_time) > self.MEMORY_EXPIRY_THRESHOLD:
+                self._schedule_memory_expiry(memory)  # Zaokrąglenia - jeszcze nie teraz
+            else:
+                expired.add(id(memory))
+        if expired:
+            self.episodic_memory = [mem for mem in self.episodic_memory if id(mem) not in expired]
+
+        # Ogranicz liczbę wspomnień do MEMORY_LIMIT
+        excess = len(self.episodic_memory) - self.MEMORY_LIMIT
+        if excess > 0:
+            # Zachowaj tylko najważniejsze (przy remisie odpadają nowsze)
+            weakest = heapq.nsmallest(
+                excess, range(len(self.episodic_memory)),
+                key=lambda i: (self.episodic_memory[i].get_current_strength(current_time), -i))
+            dropped = set(weakest)
+            for i in dropped:
+                self._memory_expiry.cancel(id(self.episodic_memory[i]))
+            self.episodic_memory = [mem for i, mem in enumerate(self.episodic_memory) if i not in dropped]
+
+        self._tracked_memories = len(self.episodic_memory)
     
     def _update_goals(self, current_time: float):
         """Aktualizuje cele NPCa"""
         # Sortuj cele według priorytetu i pilności
         self.goals.sort(key=lambda g: (
-            g.priority * (2.0 if g.is_urgent(current_time) else 1.0),
+            g.priority * (2.0 if g.is_urgent(current_time, self._game_minute()) else 1.0),
             g.completion
         ), reverse=True)
         
@@ -520,17 +683,21 @@ class NPC:
             emotional_impact = {}
         
         memory = Memory(
-            timestamp=time.time(),
+            timestamp=self._now(),
             event_type=event_type,
             description=description,
             participants=participants,
             location=location,
             importance=importance,
             emotional_impact=emotional_impact,
-            decay_rate=0.01 / max(0.1, importance)  # Ważniejsze wspomnienia wolniej zanikają
+            # Ważniejsze wspomnienia wolniej zanikają (0.01 na minutę gry przy ważności 1)
+            decay_rate=0.01 / max(0.1, importance) / self._game_minute()
         )
         
         self.episodic_memory.append(memory)
+        if self._tracked_memories == len(self.episodic_memory) - 1:
+            self._tracked_memories += 1
+            self._schedule_memory_expiry(memory)
         
         # Aktualizuj pamięć emocjonalną
         for participant in participants:
@@ -553,7 +720,7 @@ class NPC:
                        time_range: Optional[Tuple[float, float]] = None,
                        limit: int = 10) -> List[Memory]:
         """Przywołuje wspomnienia według kryteriów"""
-        current_time = time.time()
+        current_time = self._now()
         relevant_memories = []
         
         for memory in self.episodic_memory:
@@ -586,7 +753,7 @@ class NPC:
     def interact_with(self, target_id: str, interaction_type: str, intensity: float = 1.0):
         """Przeprowadza interakcję z inną postacią"""
         relationship = self.get_relationship(target_id)
-        relationship.update_from_interaction(interaction_type, intensity)
+        relationship.update_from_interaction(interaction_type, intensity, self._now())
         
         # Zapisz jako wspomnienie
         emotional_impact = {}
@@ -610,7 +777,7 @@ class NPC:
     
     def get_dialogue(self, context: Dict) -> Optional[str]:
         """Wybiera odpowiedni dialog na podstawie kontekstu"""
-        current_time = time.time()
+        current_time = self._now()
         emotion = self.get_dominant_emotion()
         
         # Określ kategorię dialogu
@@ -642,7 +809,7 @@ class NPC:
             dialogue_category = f"{dialogue_category}_sad"
         
         # Uwzględnij porę dnia
-        hour = datetime.fromtimestamp(current_time).hour
+        hour = self._hour_at(current_time)
         if 22 <= hour or hour < 6:
             dialogue_category = f"{dialogue_category}_night"
         elif 6 <= hour < 12:
@@ -673,7 +840,7 @@ class NPC:
         for dialogue in dialogues:
             dialogue_id = f"{dialogue_category}_{dialogues.index(dialogue)}"
             if dialogue_id not in self.dialogue_cooldowns or \
-               current_time - self.dialogue_cooldowns[dialogue_id] > 300:  # 5 minut cooldown
+               current_time - self.dialogue_cooldowns[dialogue_id] > 300 * self._game_minute():  # 5 godzin gry
                 available_dialogues.append((dialogue_id, dialogue))
         
         if not available_dialogues:
@@ -688,7 +855,9 @@ class NPC:
         
         # Zastąp zmienne w dialogu
         dialogue = dialogue.replace("{player_name}", context.get("player_name", "nieznajomy"))
-        dialogue = dialogue.replace("{time}", datetime.fromtimestamp(current_time).strftime("%H:%M"))
+        minute = int(current_time // 60) % 60 if self.clock is not None else \
+            datetime.fromtimestamp(current_time).minute
+        dialogue = dialogue.replace("{time}", f"{self._hour_at(current_time):02d}:{minute:02d}")
         dialogue = dialogue.replace("{location}", self.location)
         
         return dialogue
@@ -1056,13 +1225,42 @@ class NPCManager:
     """Manager zarządzający wszystkimi NPCami"""
     
     def __init__(self, data_file: str = "data/npc_complete.json"):
-        self.npcs: Dict[str, NPC] = {}
+        # Indeks lokacja -> NPCe, utrzymywany przy każdym ruchu NPCa
+        self.location_index = LocationIndex()
+        self.npcs: Dict[str, NPC] = NPCRegistry(self.location_index)
         self.data_file = data_file
         self.world_events: List[Dict] = []
-        self.time_scale = 60  # 1 sekunda = 1 minuta w grze
+        self.time_scale = 60  # 1 sekunda = 1 minuta w grze (tylko bez zegara gry)
+        self.clock = None  # Opcjonalny zegar gry (core.game_clock.GameClock)
         self.last_update = time.time()
         self.economy = None  # Opcjonalna referencja do systemu ekonomii
 
+        # Interakcje społeczne
+        self.interaction_cap: Optional[int] = None  # Limit interakcji na lokację na tick
+        self.interaction_seed: Optional[int] = None
+        self._interaction_rng: Optional[random.Random] = None
+
+        # Poziomy szczegółowości symulacji - aktywne gdy znana jest lokacja gracza
+        self.lod = SimulationLOD()
+        self.player_location: Optional[str] = None
+        self.world_locations: Optional[Dict[str, Any]] = None  # id -> Location
+
+        # Opcjonalny zwektoryzowany stan potrzeb i emocji (NumPy)
+        self.state_arrays: Optional[NPCStateArrays] = None
+        self._state_arrays_version = -1
+
+        # Skompilowane behavior trees współdzielone przez NPCów o tej samej
+        # roli i osobowości (z pamięcią warunków w obrębie ticku)
+        self.behavior_trees = BehaviorTreeCache()
+
+        # Opcjonalne budzenie NPCów zdarzeniami (drzewo tylko po wybudzeniu)
+        self.wake_scheduler: Optional[WakeScheduler] = None
+        self._wake_version = -1
+        self._wake_player_location: Optional[str] = None
+
+        # Opcjonalny profiler ticku (core.profiler.TickProfiler)
+        self.profiler = None
+
         # Wczytaj NPCów
         self.load_npcs()
         
@@ -1070,14 +1268,18 @@ class NPCManager:
     
     def load_npcs(self):
         """Wczytuje NPCów z pliku"""
+        # Import leniwy - core importuje npcs przy starcie
+        from core.data_loader import data_loader, thaw
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Współdzielony widok pliku (parsowany raz na proces)
+            data = data_loader.load_file(self.data_file)
             
             # Nowa struktura - NPCs są w słowniku, nie liście
             npcs_data = data.get("npcs", {})
             
-            for npc_id, npc_data in npcs_data.items():
+            for npc_id, npc_view in npcs_data.items():
+                # NPC modyfikuje swoje dane (ekwipunek, cele) - własna kopia
+                npc_data = thaw(npc_view)
                 # Upewnij się że ID jest ustawione
                 npc_data["id"] = npc_id
                 
@@ -1094,14 +1296,15 @@ class NPCManager:
                     npc_data["intelligence"] = stats.get("intelligence", 50)
                 
                 npc = NPC(npc_data)
+                if self.clock is not None:
+                    npc.clock = self.clock
                 self.npcs[npc.id] = npc
                 
-                # Przypisz behavior tree
-                from .ai_behaviors import create_behavior_tree
-                npc.behavior_tree = create_behavior_tree(npc.role, npc.personality)
+                # Przypisz (współdzielone, skompilowane) behavior tree
+                npc.behavior_tree = self.behavior_trees.get(npc.role, npc.personality)
             
             # Załaduj też schedule templates jeśli są
-            self.schedule_templates = data.get("schedule_templates", {})
+            self.schedule_templates = thaw(data.get("schedule_templates", {}))
             logger.info(f"Załadowano {len(self.schedule_templates)} szablonów harmonogramów")
                 
         except FileNotFoundError:
@@ -1113,17 +1316,23 @@ class NPCManager:
     
     def update(self, delta_time=None, world_context=None):
         """Aktualizuje wszystkie NPCe"""
-        current_time = time.time()
+        clock = self.clock
+        current_time = self._now()
         
-        # Użyj przekazane parametry lub oblicz domyślne
+        # Użyj przekazane parametry lub oblicz domyślne (w sekundach gry)
         if delta_time is None:
-            delta_time = (current_time - self.last_update) * self.time_scale
+            if clock is not None:
+                delta_time = max(0.0, current_time - self.last_update)
+            else:
+                delta_time = (current_time - self.last_update) * self.time_scale
         
         # Przygotuj kontekst świata jeśli nie został przekazany
         if world_context is None:
             world_context = {
                 "time": current_time,
-                "hour": datetime.fromtimestamp(current_time).hour,
+                "game_minute": 60.0 if clock is not None else 1.0,  # ai_behaviors.context_minute
+                "hour": clock.hour_at(current_time) if clock is not None
+                        else datetime.fromtimestamp(current_time).hour,
                 "npcs": self.npcs,
                 "events": self.world_events[-10:],  # Ostatnie 10 wydarzeń
             }
@@ -1135,9 +1344,18 @@ class NPCManager:
                 "global_events": self.economy.global_events[-5:] if hasattr(self.economy, 'global_events') else []
             }
         
-        # Aktualizuj każdego NPCa
-        for npc in self.npcs.values():
-            npc.update(delta_time, world_context)
+        wake = self._begin_wake_tick(world_context)
+        
+        # Aktualizuj NPCów - pełna symulacja tylko blisko gracza
+        with self.behavior_trees.memo.tick():
+            if self.lod.config.enabled and self.player_location is not None:
+                self._update_with_lod(delta_time, world_context, current_time)
+            else:
+                arrays = self._synced_state_arrays()
+                if arrays is not None:
+                    arrays.step(delta_time)
+                self._update_npcs(self.npcs.values(), delta_time, world_context,
+                                  arrays is not None, wake)
         
         # Przetwórz interakcje między NPCami
         self._process_npc_interactions()
@@ -1148,8 +1366,254 @@ class NPCManager:
         
         self.last_update = current_time
     
+    def _update_npcs(self, npcs: Any, delta_time: Union[float, List[float]], world_context: Dict,
+                     needs_updated: bool, wake: Optional[WakeScheduler]):
+        """Pełny NPC.update dla NPCów (z pomiarem czasu w próbkowanych tickach).
+        
+        Args:
+            delta_time: Wspólny czas albo lista czasów - po jednym na NPCa
+                (jak NPCStateArrays.step)
+        """
+        deltas = delta_time if isinstance(delta_time, list) else repeat(delta_time)
+        profiler = self.profiler
+        if profiler is None or not profiler.sampling:
+            for npc, delta in zip(npcs, deltas):
+                npc.update(delta, world_context, needs_updated=needs_updated, wake_scheduler=wake)
+            return
+        perf_counter = time.perf_counter
+        for npc, delta in zip(npcs, deltas):
+            start = perf_counter()
+            npc.update(delta, world_context, needs_updated=needs_updated, wake_scheduler=wake)
+            profiler.record_npc(npc.id, perf_counter() - start)
+
+    def set_clock(self, clock: Any):
+        """Podpina zegar gry (lub None - czas systemowy) do managera i NPCów.
+        
+        Z zegarem NPCe czytają czas gry: harmonogramy, wspomnienia i cele
+        płyną z prędkością symulacji, a nie zegara systemowego.
+        """
+        self.clock = clock
+        self.npcs.clock = clock
+        for npc in self.npcs.values():
+            npc.clock = clock
+        self.last_update = self._now()
+    
+    def _now(self) -> float:
+        """Bieżący czas w sekundach (czas gry, gdy podpięty jest zegar)."""
+        clock = self.clock
+        return clock.time() if clock is not None else time.time()
+    
+    def attach_profiler(self, profiler: Any):
+        """Podpina profiler ticku (lub None) do managera i behavior trees."""
+        self.profiler = profiler
+        self.behavior_trees.set_profiler(profiler)
+
+    def configure_lod(self, **settings):
+        """Zmienia ustawienia poziomów symulacji (pola SimulationLODConfig).
+        
+        Przykład: manager.configure_lod(reduced_interval=10, coarse_interval=60)
+        """
+        for key, value in settings.items():
+            if not hasattr(self.lod.config, key):
+                raise ValueError(f"Nieznane ustawienie LOD: {key}")
+            setattr(self.lod.config, key, value)
+        self.lod.invalidate()
+    
+    def _location_neighbors(self, location_id: str) -> List[str]:
+        """Zwraca sąsiadów lokacji z mapy świata (Location.get_neighbors)."""
+        if not self.world_locations:
+            return []
+        location = self.world_locations.get(location_id)
+        if location is None:
+            return []
+        return list(location.get_neighbors().values())
+    
+    def _update_with_lod(self, delta_time: float, world_context: Dict, current_time: float):
+        """Aktualizuje NPCów według poziomów szczegółowości.
+        
+        FULL: lokacja gracza i sąsiednie - pełny NPC.update co tick.
+        REDUCED: dalsze lokacje - co reduced_interval ticków pełny NPC.update
+        z zaległym czasem (jeden większy krok zamiast kilku małych).
+        COARSE: odległe regiony i lokacje spoza mapy - co coarse_interval
+        ticków pełny NPC.update wszystkich NPCów lokacji naraz.
+        
+        NPCe poza FULL wciąż działają (harmonogram, behavior tree, ruch),
+        tylko rzadziej i grubszym krokiem czasu.
+        """
+        lod = self.lod
+        lod.begin_tick(self.player_location, self._location_neighbors)
+        tier_counts = lod.tier_counts
+        
+        full_npcs = []
+        due = []  # (NPC, zaległy czas)
+        for npc_id, npc in self.npcs.items():
+            location = npc.location
+            tier = lod.tier_for(location)
+            tier_counts[tier] += 1
+            
+            if tier == SimulationTier.FULL:
+                pending = lod.take_pending(npc_id)
+                if pending:
+                    npc.catch_up(pending, current_time)
+                full_npcs.append(npc)
+                continue
+            
+            lod.defer(npc_id, delta_time)
+            if lod.is_due(tier, npc_id, location):
+                due.append((npc, lod.take_pending(npc_id)))
+        
+        arrays = self._synced_state_arrays()
+        if arrays is not None:
+            if full_npcs:
+                arrays.step(delta_time, arrays.rows_of(full_npcs))
+            if due:
+                arrays.step([pending for _, pending in due],
+                            arrays.rows_of(npc for npc, _ in due))
+        
+        vectorized = arrays is not None
+        wake = self.wake_scheduler
+        self._update_npcs(full_npcs, delta_time, world_context, vectorized, wake)
+        if due:
+            self._update_npcs([npc for npc, _ in due], [pending for _, pending in due],
+                              world_context, vectorized, wake)
+    
+    def enable_vectorized_state(self) -> bool:
+        """Przenosi potrzeby i emocje NPCów do tablic NumPy (struct-of-arrays).
+        
+        Atrybuty hunger/thirst/energy/emotional_states NPCów stają się widokami
+        na tablice, a update aktualizuje wszystkich NPCów kilkoma operacjami
+        wektorowymi zamiast pętli po obiektach.
+        
+        Returns:
+            True jeśli włączono, False gdy NumPy nie jest dostępne
+        """
+        if not NUMPY_AVAILABLE:
+            logger.warning("NumPy niedostępne - stan NPCów pozostaje skalarny")
+            return False
+        if self.state_arrays is None:
+            self.state_arrays = NPCStateArrays(EmotionalState, NPCState,
+                                               capacity=max(64, len(self.npcs)))
+            self._state_arrays_version = -1
+        self._synced_state_arrays()
+        return True
+    
+    def disable_vectorized_state(self):
+        """Przywraca skalarny stan NPCów (wartości są kopiowane z tablic)."""
+        if self.state_arrays is not None:
+            self.state_arrays.detach_all()
+            self.state_arrays = None
+    
+    def _synced_state_arrays(self) -> Optional[NPCStateArrays]:
+        """Zwraca tablice stanu dopasowane do aktualnego składu NPCów."""
+        arrays = self.state_arrays
+        if arrays is not None and self._state_arrays_version != self.npcs.version:
+            arrays.sync(self.npcs)
+            self._state_arrays_version = self.npcs.version
+        return arrays
+    
+    def enable_wakeups(self, event_bus: Any = None, **settings) -> WakeScheduler:
+        """Włącza budzenie NPCów zdarzeniami zamiast wykonywania drzew co tick.
+        
+        Args:
+            event_bus: Opcjonalny EventBus - walka, ruch i śmierć w lokacji
+                NPCa budzą go w następnym ticku
+            **settings: Parametry WakeScheduler (max_dormant_ticks, need_thresholds)
+        
+        Returns:
+            Aktywny WakeScheduler
+        """
+        self.disable_wakeups()
+        self.wake_scheduler = WakeScheduler(self.location_index, **settings)
+        self._wake_version = -1
+        self._wake_player_location = None
+        if event_bus is not None:
+            self.wake_scheduler.attach_event_bus(event_bus)
+        return self.wake_scheduler
+    
+    def disable_wakeups(self):
+        """Przywraca wykonywanie behavior tree każdego NPCa w każdym ticku."""
+        if self.wake_scheduler is not None:
+            self.wake_scheduler.detach_event_bus()
+            self.wake_scheduler = None
+    
+    def _begin_wake_tick(self, world_context: Dict) -> Optional[WakeScheduler]:
+        """Synchronizuje WakeScheduler z NPCami i budzi zależnych od godziny i gracza."""
+        wake = self.wake_scheduler
+        if wake is None:
+            return None
+        if self._wake_version != self.npcs.version:
+            wake.sync(self.npcs)
+            self._wake_version = self.npcs.version
+        wake.begin_tick(world_context.get("hour"))
+        
+        # Gracz wszedł lub wyszedł - zmienia się wynik sees_player
+        if self.player_location != self._wake_player_location:
+            wake.wake_location(self._wake_player_location)
+            wake.wake_location(self.player_location)
+            self._wake_player_location = self.player_location
+        return wake
+    
+    def set_interaction_seed(self, seed: Optional[int]):
+        """Włącza tryb deterministyczny interakcji NPCów.
+        
+        Z ustawionym seedem interakcje losują z własnego generatora,
+        niezależnego od reszty gry, więc ten sam seed daje te same wyniki.
+        
+        Args:
+            seed: Seed generatora lub None aby wrócić do globalnego random
+        """
+        self.interaction_seed = seed
+        self._interaction_rng = random.Random(seed) if seed is not None else None
+    
     def _process_npc_interactions(self):
-        """Przetwarza automatyczne interakcje między NPCami"""
+        """Przetwarza automatyczne interakcje między NPCami
+        
+        NPCe w stanie SOCIALIZING/IDLE są najpierw grupowane po lokacjach,
+        a pary tworzone są tylko wewnątrz grupy - koszt to O(n) plus liczba
+        faktycznych interakcji. Kolejność par jest identyczna jak w pełnej
+        pętli po wszystkich parach, więc wyniki (również losowe) się zgadzają.
+        """
+        rng = self._interaction_rng or random
+        
+        initiators = []
+        groups: Dict[str, List[NPC]] = {}
+        for npc in self.npcs.values():
+            state = npc.current_state
+            if state == NPCState.SOCIALIZING:
+                initiators.append(npc)
+                groups.setdefault(npc.location, []).append(npc)
+            elif state == NPCState.IDLE:
+                groups.setdefault(npc.location, []).append(npc)
+        
+        cap = self.interaction_cap
+        interactions_per_location: Dict[str, int] = {}
+        
+        for npc1 in initiators:
+            location = npc1.location
+            partners = groups[location]
+            if len(partners) < 2:
+                continue
+            
+            for npc2 in partners:
+                if npc2 is npc1:
+                    continue
+                
+                if cap is not None:
+                    done = interactions_per_location.get(location, 0)
+                    if done >= cap:
+                        break
+                    interactions_per_location[location] = done + 1
+                
+                # Deterministycznie wywołuj interakcję gdy NPCe spełniają warunki
+                self._simulate_npc_interaction(npc1, npc2, rng)
+    
+    def _process_npc_interactions_pairwise(self):
+        """Referencyjna pętla po wszystkich parach NPCów - O(n²).
+        
+        Zachowana do testów zgodności i benchmarków.
+        """
+        rng = self._interaction_rng or random
+        
         for npc1_id, npc1 in self.npcs.items():
             if npc1.current_state != NPCState.SOCIALIZING:
                 continue
@@ -1166,24 +1630,26 @@ class NPCManager:
                 if npc2.current_state not in [NPCState.SOCIALIZING, NPCState.IDLE]:
                     continue
 
-                # Deterministycznie wywołuj interakcję gdy NPCe spełniają warunki
-                self._simulate_npc_interaction(npc1, npc2)
+                self._simulate_npc_interaction(npc1, npc2, rng)
     
-    def _simulate_npc_interaction(self, npc1: NPC, npc2: NPC):
+    def _simulate_npc_interaction(self, npc1: NPC, npc2: NPC, rng=None):
         """Symuluje interakcję między dwoma NPCami"""
+        if rng is None:
+            rng = random
+        
         relationship1 = npc1.get_relationship(npc2.id)
         relationship2 = npc2.get_relationship(npc1.id)
         
         # Określ typ interakcji na podstawie relacji
         if relationship1.get_overall_disposition() > 30:
             # Przyjazna interakcja
-            if random.random() < 0.7:
+            if rng.random() < 0.7:
                 interaction_type = "friendly_chat"
             else:
                 interaction_type = "help"
         elif relationship1.get_overall_disposition() < -30:
             # Wroga interakcja
-            if random.random() < 0.8:
+            if rng.random() < 0.8:
                 interaction_type = "insult"
             else:
                 interaction_type = "threat"
@@ -1201,39 +1667,51 @@ class NPCManager:
             "participants": [npc1.id, npc2.id],
             "interaction_type": interaction_type,
             "location": npc1.location,
-            "timestamp": time.time()
-        })
+            "timestamp": self._now()
+        }, rng)
         
         logger.debug(f"Interakcja: {npc1.name} -> {interaction_type} -> {npc2.name}")
     
-    def add_world_event(self, event: Dict):
+    def add_world_event(self, event: Dict, rng=None):
         """Dodaje wydarzenie do historii świata"""
+        if rng is None:
+            rng = random
         self.world_events.append(event)
         
+        if self.wake_scheduler is not None:
+            self.wake_scheduler.on_world_event(event)
+        
         # Powiadom NPCów w pobliżu
-        for npc in self.npcs.values():
-            if npc.location == event.get("location"):
-                # NPC może zapamiętać wydarzenie
-                if random.random() < 0.5:  # 50% szans na zapamiętanie
-                    importance = 0.2
-                    if npc.id in event.get("participants", []):
-                        importance = 0.5
-                    
-                    npc.add_memory(
-                        event_type=f"witnessed_{event['type']}",
-                        description=f"Był świadkiem: {event.get('description', event['type'])}",
-                        participants=event.get("participants", []),
-                        location=event.get("location", "unknown"),
-                        importance=importance
-                    )
+        for npc in self.get_npcs_in_location(event.get("location")):
+            # NPC może zapamiętać wydarzenie
+            if rng.random() < 0.5:  # 50% szans na zapamiętanie
+                importance = 0.2
+                if npc.id in event.get("participants", []):
+                    importance = 0.5
+                
+                npc.add_memory(
+                    event_type=f"witnessed_{event['type']}",
+                    description=f"Był świadkiem: {event.get('description', event['type'])}",
+                    participants=event.get("participants", []),
+                    location=event.get("location", "unknown"),
+                    importance=importance
+                )
     
     def get_npc(self, npc_id: str) -> Optional[NPC]:
         """Zwraca NPCa po ID"""
         return self.npcs.get(npc_id)
     
     def get_npcs_in_location(self, location: str) -> List[NPC]:
-        """Zwraca listę NPCów w danej lokacji"""
-        return [npc for npc in self.npcs.values() if npc.location == location]
+        """Zwraca listę NPCów w danej lokacji (z indeksu przestrzennego)"""
+        return self.npcs.in_location(location)
+    
+    def check_location_index(self) -> List[str]:
+        """Sprawdza spójność indeksu przestrzennego z lokacjami NPCów.
+        
+        Returns:
+            Lista niespójności (pusta gdy indeks jest poprawny)
+        """
+        return self.location_index.check_consistency(self.npcs)
     
     def player_interact(self, player_id: str, npc_id: str, action: str, **kwargs) -> Dict:
         """Obsługuje interakcję gracza z NPCem"""
@@ -1294,7 +1772,7 @@ class NPCManager:
                 "participants": [player_id, npc_id],
                 "location": npc.location,
                 "description": f"{player_id} zaatakował {npc.name}",
-                "timestamp": time.time()
+                "timestamp": self._now()
             })
             
             result["success"] = True
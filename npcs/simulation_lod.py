@@ -0,0 +1,125 @@
+"""
+Poziomy szczegółowości (LOD) symulacji NPCów dla gry Droga Szamana RPG
+NPCe blisko gracza są symulowane w pełni, dalsi rzadziej i w uproszczeniu
+"""
+
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class SimulationTier(Enum):
+    """Poziom szczegółowości symulacji NPCa"""
+    FULL = "full"          # Pełny NPC.update co tick
+    REDUCED = "reduced"    # Pełny NPC.update co kilka ticków, z zaległym czasem
+    COARSE = "coarse"      # Odległe regiony, rzadkie zbiorcze kroki całej lokacji
+
+
+@dataclass
+class SimulationLODConfig:
+    """Ustawienia poziomów symulacji.
+
+    Promienie liczone są w przejściach między lokacjami od lokacji gracza
+    (0 = lokacja gracza, 1 = sąsiedzi z Location.get_neighbors).
+    """
+    enabled: bool = True
+    full_radius: int = 1
+    reduced_radius: int = 3
+    reduced_interval: int = 5    # Co ile ticków aktualizować tier REDUCED
+    coarse_interval: int = 30    # Co ile ticków aktualizować tier COARSE
+
+
+class SimulationLOD:
+    """Przydziela NPCów do poziomów symulacji i liczy zaległy czas.
+
+    NPCe poza pełnym poziomem są aktualizowani rzadziej - ich czas jest
+    akumulowany i oddawany w jednym pełnym NPC.update. Tick, w którym dany
+    NPC (REDUCED) lub dana lokacja (COARSE) jest aktualizowana, jest
+    rozłożony stabilnym hashem, żeby koszt nie kumulował się w jednym ticku.
+    """
+
+    def __init__(self, config: Optional[SimulationLODConfig] = None):
+        self.config = config or SimulationLODConfig()
+        self.tick = 0
+        self._distances: Dict[str, int] = {}
+        self._origin: Optional[str] = None
+        self._pending: Dict[str, float] = {}
+        self.tier_counts: Dict[SimulationTier, int] = {tier: 0 for tier in SimulationTier}
+
+    def begin_tick(self, player_location: str,
+                   neighbors: Callable[[str], Iterable[str]]):
+        """Rozpoczyna tick - przelicza odległości gdy gracz zmienił lokację."""
+        self.tick += 1
+        self.tier_counts = {tier: 0 for tier in SimulationTier}
+        if player_location != self._origin:
+            self._origin = player_location
+            self._distances = self._bfs(player_location, neighbors,
+                                        max(self.config.full_radius, self.config.reduced_radius))
+
+    def invalidate(self):
+        """Wymusza przeliczenie odległości (np. po zmianie mapy)."""
+        self._origin = None
+
+    def _bfs(self, start: str, neighbors: Callable[[str], Iterable[str]],
+             max_depth: int) -> Dict[str, int]:
+        """Odległości w przejściach od start, do max_depth włącznie."""
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            location = queue.popleft()
+            depth = distances[location]
+            if depth >= max_depth:
+                continue
+            for neighbor in neighbors(location):
+                if neighbor not in distances:
+                    distances[neighbor] = depth + 1
+                    queue.append(neighbor)
+        return distances
+
+    def tier_for(self, location: str) -> SimulationTier:
+        """Zwraca poziom symulacji dla lokacji."""
+        distance = self._distances.get(location)
+        if distance is None:
+            return SimulationTier.COARSE
+        if distance <= self.config.full_radius:
+            return SimulationTier.FULL
+        if distance <= self.config.reduced_radius:
+            return SimulationTier.REDUCED
+        return SimulationTier.COARSE
+
+    def defer(self, npc_id: str, delta_time: float):
+        """Odkłada czas NPCa do późniejszego nadrobienia."""
+        self._pending[npc_id] = self._pending.get(npc_id, 0.0) + delta_time
+
+    def take_pending(self, npc_id: str) -> float:
+        """Zwraca i zeruje zaległy czas NPCa."""
+        return self._pending.pop(npc_id, 0.0)
+
+    def pending_time(self, npc_id: str) -> float:
+        """Zwraca zaległy czas NPCa bez zerowania."""
+        return self._pending.get(npc_id, 0.0)
+
+    def is_due(self, tier: SimulationTier, npc_id: str, location: str) -> bool:
+        """Sprawdza czy w tym ticku należy nadrobić NPCa z danego poziomu."""
+        if tier == SimulationTier.REDUCED:
+            interval, key = self.config.reduced_interval, npc_id
+        else:
+            # Cały region nadrabiany razem - jeden zbiorczy krok na lokację
+            interval, key = self.config.coarse_interval, location
+        if interval <= 1:
+            return True
+        return (self.tick + zlib.crc32(key.encode('utf-8'))) % interval == 0
+
+    def forget(self, npc_id: str):
+        """Usuwa zaległy czas usuniętego NPCa."""
+        self._pending.pop(npc_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statystyki ostatniego ticku."""
+        return {
+            "tick": self.tick,
+            "tiers": {tier.value: count for tier, count in self.tier_counts.items()},
+            "pending_npcs": len(self._pending),
+        }
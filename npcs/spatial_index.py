@@ -0,0 +1,216 @@
+"""
+Indeks przestrzenny NPCów dla gry Droga Szamana RPG
+Utrzymuje mapowanie lokacja -> zbiór NPCów aktualizowane przy każdym ruchu
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+class LocationIndex:
+    """Indeks lokacja -> zbiór ID NPCów.
+
+    Zapytania kosztują tyle, ilu jest mieszkańców lokacji, a nie tyle,
+    ilu NPCów jest w całym świecie. Indeks jest aktualizowany przez
+    setter NPC.location (i alias current_location).
+    """
+
+    def __init__(self):
+        self._by_location: Dict[str, Set[str]] = {}
+        self._location_of: Dict[str, str] = {}
+        # Kolejność rejestracji - zapytania zwracają NPCów w tej samej
+        # kolejności co iteracja po słowniku managera (ważne dla RNG)
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+
+    def add(self, npc: Any, order: Optional[int] = None):
+        """Rejestruje NPCa w indeksie i podpina się pod jego ruchy.
+
+        Args:
+            npc: NPC do zarejestrowania
+            order: Pozycja w kolejności iteracji (domyślnie na końcu)
+        """
+        self.remove(npc.id)
+        if order is None:
+            order = self._next_order
+        self._next_order = max(self._next_order, order + 1)
+        location = npc.location
+        self._by_location.setdefault(location, set()).add(npc.id)
+        self._location_of[npc.id] = location
+        self._order[npc.id] = order
+        npc._location_index = self
+
+    def remove(self, npc_id: str):
+        """Usuwa NPCa z indeksu (brak NPCa nie jest błędem)."""
+        location = self._location_of.pop(npc_id, None)
+        if location is None:
+            return
+        self._order.pop(npc_id, None)
+        occupants = self._by_location.get(location)
+        if occupants is not None:
+            occupants.discard(npc_id)
+            if not occupants:
+                del self._by_location[location]
+
+    def move(self, npc_id: str, old_location: str, new_location: str):
+        """Przenosi NPCa między lokacjami - O(1)."""
+        occupants = self._by_location.get(old_location)
+        if occupants is not None:
+            occupants.discard(npc_id)
+            if not occupants:
+                del self._by_location[old_location]
+        self._by_location.setdefault(new_location, set()).add(npc_id)
+        self._location_of[npc_id] = new_location
+
+    def clear(self):
+        """Czyści indeks."""
+        self._by_location.clear()
+        self._location_of.clear()
+        self._order.clear()
+        self._next_order = 0
+
+    def ids_in(self, location: str) -> List[str]:
+        """Zwraca ID NPCów w lokacji w kolejności rejestracji."""
+        occupants = self._by_location.get(location)
+        if not occupants:
+            return []
+        return sorted(occupants, key=self._order.__getitem__)
+
+    def count_in(self, location: str) -> int:
+        """Zwraca liczbę NPCów w lokacji."""
+        return len(self._by_location.get(location, _EMPTY))
+
+    def order_of(self, npc_id: str) -> Optional[int]:
+        """Zwraca pozycję NPCa w kolejności rejestracji."""
+        return self._order.get(npc_id)
+
+    def location_of(self, npc_id: str) -> Optional[str]:
+        """Zwraca lokację NPCa według indeksu."""
+        return self._location_of.get(npc_id)
+
+    def occupied_locations(self) -> List[str]:
+        """Zwraca listę lokacji, w których ktoś przebywa."""
+        return list(self._by_location.keys())
+
+    def __len__(self) -> int:
+        return len(self._location_of)
+
+    def check_consistency(self, npcs: Dict[str, Any]) -> List[str]:
+        """Porównuje indeks z faktycznymi lokacjami NPCów.
+
+        Args:
+            npcs: Słownik npc_id -> NPC, który indeks powinien odzwierciedlać
+
+        Returns:
+            Lista opisów niespójności (pusta gdy indeks jest poprawny)
+        """
+        errors = []
+
+        for npc_id, npc in npcs.items():
+            if getattr(npc, 'id', npc_id) != npc_id:
+                errors.append(f"{npc_id}: klucz różny od npc.id={npc.id}")
+            indexed = self._location_of.get(npc_id)
+            if indexed is None:
+                errors.append(f"{npc_id}: brak w indeksie")
+                continue
+            if indexed != npc.location:
+                errors.append(f"{npc_id}: indeks={indexed}, faktycznie={npc.location}")
+            if npc_id not in self._by_location.get(indexed, _EMPTY):
+                errors.append(f"{npc_id}: brak w zbiorze lokacji {indexed}")
+            if getattr(npc, '_location_index', None) is not self:
+                errors.append(f"{npc_id}: NPC nie jest podpięty pod ten indeks")
+
+        for npc_id in self._location_of:
+            if npc_id not in npcs:
+                errors.append(f"{npc_id}: w indeksie, ale nie w managerze")
+
+        for location, occupants in self._by_location.items():
+            if not occupants:
+                errors.append(f"{location}: pusty zbiór w indeksie")
+            for npc_id in occupants:
+                if self._location_of.get(npc_id) != location:
+                    errors.append(f"{npc_id}: zbiór {location} niezgodny z mapą odwrotną")
+
+        return errors
+
+
+_EMPTY: frozenset = frozenset()
+
+
+class NPCRegistry(dict):
+    """Słownik npc_id -> NPC, który synchronizuje LocationIndex.
+
+    Kod gry dodaje NPCów bezpośrednio (np. ``manager.npcs["rat_1"] = rat``),
+    więc to słownik musi pilnować indeksu, a nie tylko load_npcs.
+    Z tego samego powodu podpina dodawanym NPCom zegar gry managera.
+    """
+
+    def __init__(self, index: LocationIndex, *args, **kwargs):
+        super().__init__()
+        self.index = index
+        self.clock = None  # Zegar gry managera (NPCManager.set_clock)
+        # Licznik zmian składu - pozwala innym strukturom wykryć dodanie/usunięcie NPCa
+        self.version = 0
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, npc_id: str, npc: Any):
+        order = None
+        if npc_id in self:
+            # Nadpisanie klucza zachowuje pozycję w dict - w indeksie też
+            order = self.index.order_of(npc_id)
+            self._detach(npc_id, super().__getitem__(npc_id))
+        super().__setitem__(npc_id, npc)
+        if self.clock is not None:
+            npc.clock = self.clock
+        self.index.add(npc, order)
+        self.version += 1
+
+    def __delitem__(self, npc_id: str):
+        npc = self[npc_id]
+        super().__delitem__(npc_id)
+        self._detach(npc_id, npc)
+
+    def pop(self, npc_id: str, *default):
+        if npc_id not in self:
+            if default:
+                return default[0]
+            raise KeyError(npc_id)
+        npc = super().pop(npc_id)
+        self._detach(npc_id, npc)
+        return npc
+
+    def popitem(self):
+        npc_id, npc = super().popitem()
+        self._detach(npc_id, npc)
+        return npc_id, npc
+
+    def setdefault(self, npc_id: str, npc: Any = None):
+        if npc_id not in self:
+            self[npc_id] = npc
+        return self[npc_id]
+
+    def update(self, *args, **kwargs):
+        for npc_id, npc in dict(*args, **kwargs).items():
+            self[npc_id] = npc
+
+    def clear(self):
+        for npc in self.values():
+            if getattr(npc, '_location_index', None) is self.index:
+                npc._location_index = None
+        super().clear()
+        self.index.clear()
+        self.version += 1
+
+    def _detach(self, npc_id: str, npc: Any):
+        self.version += 1
+        self.index.remove(npc_id)
+        if getattr(npc, '_location_index', None) is self.index:
+            npc._location_index = None
+
+    def in_location(self, location: str) -> List[Any]:
+        """Zwraca NPCów w lokacji na podstawie indeksu."""
+        return [self[npc_id] for npc_id in self.index.ids_in(location)]
+
+    def iter_in_location(self, location: str) -> Iterable[Any]:
+        """Iteruje po NPCach w lokacji bez budowania listy."""
+        for npc_id in self.index.ids_in(location):
+            yield self[npc_id]
@@ -0,0 +1,298 @@
+"""
+Zwektoryzowany stan potrzeb i emocji NPCów (NumPy struct-of-arrays)
+Opcjonalny - gdy NumPy nie jest zainstalowane, NPCe używają ścieżki skalarnej
+"""
+
+import importlib.util
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, List
+
+# NumPy importowane leniwie (pierwsze NPCStateArrays) - sam import to
+# kilkadziesiąt ms startu gry, a tryb zwektoryzowany jest opcjonalny
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+np = None
+
+
+def _import_numpy():
+    """Importuje NumPy przy pierwszym użyciu."""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+
+# Kody stanów aktywności istotne dla zużycia energii
+STATE_SLEEPING = 0
+STATE_EXERTING = 1   # WORKING, PATROLLING
+STATE_OTHER = 2
+
+
+class SoAField:
+    """Deskryptor pola NPCa: wartość z NPCStateArrays gdy NPC jest podpięty,
+    w przeciwnym razie zwykły atrybut instancji."""
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        self.slot = '_' + name
+
+    def __get__(self, npc, owner=None):
+        if npc is None:
+            return self
+        store = npc.__dict__.get('_soa')
+        if store is not None:
+            return float(getattr(store, self.name)[npc._soa_row])
+        try:
+            return npc.__dict__[self.slot]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, npc, value):
+        store = npc.__dict__.get('_soa')
+        if store is not None:
+            getattr(store, self.name)[npc._soa_row] = value
+        else:
+            npc.__dict__[self.slot] = value
+
+
+class EmotionRowView(MutableMapping):
+    """Słownik EmotionalState -> float będący widokiem na wiersz macierzy emocji.
+
+    Podmienia NPC.emotional_states na czas podpięcia do NPCStateArrays,
+    więc istniejący kod (modify_emotion, behavior trees) działa bez zmian.
+    """
+
+    __slots__ = ('_store', '_npc')
+
+    def __init__(self, store: 'NPCStateArrays', npc: Any):
+        self._store = store
+        self._npc = npc
+
+    def __getitem__(self, emotion) -> float:
+        column = self._store.emotion_columns.get(emotion)
+        if column is None:
+            raise KeyError(emotion)
+        return float(self._store.emotions[self._npc._soa_row, column])
+
+    def __setitem__(self, emotion, value: float):
+        column = self._store.emotion_columns.get(emotion)
+        if column is None:
+            raise KeyError(emotion)
+        self._store.emotions[self._npc._soa_row, column] = value
+
+    def __delitem__(self, emotion):
+        raise TypeError("Nie można usuwać emocji z widoku NPCStateArrays")
+
+    def __iter__(self):
+        return iter(self._store.emotion_order)
+
+    def __len__(self) -> int:
+        return len(self._store.emotion_order)
+
+    def __contains__(self, emotion) -> bool:
+        return emotion in self._store.emotion_columns
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class NPCStateArrays:
+    """Struct-of-arrays dla hunger/thirst/energy i emocji wszystkich NPCów.
+
+    NPC po podpięciu (attach) czyta i zapisuje te pola przez widoki na
+    wiersz ``npc._soa_row``, a manager aktualizuje wszystkich NPCów kilkoma
+    operacjami na tablicach (step). Wyniki odpowiadają NPC._update_needs
+    i NPC._decay_emotions z dokładnością do błędu zmiennoprzecinkowego.
+    """
+
+    def __init__(self, emotion_enum: Any, state_enum: Any, capacity: int = 64):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NPCStateArrays wymaga pakietu numpy")
+        _import_numpy()
+
+        self.emotion_order: List[Any] = list(emotion_enum)
+        self.emotion_columns: Dict[Any, int] = {e: i for i, e in enumerate(self.emotion_order)}
+        self.neutral_column = self.emotion_columns[emotion_enum.NEUTRAL]
+        self.angry_column = self.emotion_columns[emotion_enum.ANGRY]
+        self.sad_column = self.emotion_columns[emotion_enum.SAD]
+        self.state_codes: Dict[Any, int] = {
+            state_enum.SLEEPING: STATE_SLEEPING,
+            state_enum.WORKING: STATE_EXERTING,
+            state_enum.PATROLLING: STATE_EXERTING,
+        }
+
+        self.size = 0
+        self.capacity = 0
+        self.npcs: List[Any] = []
+        self.hunger = np.zeros(0)
+        self.thirst = np.zeros(0)
+        self.energy = np.zeros(0)
+        self.max_energy = np.zeros(0)
+        self.state_code = np.zeros(0, dtype=np.int8)
+        self.emotions = np.zeros((0, len(self.emotion_order)))
+        self._grow(max(1, capacity))
+
+    def _grow(self, capacity: int):
+        """Powiększa tablice, zachowując istniejące wiersze."""
+        for name in ('hunger', 'thirst', 'energy', 'max_energy', 'state_code', 'emotions'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return self.size
+
+    def code_for_state(self, state: Any) -> int:
+        """Kod stanu aktywności dla tablicy state_code."""
+        return self.state_codes.get(state, STATE_OTHER)
+
+    # ========== PODPINANIE NPCÓW ==========
+
+    def attach(self, npc: Any):
+        """Przenosi stan NPCa do tablic i podmienia jego pola na widoki."""
+        if getattr(npc, '_soa', None) is self:
+            return
+        if self.size == self.capacity:
+            self._grow(self.capacity * 2)
+
+        row = self.size
+        self.hunger[row] = npc.hunger
+        self.thirst[row] = npc.thirst
+        self.energy[row] = npc.energy
+        self.max_energy[row] = npc.max_energy
+        self.state_code[row] = self.code_for_state(npc.current_state)
+        self.emotions[row] = 0.0
+        for emotion, value in npc.emotional_states.items():
+            column = self.emotion_columns.get(emotion)
+            if column is not None:
+                self.emotions[row, column] = value
+
+        self.npcs.append(npc)
+        self.size += 1
+        npc._soa_row = row
+        npc._soa = self
+        npc.emotional_states = EmotionRowView(self, npc)
+
+    def detach(self, npc: Any):
+        """Kopiuje stan z powrotem do NPCa i usuwa jego wiersz (swap-remove)."""
+        if getattr(npc, '_soa', None) is not self:
+            return
+        row = npc._soa_row
+
+        # Zapisz wartości skalarne zanim wiersz zniknie
+        values = {
+            'hunger': float(self.hunger[row]),
+            'thirst': float(self.thirst[row]),
+            'energy': float(self.energy[row]),
+            'max_energy': float(self.max_energy[row]),
+        }
+        emotions = {e: float(self.emotions[row, i]) for i, e in enumerate(self.emotion_order)}
+
+        last = self.size - 1
+        if row != last:
+            moved = self.npcs[last]
+            for array in (self.hunger, self.thirst, self.energy, self.max_energy,
+                          self.state_code, self.emotions):
+                array[row] = array[last]
+            self.npcs[row] = moved
+            moved._soa_row = row
+        self.npcs.pop()
+        self.size -= 1
+
+        npc._soa = None
+        npc._soa_row = -1
+        for name, value in values.items():
+            setattr(npc, name, value)
+        npc.emotional_states = emotions
+
+    def sync(self, npcs: Dict[str, Any]):
+        """Dopasowuje zawartość tablic do słownika NPCów managera."""
+        current = set(map(id, npcs.values()))
+        for npc in list(self.npcs):
+            if id(npc) not in current:
+                self.detach(npc)
+        for npc in npcs.values():
+            self.attach(npc)
+
+    def detach_all(self):
+        """Odpina wszystkich NPCów (przywraca ścieżkę skalarną)."""
+        for npc in list(self.npcs):
+            self.detach(npc)
+
+    def rows_of(self, npcs: Iterable[Any]):
+        """Tablica indeksów wierszy dla podanych NPCów."""
+        return np.fromiter((npc._soa_row for npc in npcs), dtype=np.intp)
+
+    # ========== AKTUALIZACJA ==========
+
+    def step(self, delta_time, rows=None):
+        """Aktualizuje potrzeby, wpływ potrzeb na emocje i wygaszanie emocji.
+
+        Odpowiednik NPC._update_needs + NPC._decay_emotions dla wielu NPCów.
+
+        Args:
+            delta_time: Czas (skalar lub tablica - osobno dla każdego wiersza)
+            rows: Indeksy wierszy do aktualizacji (domyślnie wszystkie)
+        """
+        if rows is None:
+            rows = slice(0, self.size)
+        elif len(rows) == 0:
+            return
+        dt = np.asarray(delta_time, dtype=np.float64)
+
+        hunger = np.minimum(100.0, self.hunger[rows] + dt * 0.01)
+        thirst = np.minimum(100.0, self.thirst[rows] + dt * 0.02)
+        self.hunger[rows] = hunger
+        self.thirst[rows] = thirst
+
+        energy = self.energy[rows]
+        codes = self.state_code[rows]
+        energy = np.where(
+            codes == STATE_SLEEPING,
+            np.minimum(self.max_energy[rows], energy + dt * 0.05),
+            np.maximum(0.0, energy - dt * np.where(codes == STATE_EXERTING, 0.02, 0.01))
+        )
+        self.energy[rows] = energy
+
+        emotions = self.emotions[rows]
+        angry, sad = self.angry_column, self.sad_column
+
+        # Potrzeby wpływają na emocje (ta sama kolejność co w _update_needs)
+        hungry = hunger > 80
+        if hungry.any():
+            self._modify(emotions, hungry, angry, 0.1)
+            self._modify(emotions, hungry, sad, 0.05)
+        tired = energy < 20
+        if tired.any():
+            self._modify(emotions, tired, sad, 0.1)
+
+        # Wygaszanie emocji
+        neutral = self.neutral_column
+        decay = np.broadcast_to(dt * 0.01, hunger.shape)[:, None]
+        neutral_values = emotions[:, neutral].copy()
+        emotions = np.maximum(0.0, emotions - decay)
+        emotions[:, neutral] = neutral_values
+        self._normalize(emotions, reset_empty=True)
+
+        self.emotions[rows] = emotions
+
+    def _modify(self, emotions, mask, column: int, intensity: float):
+        """Zwektoryzowane NPC.modify_emotion dla wierszy z maski."""
+        neutral = self.neutral_column
+        emotions[mask, column] = np.minimum(1.0, emotions[mask, column] + intensity)
+        emotions[mask, neutral] = np.maximum(0.0, emotions[mask, neutral] - intensity * 0.5)
+        subset = emotions[mask]
+        self._normalize(subset, reset_empty=False)
+        emotions[mask] = subset
+
+    def _normalize(self, emotions, reset_empty: bool):
+        """Normalizuje wiersze do sumy 1 (puste wiersze -> NEUTRAL gdy reset_empty)."""
+        totals = emotions.sum(axis=1)
+        positive = totals > 0
+        emotions[positive] /= totals[positive, None]
+        if reset_empty:
+            empty = ~positive
+            if empty.any():
+                emotions[empty, self.neutral_column] = 1.0
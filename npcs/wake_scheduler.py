@@ -0,0 +1,245 @@
+"""
+Budzenie NPCów zdarzeniami dla gry Droga Szamana RPG
+Behavior tree NPCa jest wykonywane tylko gdy zajdzie coś, co może zmienić
+jego decyzję - zamiast odpytywania wszystkich drzew w każdym ticku
+"""
+
+from bisect import bisect_right
+from collections import Counter
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class WakeReason(Enum):
+    """Powód wykonania behavior tree NPCa"""
+    NEW = "new"                # Pierwszy tick NPCa w harmonogramie
+    SCHEDULE = "schedule"      # Granica godzin w harmonogramie NPCa
+    NEED = "need"              # Potrzeba przekroczyła próg
+    STATE = "state"            # Zmiana stanu aktywności (np. przez _check_schedule)
+    EVENT = "event"            # Walka, ruch lub wydarzenie świata w lokacji NPCa
+    RUNNING = "running"        # Drzewo zwróciło RUNNING - kontynuacja w następnym ticku
+    TIMEOUT = "timeout"        # Zabezpieczenie - zbyt długo bez wykonania
+
+
+# Progi potrzeb, na których zmieniają się warunki w behavior trees
+# (is_hungry > 60, is_starving > 90, is_tired < 30, about_to_collapse < 5...)
+DEFAULT_NEED_THRESHOLDS: Dict[str, Tuple[float, ...]] = {
+    "hunger": (30, 35, 40, 60, 80, 90),
+    "thirst": (60,),
+    "energy": (5, 20, 30, 40),
+}
+
+# Kategorie event_bus budzące NPCów w lokacji zdarzenia
+WAKE_CATEGORIES = ("combat", "movement", "death")
+
+# Typy wydarzeń NPCManager.add_world_event, na które reagują behavior trees
+# (is_under_attack, someone_needs_help...). Zwykłe rozmowy NPCów nie budzą.
+WAKE_WORLD_EVENT_TYPES = frozenset({
+    "attack", "combat", "fight", "death", "escape", "alarm", "fire", "help_request",
+})
+
+
+def schedule_boundaries(schedule: Dict[int, str]) -> List[int]:
+    """Godziny, w których zmienia się aktywność z harmonogramu NPCa."""
+    return [hour for hour in range(24)
+            if schedule.get(hour, "idle") != schedule.get((hour - 1) % 24, "idle")]
+
+
+class _WakeEntry:
+    """Stan NPCa zapamiętany przy ostatnim wykonaniu drzewa"""
+    __slots__ = ('last_run', 'bands', 'state', 'hours')
+
+    def __init__(self, hours: List[int]):
+        self.last_run = -1
+        self.bands: Tuple[int, ...] = ()
+        self.state = None
+        self.hours = hours
+
+
+class WakeScheduler:
+    """Decyduje, którzy NPCe wykonują behavior tree w danym ticku.
+
+    NPC po wykonaniu drzewa przechodzi w stan uśpienia i czeka na jedno
+    z wybudzeń: granicę godzin swojego harmonogramu, przekroczenie progu
+    potrzeby, zmianę stanu aktywności, zdarzenie w swojej lokacji (walka,
+    ruch - z event_bus lub NPCManager.add_world_event) albo upływ
+    max_dormant_ticks. Potrzeby, harmonogram i pamięć są dalej
+    aktualizowane co tick - pomijane jest tylko drzewo.
+    """
+
+    def __init__(self, location_index: Any, max_dormant_ticks: int = 30,
+                 need_thresholds: Optional[Dict[str, Tuple[float, ...]]] = None):
+        self.location_index = location_index
+        self.max_dormant_ticks = max_dormant_ticks
+        self.need_thresholds = dict(need_thresholds or DEFAULT_NEED_THRESHOLDS)
+        self._need_names = tuple(self.need_thresholds)
+
+        self.tick = 0
+        self._hour: Optional[int] = None
+        self._entries: Dict[str, _WakeEntry] = {}
+        self._by_hour: Dict[int, Set[str]] = {}
+        self._pending: Dict[str, WakeReason] = {}
+        self._event_bus = None
+
+        self.runs = 0
+        self.skips = 0
+        self.wakes: Counter = Counter()
+
+    # ========== REJESTRACJA ==========
+
+    def register(self, npc: Any):
+        """Rejestruje NPCa i jego godziny wybudzeń z harmonogramu."""
+        self.forget(npc.id)
+        hours = schedule_boundaries(npc.schedule) if isinstance(getattr(npc, 'schedule', None), dict) else []
+        self._entries[npc.id] = _WakeEntry(hours)
+        for hour in hours:
+            self._by_hour.setdefault(hour, set()).add(npc.id)
+        self._pending[npc.id] = WakeReason.NEW
+
+    def forget(self, npc_id: str):
+        """Usuwa NPCa z harmonogramu wybudzeń."""
+        entry = self._entries.pop(npc_id, None)
+        self._pending.pop(npc_id, None)
+        if entry is None:
+            return
+        for hour in entry.hours:
+            sleepers = self._by_hour.get(hour)
+            if sleepers is not None:
+                sleepers.discard(npc_id)
+                if not sleepers:
+                    del self._by_hour[hour]
+
+    def sync(self, npcs: Dict[str, Any]):
+        """Dopasowuje zarejestrowanych NPCów do słownika managera."""
+        for npc_id in [npc_id for npc_id in self._entries if npc_id not in npcs]:
+            self.forget(npc_id)
+        for npc_id, npc in npcs.items():
+            if npc_id not in self._entries:
+                self.register(npc)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ========== WYBUDZENIA ==========
+
+    def wake(self, npc_id: str, reason: WakeReason = WakeReason.EVENT):
+        """Oznacza NPCa do wykonania drzewa w najbliższym ticku."""
+        if npc_id in self._entries and npc_id not in self._pending:
+            self._pending[npc_id] = reason
+
+    def wake_many(self, npc_ids: Iterable[str], reason: WakeReason = WakeReason.EVENT):
+        for npc_id in npc_ids:
+            self.wake(npc_id, reason)
+
+    def wake_location(self, location: Optional[str], reason: WakeReason = WakeReason.EVENT):
+        """Budzi wszystkich NPCów przebywających w lokacji."""
+        if location:
+            self.wake_many(self.location_index.ids_in(location), reason)
+
+    def on_world_event(self, event: Dict[str, Any]):
+        """Budzi uczestników i świadków istotnego wydarzenia świata."""
+        if event.get("type") not in WAKE_WORLD_EVENT_TYPES:
+            return
+        self.wake_many(event.get("participants", []))
+        self.wake_location(event.get("location"))
+
+    def begin_tick(self, hour: Optional[int] = None):
+        """Rozpoczyna tick - budzi NPCów, których harmonogram zmienia się o tej godzinie.
+
+        Args:
+            hour: Bieżąca godzina gry (world_context["hour"]); przeskoczone
+                godziny też budzą NPCów
+        """
+        self.tick += 1
+        if hour is None:
+            return
+        previous, self._hour = self._hour, hour
+        if previous is None or previous == hour:
+            return
+        steps = (hour - previous) % 24
+        for offset in range(1, steps + 1):
+            self.wake_many(self._by_hour.get((previous + offset) % 24, ()), WakeReason.SCHEDULE)
+
+    def _bands(self, npc: Any) -> Tuple[int, ...]:
+        """Indeksy przedziałów progowych dla potrzeb NPCa."""
+        thresholds = self.need_thresholds
+        return tuple(bisect_right(thresholds[name], getattr(npc, name, 0))
+                     for name in self._need_names)
+
+    def should_run(self, npc: Any) -> bool:
+        """Czy NPC ma w tym ticku wykonać behavior tree."""
+        npc_id = npc.id
+        entry = self._entries.get(npc_id)
+        if entry is None:
+            self.register(npc)
+            reason = self._pending.pop(npc_id)
+        elif npc_id in self._pending:
+            reason = self._pending.pop(npc_id)
+        elif self._bands(npc) != entry.bands:
+            reason = WakeReason.NEED
+        elif npc.current_state != entry.state:
+            # Porównanie ze stanem sprzed poprzedniego wykonania drzewa - zmiany
+            # wprowadzone przez samo drzewo nie budzą NPCa ponownie
+            reason = WakeReason.STATE
+        elif self.tick - entry.last_run >= self.max_dormant_ticks:
+            reason = WakeReason.TIMEOUT
+        else:
+            self.skips += 1
+            return False
+        entry = self._entries[npc_id]
+        entry.state = npc.current_state
+        self.runs += 1
+        self.wakes[reason] += 1
+        return True
+
+    def after_run(self, npc: Any, status: Any):
+        """Zapamiętuje stan NPCa po wykonaniu drzewa (punkt odniesienia dla wybudzeń)."""
+        entry = self._entries.get(npc.id)
+        if entry is None:
+            return
+        entry.last_run = self.tick
+        entry.bands = self._bands(npc)
+        if getattr(status, 'value', None) == "running":
+            self._pending[npc.id] = WakeReason.RUNNING
+
+    # ========== EVENT BUS ==========
+
+    def attach_event_bus(self, event_bus: Any):
+        """Subskrybuje kategorie event_bus, które budzą NPCów (walka, ruch, śmierć)."""
+        from core.event_bus import EventCategory
+        self.detach_event_bus()
+        for category in WAKE_CATEGORIES:
+            event_bus.subscribe_category(EventCategory(category), self.on_game_event)
+        self._event_bus = event_bus
+
+    def detach_event_bus(self):
+        """Anuluje subskrypcje event_bus."""
+        if self._event_bus is None:
+            return
+        from core.event_bus import EventCategory
+        for category in WAKE_CATEGORIES:
+            self._event_bus.unsubscribe_category(EventCategory(category), self.on_game_event)
+        self._event_bus = None
+
+    def on_game_event(self, event: Any):
+        """Handler event_bus - budzi uczestników i NPCów z lokacji zdarzenia."""
+        data = event.data if isinstance(event.data, dict) else {}
+        locations = {data.get("location"), data.get("from"), data.get("to")}
+        for entity in (event.source, event.target):
+            if entity:
+                self.wake(entity)
+                locations.add(self.location_index.location_of(entity))
+        for location in locations:
+            self.wake_location(location)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statystyki wykonania drzew."""
+        total = self.runs + self.skips
+        return {
+            "tick": self.tick,
+            "npcs": len(self._entries),
+            "runs": self.runs,
+            "skips": self.skips,
+            "run_ratio": self.runs / total if total else 0.0,
+            "wakes": {reason.value: count for reason, count in self.wakes.items()},
+        }
@@ -1,15 +1,91 @@
-"""System zarządzania zapisami gry."""
+"""System zarządzania zapisami gry.
+
+Slot to pełny snapshot (slot_N.sav.gz) i dziennik zmian (slot_N.wal).
+Zapis przyrostowy (save_delta) dzieli stan gry na rekordy - np. jedno
+pole jednego NPCa - i dopisuje do dziennika tylko rekordy zmienione od
+poprzedniego zapisu. Każdy wpis dziennika ma własną sumę SHA-256, więc
+urwany ostatni wpis (awaria w trakcie zapisu) jest przy wczytywaniu
+pomijany. Co COMPACT_EVERY delt dziennik jest kompaktowany do nowego
+snapshotu.
+"""
 
 import json
 import os
+import re
 import gzip
 import hashlib
 import shutil
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Callable, Iterator, Optional, List, Tuple
 from datetime import datetime
 from dataclasses import dataclass, asdict
 
 
+RecordPath = Tuple[str, ...]
+
+# slot_{slot}_backup_{YYYYmmdd_HHMMSS}{.sav.gz|.sav|.meta|.wal}
+_BACKUP_NAME = re.compile(r'slot_(\d+)_backup_(\d{8}_\d{6})\.')
+
+
+def _json_key(key: Any) -> str:
+    """Klucz słownika tak, jak zapisze go JSON."""
+    return key if isinstance(key, str) else json.dumps(key)
+
+
+def _flatten_records(data: Dict[str, Any], depth: int,
+                     path: RecordPath = ()) -> Iterator[Tuple[RecordPath, Any]]:
+    """Dzieli stan zapisu na rekordy (ścieżka kluczy -> wartość) do zadanej głębokości."""
+    for key, value in data.items():
+        record_path = path + (_json_key(key),)
+        if isinstance(value, dict) and value and len(record_path) < depth:
+            yield from _flatten_records(value, depth, record_path)
+        else:
+            yield record_path, value
+
+
+def _snapshot_records(save_data: Dict[str, Any], depth: int) -> Dict[RecordPath, Tuple[bytes, str]]:
+    """Rekordy stanu: ścieżka -> (skrót, zwarty JSON wartości)."""
+    records = {}
+    for path, value in _flatten_records(save_data, depth):
+        text = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+        records[path] = (hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest(), text)
+    return records
+
+
+def _delete_record(data: Dict[str, Any], path: List[str]):
+    """Usuwa rekord razem z pustymi już słownikami nadrzędnymi."""
+    parents = []
+    target = data
+    for key in path[:-1]:
+        child = target.get(key)
+        if not isinstance(child, dict):
+            return
+        parents.append((target, key))
+        target = child
+    target.pop(path[-1], None)
+    while parents and not target:
+        parent, key = parents.pop()
+        del parent[key]
+        target = parent
+
+
+def _no_progress(stage: str, fraction: float):
+    pass
+
+
+def _apply_delta(data: Dict[str, Any], delta: Dict[str, Any]):
+    """Nakłada wpis dziennika na stan zapisu (najpierw usunięcia, potem zmiany)."""
+    for path in delta.get('del', []):
+        _delete_record(data, path)
+    for path, value in delta.get('set', []):
+        target = data
+        for key in path[:-1]:
+            child = target.get(key)
+            if not isinstance(child, dict):
+                child = target[key] = {}
+            target = child
+        target[path[-1]] = value
+
+
 @dataclass
 class SaveMetadata:
     """Metadane zapisu gry."""
@@ -23,6 +99,7 @@ class SaveMetadata:
     difficulty: str
     checksum: str
     compressed: bool = True
+    deltas: int = 0  # Wpisy dziennika nałożone na snapshot
     
     def to_dict(self) -> Dict[str, Any]:
         """Konwertuj na słownik."""
@@ -37,6 +114,9 @@ class SaveManager:
     MAX_SLOTS = 5
     AUTOSAVE_SLOT = 5
     SAVE_VERSION = 1
+    DELTA_DEPTH = 4  # Głębokość podziału stanu na rekordy (np. npcs/npcs/<id>/<pole>)
+    COMPACT_EVERY = 20  # Po tylu deltach dziennik jest kompaktowany do snapshotu
+    BACKUP_KEEP = 10  # Ile backupów zachować per slot (rotacja przy zapisie)
     
     def __init__(self):
         """Inicjalizacja managera zapisów."""
@@ -46,6 +126,9 @@ class SaveManager:
         self.compression_enabled = True
         self.auto_save_enabled = False
         self.last_auto_save = 0
+        # Stan dziennika per slot: snapshot bazowy, numer delty, skróty rekordów
+        self._journals: Dict[int, Dict[str, Any]] = {}
+        self.last_save_stats: Dict[str, Any] = {}
     
     def ensure_directories(self):
         """Upewnij się że katalogi zapisów istnieją."""
@@ -84,64 +167,53 @@ class SaveManager:
         """
         return os.path.join(self.SAVE_DIR, f"slot_{slot}.meta")
     
+    def get_journal_path(self, slot: int) -> str:
+        """Pobierz ścieżkę do dziennika zmian (delt) slotu.
+        
+        Args:
+            slot: Numer slotu
+            
+        Returns:
+            Ścieżka do pliku
+        """
+        return os.path.join(self.SAVE_DIR, f"slot_{slot}.wal")
+    
+    def _valid_slot(self, slot: int) -> bool:
+        # Pozwól na slot 99 dla testów
+        if slot != 99 and (slot < 1 or slot > self.MAX_SLOTS):
+            print(f"Nieprawidłowy slot: {slot}")
+            return False
+        return True
+    
     def save_game(self, game_state: Any, slot: int, 
-                  create_backup: bool = True) -> bool:
+                  create_backup: bool = True, deferred: bool = False) -> bool:
         """Zapisz stan gry.
         
         Args:
             game_state: Stan gry do zapisania
             slot: Numer slotu (1-5)
             create_backup: Czy utworzyć backup
+            deferred: Czy zapisać w tle (serializacja, kompresja, suma
+                kontrolna i backupy poza wątkiem gry)
             
         Returns:
-            Czy zapis się powiódł
+            Czy zapis się powiódł (przy deferred - czy został zlecony)
         """
-        # Pozwól na slot 99 dla testów
-        if slot != 99 and (slot < 1 or slot > self.MAX_SLOTS):
-            print(f"Nieprawidłowy slot: {slot}")
+        if not self._valid_slot(slot):
             return False
         
+        from core.background_save import background_saver
         try:
-            # Przygotuj dane do zapisu
             save_data = self._prepare_save_data(game_state)
-            
-            # Serializuj do JSON
-            json_data = json.dumps(save_data, ensure_ascii=False, indent=2)
-            
-            # Oblicz checksum
-            checksum = hashlib.sha256(json_data.encode()).hexdigest()
-            
-            # Utwórz metadane
-            metadata = SaveMetadata(
-                slot=slot,
-                timestamp=datetime.now().isoformat(),
-                game_version=game_state.version,
-                save_version=self.SAVE_VERSION,
-                player_name=game_state.player.name if game_state.player else "Unknown",
-                day=game_state.day,
-                playtime=game_state.total_playtime,
-                difficulty=game_state.settings.difficulty,
-                checksum=checksum,
-                compressed=True
-            )
-            
-            # Backup poprzedniego zapisu
-            if create_backup and os.path.exists(self.get_save_path(slot)):
-                self._create_backup(slot)
-            
-            # Zapisz skompresowane dane
-            save_path = self.get_save_path(slot, compressed=True)
-            with gzip.open(save_path, 'wt', encoding='utf-8') as f:
-                f.write(json_data)
-            
-            # Zapisz metadane
-            meta_path = self.get_metadata_path(slot)
-            with open(meta_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata.to_dict(), f, ensure_ascii=False, indent=2)
-            
-            # Zaktualizuj cache
-            self.metadata_cache[slot] = metadata
-            
+            if deferred:
+                background_saver.submit(
+                    self.get_save_path(slot), save_data,
+                    lambda data, progress: self._write_snapshot(slot, data, create_backup,
+                                                                progress=progress),
+                    slot=slot)
+                return True
+            background_saver.run(self.get_save_path(slot),
+                                 lambda: self._write_snapshot(slot, save_data, create_backup))
             print(f"✓ Gra zapisana w slocie {slot}")
             return True
             
@@ -149,6 +221,235 @@ class SaveManager:
             print(f"✗ Błąd zapisu: {e}")
             return False
     
+    def save_delta(self, game_state: Any, slot: int, deferred: bool = False) -> bool:
+        """Zapis przyrostowy - dopisuje do dziennika tylko zmienione rekordy.
+        
+        Pierwszy zapis slotu w sesji (bez wczytania go wcześniej), brak
+        snapshotu albo przekroczenie COMPACT_EVERY delt lub rozmiaru
+        snapshotu kończy się pełnym snapshotem, który zeruje dziennik.
+        
+        Args:
+            game_state: Stan gry do zapisania
+            slot: Numer slotu (1-5)
+            deferred: Czy zapisać w tle (w wątku gry powstaje tylko migawka)
+            
+        Returns:
+            Czy zapis się powiódł (przy deferred - czy został zlecony)
+        """
+        if not self._valid_slot(slot):
+            return False
+        
+        from core.background_save import background_saver
+        try:
+            save_data = self._prepare_save_data(game_state)
+            if deferred:
+                background_saver.submit(
+                    self.get_save_path(slot), save_data,
+                    lambda data, progress: self._write_delta(slot, data, progress),
+                    slot=slot)
+                return True
+            background_saver.run(self.get_save_path(slot),
+                                 lambda: self._write_delta(slot, save_data))
+            return True
+            
+        except Exception as e:
+            print(f"✗ Błąd zapisu przyrostowego: {e}")
+            return False
+    
+    def auto_save(self, game_state: Any) -> bool:
+        """Autozapis do AUTOSAVE_SLOT (przyrostowo, w tle).
+        
+        Args:
+            game_state: Stan gry do zapisania
+            
+        Returns:
+            Czy zapis został zlecony
+        """
+        if not self.auto_save_enabled:
+            return False
+        self.last_auto_save = game_state.game_time
+        return self.save_delta(game_state, self.AUTOSAVE_SLOT, deferred=True)
+    
+    def wait_for_saves(self, timeout: Optional[float] = None) -> bool:
+        """Czekaj na zakończenie zapisów w tle.
+        
+        Returns:
+            Czy zapisy zakończyły się przed upływem timeout
+        """
+        from core.background_save import background_saver
+        return background_saver.wait(timeout=timeout)
+    
+    def _write_delta(self, slot: int, save_data: Dict[str, Any],
+                     progress: Optional[Callable[[str, float], None]] = None):
+        """Dopisuje deltę do dziennika albo kompaktuje go do snapshotu."""
+        progress = progress or _no_progress
+        progress('serialize', 0.2)
+        records = _snapshot_records(save_data, self.DELTA_DEPTH)
+        journal = self._journals.get(slot)
+        metadata = self.get_metadata(slot)
+        
+        if (journal is None or metadata is None or metadata.checksum != journal['base']
+                or not os.path.exists(self.get_save_path(slot))
+                or journal['seq'] >= self.COMPACT_EVERY
+                or journal['journal_bytes'] > journal['base_bytes']):
+            # Kompaktowanie - nowy snapshot zamiast kolejnej delty
+            self._write_snapshot(slot, save_data, create_backup=False, records=records,
+                                 progress=progress)
+            return
+        
+        progress('checksum', 0.5)
+        digests = journal['digests']
+        changed = [(path, text) for path, (digest, text) in records.items()
+                   if digests.get(path) != digest]
+        removed = [list(path) for path in digests if path not in records]
+        seq = journal['seq'] + 1
+        
+        # Zmienione rekordy mają już zwarty JSON - wpis składany bez ponownej serializacji
+        entry = '{"seq":%d,"base":%s,"del":%s,"set":[%s]}' % (
+            seq, json.dumps(journal['base']), json.dumps(removed, ensure_ascii=False),
+            ','.join('[%s,%s]' % (json.dumps(list(path), ensure_ascii=False), text)
+                     for path, text in changed))
+        line = f"{hashlib.sha256(entry.encode('utf-8')).hexdigest()} {entry}\n".encode('utf-8')
+        progress('write', 0.8)
+        with open(self.get_journal_path(slot), 'ab') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        
+        journal['seq'] = seq
+        journal['digests'] = {path: digest for path, (digest, _) in records.items()}
+        journal['journal_bytes'] += len(line)
+        self._write_metadata(self._build_metadata(save_data, slot, journal['base'], seq))
+        self.last_save_stats = {
+            'mode': 'delta',
+            'records': len(records),
+            'changed': len(changed),
+            'removed': len(removed),
+            'bytes': len(line),
+        }
+    
+    def _build_metadata(self, save_data: Dict[str, Any], slot: int, checksum: str,
+                        deltas: int = 0) -> SaveMetadata:
+        # Z danych zapisu, nie ze stanu gry - zapis w tle nie czyta żywego stanu
+        return SaveMetadata(
+            slot=slot,
+            timestamp=datetime.now().isoformat(),
+            game_version=save_data['game_version'],
+            save_version=self.SAVE_VERSION,
+            player_name=(save_data.get('player') or {}).get('name', "Unknown"),
+            day=save_data['day'],
+            playtime=save_data['total_playtime'],
+            difficulty=save_data['settings']['difficulty'],
+            checksum=checksum,
+            compressed=True,
+            deltas=deltas
+        )
+    
+    def _write_metadata(self, metadata: SaveMetadata):
+        # Metadane zmieniają się przy każdej delcie - podmiana pliku, nie nadpisanie
+        meta_path = self.get_metadata_path(metadata.slot)
+        with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(metadata.to_dict(), f, ensure_ascii=False, indent=2)
+        os.replace(f"{meta_path}.tmp", meta_path)
+        self.metadata_cache[metadata.slot] = metadata
+    
+    def _write_snapshot(self, slot: int, save_data: Dict[str, Any], create_backup: bool,
+                        records: Optional[Dict[RecordPath, Tuple[bytes, str]]] = None,
+                        progress: Optional[Callable[[str, float], None]] = None):
+        """Zapisuje pełny snapshot i zeruje dziennik slotu."""
+        progress = progress or _no_progress
+        # Serializuj do JSON
+        progress('serialize', 0.2)
+        json_data = json.dumps(save_data, ensure_ascii=False, indent=2)
+        
+        # Oblicz checksum
+        progress('checksum', 0.4)
+        checksum = hashlib.sha256(json_data.encode()).hexdigest()
+        
+        # Backup poprzedniego zapisu i rotacja starych
+        if create_backup and os.path.exists(self.get_save_path(slot)):
+            progress('backup', 0.5)
+            self._create_backup(slot)
+            self.cleanup_old_backups(self.BACKUP_KEEP)
+        
+        # Zapisz skompresowane dane (podmiana pliku - awaria nie zostawia połowy zapisu)
+        progress('compress', 0.6)
+        save_path = self.get_save_path(slot, compressed=True)
+        temp_path = f"{save_path}.tmp"
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+            f.write(json_data)
+        os.replace(temp_path, save_path)
+        
+        # Dziennik usuwany dopiero po podmianie snapshotu - awaria wcześniej
+        # zostawia stary snapshot z jego dziennikiem. Pozostawiony dziennik
+        # nie trafi na nowy snapshot: load_game porównuje wpisy z jego sumą
+        journal_path = self.get_journal_path(slot)
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+        
+        progress('write', 0.9)
+        self._write_metadata(self._build_metadata(save_data, slot, checksum))
+        
+        if records is None:
+            records = _snapshot_records(save_data, self.DELTA_DEPTH)
+        self._journals[slot] = {
+            'base': checksum,
+            'seq': 0,
+            'digests': {path: digest for path, (digest, _) in records.items()},
+            'journal_bytes': 0,
+            'base_bytes': len(json_data),
+        }
+        self.last_save_stats = {
+            'mode': 'snapshot',
+            'records': len(records),
+            'changed': len(records),
+            'removed': 0,
+            'bytes': len(json_data),
+        }
+    
+    def _replay_journal(self, slot: int, base_checksum: str,
+                        save_data: Dict[str, Any]) -> Tuple[int, int]:
+        """Nakłada wpisy dziennika na snapshot.
+        
+        Czytanie kończy się na pierwszym wpisie urwanym, z błędną sumą albo
+        z innego snapshotu. Urwany koniec dziennika jest obcinany, żeby
+        kolejne delty nie trafiły za uszkodzony wpis.
+        
+        Returns:
+            (numer ostatniej nałożonej delty, rozmiar poprawnej części dziennika)
+        """
+        journal_path = self.get_journal_path(slot)
+        if not os.path.exists(journal_path):
+            return 0, 0
+        
+        seq = 0
+        valid_bytes = 0
+        with open(journal_path, 'rb') as f:
+            raw = f.read()
+        for line in raw.splitlines(keepends=True):
+            if not line.endswith(b'\n'):
+                break
+            digest, _, entry = line.rstrip(b'\n').partition(b' ')
+            if hashlib.sha256(entry).hexdigest().encode() != digest:
+                break
+            delta = json.loads(entry)
+            if delta.get('base') != base_checksum:
+                # Dziennik innego snapshotu - nieaktualny; usuń, żeby nowe
+                # delty nie trafiły za jego wpisy
+                print(f"⚠️ Ostrzeżenie: Dziennik slotu {slot} nie pasuje do snapshotu - pominięto")
+                os.remove(journal_path)
+                return 0, 0
+            if delta.get('seq') != seq + 1:
+                break
+            _apply_delta(save_data, delta)
+            seq += 1
+            valid_bytes += len(line)
+        
+        if valid_bytes < len(raw):
+            print(f"⚠️ Ostrzeżenie: Uszkodzony koniec dziennika slotu {slot} - pominięto")
+            os.truncate(journal_path, valid_bytes)
+        return seq, valid_bytes
+    
     def load_game(self, slot: int) -> Optional[Dict[str, Any]]:
         """Wczytaj stan gry.
         
@@ -165,6 +466,10 @@ class SaveManager:
         
         save_path = self.get_save_path(slot, compressed=True)
         
+        # Zapis w tle do tego slotu musi się najpierw zakończyć
+        from core.background_save import background_saver
+        background_saver.wait(save_path)
+        
         # Sprawdź czy istnieje skompresowany
         if not os.path.exists(save_path):
             # Może jest nieskompresowany?
@@ -193,8 +498,22 @@ class SaveManager:
             if checksum != metadata.checksum:
                 print("⚠️ Ostrzeżenie: Checksum nie zgadza się - plik mógł być zmodyfikowany")
             
-            # Parsuj JSON
+            # Parsuj JSON i nałóż delty z dziennika - wpisy muszą wskazywać
+            # snapshot faktycznie wczytany, a nie ten z metadanych
             save_data = json.loads(json_data)
+            seq, journal_bytes = self._replay_journal(slot, checksum, save_data)
+            if seq < metadata.deltas:
+                print(f"⚠️ Ostrzeżenie: Wczytano {seq} z {metadata.deltas} zapisów przyrostowych")
+            
+            # Kolejne save_delta dopisują do tego samego dziennika
+            records = _snapshot_records(save_data, self.DELTA_DEPTH)
+            self._journals[slot] = {
+                'base': checksum,
+                'seq': seq,
+                'digests': {path: digest for path, (digest, _) in records.items()},
+                'journal_bytes': journal_bytes,
+                'base_bytes': len(json_data),
+            }
             
             # Sprawdź wersję
             if save_data.get('save_version') != self.SAVE_VERSION:
@@ -231,14 +550,15 @@ class SaveManager:
                 if os.path.exists(path):
                     os.remove(path)
             
-            # Usuń metadane
-            meta_path = self.get_metadata_path(slot)
-            if os.path.exists(meta_path):
-                os.remove(meta_path)
+            # Usuń metadane i dziennik
+            for path in (self.get_metadata_path(slot), self.get_journal_path(slot)):
+                if os.path.exists(path):
+                    os.remove(path)
             
             # Wyczyść cache
             if slot in self.metadata_cache:
                 del self.metadata_cache[slot]
+            self._journals.pop(slot, None)
             
             print(f"✓ Zapis w slocie {slot} usunięty")
             return True
@@ -306,6 +626,10 @@ class SaveManager:
         Returns:
             Słownik z danymi do zapisu
         """
+        # Bariera - odroczone handlery event_bus muszą zakończyć pracę przed zapisem
+        from core.event_bus import event_bus
+        event_bus.flush()
+        
         save_data = {
             'save_version': self.SAVE_VERSION,
             'game_version': game_state.version,
@@ -363,8 +687,9 @@ class SaveManager:
         if game_state.weather_system:
             save_data['weather'] = game_state.weather_system.save_state()
         
-        # System craftingu
-        if hasattr(game_state, 'crafting_system') and game_state.crafting_system:
+        # System craftingu (pomijany, jeśli w tej grze jeszcze nie powstał)
+        if getattr(game_state, 'crafting_ready', True) and \
+                hasattr(game_state, 'crafting_system') and game_state.crafting_system:
             crafting_data = {}
             if hasattr(game_state.crafting_system, 'discovered_recipes'):
                 crafting_data['discovered_recipes'] = list(game_state.crafting_system.discovered_recipes)
@@ -391,14 +716,15 @@ class SaveManager:
                     backup_path = os.path.join(self.BACKUP_DIR, backup_name)
                     shutil.copy2(source, backup_path)
             
-            # Backup metadanych
-            meta_source = self.get_metadata_path(slot)
-            if os.path.exists(meta_source):
-                meta_backup = os.path.join(
-                    self.BACKUP_DIR, 
-                    f"slot_{slot}_backup_{timestamp}.meta"
-                )
-                shutil.copy2(meta_source, meta_backup)
+            # Backup metadanych i dziennika (delty należą do snapshotu)
+            for source, ext in ((self.get_metadata_path(slot), ".meta"),
+                                (self.get_journal_path(slot), ".wal")):
+                if os.path.exists(source):
+                    backup = os.path.join(
+                        self.BACKUP_DIR, 
+                        f"slot_{slot}_backup_{timestamp}{ext}"
+                    )
+                    shutil.copy2(source, backup)
                 
         except Exception as e:
             print(f"Błąd tworzenia backupu: {e}")
@@ -437,6 +763,15 @@ class SaveManager:
                 if target_slot in self.metadata_cache:
                     del self.metadata_cache[target_slot]
             
+            # Dziennik z backupu albo żaden (stary dziennik slotu nie pasuje)
+            journal_backup = backup_path.replace('.sav.gz', '.wal').replace('.sav', '.wal')
+            journal_target = self.get_journal_path(target_slot)
+            if os.path.exists(journal_backup):
+                shutil.copy2(journal_backup, journal_target)
+            elif os.path.exists(journal_target):
+                os.remove(journal_target)
+            self._journals.pop(target_slot, None)
+            
             print(f"✓ Backup przywrócony do slotu {target_slot}")
             return True
             
@@ -447,34 +782,29 @@ class SaveManager:
     def cleanup_old_backups(self, keep_count: int = 10):
         """Usuń stare backupy.
         
+        Backup to komplet plików z jednym znacznikiem czasu (snapshot,
+        metadane, dziennik) - rotacja liczy i usuwa całe komplety, od
+        najstarszego znacznika.
+        
         Args:
             keep_count: Ile backupów zachować per slot
         """
         try:
-            # Grupuj backupy po slotach
-            backups_by_slot = {}
+            # Grupuj pliki backupów po slotach i znacznikach czasu
+            backups_by_slot: Dict[int, Dict[str, List[str]]] = {}
             
             for filename in os.listdir(self.BACKUP_DIR):
-                if filename.startswith('slot_') and 'backup' in filename:
-                    parts = filename.split('_')
-                    if len(parts) >= 2:
-                        slot = int(parts[1])
-                        if slot not in backups_by_slot:
-                            backups_by_slot[slot] = []
-                        backups_by_slot[slot].append(filename)
-            
-            # Usuń najstarsze
-            for slot, files in backups_by_slot.items():
-                if len(files) > keep_count:
-                    # Sortuj po czasie modyfikacji
-                    files.sort(key=lambda f: os.path.getmtime(
-                        os.path.join(self.BACKUP_DIR, f)
-                    ))
-                    
-                    # Usuń najstarsze
-                    for file_to_delete in files[:-keep_count]:
-                        path = os.path.join(self.BACKUP_DIR, file_to_delete)
-                        os.remove(path)
+                match = _BACKUP_NAME.match(filename)
+                if match:
+                    sets = backups_by_slot.setdefault(int(match.group(1)), {})
+                    sets.setdefault(match.group(2), []).append(filename)
+            
+            # Usuń najstarsze komplety
+            for slot, sets in backups_by_slot.items():
+                timestamps = sorted(sets)
+                for timestamp in timestamps[:max(0, len(timestamps) - keep_count)]:
+                    for file_to_delete in sets[timestamp]:
+                        os.remove(os.path.join(self.BACKUP_DIR, file_to_delete))
             
         except Exception as e:
             print(f"Błąd czyszczenia backupów: {e}")
@@ -505,10 +835,10 @@ class SaveManager:
                 # Dodaj plik zapisu
                 zf.write(save_path, os.path.basename(save_path))
                 
-                # Dodaj metadane
-                meta_path = self.get_metadata_path(slot)
-                if os.path.exists(meta_path):
-                    zf.write(meta_path, os.path.basename(meta_path))
+                # Dodaj metadane i dziennik
+                for path in (self.get_metadata_path(slot), self.get_journal_path(slot)):
+                    if os.path.exists(path):
+                        zf.write(path, os.path.basename(path))
                 
                 # Dodaj informacje o eksporcie
                 export_info = {
@@ -571,9 +901,19 @@ class SaveManager:
                     with open(meta_target, 'wb') as f:
                         f.write(zf.read(meta_file))
                 
+                # Dziennik z archiwum albo żaden
+                journal_file = save_file.replace('.sav.gz', '.wal').replace('.sav', '.wal')
+                journal_target = self.get_journal_path(target_slot)
+                if journal_file in files:
+                    with open(journal_target, 'wb') as f:
+                        f.write(zf.read(journal_file))
+                elif os.path.exists(journal_target):
+                    os.remove(journal_target)
+                
                 # Wyczyść cache
                 if target_slot in self.metadata_cache:
                     del self.metadata_cache[target_slot]
+                self._journals.pop(target_slot, None)
             
             print(f"✓ Zapis zaimportowany do slotu {target_slot}")
             return True
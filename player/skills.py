@@ -383,6 +383,27 @@ class SkillSystem:
         SkillName.MEDYCYNA: ("Medycyna", "Leczenie ran i chorób", SkillCategory.PRZETRWANIE)
     }
     
+    # Synergie: umiejętność -> [(wspierana umiejętność, mnożnik, maks. poziom)]
+    SKILL_SYNERGIES = {
+        # Bojowe umiejętności wzajemnie się wspierają
+        SkillName.WALKA_WRECZ: [(SkillName.SILA, 0.5, 20), (SkillName.ZWROTNOSC, 0.3, 20)],
+        SkillName.MIECZE: [(SkillName.WALKA_WRECZ, 0.3, 15), (SkillName.SILA, 0.4, 20)],
+        SkillName.SZTYLETY: [(SkillName.ZWROTNOSC, 0.5, 20), (SkillName.SKRADANIE, 0.3, 15)],
+        SkillName.LUCZNICTWO: [(SkillName.ZWROTNOSC, 0.4, 20), (SkillName.TROPIENIE, 0.2, 15)],
+        
+        # Społeczne
+        SkillName.PERSWAZJA: [(SkillName.OSZUSTWO, 0.3, 15), (SkillName.ETYKIETA, 0.2, 15)],
+        SkillName.HANDEL: [(SkillName.PERSWAZJA, 0.4, 20), (SkillName.MATEMATYKA, 0.3, 15)],
+        
+        # Rzemieślnicze
+        SkillName.KOWALSTWO: [(SkillName.SILA, 0.3, 20), (SkillName.INŻYNIERIA, 0.2, 15)],
+        SkillName.ALCHEMIA: [(SkillName.ZIELARSTWO, 0.4, 20), (SkillName.MATEMATYKA, 0.2, 15)],
+        
+        # Przetrwanie
+        SkillName.PIERWSZA_POMOC: [(SkillName.ZIELARSTWO, 0.3, 15), (SkillName.ALCHEMIA, 0.2, 10)],
+        SkillName.TROPIENIE: [(SkillName.LUCZNICTWO, 0.2, 15), (SkillName.GEOGRAFIA, 0.3, 15)],
+    }
+    
     def __init__(self):
         """Inicjalizacja systemu umiejętności."""
         self.skills: Dict[SkillName, Skill] = {}
@@ -409,34 +430,13 @@ class SkillSystem:
     
     def _initialize_skill_synergies(self, skill: Skill, skill_enum: SkillName):
         """Inicjalizuje synergię między umiejętnościami."""
-        synergies_map = {
-            # Bojowe umiejętności wzajemnie się wspierają
-            SkillName.WALKA_WRECZ: [(SkillName.SILA, 0.5, 20), (SkillName.ZWROTNOSC, 0.3, 20)],
-            SkillName.MIECZE: [(SkillName.WALKA_WRECZ, 0.3, 15), (SkillName.SILA, 0.4, 20)],
-            SkillName.SZTYLETY: [(SkillName.ZWROTNOSC, 0.5, 20), (SkillName.SKRADANIE, 0.3, 15)],
-            SkillName.LUCZNICTWO: [(SkillName.ZWROTNOSC, 0.4, 20), (SkillName.TROPIENIE, 0.2, 15)],
-            
-            # Społeczne
-            SkillName.PERSWAZJA: [(SkillName.OSZUSTWO, 0.3, 15), (SkillName.ETYKIETA, 0.2, 15)],
-            SkillName.HANDEL: [(SkillName.PERSWAZJA, 0.4, 20), (SkillName.MATEMATYKA, 0.3, 15)],
-            
-            # Rzemieślnicze
-            SkillName.KOWALSTWO: [(SkillName.SILA, 0.3, 20), (SkillName.INŻYNIERIA, 0.2, 15)],
-            SkillName.ALCHEMIA: [(SkillName.ZIELARSTWO, 0.4, 20), (SkillName.MATEMATYKA, 0.2, 15)],
-            
-            # Przetrwanie
-            SkillName.PIERWSZA_POMOC: [(SkillName.ZIELARSTWO, 0.3, 15), (SkillName.ALCHEMIA, 0.2, 10)],
-            SkillName.TROPIENIE: [(SkillName.LUCZNICTWO, 0.2, 15), (SkillName.GEOGRAFIA, 0.3, 15)],
-        }
-        
-        if skill_enum in synergies_map:
-            for target_skill, multiplier, max_level in synergies_map[skill_enum]:
-                synergy = SkillSynergy(
-                    target_skill=target_skill,
-                    bonus_multiplier=multiplier,
-                    max_level=max_level
-                )
-                skill.synergies.append(synergy)
+        for target_skill, multiplier, max_level in self.SKILL_SYNERGIES.get(skill_enum, ()):
+            synergy = SkillSynergy(
+                target_skill=target_skill,
+                bonus_multiplier=multiplier,
+                max_level=max_level
+            )
+            skill.synergies.append(synergy)
     
     def get_skill(self, skill_name: SkillName) -> Optional[Skill]:
         """
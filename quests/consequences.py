@@ -10,6 +10,20 @@ from enum import Enum
 import random
 import json
 
+from core.game_clock import GameClock
+from core.scheduler import Scheduler
+
+
+# Domyślny odstęp między wystąpieniami konsekwencji RECURRING
+DEFAULT_RECURRING_HOURS = 24
+
+
+def _mark_world(world_state: Dict, path: str):
+    """Zgłoś zmianę zagnieżdżonej ścieżki, jeśli world_state śledzi zmiany (WorldState)."""
+    mark = getattr(world_state, 'mark', None)
+    if mark is not None:
+        mark(path)
+
 
 class ConsequenceType(Enum):
     """Typy konsekwencji."""
@@ -144,6 +158,25 @@ class Consequence:
     triggered: bool = False
     trigger_time: Optional[datetime] = None
     expiry_time: Optional[datetime] = None
+    interval_hours: Optional[float] = None  # Odstęp wystąpień RECURRING
+    
+    @property
+    def recurrence(self) -> Optional[timedelta]:
+        """Odstęp między wystąpieniami (None - konsekwencja jednorazowa)."""
+        if self.consequence_type != ConsequenceType.RECURRING:
+            return None
+        return timedelta(hours=self.interval_hours or DEFAULT_RECURRING_HOURS)
+    
+    def is_expired(self, current_time: datetime) -> bool:
+        """Czy minął czas ważności konsekwencji."""
+        return self.expiry_time is not None and current_time > self.expiry_time
+    
+    def conditions_met(self, world_state: Dict) -> bool:
+        """Czy stan świata spełnia warunki konsekwencji."""
+        for condition, value in self.trigger_conditions.items():
+            if condition not in world_state or world_state[condition] != value:
+                return False
+        return True
     
     def can_trigger(self, world_state: Dict, current_time: datetime) -> bool:
         """Sprawdza czy konsekwencja może się wydarzyć."""
@@ -153,15 +186,10 @@ class Consequence:
         if self.trigger_time and current_time < self.trigger_time:
             return False
             
-        if self.expiry_time and current_time > self.expiry_time:
+        if self.is_expired(current_time):
             return False
             
-        # Sprawdź warunki
-        for condition, value in self.trigger_conditions.items():
-            if condition not in world_state or world_state[condition] != value:
-                return False
-                
-        return True
+        return self.conditions_met(world_state)
     
     def apply(self, world_state: Dict, game_state: Dict) -> Dict[str, Any]:
         """Aplikuje konsekwencję do stanu gry."""
@@ -199,11 +227,13 @@ class Consequence:
                 if 'npcs' not in world_state:
                     world_state['npcs'] = {}
                 world_state['npcs'][effect_value['name']] = effect_value
+                _mark_world(world_state, f"npcs.{effect_value['name']}")
                 results['changes'][f'new_npc_{effect_value["name"]}'] = True
                 
             elif effect_type == 'remove_npc':
                 if 'npcs' in world_state and effect_value in world_state['npcs']:
                     del world_state['npcs'][effect_value]
+                    _mark_world(world_state, f"npcs.{effect_value}")
                     results['changes'][f'removed_npc_{effect_value}'] = True
                     
             elif effect_type == 'modify_location':
@@ -213,6 +243,7 @@ class Consequence:
                 if location not in world_state['locations']:
                     world_state['locations'][location] = {}
                 world_state['locations'][location].update(modifications)
+                _mark_world(world_state, f"locations.{location}")
                 results['changes'][f'location_{location}'] = modifications
         
         self.triggered = True
@@ -231,7 +262,8 @@ class Consequence:
             'dialogue': self.dialogue,
             'triggered': self.triggered,
             'trigger_time': self.trigger_time.isoformat() if self.trigger_time else None,
-            'expiry_time': self.expiry_time.isoformat() if self.expiry_time else None
+            'expiry_time': self.expiry_time.isoformat() if self.expiry_time else None,
+            'interval_hours': self.interval_hours
         }
 
 
@@ -241,6 +273,7 @@ class ConsequenceChain:
     def __init__(self, chain_id: str, initial_consequence: Consequence):
         self.chain_id = chain_id
         self.consequences: List[Consequence] = [initial_consequence]
+        self.delays: List[float] = [0]  # Opóźnienie kroku względem poprzedniego (godziny)
         self.current_index = 0
         self.completed = False
         
@@ -252,6 +285,18 @@ class ConsequenceChain:
             if last_trigger:
                 consequence.trigger_time = last_trigger + timedelta(hours=delay_hours)
         self.consequences.append(consequence)
+        self.delays.append(delay_hours)
+        
+    def next_due(self, after: Optional[datetime]) -> datetime:
+        """Czas następnego kroku: jego trigger_time albo opóźnienie od poprzedniego.
+        
+        Args:
+            after: Czas wykonania poprzedniego kroku (None - brak, krok od razu)
+        """
+        consequence = self.get_next()
+        if consequence.trigger_time:
+            return consequence.trigger_time
+        return (after or datetime.min) + timedelta(hours=self.delays[self.current_index])
         
     def get_next(self) -> Optional[Consequence]:
         """Zwraca następną konsekwencję w łańcuchu."""
@@ -310,23 +355,51 @@ class ConsequenceWeb:
 
 
 class ConsequenceManager:
-    """Główny menedżer systemu konsekwencji."""
+    """Główny menedżer systemu konsekwencji.
+    
+    Zaplanowane konsekwencje i kroki łańcuchów czekają we wspólnym
+    harmonogramie (core.scheduler.Scheduler) według czasu gry - każda
+    aktualizacja dotyka tylko tych, których czas nadszedł. Konsekwencje
+    z niespełnionymi warunkami czekają osobno i są sprawdzane ponownie
+    dopiero po zmianie stanu świata.
+    """
     
     def __init__(self):
         self.consequences: Dict[str, Consequence] = {}
         self.chains: Dict[str, ConsequenceChain] = {}
         self.webs: Dict[str, ConsequenceWeb] = {}
-        self.scheduled_consequences: List[Consequence] = []
+        self.scheduler = Scheduler()  # id konsekwencji / ('chain', id) -> konsekwencja / łańcuch
+        self._waiting: Dict[Any, Any] = {}  # Czas nadszedł, warunki niespełnione
+        self._waiting_version: Optional[int] = None
+        self.current_time: Optional[datetime] = None
         self.history: List[Dict] = []
         
+    @property
+    def scheduled_consequences(self) -> List[Consequence]:
+        """Oczekujące konsekwencje (bez kroków łańcuchów) w kolejności czasu."""
+        pending = [item for item in self._waiting.values() if isinstance(item, Consequence)]
+        pending.extend(item for _, _, item in self.scheduler.items()
+                       if isinstance(item, Consequence))
+        return pending
+        
     def register_consequence(self, consequence: Consequence):
         """Rejestruje nową konsekwencję."""
         self.consequences[consequence.id] = consequence
         
         # Jeśli ma określony czas, dodaj do zaplanowanych
         if consequence.trigger_time:
-            self.scheduled_consequences.append(consequence)
-            self.scheduled_consequences.sort(key=lambda x: x.trigger_time)
+            self._waiting.pop(consequence.id, None)
+            self.scheduler.schedule(consequence.id, consequence.trigger_time, consequence,
+                                    consequence.recurrence)
+            
+    def cancel_consequence(self, consequence_id: str) -> bool:
+        """Anuluje zaplanowaną konsekwencję (także cykliczną).
+        
+        Returns:
+            Czy konsekwencja była zaplanowana
+        """
+        waiting = self._waiting.pop(consequence_id, None) is not None
+        return self.scheduler.cancel(consequence_id) or waiting
             
     def create_chain(self, chain_id: str, consequences: List[Consequence]) -> ConsequenceChain:
         """Tworzy łańcuch konsekwencji."""
@@ -338,70 +411,114 @@ class ConsequenceManager:
             chain.add_consequence(cons)
             
         self.chains[chain_id] = chain
+        for cons in consequences:
+            self.consequences.setdefault(cons.id, cons)
+        self._schedule_chain(chain, self.current_time)
         return chain
         
+    def cancel_chain(self, chain_id: str) -> bool:
+        """Przerywa łańcuch - pozostałe kroki nie zostaną wykonane.
+        
+        Returns:
+            Czy łańcuch czekał na kolejny krok
+        """
+        key = ('chain', chain_id)
+        waiting = self._waiting.pop(key, None) is not None
+        return self.scheduler.cancel(key) or waiting
+        
+    def _schedule_chain(self, chain: ConsequenceChain, after: Optional[datetime]):
+        """Zaplanuj następny krok łańcucha."""
+        if chain.completed or chain.get_next() is None:
+            return
+        self.scheduler.schedule(('chain', chain.chain_id), chain.next_due(after), chain)
+        
     def create_web(self, web_id: str) -> ConsequenceWeb:
         """Tworzy sieć konsekwencji."""
         web = ConsequenceWeb(web_id)
         self.webs[web_id] = web
         return web
     
-    def update(self, game_time: int):
+    def update(self, game_time: int, world_state: Optional[Dict] = None):
         """Aktualizuje system konsekwencji.
         
         Args:
-            game_time: Aktualny czas gry w minutach
+            game_time: Czas gry w minutach od początku świata (GameClock.minutes)
+            world_state: Stan świata dla warunków konsekwencji (np. GameState.world)
         """
-        # Na razie prosta implementacja - może być rozbudowana
-        from datetime import datetime, timedelta
-        
-        # Konwertuj game_time na datetime
-        base_time = datetime(1000, 1, 1, 0, 0)  # Bazowy czas świata gry
-        current_time = base_time + timedelta(minutes=game_time)
+        current_time = GameClock.to_datetime(game_time)
+        self.current_time = current_time
         
-        # Sprawdź zaplanowane konsekwencje
-        # Potrzebujemy world_state i game_state - na razie puste
-        world_state = {}
-        game_state = {}
+        if world_state is None:
+            world_state = {}
         
         # Procesuj zaplanowane konsekwencje jeśli są
-        if self.scheduled_consequences:
-            self.process_scheduled(current_time, world_state, game_state)
+        if self._waiting or self.scheduler:
+            self.process_scheduled(current_time, world_state, {})
         
     def process_scheduled(self, current_time: datetime, world_state: Dict, 
                          game_state: Dict) -> List[Dict]:
-        """Przetwarza zaplanowane konsekwencje."""
+        """Przetwarza konsekwencje i kroki łańcuchów, których czas nadszedł."""
         triggered = []
         
-        for consequence in list(self.scheduled_consequences):
-            if consequence.can_trigger(world_state, current_time):
-                result = consequence.apply(world_state, game_state)
-                triggered.append(result)
-                self.history.append({
-                    'time': current_time,
-                    'consequence': consequence.id,
-                    'result': result
-                })
-                
-                # Usuń jednorazowe
-                if consequence.consequence_type != ConsequenceType.RECURRING:
-                    self.scheduled_consequences.remove(consequence)
+        # Czekające na warunki - ponownie tylko gdy świat się zmienił
+        # (zwykły słownik nie ma wersji, więc wtedy zawsze)
+        if self._waiting:
+            version = getattr(world_state, 'version', None)
+            if version is None or version != self._waiting_version:
+                self._waiting_version = version
+                for key, item in list(self._waiting.items()):
+                    self._fire(key, item, current_time, current_time,
+                               world_state, game_state, triggered)
+        
+        for due, key, item in self.scheduler.pop_due(current_time):
+            self._fire(key, item, due, current_time, world_state, game_state, triggered)
                     
         return triggered
         
-    def process_chains(self, world_state: Dict, game_state: Dict) -> List[Dict]:
-        """Przetwarza aktywne łańcuchy."""
-        results = []
-        
-        for chain in self.chains.values():
-            if not chain.completed:
-                next_cons = chain.get_next()
-                if next_cons and next_cons.can_trigger(world_state, datetime.now()):
-                    result = next_cons.apply(world_state, game_state)
-                    results.append(result)
-                    chain.advance()
-                    
-        return results
+    def _fire(self, key: Any, item: Any, due: datetime, current_time: datetime,
+              world_state: Dict, game_state: Dict, triggered: List[Dict]):
+        """Wykonaj konsekwencję lub krok łańcucha, którego czas nadszedł."""
+        chain = item if isinstance(item, ConsequenceChain) else None
+        consequence = chain.get_next() if chain else item
+        recurring = consequence.consequence_type == ConsequenceType.RECURRING
+        
+        if consequence.is_expired(current_time) or (consequence.triggered and not recurring):
+            # Przeterminowana lub już wykonana - łańcuch przechodzi dalej
+            self._waiting.pop(key, None)
+            if chain:
+                chain.advance()
+                self._schedule_chain(chain, current_time)
+            else:
+                self.scheduler.cancel(key)
+            return
+        
+        if not consequence.conditions_met(world_state):
+            if not recurring:
+                self._waiting[key] = item
+            return
+        
+        self._waiting.pop(key, None)
+        result = consequence.apply(world_state, game_state)
+        triggered.append(result)
+        self.history.append({
+            'time': current_time,
+            'consequence': consequence.id,
+            'result': result
+        })
+        if chain:
+            chain.advance()
+            self._schedule_chain(chain, due)
+        
+    def process_chains(self, world_state: Dict, game_state: Dict,
+                       current_time: Optional[datetime] = None) -> List[Dict]:
+        """Przetwarza aktywne łańcuchy.
+        
+        Łańcuchy dzielą harmonogram z pojedynczymi konsekwencjami, więc
+        wykonywane są wszystkie, których czas nadszedł.
+        """
+        if current_time is None:
+            current_time = self.current_time or datetime.now()
+        return self.process_scheduled(current_time, world_state, game_state)
         
     def trigger_consequence(self, consequence_id: str, world_state: Dict, 
                            game_state: Dict) -> Dict:
@@ -457,7 +574,8 @@ class ConsequenceManager:
         # Konsekwencje i scheduled_consequences wymagałyby deserializacji
         # Na razie pozostawiamy puste - będą odtworzone przy następnych eventach
         self.consequences = {}
-        self.scheduled_consequences = []
+        self.scheduler.clear()
+        self._waiting.clear()
 
 
 # Predefiniowane konsekwencje dla questów więziennych
@@ -1614,7 +1614,7 @@ class QuestIntegrationManager:
         self.sync_world_state()
         
         # Aktualizuj silnik questów
-        self.quest_engine.update(datetime.now())
+        self.quest_engine.update()
         
         # Przetwórz konsekwencje questów
         self.process_quest_consequences()
@@ -1662,8 +1662,9 @@ class QuestIntegrationManager:
     
     def process_quest_consequences(self):
         """Przetwarza konsekwencje questów"""
+        current_time = self.quest_engine.now()
         for consequence in self.quest_engine.consequence_queue[:]:
-            if consequence.is_due(datetime.now()):
+            if consequence.is_due(current_time):
                 # Zastosuj zmiany w świecie gry
                 for key, value in consequence.world_changes.items():
                     if key == "prison_alert":
@@ -3,14 +3,17 @@ Silnik questów emergentnych dla więzienia w Droga Szamana RPG.
 System tworzy organiczne sytuacje wynikające ze stanu świata.
 """
 
+import operator
 import random
-from typing import Dict, List, Optional, Tuple, Any, Callable
+from typing import Dict, List, Optional, Tuple, Any, Callable, Set
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
 import json
 
 from core.event_bus import event_bus, GameEvent, EventCategory, EventPriority
+from core.game_clock import GameClock, clock_now
+from core.scheduler import Scheduler
 
 
 class QuestState(Enum):
@@ -52,6 +55,80 @@ class QuestObjective:
         return False
 
 
+# Operatory warunków aktywacji: {'operator': '<', 'value': 5}
+CONDITION_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    '==': operator.eq,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+    '!=': operator.ne,
+    'in': lambda actual, value: actual in value,
+    'contains': lambda actual, value: value in actual,
+}
+
+_MISSING = object()
+
+
+def _compile_getter(key: str) -> Callable[[Dict], Any]:
+    """Funkcja odczytu klucza (a.b.c - zagnieżdżone słowniki); _MISSING gdy brak."""
+    if '.' not in key:
+        return lambda world_state: world_state.get(key, _MISSING)
+    parts = tuple(key.split('.'))
+
+    def get_nested(world_state):
+        current = world_state
+        for part in parts:
+            try:
+                if part not in current:
+                    return _MISSING
+                current = current[part]
+            except TypeError:
+                return _MISSING
+        return current
+    return get_nested
+
+
+def _compile_condition(key: str, required_value: Any) -> Callable[[Dict], bool]:
+    """Kompiluje pojedynczy warunek aktywacji do domknięcia."""
+    get = _compile_getter(key)
+    if isinstance(required_value, dict):
+        compare = CONDITION_OPERATORS.get(required_value.get('operator', '=='))
+        value = required_value['value']
+        if compare is None:
+            # Nieznany operator - wystarczy istnienie klucza
+            return lambda world_state: get(world_state) is not _MISSING
+    else:
+        compare = operator.eq
+        value = required_value
+
+    def condition(world_state):
+        actual = get(world_state)
+        if actual is _MISSING:
+            return False
+        try:
+            return bool(compare(actual, value))
+        except TypeError:
+            return False
+    return condition
+
+
+def _path_prefixes(path: str) -> List[str]:
+    """Przodkowie ścieżki z kropkami: "a.b.c" -> ["a", "a.b"]."""
+    parts = path.split('.')
+    return ['.'.join(parts[:i]) for i in range(1, len(parts))]
+
+
+def compile_conditions(conditions: Dict[str, Any]) -> Callable[[Dict], bool]:
+    """Kompiluje warunki aktywacji ziarna do jednej funkcji world_state -> bool."""
+    compiled = tuple(_compile_condition(key, value) for key, value in conditions.items())
+    if not compiled:
+        return lambda world_state: True
+    if len(compiled) == 1:
+        return compiled[0]
+    return lambda world_state: all(condition(world_state) for condition in compiled)
+
+
 @dataclass
 class QuestSeed:
     """Ziarno questa - warunki aktywacji i pierwsze ślady."""
@@ -63,55 +140,28 @@ class QuestSeed:
     time_sensitive: bool = False
     expiry_hours: int = 72
     priority: int = 5  # 1-10, wyższy = ważniejszy
+    # Klucze world_state czytane przez warunki (domyślnie klucze activation_conditions)
+    depends_on: Optional[List[str]] = None
+    _predicate: Optional[Callable[[Dict], bool]] = field(default=None, init=False,
+                                                         repr=False, compare=False)
+    
+    @property
+    def dependencies(self) -> Tuple[str, ...]:
+        """Ścieżki world_state, których zmiana wymaga ponownego sprawdzenia ziarna."""
+        if self.depends_on is not None:
+            return tuple(self.depends_on)
+        return tuple(self.activation_conditions)
+    
+    def recompile(self):
+        """Skompiluj warunki ponownie (po zmianie activation_conditions)."""
+        self._predicate = compile_conditions(self.activation_conditions)
     
     def check_activation(self, world_state: Dict) -> bool:
         """Sprawdza czy warunki aktywacji są spełnione."""
-        for key, required_value in self.activation_conditions.items():
-            if '.' in key:  # Nested dict access
-                keys = key.split('.')
-                current = world_state
-                for k in keys[:-1]:
-                    if k not in current:
-                        return False
-                    current = current[k]
-                if keys[-1] not in current:
-                    return False
-                actual_value = current[keys[-1]]
-            else:
-                if key not in world_state:
-                    return False
-                actual_value = world_state[key]
-            
-            # Porównanie wartości
-            if isinstance(required_value, dict):
-                operator = required_value.get('operator', '==')
-                value = required_value['value']
-                if operator == '<':
-                    if not actual_value < value:
-                        return False
-                elif operator == '>':
-                    if not actual_value > value:
-                        return False
-                elif operator == '<=':
-                    if not actual_value <= value:
-                        return False
-                elif operator == '>=':
-                    if not actual_value >= value:
-                        return False
-                elif operator == '!=':
-                    if not actual_value != value:
-                        return False
-                elif operator == 'in':
-                    if actual_value not in value:
-                        return False
-                elif operator == 'contains':
-                    if value not in actual_value:
-                        return False
-            else:
-                if actual_value != required_value:
-                    return False
-        
-        return True
+        predicate = self._predicate
+        if predicate is None:
+            predicate = self._predicate = compile_conditions(self.activation_conditions)
+        return predicate(world_state)
 
 
 @dataclass
@@ -215,13 +265,14 @@ class EmergentQuest:
         """Dodaje gałąź decyzyjną do questa."""
         self.branches[branch.branch_id] = branch
         
-    def discover(self, method: DiscoveryMethod, location: str) -> Dict[str, Any]:
+    def discover(self, method: DiscoveryMethod, location: str,
+                 current_time: Optional[datetime] = None) -> Dict[str, Any]:
         """Odkrycie questa przez gracza."""
         if self.state not in [QuestState.SEEDING, QuestState.DISCOVERABLE]:
             return {"success": False, "reason": "Quest nie jest jeszcze dostępny do odkrycia"}
         
         self.state = QuestState.ACTIVE
-        self.start_time = datetime.now()
+        self.start_time = current_time or datetime.now()
         
         discovery_text = self.discovery_dialogue.get(method.value, [
             "Odkryłeś coś dziwnego...",
@@ -288,7 +339,8 @@ class EmergentQuest:
         
         return result
     
-    def resolve(self, branch_id: str, player_state: Dict, world_state: Dict) -> Dict[str, Any]:
+    def resolve(self, branch_id: str, player_state: Dict, world_state: Dict,
+                current_time: Optional[datetime] = None) -> Dict[str, Any]:
         """Rozwiązanie questa wybraną ścieżką."""
         if branch_id not in self.branches:
             return {"success": False, "reason": "Nieznana ścieżka rozwiązania"}
@@ -299,13 +351,13 @@ class EmergentQuest:
         
         self.current_branch = branch_id
         self.state = QuestState.RESOLVED
-        self.resolution_time = datetime.now()
+        self.resolution_time = current_time or datetime.now()
         
         # Zastosuj natychmiastowe konsekwencje
         immediate_consequences = self._apply_immediate_consequences(branch, world_state)
         
         # Zaplanuj opóźnione konsekwencje
-        delayed_consequences = self._schedule_delayed_consequences(branch)
+        delayed_consequences = self._schedule_delayed_consequences(branch, self.resolution_time)
         
         # Oblicz wpływ moralny
         self.moral_weight = self._calculate_moral_impact(branch_id)
@@ -323,10 +375,11 @@ class EmergentQuest:
             "dialogue": branch.dialogue_options.get('resolution', 'Sytuacja została rozwiązana.')
         }
     
-    def fail(self, reason: str, world_state: Dict) -> Dict[str, Any]:
+    def fail(self, reason: str, world_state: Dict,
+             current_time: Optional[datetime] = None) -> Dict[str, Any]:
         """Quest kończy się niepowodzeniem."""
         self.state = QuestState.FAILED
-        self.resolution_time = datetime.now()
+        self.resolution_time = current_time or datetime.now()
         
         # Konsekwencje zignorowania questa
         failure_consequences = self._apply_failure_consequences(world_state)
@@ -368,8 +421,9 @@ class EmergentQuest:
                     changes[f'relationship_{npc}'] = change
         return changes
     
-    def _schedule_delayed_consequences(self, branch: QuestBranch) -> List[ConsequenceEvent]:
-        """Planuje opóźnione konsekwencje."""
+    def _schedule_delayed_consequences(self, branch: QuestBranch,
+                                       current_time: datetime) -> List[ConsequenceEvent]:
+        """Planuje opóźnione konsekwencje (względem czasu rozwiązania)."""
         delayed = []
         for cons_type, cons_value in branch.consequences.items():
             if cons_type == 'delayed':
@@ -377,7 +431,7 @@ class EmergentQuest:
                     event = ConsequenceEvent(
                         event_id=f"{self.quest_id}_{branch.branch_id}_{delay_hours}h",
                         quest_id=self.quest_id,
-                        trigger_time=datetime.now() + timedelta(hours=delay_hours),
+                        trigger_time=current_time + timedelta(hours=delay_hours),
                         event_type='delayed',
                         world_changes=effects.get('world_changes', {}),
                         npc_reactions=effects.get('npc_reactions', {}),
@@ -482,17 +536,67 @@ class QuestEngine:
         self.active_quests: Dict[str, EmergentQuest] = {}
         self.completed_quests: List[str] = []
         self.failed_quests: List[str] = []
-        self.consequence_queue: List[ConsequenceEvent] = []
+        self.consequence_scheduler = Scheduler()  # ConsequenceEvent według trigger_time
+        self.clock: Optional[GameClock] = None  # Zegar gry (None - czas systemowy)
         self.world_state: Dict[str, Any] = {}
         self.player_state: Dict[str, Any] = {}
         self.reward_system: Optional['RewardSystem'] = None  # Inicjalizowany później
+        # Aktywacja ziaren: wersja world_state z ostatniego sprawdzenia (gdy
+        # world_state to core.world_state.WorldState), ziarna do sprawdzenia
+        # niezależnie od zmian i indeksy zależności: ścieżka -> ziarna oraz
+        # przodek ścieżki ("a", "a.b" dla "a.b.c") -> ziarna
+        self._activation_version: Optional[int] = None
+        self._pending_seeds: Set[str] = set()
+        self._seeds_by_path: Dict[str, Set[str]] = {}
+        self._seeds_below: Dict[str, Set[str]] = {}
+        self._seed_order: Dict[str, int] = {}
         
     def register_seed(self, seed: QuestSeed):
         """Rejestruje nowe ziarno questa."""
+        if seed.quest_id in self.quest_seeds:
+            self._unindex_seed(self.quest_seeds[seed.quest_id])
         self.quest_seeds[seed.quest_id] = seed
+        seed.recompile()
+        self._seed_order.setdefault(seed.quest_id, len(self._seed_order))
+        for path in seed.dependencies:
+            self._seeds_by_path.setdefault(path, set()).add(seed.quest_id)
+            for prefix in _path_prefixes(path):
+                self._seeds_below.setdefault(prefix, set()).add(seed.quest_id)
+        self._pending_seeds.add(seed.quest_id)
+    
+    def _unindex_seed(self, seed: QuestSeed):
+        for path in seed.dependencies:
+            self._seeds_by_path.get(path, set()).discard(seed.quest_id)
+            for prefix in _path_prefixes(path):
+                self._seeds_below.get(prefix, set()).discard(seed.quest_id)
+    
+    def _seeds_affected_by(self, change: str) -> Set[str]:
+        """Ziarna zależne od zmienionej ścieżki, jej przodków lub potomków."""
+        affected = set(self._seeds_by_path.get(change, ()))
+        affected.update(self._seeds_below.get(change, ()))
+        for prefix in _path_prefixes(change):
+            affected.update(self._seeds_by_path.get(prefix, ()))
+        return affected
+    
+    def _touch(self, path: str):
+        """Zgłoś zmianę zagnieżdżonej ścieżki world_state (jeśli śledzi zmiany)."""
+        mark = getattr(self.world_state, 'mark', None)
+        if mark is not None:
+            mark(path)
+        
+    def now(self) -> datetime:
+        """Bieżący czas silnika - czas gry, gdy podpięty jest zegar."""
+        return clock_now(self.clock)
+    
+    def update(self, current_time: Optional[datetime] = None):
+        """Aktualizacja silnika - sprawdza aktywacje i konsekwencje.
+        
+        Args:
+            current_time: Bieżący czas (domyślnie now())
+        """
+        if current_time is None:
+            current_time = self.now()
         
-    def update(self, current_time: datetime):
-        """Aktualizacja silnika - sprawdza aktywacje i konsekwencje."""
         # Sprawdź aktywację nowych questów
         self._check_seed_activation()
         
@@ -517,10 +621,31 @@ class QuestEngine:
         # Można też dodać completed i failed jeśli potrzeba
         return all_quests
     
+    def _seeds_to_check(self) -> List[str]:
+        """Ziarna, których warunki mogły się zmienić od ostatniego sprawdzenia.
+        
+        Gdy world_state nie śledzi zmian (zwykły słownik) - wszystkie ziarna.
+        """
+        previous = self._activation_version
+        changes_since = getattr(self.world_state, 'changes_since', None)
+        if changes_since is None or previous is None:
+            self._pending_seeds.clear()
+            return list(self.quest_seeds)
+        
+        candidates = self._pending_seeds
+        self._pending_seeds = set()
+        for change in changes_since(previous):
+            candidates |= self._seeds_affected_by(change)
+        quest_seeds = self.quest_seeds
+        return sorted((seed_id for seed_id in candidates if seed_id in quest_seeds),
+                      key=self._seed_order.__getitem__)
+    
     def _check_seed_activation(self):
         """Sprawdza które ziarna questów mogą się aktywować."""
-        for seed_id, seed in self.quest_seeds.items():
-            if seed_id not in self.active_quests and seed_id not in self.completed_quests:
+        completed = set(self.completed_quests)
+        for seed_id in self._seeds_to_check():
+            seed = self.quest_seeds[seed_id]
+            if seed_id not in self.active_quests and seed_id not in completed:
                 if seed.check_activation(self.world_state):
                     # Aktywuj questa
                     quest = self._create_quest_from_seed(seed)
@@ -529,6 +654,8 @@ class QuestEngine:
                     
                     # Rozprowadź początkowe wskazówki
                     self._spread_initial_clues(quest)
+        # Zmiany wprowadzone przez samą aktywację są już uwzględnione
+        self._activation_version = getattr(self.world_state, 'version', None)
     
     def _create_quest_from_seed(self, seed: QuestSeed) -> EmergentQuest:
         """Tworzy questa z ziarna."""
@@ -545,15 +672,31 @@ class QuestEngine:
                 self.world_state['locations'][location] = {}
             
             self.world_state['locations'][location][f'clue_{quest.quest_id}'] = clue
+            self._touch(f'locations.{location}')
         
         # Zmień stan na odkrywalny po pewnym czasie
         quest.state = QuestState.DISCOVERABLE
-    
+
+    @property
+    def consequence_queue(self) -> List[ConsequenceEvent]:
+        """Oczekujące konsekwencje w kolejności czasu (kopia)."""
+        return [consequence for _, _, consequence in self.consequence_scheduler.items()]
+
+    def schedule_consequence(self, consequence: ConsequenceEvent):
+        """Zaplanuj konsekwencję na jej trigger_time."""
+        self.consequence_scheduler.schedule(id(consequence), consequence.trigger_time, consequence)
+
+    def cancel_consequence(self, consequence: ConsequenceEvent) -> bool:
+        """Anuluj zaplanowaną konsekwencję.
+
+        Returns:
+            Czy konsekwencja czekała w kolejce
+        """
+        return self.consequence_scheduler.cancel(id(consequence))
+
     def _process_consequences(self, current_time: datetime):
-        """Przetwarza zakolejkowane konsekwencje."""
-        due_consequences = [c for c in self.consequence_queue if c.is_due(current_time)]
-        
-        for consequence in due_consequences:
+        """Przetwarza konsekwencje, których czas nadszedł (pozostałe czekają w kopcu)."""
+        for _, _, consequence in self.consequence_scheduler.pop_due(current_time):
             # Zastosuj zmiany świata
             for key, value in consequence.world_changes.items():
                 self.world_state[key] = value
@@ -563,6 +706,7 @@ class QuestEngine:
                 if 'npc_reactions' not in self.world_state:
                     self.world_state['npc_reactions'] = {}
                 self.world_state['npc_reactions'][npc] = reaction
+                self._touch(f'npc_reactions.{npc}')
             
             # Aktywuj nowe ziarna questów
             for seed_id in consequence.new_quest_seeds:
@@ -572,9 +716,6 @@ class QuestEngine:
                     quest.state = QuestState.SEEDING
                     self.active_quests[seed_id] = quest
                     self._spread_initial_clues(quest)
-            
-            # Usuń z kolejki
-            self.consequence_queue.remove(consequence)
     
     def _check_quest_timeouts(self, current_time: datetime):
         """Sprawdza czy questy nie przekroczyły limitu czasu."""
@@ -583,17 +724,19 @@ class QuestEngine:
                 elapsed_hours = (current_time - quest.start_time).total_seconds() / 3600
                 if elapsed_hours > quest.seed.expiry_hours:
                     # Quest się nie udał z powodu upływu czasu
-                    result = quest.fail("Czas minął", self.world_state)
+                    result = quest.fail("Czas minął", self.world_state, current_time)
                     self.failed_quests.append(quest_id)
                     del self.active_quests[quest_id]
+                    # Ziarno może aktywować się ponownie
+                    self._pending_seeds.add(quest_id)
     
     def _update_quest_states(self):
         """Aktualizuje stany questów bazując na warunkach świata."""
         for quest in self.active_quests.values():
             if quest.state == QuestState.CONSEQUENCING:
                 # Sprawdź czy wszystkie konsekwencje zostały przetworzone
-                pending = [c for c in quest.consequences if c in self.consequence_queue]
-                if not pending:
+                scheduled = self.consequence_scheduler
+                if not any(id(c) in scheduled for c in quest.consequences):
                     quest.state = QuestState.RESOLVED
                     self.completed_quests.append(quest.quest_id)
                     del self.active_quests[quest.quest_id]
@@ -609,7 +752,7 @@ class QuestEngine:
                     if quest.quest_id in clue_key:
                         # Odkryto questa!
                         method = random.choice(quest.seed.discovery_methods)
-                        return quest.discover(method, location)
+                        return quest.discover(method, location, self.now())
         
         return None
     
@@ -638,11 +781,12 @@ class QuestEngine:
             return {"success": False, "reason": "Quest nie jest aktywny"}
         
         quest = self.active_quests[quest_id]
-        result = quest.resolve(branch_id, self.player_state, self.world_state)
+        result = quest.resolve(branch_id, self.player_state, self.world_state, self.now())
         
         if result['success']:
             # Dodaj konsekwencje do kolejki
-            self.consequence_queue.extend(quest.consequences)
+            for consequence in quest.consequences:
+                self.schedule_consequence(consequence)
             quest.state = QuestState.CONSEQUENCING
 
             # Emituj event ukończenia questa
@@ -685,7 +829,7 @@ class QuestEngine:
         if not quest.start_time:
             return quest.seed.expiry_hours
         
-        elapsed = (datetime.now() - quest.start_time).total_seconds() / 3600
+        elapsed = (self.now() - quest.start_time).total_seconds() / 3600
         return max(0, quest.seed.expiry_hours - elapsed)
     
     def get_active_quests(self) -> List[EmergentQuest]:
@@ -732,6 +876,7 @@ class QuestEngine:
         self.failed_quests = data.get('failed_quests', [])
         self.world_state = data.get('world_state', {})
         self.player_state = data.get('player_state', {})
+        self._activation_version = None
         
         # Odtwórz aktywne questy z zapisanych danych
         self.active_quests = {}
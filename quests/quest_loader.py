@@ -3,11 +3,11 @@ Quest Loader - ładowanie questów z plików JSON
 Zachowuje pełną kompatybilność z istniejącym quest_engine.py
 """
 
-import json
 import os
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+from core.data_loader import data_loader
 from quests.quest_engine import (
     QuestSeed, EmergentQuest, QuestBranch, DiscoveryMethod,
     ConsequenceEvent, QuestState
@@ -44,8 +44,7 @@ class QuestLoader:
 
     def _load_quest_file(self, filepath: Path):
         """Ładuje pojedynczy plik JSON z questami"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = data_loader.load_file(filepath)
 
         quests = data.get('quests', [])
         for quest_data in quests:
@@ -96,7 +95,8 @@ class QuestLoader:
             initial_clues=discovery.get('clues', {}),
             time_sensitive=timing.get('time_sensitive', False),
             expiry_hours=timing.get('expiry_hours'),
-            priority=timing.get('priority', 5)
+            priority=timing.get('priority', 5),
+            depends_on=activation.get('reads')
         )
 
     def _create_quest_class(self, data: Dict[str, Any]) -> type:
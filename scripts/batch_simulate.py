@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Wsadowa symulacja wielu światów gry z różnymi ziarnami losowości.
+Każdy świat działa w osobnym procesie (bezgłowy GameState z ekonomią,
+AI NPCów i questami emergentnymi z create_quest_seed_library), a metryki
+- ceny, podaż i popyt, aktywacje questów, śmierci NPCów - trafiają do
+kolumnowego pliku wyników (Parquet z pyarrow, w przeciwnym razie CSV).
+
+Uruchomienie:
+    python scripts/batch_simulate.py [liczba_swiatow] [godziny] [plik_wynikow] [procesy] [co_ile_godzin]
+    python scripts/batch_simulate.py 16 720 wyniki/swiaty.parquet
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.batch_runner import run_batch
+
+
+def run(worlds: int = 4, hours: float = 24.0, output: str = "batch_results.csv",
+        processes: int = None, sample_hours: float = 6.0):
+    summary = run_batch(range(1, worlds + 1), hours, output,
+                        processes=processes, sample_hours=sample_hours)
+    print(f"Światów: {summary['worlds']}, godzin gry na świat: {hours:g}, "
+          f"wierszy: {summary['rows']}")
+    print(f"Czas: {summary['wall_seconds']:.2f} s "
+          f"({summary['worlds'] * hours / summary['wall_seconds']:.0f} h gry/s)")
+    print(f"Wyniki: {summary['output']}")
+    return summary
+
+
+if __name__ == "__main__":
+    world_count = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    hour_count = float(sys.argv[2]) if len(sys.argv) > 2 else 24.0
+    output_path = sys.argv[3] if len(sys.argv) > 3 else "batch_results.csv"
+    process_count = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    sample_every = float(sys.argv[5]) if len(sys.argv) > 5 else 6.0
+    run(world_count, hour_count, output_path, process_count, sample_every)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark skompilowanych behavior trees.
+Dla każdej roli z data/npc_complete.json porównuje interpretowane drzewo
+(osobne na NPCa, wirtualne execute) ze skompilowanym, współdzielonym drzewem
+z BehaviorTreeCache i pamięcią warunków w obrębie ticku.
+
+Pomiar "decyzje" zastępuje akcje pustymi funkcjami - pokazuje sam koszt
+przechodzenia drzewa i sprawdzania warunków, bez pracy wykonywanej przez akcje.
+
+Uruchomienie:
+    python scripts/bench_behavior_tree.py [liczba_tickow]
+"""
+
+import copy
+import json
+import logging
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from npcs.npc_manager import NPC
+from npcs.ai_behaviors import ActionNode, create_behavior_tree
+from npcs.behavior_compiler import BehaviorTreeCache
+
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "data", "npc_complete.json")
+
+
+def _noop_action(npc, context):
+    return None
+
+
+def _stub_actions(node):
+    """Zastępuje akcje w drzewie pustą funkcją (pomiar samych decyzji)."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, ActionNode):
+            current.action_func = _noop_action
+        stack.extend(current.children)
+        child = getattr(current, 'child', None)
+        if child is not None:
+            stack.append(child)
+    return node
+
+
+def load_npcs():
+    """NPCe z npc_complete.json (z tymi samymi losowymi cechami w obu wariantach)."""
+    with open(DATA_FILE, 'r', encoding='utf-8') as f:
+        npcs_data = json.load(f)["npcs"]
+    result = []
+    for npc_id, npc_data in npcs_data.items():
+        npc_data = dict(npc_data, id=npc_id)
+        random.seed(npc_id)
+        result.append(NPC(copy.deepcopy(npc_data)))
+    return result
+
+
+def build_trees(npcs, compiled: bool, decisions_only: bool):
+    """Drzewa dla NPCów - interpretowane (osobne) lub z BehaviorTreeCache."""
+    if compiled:
+        builder = create_behavior_tree
+        if decisions_only:
+            builder = lambda role, personality: _stub_actions(create_behavior_tree(role, personality))
+        cache = BehaviorTreeCache(builder)
+        return [cache.get(npc.role, npc.personality) for npc in npcs], cache
+    trees = []
+    for npc in npcs:
+        tree = create_behavior_tree(npc.role, npc.personality)
+        trees.append(_stub_actions(tree) if decisions_only else tree)
+    return trees, None
+
+
+def time_roles(ticks: int, compiled: bool, decisions_only: bool):
+    """Czas wykonania drzew zsumowany per rola [ms na tick]."""
+    npcs = load_npcs()
+    trees, cache = build_trees(npcs, compiled, decisions_only)
+    npc_map = {npc.id: npc for npc in npcs}
+    per_role = defaultdict(float)
+    random.seed(0)
+
+    for tick in range(ticks):
+        events = []
+        if tick % 11 == 0:
+            target = npcs[tick % len(npcs)].id
+            events.append({"type": "attack", "participants": [target]})
+        context = {"time": time.time(), "hour": tick % 24, "npcs": npc_map,
+                   "events": events, "player_location": "cela_1"}
+        if cache is not None:
+            with cache.memo.tick():
+                for npc, tree in zip(npcs, trees):
+                    start = time.perf_counter()
+                    tree.execute(npc, context)
+                    per_role[npc.role] += time.perf_counter() - start
+        else:
+            for npc, tree in zip(npcs, trees):
+                start = time.perf_counter()
+                tree.execute(npc, context)
+                per_role[npc.role] += time.perf_counter() - start
+
+    roles = {role: total / ticks * 1000 for role, total in per_role.items()}
+    return roles, (cache.get_stats() if cache is not None else None)
+
+
+def run(ticks: int = 500):
+    logging.disable(logging.CRITICAL)
+    for decisions_only in (False, True):
+        title = "decyzje (akcje zastąpione pustymi)" if decisions_only else "pełne wykonanie"
+        interpreted, _ = time_roles(ticks, compiled=False, decisions_only=decisions_only)
+        compiled, stats = time_roles(ticks, compiled=True, decisions_only=decisions_only)
+
+        print(f"\n== {title}, {ticks} ticków ==")
+        print(f"{'rola':>16} | {'interpreter [ms]':>16} | {'skompilowane [ms]':>17} | {'przyspieszenie':>14}")
+        print("-" * 74)
+        for role in sorted(interpreted):
+            before, after = interpreted[role], compiled[role]
+            print(f"{role:>16} | {before:16.3f} | {after:17.3f} | {before / after:13.2f}x")
+        total_before, total_after = sum(interpreted.values()), sum(compiled.values())
+        print(f"{'razem':>16} | {total_before:16.3f} | {total_after:17.3f} | "
+              f"{total_before / total_after:13.2f}x")
+        print(f"NPCów: {stats['hits'] + stats['misses']}, współdzielonych drzew: {stats['trees']}, "
+              f"instrukcji łącznie: {stats['instructions']}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
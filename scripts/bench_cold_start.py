@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark zimnego startu - czas do pierwszego promptu.
+Dla main.py i integrated_gui.py uruchamia świeże procesy Pythona, które
+importują moduł gry i wykonują GameState.init_game (bez okna i bez
+czekania na gracza). Porównuje odczyt treści z JSON z odczytem z
+binarnego pakietu treści (scripts/build_content_bundle.py), budując
+pakiet, jeśli go brakuje. Wynik to mediana z liczba_powtorzen procesów.
+
+Uruchomienie:
+    python scripts/bench_cold_start.py [liczba_powtorzen]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.content_bundle import build_bundle
+
+# Kod procesu potomnego: import punktu wejścia i nowa gra do pierwszego promptu
+CHILD = """
+import contextlib, io, sys, time
+start = time.perf_counter()
+from core.data_loader import data_loader
+data_loader.use_bundle = {use_bundle}
+import {module}
+imported = time.perf_counter()
+from core.game_state import game_state
+with contextlib.redirect_stdout(io.StringIO()):
+    game_state.init_game("Test", "normal")
+    {first_prompt}
+done = time.perf_counter()
+print(imported - start, done - start, data_loader.bundle_hits, data_loader.parse_count)
+"""
+
+ENTRY_POINTS = {
+    'main.py': ('main', 'main.create_prologue_interface(game_state)'),
+    'integrated_gui.py': ('integrated_gui', 'integrated_gui.CommandParser(game_state)'),
+}
+
+
+def measure(module: str, first_prompt: str, use_bundle: bool, repeats: int):
+    """Mediany (proces, import, do promptu) w ms oraz trafienia w pakiet i parsowania JSON."""
+    code = CHILD.format(module=module, first_prompt=first_prompt, use_bundle=use_bundle)
+    process_ms, import_ms, prompt_ms = [], [], []
+    hits = parses = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                                capture_output=True, text=True)
+        process_ms.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        imported, done, hits, parses = result.stdout.split()[-4:]
+        import_ms.append(float(imported) * 1000)
+        prompt_ms.append(float(done) * 1000)
+    return (statistics.median(process_ms), statistics.median(import_ms),
+            statistics.median(prompt_ms), int(hits), int(parses))
+
+
+def run(repeats: int = 5):
+    summary = build_bundle(os.path.join(ROOT, "data"))
+    print(f"Pakiet treści: {summary['files']} plików, {summary['bytes'] / 1024:.1f} KB "
+          f"({'zbudowany' if summary['rebuilt'] else 'aktualny'})")
+    print(f"{'punkt wejścia':<20} {'treść':<7} {'proces ms':>10} {'import ms':>10} "
+          f"{'do promptu ms':>14} {'pakiet':>7} {'JSON':>5}")
+    for name, (module, first_prompt) in ENTRY_POINTS.items():
+        for use_bundle, label in ((False, "JSON"), (True, "pakiet")):
+            try:
+                process, imported, prompt, hits, parses = measure(
+                    module, first_prompt, use_bundle, repeats)
+            except RuntimeError as e:
+                print(f"{name:<20} {label:<7} pominięto: {e}")
+                break
+            print(f"{name:<20} {label:<7} {process:10.1f} {imported:10.1f} "
+                  f"{prompt:14.1f} {hits:7d} {parses:5d}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
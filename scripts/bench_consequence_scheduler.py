@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark harmonogramu konsekwencji.
+Rejestruje liczba_konsekwencji opóźnionych konsekwencji rozłożonych na
+kolejne dni gry i wykonuje liczba_tickow aktualizacji co minutę gry.
+Porównuje starą listę (sortowanie przy każdej rejestracji, przegląd
+wszystkich konsekwencji w każdym ticku) z kopcem, który dotyka tylko
+konsekwencji, których czas nadszedł.
+
+Uruchomienie:
+    python scripts/bench_consequence_scheduler.py [liczba_konsekwencji] [liczba_tickow]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quests.consequences import (Consequence, ConsequenceManager, ConsequenceSeverity,
+                                 ConsequenceType)
+
+
+class LegacyConsequenceManager(ConsequenceManager):
+    """Stara lista zaplanowanych konsekwencji."""
+
+    def __init__(self):
+        super().__init__()
+        self.legacy_scheduled: List[Consequence] = []
+
+    def register_consequence(self, consequence: Consequence):
+        self.consequences[consequence.id] = consequence
+        if consequence.trigger_time:
+            self.legacy_scheduled.append(consequence)
+            self.legacy_scheduled.sort(key=lambda x: x.trigger_time)
+
+    def update(self, game_time: int, world_state=None):
+        current_time = datetime(1000, 1, 1) + timedelta(minutes=game_time)
+        if self.legacy_scheduled:
+            self.process_scheduled(current_time, world_state or {}, {})
+
+    def process_scheduled(self, current_time: datetime, world_state: Dict,
+                          game_state: Dict) -> List[Dict]:
+        triggered = []
+        for consequence in list(self.legacy_scheduled):
+            if consequence.can_trigger(world_state, current_time):
+                triggered.append(consequence.apply(world_state, game_state))
+                if consequence.consequence_type != ConsequenceType.RECURRING:
+                    self.legacy_scheduled.remove(consequence)
+        return triggered
+
+
+def make_consequences(count: int, ticks: int) -> List[Consequence]:
+    base = datetime(1000, 1, 1)
+    return [Consequence(
+        id=f"konsekwencja_{i}",
+        quest_id="bench",
+        consequence_type=ConsequenceType.DELAYED,
+        severity=ConsequenceSeverity.MINOR,
+        description="",
+        trigger_time=base + timedelta(minutes=(i * 7919) % (ticks * 10)),
+        effects={'world_state': {f"flaga_{i % 50}": True}},
+    ) for i in range(count)]
+
+
+def time_manager(manager: ConsequenceManager, count: int, ticks: int):
+    start = time.perf_counter()
+    for consequence in make_consequences(count, ticks):
+        manager.register_consequence(consequence)
+    register_ms = (time.perf_counter() - start) * 1000
+    world = {}
+    start = time.perf_counter()
+    for minute in range(ticks):
+        manager.update(minute, world)
+    tick_us = (time.perf_counter() - start) / ticks * 1_000_000
+    return register_ms, tick_us
+
+
+def run(count: int = 5000, ticks: int = 2000):
+    legacy_register, legacy_tick = time_manager(LegacyConsequenceManager(), count, ticks)
+    heap_register, heap_tick = time_manager(ConsequenceManager(), count, ticks)
+    print(f"Konsekwencji: {count}, ticków: {ticks}")
+    print(f"Lista sortowana:  rejestracja {legacy_register:8.1f} ms, {legacy_tick:9.1f} µs/tick")
+    print(f"Kopiec:           rejestracja {heap_register:8.1f} ms, {heap_tick:9.1f} µs/tick  "
+          f"({legacy_tick / heap_tick:.1f}x szybciej)")
+
+
+if __name__ == "__main__":
+    consequence_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    tick_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    run(consequence_count, tick_count)
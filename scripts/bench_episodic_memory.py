@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark pamięci epizodycznej przy dużej liczbie wspomnień.
+Mierzy koszt add_memory przy pełnej pamięci (każde dodanie wymusza
+zapomnienie najsłabszego wspomnienia) oraz recall z zapytaniem, które nie
+trafia w indeks - jak recall_relevant bez celu i lokacji.
+
+Dla porównania mierzony jest też model starej ścieżki: sortowanie
+wszystkich wspomnień i przebudowa indeksu przy każdym zapomnieniu oraz
+ocena każdego wspomnienia przy recall bez trafień w indeksie.
+
+Uruchomienie:
+    python scripts/bench_episodic_memory.py [liczba_wspomnien]
+"""
+
+import logging
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from npcs.memory_system import EpisodicMemory
+
+
+EVENT_TYPES = ["conversation", "trade", "attack", "routine", "observation"]
+LOCATIONS = ["cela_1", "cela_2", "korytarz_centralny", "dziedziniec", "kuchnia"]
+
+
+def make_event(rng: random.Random, i: int) -> dict:
+    return {
+        "event_type": rng.choice(EVENT_TYPES),
+        "participants": [f"npc_{rng.randrange(200)}"],
+        "location": rng.choice(LOCATIONS),
+        "importance": rng.uniform(0.1, 1.0),
+        "timestamp": 1_000_000.0 + i,
+    }
+
+
+def fill(capacity: int) -> EpisodicMemory:
+    """Pamięć wypełniona do pojemności."""
+    rng = random.Random(capacity)
+    memory = EpisodicMemory(capacity=capacity)
+    memory.last_consolidation = float("inf")  # Bez konsolidacji w trakcie pomiaru
+    for i in range(capacity):
+        memory.add_memory(make_event(rng, i))
+    return memory
+
+
+def time_add_full(memory: EpisodicMemory, count: int) -> float:
+    """Średni czas add_memory z zapominaniem [µs]."""
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for i in range(count):
+        memory.add_memory(make_event(rng, memory.capacity + i))
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def time_recall_miss(memory: EpisodicMemory, count: int) -> float:
+    """Średni czas recall bez trafień w indeksie [µs]."""
+    query = {"participant": "gracz", "location": None, "event_type": None}
+    start = time.perf_counter()
+    for _ in range(count):
+        memory.recall(query, limit=5)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def time_legacy_forget(memory: EpisodicMemory, count: int) -> float:
+    """Model starego _forget_weakest: pełne sortowanie i przebudowa indeksu [µs]."""
+    memories = memory.memories
+    start = time.perf_counter()
+    for _ in range(count):
+        ranked = sorted(enumerate(memories), key=lambda x: x[1]["strength"] * x[1]["importance"])
+        removed = ranked[0][0]
+        kept = [m for idx, m in enumerate(memories) if idx != removed]
+        index = defaultdict(list)
+        for idx, m in enumerate(kept):
+            index[m["event_type"]].append(idx)
+            for participant in m["participants"]:
+                index[f"participant_{participant}"].append(idx)
+            index[f"location_{m['location']}"].append(idx)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def time_legacy_recall_scan(memory: EpisodicMemory, count: int) -> float:
+    """Model starego recall bez trafień w indeksie: ocena wszystkich wspomnień [µs]."""
+    memories = memory.memories
+    query = {"participant": "gracz", "location": None, "event_type": None}
+    now = time.time()
+    start = time.perf_counter()
+    for _ in range(count):
+        scored = [(memory._calculate_relevance(m, query, now), m) for m in memories]
+        [s for s in scored if s[0] > 0]
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def run(max_memories: int = 100_000):
+    logging.disable(logging.CRITICAL)
+    sizes = [size for size in (1_000, 10_000, 100_000) if size < max_memories] + [max_memories]
+    print(f"{'wspomnień':>10} | {'add (nowe)':>11} | {'add (stare)':>11} | "
+          f"{'recall (nowe)':>13} | {'recall (stare)':>14}   [µs/operację]")
+    print("-" * 74)
+    for size in sizes:
+        memory = fill(size)
+        legacy_runs = max(3, 30_000 // size)
+        add_new = time_add_full(memory, 2_000)
+        add_old = time_legacy_forget(memory, legacy_runs)
+        recall_new = time_recall_miss(memory, 2_000)
+        recall_old = time_legacy_recall_scan(memory, legacy_runs)
+        print(f"{size:>10} | {add_new:11.1f} | {add_old:11.1f} | {recall_new:13.1f} | {recall_old:14.1f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Mikrobenchmark EventBus.
+Przepuszcza przez szynę 1M wydarzeń z mieszanką typów jak w grze
+(walka, ruch, dialogi, handel, czas) i subskrybentami jak w GameState,
+WakeScheduler i DialogueController. Porównuje kolejkę na kopcu i historię
+w buforze cyklicznym ze starą implementacją (sortowanie kolejki przy każdej
+emisji, list.pop(0) w kolejce i historii), osobno dla emisji pojedynczych
+wydarzeń i dla trybu batch.
+
+Uruchomienie:
+    python scripts/bench_event_bus.py [liczba_wydarzen]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.event_bus import EventBus, GameEvent, EventCategory, EventPriority
+
+
+class LegacyEventBus(EventBus):
+    """Stara kolejka: sortowanie przy każdym przetwarzaniu i list.pop(0)."""
+
+    def __init__(self):
+        super().__init__()
+        self.event_queue = []
+        self.event_history = []
+        self.legacy_history_limit = 1000
+
+    def emit(self, event):
+        self.event_queue.append(event)
+        if not self.processing and not self.batch_mode:
+            self._process_queue()
+
+    def _process_queue(self):
+        self.processing = True
+        self.event_queue.sort(key=lambda e: e.priority.value, reverse=True)
+        while self.event_queue:
+            event = self.event_queue.pop(0)
+            if event.propagate:
+                self._process_event(event)
+        self.processing = False
+
+    def _process_event(self, event):
+        super()._process_event(event)
+        if len(self.event_history) > self.legacy_history_limit:
+            self.event_history.pop(0)
+
+
+def _handler(event):
+    return None
+
+
+def subscribe_game_handlers(bus: EventBus):
+    """Subskrypcje jak po init_game (GameState, WakeScheduler, DialogueController)."""
+    for event_type in ("player_death", "secret_discovered", "location_discovered",
+                       "quest_completed", "reputation_changed"):
+        bus.subscribe(event_type, _handler)
+    bus.subscribe("quest_completed", lambda event: None)
+    for category in (EventCategory.COMBAT, EventCategory.TRADE, EventCategory.CRAFT):
+        bus.subscribe_category(category, _handler)
+    for category in (EventCategory.COMBAT, EventCategory.MOVEMENT, EventCategory.DEATH):
+        bus.subscribe_category(category, lambda event: None)
+
+
+def make_events(count: int):
+    """Mieszanka wydarzeń z pomocniczych funkcji emit_* (obiekty tworzone raz)."""
+    templates = [
+        ("combat_attack", EventCategory.COMBAT, EventPriority.HIGH),
+        ("entity_moved", EventCategory.MOVEMENT, EventPriority.NORMAL),
+        ("dialogue_spoken", EventCategory.DIALOGUE, EventPriority.NORMAL),
+        ("trade_completed", EventCategory.TRADE, EventPriority.NORMAL),
+        ("hour_changed", EventCategory.TIME, EventPriority.LOW),
+        ("quest_completed", EventCategory.QUEST, EventPriority.HIGH),
+    ]
+    events = []
+    for i in range(count):
+        event_type, category, priority = templates[i % len(templates)]
+        events.append(GameEvent(event_type, category, {"i": i}, priority=priority,
+                                source="player", target=f"npc_{i % 50}"))
+    return events
+
+
+def time_direct(bus: EventBus, events) -> float:
+    """Wydarzeń na sekundę przy emisji pojedynczych wydarzeń."""
+    start = time.perf_counter()
+    for event in events:
+        bus.emit(event)
+    return len(events) / (time.perf_counter() - start)
+
+
+def time_batch(bus: EventBus, events, batch_size: int) -> float:
+    """Wydarzeń na sekundę w trybie batch (batch_size wydarzeń na partię)."""
+    start = time.perf_counter()
+    for offset in range(0, len(events), batch_size):
+        bus.start_batch()
+        for event in events[offset:offset + batch_size]:
+            bus.emit(event)
+        bus.process_batch()
+    return len(events) / (time.perf_counter() - start)
+
+
+def run(count: int = 1_000_000):
+    events = make_events(count)
+    # Stara kolejka w trybie batch jest kwadratowa - mniejsza próbka
+    batch_events = events[:min(count, 200_000)]
+    batch_size = 100_000
+
+    print(f"Wydarzeń: {count} (batch: {len(batch_events)} w partiach po {batch_size})")
+    print(f"{'wariant':>10} | {'pojedynczo [ev/s]':>18} | {'batch [ev/s]':>13}")
+    print("-" * 48)
+    results = {}
+    for name, factory in (("stary", LegacyEventBus), ("kopiec", EventBus)):
+        bus = factory()
+        subscribe_game_handlers(bus)
+        direct = time_direct(bus, events)
+        bus = factory()
+        subscribe_game_handlers(bus)
+        batch = time_batch(bus, batch_events, batch_size)
+        results[name] = (direct, batch)
+        print(f"{name:>10} | {direct:18,.0f} | {batch:13,.0f}")
+    old, new = results["stary"], results["kopiec"]
+    print(f"przyspieszenie: pojedynczo {new[0] / old[0]:.2f}x, batch {new[1] / old[1]:.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark rozsyłania wydarzeń EventBus.
+Emituje wydarzenia przez emit_combat_event, emit_movement_event i pozostałe
+funkcje pomocnicze z subskrybentami jak po init_game. Porównuje stare
+rozsyłanie (dwa wyszukiwania handlerów i trzy słowniki statystyk na każde
+wydarzenie, zawsze przez kolejkę) z krotkami handlerów budowanymi przy
+subskrypcji, z licznikami i bez nich.
+
+Uruchomienie:
+    python scripts/bench_event_dispatch.py [liczba_wydarzen]
+"""
+
+import heapq
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.event_bus import EventBus, EventCategory
+
+# core/__init__ eksportuje instancję event_bus pod tą samą nazwą co moduł
+event_bus_module = sys.modules['core.event_bus']
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_event_bus import subscribe_game_handlers
+
+
+class LegacyDispatchBus(EventBus):
+    """Stare rozsyłanie: wyszukiwanie handlerów i statystyki przy każdym wydarzeniu."""
+
+    def __init__(self):
+        super().__init__()
+        self.legacy_stats = {
+            'total_events': 0,
+            'events_by_category': {cat: 0 for cat in EventCategory},
+            'events_by_type': {},
+            'processing_time': 0
+        }
+
+    def emit(self, event):
+        heapq.heappush(self.event_queue, (-event.priority.value, next(self._sequence), event))
+        if not self.processing and not self.batch_mode:
+            self._process_queue()
+
+    def _process_event(self, event):
+        start = time.perf_counter()
+        stats = self.legacy_stats
+        stats['total_events'] += 1
+        stats['events_by_category'][event.category] += 1
+        if event.event_type not in stats['events_by_type']:
+            stats['events_by_type'][event.event_type] = 0
+        stats['events_by_type'][event.event_type] += 1
+        self.event_history.append(event)
+        if self.debug_mode:
+            print(f"[EventBus] Przetwarzanie: {event.event_type} [{event.category.value}]")
+        if event.event_type in self.listeners:
+            for handler in self.listeners[event.event_type]:
+                try:
+                    handler(event)
+                except Exception as e:
+                    print(f"[EventBus] Błąd w handlerze dla {event.event_type}: {e}")
+        if event.category in self.category_listeners:
+            for handler in self.category_listeners[event.category]:
+                try:
+                    handler(event)
+                except Exception as e:
+                    print(f"[EventBus] Błąd w handlerze kategorii {event.category}: {e}")
+        stats['processing_time'] += time.perf_counter() - start
+
+
+def emit_mix(count: int) -> None:
+    """count wydarzeń z funkcji pomocniczych modułu event_bus."""
+    helpers = (
+        lambda i: event_bus_module.emit_combat_event("attack", "player", f"npc_{i % 50}", damage=5),
+        lambda i: event_bus_module.emit_movement_event(f"npc_{i % 50}", "cela_1", "korytarz_centralny"),
+        lambda i: event_bus_module.emit_dialogue_event("player", f"npc_{i % 50}", "Witaj"),
+        lambda i: event_bus_module.emit_trade_event(f"npc_{i % 50}", "player", "chleb", 3),
+        lambda i: event_bus_module.emit_time_event("hour_changed", i),
+    )
+    for i in range(count):
+        helpers[i % len(helpers)](i)
+
+
+def time_bus(bus: EventBus, count: int) -> float:
+    """Wydarzeń na sekundę przez funkcje pomocnicze (bus podmieniony globalnie)."""
+    subscribe_game_handlers(bus)
+    previous = event_bus_module.event_bus
+    event_bus_module.event_bus = bus
+    try:
+        start = time.perf_counter()
+        emit_mix(count)
+        return count / (time.perf_counter() - start)
+    finally:
+        event_bus_module.event_bus = previous
+
+
+def time_dispatch(bus: EventBus, count: int) -> float:
+    """Wydarzeń na sekundę samego _process_event (bez tworzenia wydarzeń)."""
+    subscribe_game_handlers(bus)
+    previous = event_bus_module.event_bus
+    event_bus_module.event_bus = bus
+    try:
+        bus.start_batch()
+        emit_mix(min(count, 1000))
+        events = [entry[2] for entry in sorted(bus.event_queue)]
+        bus.event_queue.clear()
+        bus.batch_mode = False
+    finally:
+        event_bus_module.event_bus = previous
+    process = bus._process_event
+    rounds = max(1, count // len(events))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for event in events:
+            process(event)
+    return rounds * len(events) / (time.perf_counter() - start)
+
+
+def run(count: int = 500_000):
+    variants = (
+        ("stare", LegacyDispatchBus),
+        ("krotki", EventBus),
+        ("krotki, bez stat.", lambda: EventBus(collect_stats=False)),
+    )
+    print(f"Wydarzeń: {count}")
+    print(f"{'wariant':>18} | {'emit_* [ev/s]':>14} | {'rozsyłanie [ev/s]':>18}")
+    print("-" * 56)
+    results = {}
+    for name, factory in variants:
+        helpers = time_bus(factory(), count)
+        dispatch = time_dispatch(factory(), count)
+        results[name] = (helpers, dispatch)
+        print(f"{name:>18} | {helpers:14,.0f} | {dispatch:18,.0f}")
+    old = results["stare"]
+    for name, _ in variants[1:]:
+        new = results[name]
+        print(f"{name}: emit_* {new[0] / old[0]:.2f}x, rozsyłanie {new[1] / old[1]:.2f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark binarnego dziennika wydarzeń.
+Zapisuje długą sesję (domyślnie 200k wydarzeń z mieszanki jak w grze)
+do EventJournal i porównuje czas oraz rozmiar pliku ze zrzutem JSON
+(save_history z indent=2, cała sesja trzymana w historii). Mierzy też
+odczyt dziennika przez mmap.
+
+Uruchomienie:
+    python scripts/bench_event_journal.py [liczba_wydarzen]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.event_bus import EventBus
+from core.event_journal import EventJournal, MSGPACK_AVAILABLE, read_journal
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_event_bus import make_events, subscribe_game_handlers
+
+
+def run(count: int = 200_000):
+    events = make_events(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Stary sposób: historia mieści całą sesję, zrzut JSON na końcu
+        bus = EventBus()
+        subscribe_game_handlers(bus)
+        bus.history_limit = count
+        json_path = os.path.join(tmp, "historia.json")
+        start = time.perf_counter()
+        for event in events:
+            bus.emit(event)
+        bus.save_history(json_path)
+        json_time = time.perf_counter() - start
+
+        bus = EventBus()
+        subscribe_game_handlers(bus)
+        journal_path = os.path.join(tmp, "sesja.evj")
+        start = time.perf_counter()
+        with EventJournal(journal_path) as journal:
+            bus.attach_journal(journal)
+            for event in events:
+                bus.emit(event)
+            bus.detach_journal()
+        journal_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        read = sum(1 for _ in read_journal(journal_path))
+        read_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(json_path, encoding='utf-8') as f:
+            json_read = len(json.load(f))
+        json_read_time = time.perf_counter() - start
+
+        print(f"Wydarzeń: {count}, kodek dziennika: {'msgpack' if MSGPACK_AVAILABLE else 'JSON'}")
+        print(f"Historia + JSON:  {json_time:6.2f} s, {os.path.getsize(json_path) / 2**20:7.1f} MiB, "
+              f"odczyt {json_read} w {json_read_time:.2f} s")
+        print(f"Dziennik:         {journal_time:6.2f} s, {os.path.getsize(journal_path) / 2**20:7.1f} MiB, "
+              f"odczyt {read} w {read_time:.2f} s")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Raport czasu importu punktów wejścia gry (python -X importtime).
+Dla każdego modułu uruchamia świeży interpreter, wypisuje łączny czas
+importu i najdroższe moduły. Moduły ładowane leniwie (numpy, crafting,
+regiony poza więzieniem, smart interface) nie powinny się tu pojawiać.
+
+Uruchomienie:
+    python scripts/bench_import_time.py [liczba_modulow] [moduł ...]
+    python scripts/bench_import_time.py 30 main integrated_gui
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.profiler import format_import_report, import_time_report
+
+
+def run(limit: int = 20, modules=("main", "integrated_gui")):
+    for module in modules:
+        try:
+            report = import_time_report(module, cwd=ROOT)
+        except RuntimeError as e:
+            print(f"{module}: pominięto ({e})\n")
+            continue
+        print(format_import_report(report, limit))
+        print()
+
+
+if __name__ == "__main__":
+    module_limit = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    run(module_limit, sys.argv[2:] or ("main", "integrated_gui"))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark poziomów szczegółowości symulacji NPCów.
+Pokazuje czas ticku NPCManager.update w zależności od liczby NPCów,
+z pełną symulacją wszystkich NPCów i z poziomami LOD.
+
+Uruchomienie:
+    python scripts/bench_npc_lod.py [liczba_tickow]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from npcs.npc_manager import NPC, NPCManager
+from npcs.ai_behaviors import create_behavior_tree
+from world.locations.prison import Prison
+
+
+NPC_COUNTS = [100, 250, 500, 1000, 2000]
+ROLES = ["prisoner", "guard", "merchant"]
+
+
+def build_manager(npc_count: int, locations) -> NPCManager:
+    """Manager z npc_count NPCami rozłożonymi po mapie więzienia."""
+    manager = NPCManager()
+    manager.npcs.clear()
+    rng = random.Random(npc_count)
+    location_ids = list(locations.keys())
+    for i in range(npc_count):
+        role = rng.choice(ROLES)
+        npc = NPC({
+            "id": f"bench_{i}",
+            "name": f"NPC {i}",
+            "role": role,
+            "location": rng.choice(location_ids),
+            "personality": [],
+        })
+        npc.behavior_tree = create_behavior_tree(role, [])
+        manager.npcs[npc.id] = npc
+    manager.world_locations = locations
+    manager.player_location = "cela_1"
+    # Interakcje w tłumie rosną kwadratowo - mierzymy tu koszt samych ticków NPCów
+    manager.interaction_cap = 10
+    return manager
+
+
+def time_ticks(manager: NPCManager, ticks: int) -> float:
+    """Średni czas ticku w milisekundach."""
+    random.seed(0)
+    context = {"time": time.time(), "hour": 12, "npcs": manager.npcs, "events": []}
+    start = time.perf_counter()
+    for _ in range(ticks):
+        manager.update(1.0, context)
+    return (time.perf_counter() - start) / ticks * 1000
+
+
+def run(ticks: int = 30):
+    locations = Prison().locations
+    print(f"{'NPCów':>7} | {'pełna [ms/tick]':>16} | {'LOD [ms/tick]':>14} | {'przyspieszenie':>14}")
+    print("-" * 62)
+    for count in NPC_COUNTS:
+        full = build_manager(count, locations)
+        full.configure_lod(enabled=False)
+        full_ms = time_ticks(full, ticks)
+
+        lod = build_manager(count, locations)
+        lod_ms = time_ticks(lod, ticks)
+        stats = lod.lod.get_stats()["tiers"]
+
+        print(f"{count:7d} | {full_ms:16.2f} | {lod_ms:14.2f} | {full_ms / lod_ms:13.1f}x"
+              f"   (full={stats['full']}, reduced={stats['reduced']}, coarse={stats['coarse']})")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 30)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark indeksu przestrzennego NPCów.
+Przesuwa 10k NPCów na tick i porównuje zapytania o lokację
+z indeksu z liniowym skanowaniem wszystkich NPCów.
+
+Uruchomienie:
+    python scripts/bench_npc_spatial_index.py [liczba_npc] [liczba_tickow]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from npcs.npc_manager import NPC, NPCManager
+
+
+# Lokacje z więzienia, Czarnego Lasu i Targowiska Trzech Dróg
+LOCATIONS = [
+    "cela_1", "cela_2", "cela_3", "cela_4", "cela_5", "korytarz_centralny",
+    "korytarz_północny", "dziedziniec", "wartownia", "biuro_naczelnika",
+    "zbrojownia", "kuchnia", "komnata_tortur",
+    "skraj_lasu", "polana", "stara_chata", "gesty_las", "bagno",
+    "rynek", "karczma", "kuznia", "stajnie", "brama_miasta",
+]
+
+
+def build_manager(npc_count: int) -> NPCManager:
+    """Tworzy managera z npc_count syntetycznymi NPCami."""
+    manager = NPCManager()
+    rng = random.Random(42)
+    for i in range(npc_count):
+        npc_id = f"bench_{i}"
+        manager.npcs[npc_id] = NPC({
+            "id": npc_id,
+            "name": f"Więzień {i}",
+            "role": rng.choice(["prisoner", "guard", "merchant"]),
+            "location": rng.choice(LOCATIONS),
+            "personality": [],
+        })
+    return manager
+
+
+def linear_scan(manager: NPCManager, location: str):
+    """Stare zachowanie get_npcs_in_location - skan wszystkich NPCów."""
+    return [npc for npc in manager.npcs.values() if npc.location == location]
+
+
+def run(npc_count: int = 10000, ticks: int = 20):
+    print(f"Tworzenie {npc_count} NPCów...")
+    manager = build_manager(npc_count)
+    npcs = list(manager.npcs.values())
+    rng = random.Random(7)
+
+    move_time = 0.0
+    indexed_query_time = 0.0
+    linear_query_time = 0.0
+
+    for _ in range(ticks):
+        targets = [rng.choice(LOCATIONS) for _ in npcs]
+
+        start = time.perf_counter()
+        for npc, target in zip(npcs, targets):
+            npc.current_location = target
+        move_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for location in LOCATIONS:
+            manager.get_npcs_in_location(location)
+        indexed_query_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for location in LOCATIONS:
+            linear_scan(manager, location)
+        linear_query_time += time.perf_counter() - start
+
+    errors = manager.check_location_index()
+
+    print(f"NPCów: {len(manager.npcs)}, ticków: {ticks}, lokacji: {len(LOCATIONS)}")
+    print(f"Ruch {len(npcs)} NPCów/tick:       {move_time / ticks * 1000:8.2f} ms/tick")
+    print(f"Zapytania z indeksu:         {indexed_query_time / ticks * 1000:8.2f} ms/tick")
+    print(f"Zapytania skanem liniowym:   {linear_query_time / ticks * 1000:8.2f} ms/tick")
+    print(f"Spójność indeksu: {'OK' if not errors else f'{len(errors)} błędów'}")
+    for error in errors[:10]:
+        print(f"  - {error}")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    tick_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    run(count, tick_count)
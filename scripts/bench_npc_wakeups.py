@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark budzenia NPCów zdarzeniami.
+Więzienie z samymi więźniami, LOD wyłączone (wszyscy symulowani w pełni).
+Porównuje tick z behavior tree każdego NPCa z tickiem, w którym drzewo
+wykonują tylko NPCe wybudzeni przez harmonogram, potrzeby lub zdarzenia.
+
+Uruchomienie:
+    python scripts/bench_npc_wakeups.py [liczba_npc] [liczba_tickow]
+"""
+
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from npcs.npc_manager import NPC, NPCManager
+
+
+LOCATIONS = ["cela_1", "cela_2", "cela_3", "cela_4", "cela_5",
+             "korytarz_centralny", "dziedziniec", "kuchnia"]
+TICKS_PER_HOUR = 60
+
+
+def build_manager(npc_count: int) -> NPCManager:
+    """Manager z npc_count więźniami rozłożonymi po celach."""
+    manager = NPCManager()
+    manager.npcs.clear()
+    rng = random.Random(npc_count)
+    for i in range(npc_count):
+        random.seed(i)
+        npc = NPC({
+            "id": f"inmate_{i}",
+            "name": f"Więzień {i}",
+            "role": "prisoner",
+            "location": rng.choice(LOCATIONS),
+            "personality": [],
+        })
+        npc.behavior_tree = manager.behavior_trees.get(npc.role, npc.personality)
+        manager.npcs[npc.id] = npc
+    manager.configure_lod(enabled=False)
+    # Bez rozmów w celach - mierzymy koszt drzew, nie pamięci o interakcjach
+    manager.interaction_cap = 0
+    return manager
+
+
+def time_ticks(manager: NPCManager, ticks: int) -> float:
+    """Średni czas ticku w milisekundach (godzina gry zmienia się co TICKS_PER_HOUR)."""
+    random.seed(0)
+    start = time.perf_counter()
+    for tick in range(ticks):
+        hour = (8 + tick // TICKS_PER_HOUR) % 24
+        if tick % 97 == 0:
+            # Bójka w jednej z cel - budzi jej mieszkańców
+            victim = f"inmate_{tick % len(manager.npcs)}"
+            manager.add_world_event({"type": "attack", "location": manager.npcs[victim].location,
+                                     "participants": [victim], "description": "bójka"})
+        manager.update(1.0, {"time": time.time(), "hour": hour, "npcs": manager.npcs,
+                             "events": manager.world_events[-10:]})
+    return (time.perf_counter() - start) / ticks * 1000
+
+
+def run(npc_count: int = 500, ticks: int = 240):
+    logging.disable(logging.CRITICAL)
+    polling = build_manager(npc_count)
+    polling_ms = time_ticks(polling, ticks)
+
+    wakeups = build_manager(npc_count)
+    scheduler = wakeups.enable_wakeups(max_dormant_ticks=120)
+    wakeups_ms = time_ticks(wakeups, ticks)
+    stats = scheduler.get_stats()
+
+    print(f"NPCów: {npc_count}, ticków: {ticks} ({ticks // TICKS_PER_HOUR} godz. gry)")
+    print(f"Drzewo co tick:           {polling_ms:8.2f} ms/tick")
+    print(f"Budzenie zdarzeniami:     {wakeups_ms:8.2f} ms/tick  "
+          f"({polling_ms / wakeups_ms:.1f}x szybciej)")
+    print(f"Wykonane drzewa: {stats['runs']} z {stats['runs'] + stats['skips']} "
+          f"({stats['run_ratio']:.1%})")
+    for reason, count in sorted(stats["wakes"].items(), key=lambda item: -item[1]):
+        print(f"  {reason:>10}: {count}")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    tick_count = int(sys.argv[2]) if len(sys.argv) > 2 else 240
+    run(count, tick_count)
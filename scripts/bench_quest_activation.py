@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark aktywacji ziaren questów.
+Rejestruje liczba_ziaren nieaktywnych ziaren z warunkami jak w questach
+JSON (klucze z kropkami, operatory) i w każdym ticku zmienia czas gry
+oraz co dziesiąty tick jedną flagę. Porównuje stare sprawdzanie (parsowanie
+warunków każdego ziarna w każdym ticku) z warunkami skompilowanymi
+i sprawdzaniem tylko ziaren zależnych od zmienionych kluczy.
+
+Uruchomienie:
+    python scripts/bench_quest_activation.py [liczba_ziaren] [liczba_tickow]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.world_state import WorldState
+from quests.quest_engine import DiscoveryMethod, QuestEngine, QuestSeed
+
+
+def legacy_check(seed: QuestSeed, world_state) -> bool:
+    """Stare QuestSeed.check_activation - parsowanie warunków przy każdym wywołaniu."""
+    for key, required_value in seed.activation_conditions.items():
+        if '.' in key:
+            keys = key.split('.')
+            current = world_state
+            for k in keys[:-1]:
+                if k not in current:
+                    return False
+                current = current[k]
+            if keys[-1] not in current:
+                return False
+            actual_value = current[keys[-1]]
+        else:
+            if key not in world_state:
+                return False
+            actual_value = world_state[key]
+        if isinstance(required_value, dict):
+            operator = required_value.get('operator', '==')
+            value = required_value['value']
+            if operator == '<' and not actual_value < value:
+                return False
+            elif operator == '>' and not actual_value > value:
+                return False
+            elif operator == '>=' and not actual_value >= value:
+                return False
+        elif actual_value != required_value:
+            return False
+    return True
+
+
+class LegacyQuestEngine(QuestEngine):
+    """Stara aktywacja: wszystkie ziarna w każdym ticku."""
+
+    def _check_seed_activation(self):
+        for seed_id, seed in self.quest_seeds.items():
+            if seed_id not in self.active_quests and seed_id not in self.completed_quests:
+                if legacy_check(seed, self.world_state):
+                    quest = self._create_quest_from_seed(seed)
+                    self.active_quests[seed_id] = quest
+                    self._spread_initial_clues(quest)
+
+
+def make_seeds(count: int):
+    seeds = []
+    for i in range(count):
+        seeds.append(QuestSeed(
+            quest_id=f"quest_{i}",
+            name=f"Quest {i}",
+            activation_conditions={
+                "economy.food_supply": {"operator": "<", "value": -1},
+                f"prison.flags.flaga_{i % 100}": True,
+                "day": {"operator": ">=", "value": 1 + i % 5},
+            },
+            discovery_methods=[DiscoveryMethod.OVERHEARD],
+            initial_clues={},
+        ))
+    return seeds
+
+
+def time_engine(engine: QuestEngine, seeds, ticks: int) -> float:
+    world = WorldState({"game_time": 0, "day": 1, "economy": {"food_supply": 10},
+                        "prison": {"flags": {}}})
+    engine.world_state = world
+    for seed in seeds:
+        engine.register_seed(seed)
+    now = datetime.now()
+    start = time.perf_counter()
+    for tick in range(ticks):
+        world.set("game_time", tick)
+        if tick % 10 == 0:
+            world["prison"]["flags"][f"flaga_{tick % 100}"] = False
+            world.mark(f"prison.flags.flaga_{tick % 100}")
+        engine.update(now)
+    return (time.perf_counter() - start) / ticks * 1_000_000
+
+
+def run(seed_count: int = 500, ticks: int = 1000):
+    seeds = make_seeds(seed_count)
+    legacy_us = time_engine(LegacyQuestEngine(), seeds, ticks)
+    compiled_us = time_engine(QuestEngine(), make_seeds(seed_count), ticks)
+    print(f"Ziaren: {seed_count}, ticków: {ticks}")
+    print(f"Wszystkie ziarna co tick:   {legacy_us:9.1f} µs/tick")
+    print(f"Skompilowane + zależności:  {compiled_us:9.1f} µs/tick  "
+          f"({legacy_us / compiled_us:.1f}x szybciej)")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    tick_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    run(count, tick_count)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark pamięci semantycznej przy dużej bazie wiedzy.
+Porównuje dodawanie konceptów (tworzenie powiązań) i wyszukiwanie
+podobnego konceptu przy chybieniu: pełne porównanie z każdym konceptem
+(stara ścieżka), indeks odwrócony tokenów i przybliżony MinHash/LSH.
+
+Uruchomienie:
+    python scripts/bench_semantic_memory.py [liczba_konceptow]
+"""
+
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from npcs.memory_system import SemanticMemory
+
+
+class FullScanSemanticMemory(SemanticMemory):
+    """Stara ścieżka - porównanie z każdym konceptem."""
+
+    def _create_semantic_links(self, concept):
+        for other_concept in self.knowledge:
+            if other_concept != concept:
+                similarity = self._calculate_semantic_similarity(concept, other_concept)
+                if similarity > 0.3:
+                    self.relationships[concept][other_concept] = similarity
+                    self.relationships[other_concept][concept] = similarity
+
+    def _find_similar_concept(self, query):
+        best_match = None
+        best_similarity = 0.0
+        for concept in self.knowledge:
+            similarity = self._calculate_semantic_similarity(query, concept)
+            if similarity > best_similarity:
+                best_similarity = similarity
+                best_match = concept
+        return best_match if best_similarity > 0.5 else None
+
+
+def make_concepts(count: int):
+    """Nazwy konceptów z puli tokenów (kilka popularnych, wiele rzadkich)."""
+    rng = random.Random(count)
+    common = ["straznik", "cela", "klucz", "jedzenie", "tunel"]
+    rare = [f"slowo{i}" for i in range(max(50, count // 4))]
+    concepts = []
+    for i in range(count):
+        tokens = [rng.choice(common)] + rng.sample(rare, rng.randint(1, 3))
+        concepts.append("_".join(tokens) + f"_{i}")
+    return concepts
+
+
+def bench(memory: SemanticMemory, concepts, queries):
+    start = time.perf_counter()
+    for concept in concepts:
+        memory.add_knowledge(concept, concept)
+    add_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for query in queries:
+        memory.get(query)
+    lookup_us = (time.perf_counter() - start) / len(queries) * 1e6
+    links = sum(len(relations) for relations in memory.relationships.values())
+    return add_ms, lookup_us, links
+
+
+def run(count: int = 3_000):
+    logging.disable(logging.CRITICAL)
+    concepts = make_concepts(count)
+    rng = random.Random(0)
+    queries = [concept.rsplit("_", 1)[0] + "_nieznany" for concept in rng.sample(concepts, 200)]
+
+    print(f"Konceptów: {count}")
+    print(f"{'wariant':>16} | {'dodawanie [ms]':>14} | {'lookup [µs]':>11} | {'powiązań':>9}")
+    print("-" * 60)
+    for name, memory in (("pełne porównanie", FullScanSemanticMemory()),
+                         ("indeks tokenów", SemanticMemory()),
+                         ("MinHash/LSH", SemanticMemory(use_lsh=True))):
+        add_ms, lookup_us, links = bench(memory, concepts, queries)
+        print(f"{name:>16} | {add_ms:14.1f} | {lookup_us:11.1f} | {links:9}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 3_000)
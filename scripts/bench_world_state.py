@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark stanu świata przekazywanego do silnika questów.
+Porównuje stary sposób (dwa pełne get_world_state na tick: kopie flag
+i zmiennych, reputacja ze wszystkich NPCów, wycena rynku) z przyrostowym
+GameState.refresh_world_state przy stałej liczbie dodatkowych NPCów
+znających gracza.
+
+Uruchomienie:
+    python scripts/bench_world_state.py [liczba_npc] [liczba_tickow]
+"""
+
+import io
+import os
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.game_state import GameState
+from npcs.npc_manager import NPC
+
+
+def legacy_world_state(game_state: GameState) -> dict:
+    """Stary get_world_state - pełna przebudowa przy każdym wywołaniu."""
+    state = {
+        'game_time': game_state.game_time,
+        'day': game_state.day,
+        'player_location': game_state.current_location,
+        'player_health': game_state.player.health if game_state.player else 100,
+        'player_reputation': {},
+        'discovered_secrets': list(game_state.discovered_secrets),
+        'game_flags': game_state.game_flags.copy(),
+        'global_variables': game_state.global_variables.copy()
+    }
+    for npc_id, npc in game_state.npc_manager.npcs.items():
+        if hasattr(npc, 'relationships') and 'player' in npc.relationships:
+            state['player_reputation'][npc_id] = npc.relationships['player'].get_overall_disposition()
+    prison_market = game_state.economy.markets.get('prison')
+    food_supply = 0
+    if prison_market and hasattr(prison_market, 'dane_rynkowe'):
+        food_data = prison_market.dane_rynkowe.get('chleb')
+        if food_data:
+            food_supply = food_data.podaz
+    state['economy'] = {
+        'food_supply': food_supply,
+        'average_prices': game_state.economy.get_average_prices()
+    }
+    return state
+
+
+def build_game(npc_count: int) -> GameState:
+    GameState._instance = None
+    game_state = GameState()
+    with redirect_stdout(io.StringIO()):
+        game_state.init_game("Bench", "normal")
+    for i in range(npc_count):
+        random.seed(i)
+        npc = NPC({"id": f"bench_{i}", "name": f"Więzień {i}", "role": "prisoner",
+                   "location": "dziedziniec", "personality": []})
+        npc.modify_relationship("player", trust=i % 40, familiarity=20)
+        game_state.npc_manager.npcs[npc.id] = npc
+    for i in range(50):
+        game_state.game_flags[f"flaga_{i}"] = True
+    return game_state
+
+
+def run(npc_count: int = 500, ticks: int = 2000):
+    game_state = build_game(npc_count)
+    start = time.perf_counter()
+    for tick in range(ticks):
+        game_state.game_time += 1
+        legacy_world_state(game_state)
+        legacy_world_state(game_state).get('player_reputation', {})
+    legacy_us = (time.perf_counter() - start) / ticks * 1_000_000
+
+    game_state.refresh_world_state()
+    start = time.perf_counter()
+    for tick in range(ticks):
+        game_state.game_time += 1
+        game_state.refresh_world_state().view().get('player_reputation', {})
+    incremental_us = (time.perf_counter() - start) / ticks * 1_000_000
+
+    print(f"NPCów: {len(game_state.npc_manager.npcs)}, ticków: {ticks}")
+    print(f"2x get_world_state:     {legacy_us:9.1f} µs/tick")
+    print(f"refresh_world_state:    {incremental_us:9.1f} µs/tick  "
+          f"({legacy_us / incremental_us:.1f}x szybciej, pełne przeliczenie reputacji "
+          f"co {GameState.REPUTATION_RESYNC_TICKS} ticków)")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    tick_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    run(count, tick_count)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Budowanie binarnego pakietu treści gry.
+Parsuje wszystkie pliki JSON z katalogu danych (przedmioty, lokacje, NPCe,
+receptury, dialogi, questy) i zapisuje je jako jeden pakiet, który
+DataLoader mapuje w pamięci przy starcie zamiast parsować JSON.
+Aktualny pakiet (ten sam hash źródeł) nie jest przepisywany.
+
+Uruchomienie:
+    python scripts/build_content_bundle.py [katalog_danych] [plik_pakietu] [--wymus]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.content_bundle import build_bundle
+
+
+def run(data_root: str = "data", output: str = None, force: bool = False):
+    summary = build_bundle(data_root, output, force=force)
+    state = "zbudowany" if summary['rebuilt'] else "aktualny, bez zmian"
+    print(f"Pakiet {summary['path']}: {state}")
+    print(f"Plików: {summary['files']}, rozmiar: {summary['bytes'] / 1024:.1f} KB, "
+          f"czas: {summary['seconds'] * 1000:.1f} ms")
+    print(f"Hash źródeł: {summary['source_hash'][:16]}")
+    for relpath in summary['skipped']:
+        print(f"Pominięto (błąd JSON): {relpath}")
+    return summary
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--wymus"]
+    run(args[0] if args else "data", args[1] if len(args) > 1 else None,
+        force="--wymus" in sys.argv)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Symulacja Droga Szamana RPG bez interfejsu.
+Przewija świat gry o zadaną liczbę godzin z prędkością procesora
+(balansowanie ekonomii, długie testy AI NPCów) i wypisuje ticki/s,
+wydarzenia/s oraz czasy podsystemów.
+
+Uruchomienie:
+    python simulate.py [godziny] [--ziarno N] [--krok MINUTY] [--json PLIK] [--gadatliwie]
+    python simulate.py 720 --ziarno 42          # 30 dni gry
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Dodaj ścieżkę do modułów
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.headless import HeadlessSimulation
+
+
+def main(argv=None):
+    """Punkt wejścia symulacji bez interfejsu."""
+    parser = argparse.ArgumentParser(description="Symulacja świata gry bez interfejsu")
+    parser.add_argument("godziny", nargs="?", type=float, default=24.0,
+                        help="Liczba godzin gry do przewinięcia (domyślnie 24)")
+    parser.add_argument("--ziarno", type=int, default=None, help="Ziarno losowości")
+    parser.add_argument("--krok", type=float, default=1.0,
+                        help="Długość ticku w minutach gry (domyślnie 1)")
+    parser.add_argument("--json", dest="json_path", default=None,
+                        help="Zapisz raport do pliku JSON")
+    parser.add_argument("--gadatliwie", action="store_true",
+                        help="Nie wyciszaj komunikatów gry")
+    args = parser.parse_args(argv)
+
+    simulation = HeadlessSimulation(seed=args.ziarno, tick_minutes=args.krok,
+                                    quiet=not args.gadatliwie)
+    report = simulation.run(args.godziny)
+    print(simulation.format_report(report))
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nRaport zapisany: {args.json_path}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
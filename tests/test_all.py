@@ -8,6 +8,7 @@ import os
 import unittest
 import json
 import time
+import threading
 from unittest.mock import Mock, patch
 
 # Dodaj ścieżkę do modułów
@@ -86,6 +87,87 @@ class TestEventBus(unittest.TestCase):
         
         # Sprawdź czy przetworzone w kolejności priorytetów
         self.assertEqual(events_order, [10, 5, 3])  # CRITICAL, NORMAL, LOW
+    
+    def test_equal_priority_order_and_history_limit(self):
+        """Test kolejności przy równych priorytetach i limitu historii."""
+        order = []
+        self.event_bus.subscribe("ordered", lambda event: order.append(event.data["i"]))
+        self.event_bus.history_limit = 5
+        
+        self.event_bus.start_batch()
+        for i in range(8):
+            priority = EventPriority.HIGH if i % 3 == 0 else EventPriority.NORMAL
+            self.event_bus.emit(GameEvent("ordered", EventCategory.SYSTEM, {"i": i},
+                                          priority=priority))
+        self.event_bus.process_batch()
+        
+        self.assertEqual(order, [0, 3, 6, 1, 2, 4, 5, 7])
+        history = self.event_bus.get_history(limit=3)
+        self.assertEqual([event.data["i"] for event in history], [4, 5, 7])
+        self.assertEqual(len(self.event_bus.event_history), 5)
+    
+    def test_dispatch_rebuilt_on_subscription_change(self):
+        """Test krotek handlerów po zmianie subskrypcji i wyłączonych statystyk."""
+        calls = []
+        by_type = lambda event: calls.append("typ")
+        by_category = lambda event: calls.append("kategoria")
+        bus = EventBus(collect_stats=False)
+        bus.subscribe_category(EventCategory.COMBAT, by_category)
+        bus.subscribe("combat_attack", by_type)
+        
+        bus.emit(GameEvent("combat_attack", EventCategory.COMBAT, {}))
+        self.assertEqual(calls, ["typ", "kategoria"])
+        
+        bus.unsubscribe("combat_attack", by_type)
+        bus.emit(GameEvent("combat_attack", EventCategory.COMBAT, {}))
+        self.assertEqual(calls, ["typ", "kategoria", "kategoria"])
+        
+        bus.subscribe("combat_attack", by_type)
+        bus.unsubscribe_category(EventCategory.COMBAT, by_category)
+        bus.emit(GameEvent("combat_attack", EventCategory.COMBAT, {}))
+        self.assertEqual(calls[-1:], ["typ"])
+        self.assertEqual(len(calls), 4)
+        
+        self.assertIsNone(bus.counters)
+        self.assertEqual(bus.get_stats()['total_events'], 0)
+        self.event_bus.emit(GameEvent("combat_attack", EventCategory.COMBAT, {}))
+        self.assertEqual(self.event_bus.get_stats()['events_by_type']['combat_attack'], 1)
+    
+    def test_deferred_handlers_order_backpressure_and_flush(self):
+        """Test odroczonych handlerów: kolejność, backpressure i bariera flush."""
+        bus = EventBus(deferred_workers=2, max_deferred_pending=2)
+        gate = threading.Event()
+        seen = []
+        
+        def slow(event):
+            gate.wait(1)
+            seen.append(event.data["i"])
+        
+        bus.subscribe("deferred", slow, deferred=True)
+        bus.subscribe_category(EventCategory.TRADE, slow, deferred=True)
+        releaser = threading.Timer(0.05, gate.set)
+        releaser.start()
+        for i in range(6):
+            category = EventCategory.TRADE if i % 2 else EventCategory.SYSTEM
+            bus.emit(GameEvent("deferred", category, {"i": i}))
+        
+        self.assertTrue(bus.flush(timeout=5))
+        releaser.join()
+        # Jeden handler w dwóch subskrypcjach - wspólna kolejka, kolejność emisji
+        self.assertEqual(seen, [0, 1, 1, 2, 3, 3, 4, 5, 5])
+        stats = bus.executor.get_stats()
+        handler_stats = next(iter(stats['handlers'].values()))
+        self.assertEqual(stats['pending'], 0)
+        self.assertEqual(handler_stats['completed'], 9)
+        self.assertLessEqual(handler_stats['max_depth'], 2)
+        self.assertGreater(handler_stats['blocked'], 0)
+        
+        bus.unsubscribe("deferred", slow)
+        bus.unsubscribe_category(EventCategory.TRADE, slow)
+        bus.emit(GameEvent("deferred", EventCategory.TRADE, {"i": 6}))
+        self.assertTrue(bus.flush(timeout=5))
+        self.assertEqual(len(seen), 9)
+        bus.executor.shutdown()
 
 
 class TestPrison(unittest.TestCase):
@@ -277,6 +359,83 @@ class TestNPCSystem(unittest.TestCase):
         self.assertIsNotNone(rel)
         self.assertGreater(rel.trust, 0)
 
+    def test_shared_content_store(self):
+        """Test współdzielonego, niezmiennego widoku npc_complete.json z DataLoader."""
+        import tempfile
+        from core.data_loader import DataLoader, data_loader
+        from npcs.dialogue_system import DialogueSystem
+
+        # NPCManager i system dialogów dostają ten sam obiekt - jedno parsowanie
+        shared = data_loader.load_file("data/npc_complete.json")
+        self.assertIs(DialogueSystem().npc_complete_data, shared)
+        with self.assertRaises(TypeError):
+            shared["npcs"]["brutus"]["gold"] = 0
+        # NPC dostaje własną, modyfikowalną kopię
+        npc = NPCManager("data/npc_complete.json").npcs["brutus"]
+        npc.inventory["kamień"] = 1
+        self.assertNotIn("kamień", shared["npcs"]["brutus"].get("inventory", {}))
+        
+        loader = DataLoader()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tresc.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"lista": [1, [2]], "mapa": {"a": 1}}, f)
+            first = loader.load_file(path)
+            self.assertIs(loader.load_file(path), first)
+            self.assertEqual(loader.parse_count, 1)
+            self.assertEqual(first["lista"], (1, (2,)))
+            self.assertIsInstance(first["mapa"], dict)
+            
+            # Zmiana pliku (czas modyfikacji) unieważnia widok
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"lista": [3]}, f)
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            self.assertEqual(loader.load_file(path)["lista"], (3,))
+            self.assertEqual(loader.parse_count, 2)
+
+    def test_content_bundle(self):
+        """Test binarnego pakietu treści - odczyt przez DataLoader i unieważnianie."""
+        import tempfile
+        from core.content_bundle import ContentBundle, build_bundle
+        from core.data_loader import DataLoader, read_json_view
+
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "npcs"))
+            npc_path = os.path.join(tmp, "npcs", "npc.json")
+            items_path = os.path.join(tmp, "items.json")
+            with open(npc_path, "w", encoding="utf-8") as f:
+                json.dump({"npcs": {"brutus": {"role": "guard", "cechy": ["zły"]}}}, f)
+            with open(items_path, "w", encoding="utf-8") as f:
+                json.dump({"chleb": {"waga": 0.5}}, f)
+
+            summary = build_bundle(tmp)
+            self.assertTrue(summary["rebuilt"])
+            self.assertEqual(summary["files"], 2)
+            self.assertFalse(build_bundle(tmp)["rebuilt"])
+
+            loader = DataLoader(tmp)
+            view = loader.load_file(npc_path)
+            self.assertEqual(view, read_json_view(npc_path))
+            self.assertEqual(view["npcs"]["brutus"]["cechy"], ("zły",))
+            with self.assertRaises(TypeError):
+                view["npcs"]["brutus"]["role"] = "kucharz"
+            self.assertEqual((loader.bundle_hits, loader.parse_count), (1, 0))
+
+            # Plik zmieniony po zbudowaniu pakietu jest czytany z JSON
+            with open(items_path, "w", encoding="utf-8") as f:
+                json.dump({"chleb": {"waga": 0.7}}, f)
+            stat = os.stat(items_path)
+            os.utime(items_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            self.assertEqual(loader.load_file(items_path)["chleb"]["waga"], 0.7)
+            self.assertEqual((loader.bundle_hits, loader.parse_count), (1, 1))
+            loader.close_bundle()
+
+            bundle = ContentBundle(os.path.join(tmp, "content.bundle"), tmp)
+            self.assertFalse(bundle.is_current())
+            bundle.close()
+            self.assertTrue(build_bundle(tmp)["rebuilt"])
+
 
 class TestEconomy(unittest.TestCase):
     """Testy systemu ekonomii."""
@@ -454,6 +613,106 @@ class TestQuestSystem(unittest.TestCase):
         
         # Sprawdź czy quest jest odkryty
         self.assertTrue(test_quest.is_discovered)
+    
+    def test_compiled_seed_activation_tracks_dependencies(self):
+        """Test skompilowanych warunków i sprawdzania tylko ziaren zależnych od zmian."""
+        from datetime import datetime
+        from core.world_state import WorldState
+        from quests.quest_engine import QuestSeed, DiscoveryMethod
+        
+        seed = QuestSeed("glod", "Głód", {"economy.food_supply": {"operator": "<", "value": 3},
+                                          "day": {"operator": ">=", "value": 2}},
+                         [DiscoveryMethod.OVERHEARD], {})
+        self.assertFalse(seed.check_activation(self.world_state))
+        self.assertTrue(seed.check_activation({"economy": {"food_supply": 1}, "day": 2}))
+        self.assertFalse(seed.check_activation({"economy": 5, "day": 2}))
+        self.assertEqual(seed.dependencies, ("economy.food_supply", "day"))
+        
+        checked = []
+        world = WorldState(self.world_state)
+        self.quest_engine.world_state = world
+        for i in range(50):
+            other = QuestSeed(f"inne_{i}", "Inne", {f"flaga_{i}": True},
+                              [DiscoveryMethod.OVERHEARD], {})
+            self.quest_engine.register_seed(other)
+        self.quest_engine.register_seed(seed)
+        original = QuestSeed.check_activation
+        
+        def counting(seed_self, world_state):
+            checked.append(seed_self.quest_id)
+            return original(seed_self, world_state)
+        
+        with patch.object(QuestSeed, 'check_activation', counting):
+            self.quest_engine.update(datetime.now())
+            self.assertEqual(len(checked), 51)
+            
+            checked.clear()
+            world.set("game_time", 421)
+            world["day"] = 2
+            self.quest_engine.update(datetime.now())
+            self.assertEqual(checked, ["glod"])
+            self.assertNotIn("glod", self.quest_engine.active_quests)
+            
+            checked.clear()
+            world.set_nested("economy", "food_supply", 1)
+            self.quest_engine.update(datetime.now())
+            self.assertEqual(checked, ["glod"])
+            self.assertIn("glod", self.quest_engine.active_quests)
+            
+            checked.clear()
+            world["flaga_7"] = True
+            self.quest_engine.update(datetime.now())
+            self.assertEqual(checked, ["inne_7"])
+
+    def test_consequence_scheduler(self):
+        """Test harmonogramu konsekwencji: kolejność, anulowanie, cykliczne i łańcuchy."""
+        from datetime import datetime, timedelta
+        from core.scheduler import Scheduler
+        from core.world_state import WorldState
+        from quests.consequences import Consequence, ConsequenceType, ConsequenceSeverity
+
+        scheduler = Scheduler()
+        scheduler.schedule("c", 30, "C")
+        scheduler.schedule("a", 10, "A")
+        scheduler.schedule("b", 20, "B", interval=15)
+        scheduler.schedule("a", 25, "A")  # Przeplanowanie
+        self.assertTrue(scheduler.cancel("c"))
+        self.assertEqual(scheduler.next_due(), 20)
+        self.assertEqual(scheduler.pop_due(40), [(20, "b", "B"), (25, "a", "A"), (35, "b", "B")])
+        self.assertEqual(scheduler.items(), [(50, "b", "B")])
+
+        base = datetime(1000, 1, 1)
+
+        def make(cid, hours, kind=ConsequenceType.DELAYED, **kwargs):
+            return Consequence(cid, "q", kind, ConsequenceSeverity.MINOR, cid,
+                               trigger_time=base + timedelta(hours=hours) if hours is not None else None,
+                               **kwargs)
+
+        manager = ConsequenceManager()
+        world = WorldState({"bunt": False})
+        manager.register_consequence(make("zaraza", 1, ConsequenceType.RECURRING))
+        manager.register_consequence(make("zemsta", 2, trigger_conditions={"bunt": True}))
+        manager.register_consequence(make("anulowana", 3))
+        self.assertTrue(manager.cancel_consequence("anulowana"))
+        manager.create_chain("lancuch", [make("krok1", 1), make("krok2", None)])
+        manager.chains["lancuch"].add_consequence(make("krok3", None), delay_hours=5)
+
+        manager.update(3 * 24 * 60 + 60, world)
+        fired = [entry['consequence'] for entry in manager.history]
+        self.assertEqual(fired.count("zaraza"), 4)  # Godziny 1, 25, 49 i 73
+        self.assertNotIn("zemsta", fired)
+        self.assertNotIn("anulowana", fired)
+        self.assertEqual([c.id for c in manager.scheduled_consequences], ["zemsta", "zaraza"])
+        self.assertEqual(manager.scheduler.due_of(("chain", "lancuch")), base + timedelta(hours=1))
+
+        world["bunt"] = True
+        manager.update(3 * 24 * 60 + 61, world)
+        fired = [entry['consequence'] for entry in manager.history]
+        self.assertIn("zemsta", fired)
+        self.assertEqual(manager.scheduler.due_of(("chain", "lancuch")), base + timedelta(hours=6))
+        self.assertTrue(manager.cancel_chain("lancuch"))
+        self.assertTrue(manager.cancel_consequence("zaraza"))
+        self.assertFalse(manager.scheduler)
 
 
 class TestGameState(unittest.TestCase):
@@ -504,6 +763,425 @@ class TestGameState(unittest.TestCase):
         self.assertEqual(new_state.game_time, 500)
         self.assertIn("test_secret", new_state.discovered_secrets)
 
+    def test_save_manager_delta_journal(self):
+        """Test zapisu przyrostowego - snapshot, dziennik delt, awaria, kompaktowanie."""
+        import tempfile
+        self.game_state.init_game("TestPlayer", "normal")
+        self.game_state.update(10)
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(SaveManager, 'SAVE_DIR', tmp), \
+                patch.object(SaveManager, 'BACKUP_DIR', os.path.join(tmp, 'backups')):
+            manager = SaveManager()
+            self.assertTrue(manager.save_delta(self.game_state, 99))
+            self.assertEqual(manager.last_save_stats['mode'], 'snapshot')
+
+            # Delta zawiera tylko zmienione rekordy
+            self.game_state.game_flags['delta_flag'] = True
+            self.game_state.update(10)
+            self.assertTrue(manager.save_delta(self.game_state, 99))
+            stats = manager.last_save_stats
+            self.assertEqual(stats['mode'], 'delta')
+            self.assertLess(stats['changed'], stats['records'] // 4)
+            self.assertEqual(manager.get_metadata(99).deltas, 1)
+
+            self.game_state.discovered_secrets.add("delta_secret")
+            self.assertTrue(manager.save_delta(self.game_state, 99))
+
+            # Awaria w trakcie dopisywania - urwany wpis jest pomijany
+            journal_path = manager.get_journal_path(99)
+            valid_size = os.path.getsize(journal_path)
+            with open(journal_path, 'ab') as f:
+                f.write(b'0123 {"seq":3,"set":[')
+
+            loaded = SaveManager().load_game(99)
+            self.assertTrue(loaded['game_flags']['delta_flag'])
+            self.assertIn("delta_secret", loaded['discovered_secrets'])
+            self.assertEqual(loaded['game_time'], self.game_state.game_time)
+            self.assertEqual(os.path.getsize(journal_path), valid_size)
+
+            # Kompaktowanie - nowy snapshot zeruje dziennik
+            manager.COMPACT_EVERY = 2
+            self.assertTrue(manager.save_delta(self.game_state, 99))
+            self.assertEqual(manager.last_save_stats['mode'], 'snapshot')
+            self.assertFalse(os.path.exists(journal_path))
+            self.assertEqual(manager.get_metadata(99).deltas, 0)
+            self.assertIn("delta_secret", SaveManager().load_game(99)['discovered_secrets'])
+
+    def test_save_manager_stale_journal_after_snapshot(self):
+        """Test awarii między podmianą snapshotu a metadanymi - stary dziennik nie cofa stanu."""
+        import tempfile
+        import shutil
+        self.game_state.init_game("TestPlayer", "normal")
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(SaveManager, 'SAVE_DIR', tmp), \
+                patch.object(SaveManager, 'BACKUP_DIR', os.path.join(tmp, 'backups')):
+            manager = SaveManager()
+            self.assertTrue(manager.save_delta(self.game_state, 99))
+            self.game_state.game_flags['delta_flag'] = True
+            self.assertTrue(manager.save_delta(self.game_state, 99))
+            self.assertEqual(manager.last_save_stats['mode'], 'delta')
+
+            journal_path = manager.get_journal_path(99)
+            meta_path = manager.get_metadata_path(99)
+            shutil.copy(journal_path, f"{journal_path}.old")
+            shutil.copy(meta_path, f"{meta_path}.old")
+
+            # Nowy snapshot, po czym "awaria" - stare metadane i dziennik zostają
+            self.game_state.game_flags['delta_flag'] = False
+            self.assertTrue(manager.save_game(self.game_state, 99))
+            os.replace(f"{journal_path}.old", journal_path)
+            os.replace(f"{meta_path}.old", meta_path)
+
+            loaded = SaveManager().load_game(99)
+            self.assertFalse(loaded['game_flags']['delta_flag'])
+            self.assertFalse(os.path.exists(journal_path))
+
+    def test_save_manager_crash_around_snapshot_replace(self):
+        """Test awarii przy podmianie snapshotu - potwierdzone delty nie giną."""
+        import tempfile
+        self.game_state.init_game("TestPlayer", "normal")
+        real_replace, real_remove = os.replace, os.remove
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(SaveManager, 'SAVE_DIR', tmp), \
+                patch.object(SaveManager, 'BACKUP_DIR', os.path.join(tmp, 'backups')):
+            manager = SaveManager()
+            journal_path = manager.get_journal_path(99)
+            self.assertTrue(manager.save_delta(self.game_state, 99))
+            self.game_state.game_flags['delta_flag'] = True
+            self.assertTrue(manager.save_delta(self.game_state, 99))
+
+            def crash_on_snapshot(src, dst):
+                if dst.endswith('.sav.gz'):
+                    raise OSError("awaria przed podmianą snapshotu")
+                return real_replace(src, dst)
+
+            # Awaria przed podmianą - stary snapshot z dziennikiem
+            self.game_state.game_flags['delta_flag'] = False
+            with patch('os.replace', side_effect=crash_on_snapshot):
+                self.assertFalse(manager.save_game(self.game_state, 99))
+            self.assertTrue(os.path.exists(journal_path))
+            self.assertTrue(SaveManager().load_game(99)['game_flags']['delta_flag'])
+
+            def crash_on_journal(path):
+                if path == journal_path:
+                    raise OSError("awaria przed usunięciem dziennika")
+                return real_remove(path)
+
+            # Awaria po podmianie - nowy snapshot, stary dziennik pominięty
+            with patch('os.remove', side_effect=crash_on_journal):
+                self.assertFalse(manager.save_game(self.game_state, 99))
+            self.assertTrue(os.path.exists(journal_path))
+            self.assertFalse(SaveManager().load_game(99)['game_flags']['delta_flag'])
+
+    def test_save_manager_backup_rotation_keeps_sets(self):
+        """Test rotacji backupów - liczone i usuwane są całe komplety plików."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(SaveManager, 'SAVE_DIR', tmp), \
+                patch.object(SaveManager, 'BACKUP_DIR', os.path.join(tmp, 'backups')):
+            manager = SaveManager()
+            for day in range(1, 6):
+                for slot in (1, 2):
+                    for ext in ('.sav.gz', '.meta', '.wal'):
+                        path = os.path.join(manager.BACKUP_DIR,
+                                            f"slot_{slot}_backup_202601{day:02d}_120000{ext}")
+                        with open(path, 'w') as f:
+                            f.write("x")
+                        # Czas modyfikacji z copy2 nie mówi nic o wieku backupu
+                        os.utime(path, (1000 - day, 1000 - day))
+
+            manager.cleanup_old_backups(3)
+
+            remaining = sorted(os.listdir(manager.BACKUP_DIR))
+            self.assertEqual(len(remaining), 2 * 3 * 3)
+            for slot in (1, 2):
+                for day in (3, 4, 5):
+                    for ext in ('.sav.gz', '.meta', '.wal'):
+                        self.assertIn(f"slot_{slot}_backup_202601{day:02d}_120000{ext}", remaining)
+
+    def test_background_save(self):
+        """Test zapisu w tle - spójna migawka, wydarzenia postępu i zakończenia."""
+        from core.background_save import background_saver
+        from core.event_bus import event_bus
+        self.game_state.init_game("TestPlayer", "normal")
+        events = []
+        handler = lambda event: events.append(event)
+        event_bus.subscribe("save_progress", handler)
+        event_bus.subscribe("save_completed", handler)
+        try:
+            self.game_state.game_flags['background'] = 1
+            self.assertTrue(self.game_state.save_game(1, deferred=True))
+            # Zmiana po zleceniu zapisu nie trafia do migawki
+            self.game_state.game_flags['background'] = 2
+            self.assertTrue(background_saver.wait("saves/save_1.json", timeout=10))
+
+            # Wydarzenia emitowane w wątku gry (GameState.update)
+            self.game_state.update(1)
+            completed = [e for e in events if e.event_type == "save_completed"]
+            self.assertEqual(len(completed), 1)
+            self.assertTrue(completed[0].data['success'])
+            self.assertEqual(completed[0].data['slot'], 1)
+            stages = [e.data['stage'] for e in events if e.event_type == "save_progress"]
+            self.assertEqual(stages[0], 'snapshot')
+            self.assertIn('write', stages)
+
+            with open("saves/save_1.json", encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['game_flags']['background'], 1)
+        finally:
+            event_bus.unsubscribe("save_progress", handler)
+            event_bus.unsubscribe("save_completed", handler)
+
+    def test_background_saver_no_overlap(self):
+        """Test kolejki zapisów w tle - jeden zapis na plik, nowsza migawka zastępuje starszą."""
+        from core.background_save import BackgroundSaver
+        saver = BackgroundSaver()
+        started = threading.Event()
+        release = threading.Event()
+        active = []
+        written = []
+        overlaps = []
+
+        def write(data, progress):
+            active.append(data['n'])
+            if len(active) > 1:
+                overlaps.append(list(active))
+            started.set()
+            release.wait(5)
+            written.append(data['n'])
+            active.remove(data['n'])
+
+        saver.submit("slot", {'n': 1}, write)
+        self.assertTrue(started.wait(5))
+        saver.submit("slot", {'n': 2}, write)
+        saver.submit("slot", {'n': 3}, write)
+        release.set()
+        self.assertTrue(saver.wait("slot", timeout=10))
+
+        self.assertEqual(written, [1, 3])
+        self.assertEqual(overlaps, [])
+        self.assertEqual(saver.superseded, 1)
+
+        # Zapis synchroniczny unieważnia czekającą migawkę
+        release.clear()
+        started.clear()
+        saver.submit("slot", {'n': 4}, write)
+        self.assertTrue(started.wait(5))
+        saver.submit("slot", {'n': 5}, write)
+        release.set()
+        saver.run("slot", lambda: written.append('sync'))
+        self.assertTrue(saver.wait("slot", timeout=10))
+        self.assertEqual(written[2:], [4, 'sync'])
+        self.assertEqual(saver.get_stats()['completed'], 3)
+
+    def test_tick_profiler(self):
+        """Test profilera ticku - podsystemy, NPCe i węzły drzew."""
+        import tempfile
+        self.game_state.init_game("TestPlayer", "normal")
+        profiler = self.game_state.profiler
+        profiler.reset()
+        profiler.sample_every = 1
+        
+        for _ in range(3):
+            self.game_state.update(10)
+        
+        report = profiler.report()
+        self.assertEqual(report['ticks'], 3)
+        for section in ("tick", "npc_manager", "quest_engine", "player", "event_bus"):
+            self.assertEqual(report['sections'][section]['count'], 3)
+        self.assertTrue(report['hot_npcs'])
+        self.assertTrue(report['hot_nodes'])
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profil.json")
+            profiler.dump_json(path)
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['ticks'], 3)
+        
+        # Magistrala bez statystyk - czas wydarzeń liczony jako zero
+        from core.profiler import TickProfiler
+        quiet = TickProfiler(EventBus(collect_stats=False))
+        quiet.begin_tick()
+        quiet.end_tick()
+        self.assertEqual(quiet.report()['sections']['event_bus']['count'], 1)
+    
+    def test_incremental_world_state(self):
+        """Test przyrostowego stanu świata i zbioru zmian dla konsumentów."""
+        from core.event_bus import event_bus
+        self.game_state.init_game("TestPlayer", "normal")
+        self.game_state.update(1)
+        world = self.game_state.world
+        self.assertIs(self.game_state.quest_engine.world_state, world)
+        self.assertIn('average_prices', world['economy'])
+        
+        reader = world.reader()
+        reader.poll()
+        self.game_state.update(1)
+        changes = reader.poll()
+        self.assertIn('game_time', changes)
+        self.assertNotIn('economy', changes)
+        self.assertFalse(any(path.startswith('player_reputation') for path in changes))
+        
+        npc_id = next(iter(self.game_state.npc_manager.npcs))
+        npc = self.game_state.npc_manager.npcs[npc_id]
+        npc.modify_relationship("player", trust=50, familiarity=50)
+        event_bus.emit(GameEvent("dialogue_spoken", EventCategory.DIALOGUE, {},
+                                 source="player", target=npc_id))
+        self.game_state.set_flag("rozmowa_z_npc")
+        self.game_state.update(1)
+        changes = reader.poll()
+        self.assertIn(f'player_reputation.{npc_id}', changes)
+        self.assertIn('game_flags.rozmowa_z_npc', changes)
+        self.assertGreater(world.view()['player_reputation'][npc_id], 0)
+        self.assertTrue(world.changed_since(0, ['game_flags.rozmowa_z_npc']))
+        
+        # get_world_state zwraca kopię - zmiany nie trafiają do stanu świata
+        state = self.game_state.get_world_state()
+        state['game_flags']['obca'] = True
+        self.assertNotIn('obca', self.game_state.game_flags)
+    
+    def test_game_clock_drives_subsystems(self):
+        """Test wspólnego zegara gry - podsystemy nie czytają zegara systemowego."""
+        from core.game_clock import GameClock
+        self.game_state.init_game("TestPlayer", "normal")
+        clock = self.game_state.clock
+        self.assertEqual(clock.minutes, 420)
+        self.assertEqual(clock.now(), GameClock.to_datetime(420))
+
+        for _ in range(20):
+            self.game_state.update(60)
+
+        self.assertEqual(clock.minutes, 420 + 20 * 60)
+        self.assertEqual((clock.day, clock.minute_of_day), (self.game_state.day, self.game_state.game_time))
+        self.assertEqual(self.game_state.quest_engine.now(), clock.now())
+        self.assertEqual(self.game_state.consequence_manager.current_time, clock.now())
+        npc_manager = self.game_state.npc_manager
+        self.assertEqual(npc_manager.last_update, clock.time())
+        npc = next(iter(npc_manager.npcs.values()))
+        self.assertEqual(npc._hour_at(npc._now()), clock.hour)
+        self.assertRaises(ValueError, clock.advance, -1)
+
+    def test_headless_simulation(self):
+        """Test symulacji bez interfejsu - raport i powtarzalność dla ziarna."""
+        from core.headless import HeadlessSimulation
+
+        def simulate():
+            GameState._instance = None
+            state = GameState()
+            report = HeadlessSimulation(state, seed=7, tick_minutes=5).run(hours=12)
+            npcs = sorted((npc.id, npc.location, round(npc.hunger, 6), npc.current_state.value)
+                          for npc in state.npc_manager.npcs.values())
+            return report, npcs
+
+        report, npcs = simulate()
+        self.assertEqual(report['ticks'], 144)
+        self.assertEqual(report['game_hours'], 12)
+        self.assertGreater(report['ticks_per_second'], 0)
+        self.assertIn('npc_manager', report['subsystems'])
+        self.assertIn('quest_engine', report['subsystems'])
+        self.assertIn("Ticki/s", HeadlessSimulation.format_report(report))
+
+        second_report, second_npcs = simulate()
+        self.assertEqual(npcs, second_npcs)
+        self.assertEqual(report['events'], second_report['events'])
+
+    def test_batch_runner(self):
+        """Test wsadowej symulacji światów w puli procesów do pliku CSV."""
+        import csv
+        import tempfile
+        from core.batch_runner import metric_columns, run_batch
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "swiaty.csv")
+            summary = run_batch([3, 4], hours=4, output=path, processes=2, sample_hours=2)
+            self.assertEqual(summary['worlds'], 2)
+            self.assertEqual(summary['rows'], 4)
+            with open(path, newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+
+        self.assertEqual(list(rows[0].keys()), metric_columns())
+        self.assertEqual(sorted({row['seed'] for row in rows}), ['3', '4'])
+        self.assertEqual(sorted(float(row['game_hours']) for row in rows), [2, 2, 4, 4])
+        self.assertTrue(all(float(row['price_chleb']) > 0 for row in rows))
+        self.assertTrue(all(int(row['active_quests']) >= 0 for row in rows))
+
+    def test_statistics_update_synchronously(self):
+        """Test statystyk aktualizowanych od razu przy emisji, bez event_bus.flush()."""
+        from core.event_bus import emit_combat_event, emit_trade_event
+        self.game_state.init_game("TestPlayer", "normal")
+        dealt = self.game_state.statistics['total_damage_dealt']
+        spent = self.game_state.statistics['money_spent']
+        
+        emit_combat_event("attack", "player", "szczur", damage=5)
+        emit_trade_event("player", "gadatliwy_piotr", "chleb", 3)
+        self.assertEqual(self.game_state.statistics['total_damage_dealt'], dealt + 5)
+        self.assertEqual(self.game_state.statistics['money_spent'], spent + 3)
+    
+    def test_event_journal_replay(self):
+        """Test binarnego dziennika wydarzeń i odtwarzania do świeżego stanu gry."""
+        import tempfile
+        from core.event_bus import event_bus, emit_combat_event, emit_trade_event
+        from core.event_journal import read_journal
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sesja.evj")
+            self.game_state.start_journal(path)
+            try:
+                emit_combat_event("attack", "player", "szczur", damage=7)
+                emit_combat_event("kill", "player", "szczur")
+                emit_trade_event("player", "gadatliwy_piotr", "chleb", 4)
+                event_bus.emit(GameEvent("location_discovered", EventCategory.DISCOVERY,
+                                         {"location_id": "kuchnia"}))
+            finally:
+                self.assertEqual(self.game_state.stop_journal(), path)
+            
+            events = list(read_journal(path))
+            self.assertEqual([event.event_type for event in events],
+                             ["combat_attack", "combat_kill", "trade_completed",
+                              "location_discovered"])
+            self.assertEqual(events[0].data["damage"], 7)
+            self.assertEqual(events[0].priority, EventPriority.HIGH)
+            self.assertEqual(events[2].target, "gadatliwy_piotr")
+            
+            # Przerwany zapis - niekompletny ostatni rekord jest pomijany
+            with open(path, "ab") as f:
+                f.write(b"\x40\x00\x00\x00partial")
+            
+            GameState._instance = None
+            fresh = GameState()
+            self.assertEqual(fresh.replay_journal(path), 4)
+            event_bus.flush()
+            self.assertEqual(fresh.statistics['total_damage_dealt'], 7)
+            self.assertEqual(fresh.statistics['enemies_killed'], 1)
+            self.assertEqual(fresh.statistics['money_spent'], 4)
+            self.assertIn("kuchnia", fresh.discovered_locations)
+
+    def test_event_journal_flushed_at_exit(self):
+        """Test domknięcia aktywnego dziennika przy wyjściu bez stop_journal."""
+        import subprocess
+        import tempfile
+        from core.event_journal import read_journal
+        
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "wyjscie.evj")
+            script = (
+                "import sys\n"
+                "from core.game_state import game_state\n"
+                "from core.event_bus import emit_combat_event\n"
+                f"game_state.start_journal({path!r})\n"
+                "emit_combat_event('attack', 'player', 'szczur', damage=3)\n"
+                "sys.exit(0)\n"
+            )
+            result = subprocess.run([sys.executable, "-c", script], cwd=root,
+                                    capture_output=True, timeout=60)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            
+            events = list(read_journal(path))
+            self.assertEqual([event.event_type for event in events], ["combat_attack"])
+
 
 class TestCommandParser(unittest.TestCase):
     """Testy parsera komend."""
@@ -539,6 +1217,17 @@ class TestCommandParser(unittest.TestCase):
         success, message = self.parser.parse_and_execute("pomoc")
         self.assertTrue(success)
         self.assertIn("DOSTĘPNE KOMENDY", message)
+    
+    def test_profile_command(self):
+        """Test komendy profilera."""
+        self.game_state.update(10)
+        success, message = self.parser.parse_and_execute("profil")
+        self.assertTrue(success)
+        self.assertIn("PROFIL TICKU", message)
+        
+        success, _ = self.parser.parse_and_execute("profil reset")
+        self.assertTrue(success)
+        self.assertEqual(self.game_state.profiler.ticks, 0)
 
 
 class TestIntegration(unittest.TestCase):
@@ -634,6 +1323,31 @@ class TestPerformance(unittest.TestCase):
         self.assertIsNotNone(game_state.npc_manager)
         self.assertTrue(game_state.player.health > 0)
 
+    def test_lazy_imports(self):
+        """Test leniwego grafu importów i odroczonego craftingu."""
+        from core.profiler import import_time_report, parse_importtime
+
+        parsed = parse_importtime("import time: self [us] | cumulative | imported package\n"
+                                  "import time:       120 |        450 | core.event_bus\n")
+        self.assertEqual(parsed, {'core.event_bus': (120, 450)})
+
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        report = import_time_report('main', cwd=root)
+        self.assertIn('main', report['modules'])
+        self.assertGreater(report['total_ms'], 0)
+        for module in ('numpy', 'world.locations.dark_forest', 'world.locations.market_town',
+                       'mechanics.crafting', 'ui.smart_interface'):
+            self.assertNotIn(module, report['modules'])
+
+        # Crafting budowany przy pierwszym użyciu
+        GameState._instance = None
+        game_state = GameState()
+        game_state.init_game("LazyTest", "normal")
+        self.assertFalse(game_state.crafting_ready)
+        self.assertIsNotNone(game_state.crafting_system)
+        self.assertTrue(game_state.crafting_ready)
+        self.assertIs(game_state.crafting, game_state.crafting_system)
+
 
 def run_all_tests():
     """Uruchom wszystkie testy."""
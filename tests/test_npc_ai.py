@@ -6,6 +6,7 @@ Sprawdza behavior trees, pamięć, rutyny i interakcje społeczne
 import unittest
 import time
 import random
+from collections import defaultdict
 from unittest.mock import Mock, patch
 import sys
 import os
@@ -19,6 +20,11 @@ from npcs.ai_behaviors import (
     ConditionalNode, ActionNode, PriorityNode, ParallelNode,
     is_hungry, is_tired, is_under_attack, flee, eat_meal, sleep
 )
+from npcs.behavior_compiler import BehaviorTreeCache, compile_behavior_tree
+from npcs.simulation_lod import SimulationTier
+from npcs.wake_scheduler import WakeReason
+from core.event_bus import EventBus, GameEvent, EventCategory
+from npcs.vectorized_state import NUMPY_AVAILABLE
 from npcs.memory_system import (
     IntegratedMemorySystem, EpisodicMemory, SemanticMemory,
     ProceduralMemory, EmotionalMemory, MemoryTrace
@@ -733,6 +739,694 @@ class TestCombatIntegration(unittest.TestCase):
         self.assertIn("attacked", attack_memories[0]["event_type"])
 
 
+class TestSpatialIndex(unittest.TestCase):
+    """Testy indeksu przestrzennego NPCów"""
+    
+    def setUp(self):
+        """Przygotowanie do testów"""
+        self.manager = NPCManager("data/npc_complete.json")
+    
+    def _scan(self, location):
+        """Referencyjny skan liniowy"""
+        return [npc for npc in self.manager.npcs.values() if npc.location == location]
+    
+    def test_index_matches_linear_scan(self):
+        """Test zgodności indeksu ze skanem wszystkich NPCów"""
+        locations = {npc.location for npc in self.manager.npcs.values()}
+        for location in locations:
+            self.assertEqual(self.manager.get_npcs_in_location(location), self._scan(location))
+        self.assertEqual(self.manager.check_location_index(), [])
+    
+    def test_index_follows_moves(self):
+        """Test aktualizacji indeksu przy ruchu NPCa"""
+        npc = next(iter(self.manager.npcs.values()))
+        old_location = npc.location
+        
+        npc.current_location = "mess_hall"
+        self.assertIn(npc, self.manager.get_npcs_in_location("mess_hall"))
+        self.assertNotIn(npc, self.manager.get_npcs_in_location(old_location))
+        
+        npc.location = "tunnel"
+        self.assertEqual(self.manager.location_index.location_of(npc.id), "tunnel")
+        self.assertEqual(self.manager.check_location_index(), [])
+    
+    def test_index_follows_registry_changes(self):
+        """Test dodawania i usuwania NPCów bezpośrednio przez słownik"""
+        rat = NPC({"id": "rat_1", "name": "Szczur", "role": "creature",
+                   "location": "cela_1", "personality": []})
+        self.manager.npcs["rat_1"] = rat
+        self.assertIn(rat, self.manager.get_npcs_in_location("cela_1"))
+        self.assertIsNone(rat.clock)
+        
+        del self.manager.npcs["rat_1"]
+        self.assertNotIn(rat, self.manager.get_npcs_in_location("cela_1"))
+        self.assertIsNone(rat._location_index)
+        
+        # Ruch odpiętego NPCa nie psuje indeksu
+        rat.location = "kuchnia"
+        self.assertEqual(self.manager.check_location_index(), [])
+    
+    def test_registry_attaches_manager_clock(self):
+        """Test podpięcia zegara gry NPCom dodanym po set_clock"""
+        from core.game_clock import GameClock
+        clock = GameClock(6 * 60)
+        self.manager.set_clock(clock)
+        rat = NPC({"id": "rat_1", "name": "Szczur", "role": "creature",
+                   "location": "cela_1", "personality": []})
+        self.manager.npcs["rat_1"] = rat
+        self.assertIs(rat.clock, clock)
+        self.assertEqual(rat._now(), clock.time())
+    
+    def test_consistency_checker_detects_corruption(self):
+        """Test wykrywania niespójności indeksu"""
+        npc = next(iter(self.manager.npcs.values()))
+        npc._location = "gdzies_indziej"  # Obejście settera
+        errors = self.manager.check_location_index()
+        self.assertTrue(any(npc.id in error for error in errors))
+
+
+class TestSocialInteractionPass(unittest.TestCase):
+    """Testy grupowanego przebiegu interakcji społecznych"""
+    
+    def _make_manager(self, seed):
+        """Manager z NPCami w dwóch lokacjach i mieszanymi relacjami"""
+        manager = NPCManager("data/npc_complete.json")
+        manager.set_interaction_seed(seed)
+        for i, npc in enumerate(manager.npcs.values()):
+            npc.location = "mess_hall" if i % 2 else "dziedziniec"
+            npc.current_state = [NPCState.SOCIALIZING, NPCState.IDLE, NPCState.WORKING][i % 3]
+            npc.relationships.clear()
+        ids = list(manager.npcs.keys())
+        for i, npc_id in enumerate(ids):
+            other = ids[(i + 2) % len(ids)]
+            sign = 1 if i % 2 else -1
+            manager.npcs[npc_id].modify_relationship(
+                other, trust=80 * sign, affection=80 * sign, familiarity=100)
+        return manager
+    
+    def _interaction_result(self, manager):
+        """Porównywalny wynik przebiegu (bez znaczników czasu)"""
+        events = [(e["participants"], e["interaction_type"], e["location"])
+                  for e in manager.world_events]
+        relations = {
+            (npc.id, target): (r.trust, r.affection, r.respect, r.fear, r.familiarity)
+            for npc in manager.npcs.values() for target, r in npc.relationships.items()
+        }
+        memories = {npc.id: len(npc.episodic_memory) for npc in manager.npcs.values()}
+        return events, relations, memories
+    
+    def test_seeded_mode_matches_pairwise_loop(self):
+        """Test zgodności z pełną pętlą po parach przy tym samym seedzie"""
+        bucketed = self._make_manager(1234)
+        pairwise = self._make_manager(1234)
+        
+        for _ in range(3):
+            bucketed._process_npc_interactions()
+            pairwise._process_npc_interactions_pairwise()
+        
+        self.assertTrue(len(bucketed.world_events) > 0)
+        self.assertEqual(self._interaction_result(bucketed), self._interaction_result(pairwise))
+    
+    def test_interaction_cap_per_location(self):
+        """Test limitu interakcji na lokację na tick"""
+        manager = self._make_manager(7)
+        manager.interaction_cap = 2
+        manager._process_npc_interactions()
+        
+        per_location = {}
+        for event in manager.world_events:
+            per_location[event["location"]] = per_location.get(event["location"], 0) + 1
+        self.assertTrue(per_location)
+        self.assertTrue(all(count <= 2 for count in per_location.values()))
+
+
+class TestSimulationLOD(unittest.TestCase):
+    """Testy poziomów szczegółowości symulacji NPCów"""
+    
+    def setUp(self):
+        """Mapa liniowa a - b - c - d - e i po jednym NPCu w każdej lokacji"""
+        chain = ["a", "b", "c", "d", "e"]
+        self.locations = {}
+        for i, loc_id in enumerate(chain):
+            location = Mock()
+            neighbors = {}
+            if i > 0:
+                neighbors["zachód"] = chain[i - 1]
+            if i < len(chain) - 1:
+                neighbors["wschód"] = chain[i + 1]
+            location.get_neighbors.return_value = neighbors
+            self.locations[loc_id] = location
+        
+        self.manager = NPCManager("data/npc_complete.json")
+        self.manager.npcs.clear()
+        for loc_id in chain:
+            npc = NPC({"id": f"npc_{loc_id}", "name": loc_id, "role": "guard",
+                       "location": loc_id, "personality": []})
+            npc.behavior_tree = Mock()
+            self.manager.npcs[npc.id] = npc
+        
+        self.manager.world_locations = self.locations
+        self.manager.player_location = "a"
+        self.manager.configure_lod(full_radius=1, reduced_radius=3,
+                                   reduced_interval=4, coarse_interval=8)
+        self.context = {"time": time.time(), "hour": 12, "npcs": self.manager.npcs, "events": []}
+    
+    def test_tier_assignment(self):
+        """Test przydziału poziomów według odległości od gracza"""
+        self.manager.update(1.0, self.context)
+        lod = self.manager.lod
+        self.assertEqual(lod.tier_for("a"), SimulationTier.FULL)
+        self.assertEqual(lod.tier_for("b"), SimulationTier.FULL)
+        self.assertEqual(lod.tier_for("c"), SimulationTier.REDUCED)
+        self.assertEqual(lod.tier_for("d"), SimulationTier.REDUCED)
+        self.assertEqual(lod.tier_for("e"), SimulationTier.COARSE)
+        self.assertEqual(lod.tier_for("poza_mapa"), SimulationTier.COARSE)
+    
+    def test_far_npcs_run_behavior_tree_on_interval(self):
+        """Test wykonywania behavior tree co tick blisko i co interwał dalej"""
+        import zlib
+        with patch.object(NPC, "update", autospec=True, side_effect=NPC.update) as update:
+            for _ in range(10):
+                self.manager.update(1.0, self.context)
+        npcs = self.manager.npcs
+        self.assertEqual(npcs["npc_a"].behavior_tree.execute.call_count, 10)
+        self.assertEqual(npcs["npc_b"].behavior_tree.execute.call_count, 10)
+        
+        # REDUCED co 4 ticki (per NPC), COARSE co 8 ticków (per lokacja)
+        for far_id, key, interval in [("npc_c", "npc_c", 4), ("npc_d", "npc_d", 4),
+                                      ("npc_e", "e", 8)]:
+            due = [tick for tick in range(1, 11)
+                   if (tick + zlib.crc32(key.encode('utf-8'))) % interval == 0]
+            self.assertTrue(due)
+            self.assertEqual(npcs[far_id].behavior_tree.execute.call_count, len(due))
+            # Każdy krok oddaje cały zaległy czas od poprzedniego
+            deltas = [call.args[1] for call in update.call_args_list
+                      if call.args[0] is npcs[far_id]]
+            self.assertEqual(deltas, [float(tick - prev) for prev, tick in zip([0] + due, due)])
+    
+    def test_catch_up_matches_per_tick_needs(self):
+        """Test dokładności domkniętego nadrabiania potrzeb"""
+        ticked = NPC({"id": "t1", "name": "t", "role": "guard", "location": "x",
+                      "personality": [], "hunger": 10, "thirst": 10})
+        caught = NPC({"id": "t2", "name": "t", "role": "guard", "location": "x",
+                      "personality": [], "hunger": 10, "thirst": 10})
+        for npc in (ticked, caught):
+            npc.current_state = NPCState.WORKING
+        for _ in range(50):
+            ticked._update_needs(2.0)
+        caught._update_needs(100.0)
+        self.assertAlmostEqual(ticked.hunger, caught.hunger)
+        self.assertAlmostEqual(ticked.thirst, caught.thirst)
+        self.assertAlmostEqual(ticked.energy, caught.energy)
+    
+    def test_deferred_time_is_not_lost(self):
+        """Test że zaległy czas jest nadrabiany przy zbliżeniu gracza"""
+        far_npc = self.manager.npcs["npc_e"]
+        with patch.object(NPC, "_check_schedule"):
+            for _ in range(5):
+                self.manager.update(2.0, self.context)
+            caught_up = 10.0 - self.manager.lod.pending_time("npc_e")
+            self.assertAlmostEqual(far_npc.hunger, 50 + caught_up * 0.01)
+            
+            # Gracz podchodzi - zaległy czas nadrobiony przed pełnym update
+            self.manager.player_location = "e"
+            self.manager.update(2.0, self.context)
+        self.assertAlmostEqual(far_npc.hunger, 50 + 12.0 * 0.01)
+        self.assertEqual(self.manager.lod.pending_time("npc_e"), 0.0)
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "Wymaga pakietu numpy")
+class TestVectorizedState(unittest.TestCase):
+    """Testy zwektoryzowanego stanu potrzeb i emocji"""
+    
+    STATES = [NPCState.SLEEPING, NPCState.WORKING, NPCState.PATROLLING,
+              NPCState.IDLE, NPCState.SOCIALIZING]
+    
+    def _make_npcs(self, seed):
+        """NPCe o zróżnicowanych potrzebach, stanach i emocjach"""
+        rng = random.Random(seed)
+        npcs = {}
+        for i in range(40):
+            npc = NPC({"id": f"v{i}", "name": f"V{i}", "role": "guard",
+                       "location": "cela_1", "personality": [],
+                       "hunger": rng.uniform(60, 100), "thirst": rng.uniform(0, 100),
+                       "energy": rng.uniform(0, 40)})
+            npc.current_state = self.STATES[i % len(self.STATES)]
+            for emotion in EmotionalState:
+                npc.emotional_states[emotion] = rng.random()
+            if i % 7 == 0:
+                # Same zera poza neutralną - ścieżka resetu do NEUTRAL
+                for emotion in EmotionalState:
+                    npc.emotional_states[emotion] = 0.0
+            npcs[npc.id] = npc
+        return npcs
+    
+    def _assert_same(self, scalar, vectorized):
+        for npc_id, expected in scalar.items():
+            actual = vectorized[npc_id]
+            self.assertAlmostEqual(expected.hunger, actual.hunger, places=9)
+            self.assertAlmostEqual(expected.thirst, actual.thirst, places=9)
+            self.assertAlmostEqual(expected.energy, actual.energy, places=9)
+            for emotion in EmotionalState:
+                self.assertAlmostEqual(expected.emotional_states[emotion],
+                                       actual.emotional_states[emotion], places=9)
+    
+    def test_step_matches_scalar_path(self):
+        """Test zgodności kroków wektorowych ze ścieżką skalarną"""
+        scalar = self._make_npcs(3)
+        vectorized = self._make_npcs(3)
+        
+        manager = NPCManager("data/npc_complete.json")
+        manager.npcs.clear()
+        manager.npcs.update(vectorized)
+        self.assertTrue(manager.enable_vectorized_state())
+        
+        for delta in [1.0, 5.0, 30.0, 200.0]:
+            for npc in scalar.values():
+                npc._update_needs(delta)
+                npc._decay_emotions(delta)
+            manager.state_arrays.step(delta)
+        
+        self._assert_same(scalar, vectorized)
+    
+    def test_views_and_detach(self):
+        """Test widoków atrybutów NPCa i powrotu do ścieżki skalarnej"""
+        manager = NPCManager("data/npc_complete.json")
+        manager.enable_vectorized_state()
+        npc = next(iter(manager.npcs.values()))
+        row = npc._soa_row
+        
+        npc.hunger = 77.0
+        npc.modify_emotion(EmotionalState.HAPPY, 0.4)
+        npc.current_state = NPCState.SLEEPING
+        arrays = manager.state_arrays
+        self.assertEqual(arrays.hunger[row], 77.0)
+        self.assertAlmostEqual(sum(npc.emotional_states.values()), 1.0)
+        self.assertEqual(arrays.state_code[row], arrays.code_for_state(NPCState.SLEEPING))
+        
+        # Nowy NPC dodany po włączeniu trafia do tablic przy następnym update
+        extra = NPC({"id": "extra", "name": "Extra", "role": "guard",
+                     "location": "cela_1", "personality": []})
+        manager.npcs["extra"] = extra
+        manager.update(1.0, {"time": time.time(), "hour": 12, "npcs": manager.npcs, "events": []})
+        self.assertIs(extra._soa, arrays)
+        
+        happy = npc.emotional_states[EmotionalState.HAPPY]
+        hunger = npc.hunger
+        manager.disable_vectorized_state()
+        self.assertIsNone(npc._soa)
+        self.assertIsInstance(npc.emotional_states, dict)
+        self.assertEqual(npc.emotional_states[EmotionalState.HAPPY], happy)
+        self.assertEqual(npc.hunger, hunger)
+
+
+class TestBehaviorCompiler(unittest.TestCase):
+    """Testy skompilowanych behavior trees"""
+    
+    def _npc(self, npc_id="bt_npc", role="prisoner", personality=None):
+        random.seed(npc_id)
+        return NPC({"id": npc_id, "name": npc_id, "role": role, "location": "cela_1",
+                    "personality": personality or []})
+    
+    def test_matches_interpreter(self):
+        """Test zgodności wyników i efektów ze źródłowym drzewem"""
+        for role, personality in [("prisoner", ["quiet", "planner"]), ("guard", ["corruptible"]),
+                                  ("warden", ["sadistic"])]:
+            interpreted_npc = self._npc(role=role, personality=personality)
+            compiled_npc = self._npc(role=role, personality=personality)
+            interpreted = create_behavior_tree(role, personality)
+            compiled = compile_behavior_tree(create_behavior_tree(role, personality))
+            
+            for step in range(72):
+                events = [{"type": "attack", "participants": ["bt_npc"]}] if step % 9 == 0 else []
+                results = []
+                for npc, tree in [(interpreted_npc, interpreted), (compiled_npc, compiled)]:
+                    random.seed(step)
+                    status = tree.execute(npc, {"hour": step % 24, "npcs": {npc.id: npc},
+                                                "events": list(events)})
+                    results.append((status, random.random(), npc.to_dict()))
+                    npc.hunger = min(100, npc.hunger + 7)
+                    npc.energy = max(0, npc.energy - 5)
+                self.assertEqual(results[0], results[1], f"{role}, krok {step}")
+    
+    def test_condition_memo_within_tick(self):
+        """Test pamięci warunków (NPC, warunek) i jej kasowania po akcji"""
+        calls = []
+        
+        def is_flagged(npc, context):
+            calls.append(npc.id)
+            return context.get("flag", False)
+        
+        def act(npc, context):
+            return NodeStatus.FAILURE
+        
+        root = SelectorNode("root")
+        for i in range(3):
+            branch = SequenceNode(f"branch_{i}")
+            branch.add_child(ConditionalNode("flagged", is_flagged))
+            branch.add_child(ActionNode("act", act))
+            root.add_child(branch)
+        root.add_child(ConditionalNode("flagged", is_flagged))
+        
+        tree = compile_behavior_tree(root)
+        npc = self._npc()
+        
+        # Bez akcji pomiędzy - warunek liczony raz na NPCa w ticku
+        with tree.memo.tick():
+            tree.execute(npc, {"flag": False})
+            tree.execute(npc, {"flag": False})
+        self.assertEqual(len(calls), 1)
+        
+        # Akcja kasuje zapamiętane wyniki - każda gałąź sprawdza ponownie
+        calls.clear()
+        with tree.memo.tick():
+            tree.execute(npc, {"flag": True})
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(len(tree.memo), 0)
+    
+    def test_shared_tree_keeps_state_per_npc(self):
+        """Test współdzielenia drzew i osobnego stanu NPCów"""
+        cache = BehaviorTreeCache()
+        first = cache.get("guard", ["corruptible"])
+        self.assertIs(first, cache.get("guard", ["corruptible"]))
+        self.assertIsNot(first, cache.get("guard", []))
+        self.assertEqual(cache.get_stats()["hits"], 1)
+        
+        # Cooldown jednego NPCa nie blokuje drugiego
+        from npcs.ai_behaviors import CooldownNode
+        runs = []
+        tree = compile_behavior_tree(
+            CooldownNode("cd", ActionNode("run", lambda n, c: runs.append(n.id)), 3600))
+        npc_a, npc_b = self._npc("a"), self._npc("b")
+        self.assertEqual(tree.execute(npc_a, {}), NodeStatus.SUCCESS)
+        self.assertEqual(tree.execute(npc_a, {}), NodeStatus.FAILURE)
+        self.assertEqual(tree.execute(npc_b, {}), NodeStatus.SUCCESS)
+        self.assertEqual(runs, ["a", "b"])
+    
+    def test_unknown_nodes_are_not_shared(self):
+        """Test węzłów nieznanego typu - wykonywane przez execute, bez współdzielenia"""
+        class CustomNode(SequenceNode):
+            def execute(self, npc, context):
+                return NodeStatus.RUNNING
+        
+        cache = BehaviorTreeCache(lambda role, personality: CustomNode("custom"))
+        tree = cache.get("prisoner", [])
+        self.assertFalse(tree.shareable)
+        self.assertIsNot(tree, cache.get("prisoner", []))
+        self.assertEqual(tree.execute(self._npc(), {}), NodeStatus.RUNNING)
+    
+    def test_manager_shares_trees(self):
+        """Test przypisania współdzielonych drzew przez NPCManager"""
+        manager = NPCManager("data/npc_complete.json")
+        for npc in manager.npcs.values():
+            self.assertIs(npc.behavior_tree,
+                          manager.behavior_trees.get(npc.role, npc.personality))
+        manager.update(1.0, {"time": time.time(), "hour": 12, "npcs": manager.npcs, "events": []})
+        self.assertFalse(manager.behavior_trees.memo.active)
+
+
+class TestWakeScheduler(unittest.TestCase):
+    """Testy budzenia NPCów zdarzeniami"""
+    
+    def setUp(self):
+        self.manager = NPCManager("data/npc_complete.json")
+        self.manager.npcs.clear()
+        self.manager.configure_lod(enabled=False)
+        self.manager.interaction_cap = 0
+        for npc_id, location in [("w1", "cela_1"), ("w2", "cela_1"), ("w3", "cela_2")]:
+            npc = NPC({"id": npc_id, "name": npc_id, "role": "prisoner",
+                       "location": location, "personality": [], "hunger": 10})
+            npc.schedule_variation = 0  # Stan zależy tylko od harmonogramu
+            npc.behavior_tree = Mock()
+            npc.behavior_tree.execute.return_value = NodeStatus.SUCCESS
+            self.manager.npcs[npc_id] = npc
+        self.wake = self.manager.enable_wakeups(max_dormant_ticks=1000)
+    
+    def _tick(self, hour=9):
+        self.manager.update(1.0, {"time": time.time(), "hour": hour,
+                                  "npcs": self.manager.npcs, "events": []})
+    
+    def _calls(self):
+        return {npc_id: npc.behavior_tree.execute.call_count
+                for npc_id, npc in self.manager.npcs.items()}
+    
+    def test_dormant_until_schedule_boundary(self):
+        """Test pomijania drzew i wybudzenia na granicy harmonogramu"""
+        for _ in range(5):
+            self._tick(hour=9)
+        self.assertEqual(self._calls(), {"w1": 1, "w2": 1, "w3": 1})
+        
+        # 12:00 - z pracy na posiłek w domyślnym harmonogramie
+        self._tick(hour=12)
+        self.assertEqual(self._calls(), {"w1": 2, "w2": 2, "w3": 2})
+        self.assertEqual(self.wake.wakes[WakeReason.SCHEDULE], 3)
+    
+    def test_need_threshold_and_running(self):
+        """Test wybudzenia progiem potrzeby i kontynuacji RUNNING"""
+        self._tick()
+        self.manager.npcs["w1"].hunger = 65
+        self.manager.npcs["w3"].behavior_tree.execute.return_value = NodeStatus.RUNNING
+        self.wake.wake("w3")
+        self._tick()
+        self._tick()
+        self._tick()
+        calls = self._calls()
+        self.assertEqual(calls["w1"], 2)
+        self.assertEqual(calls["w2"], 1)
+        self.assertEqual(calls["w3"], 4)
+    
+    def test_world_events_wake_location(self):
+        """Test wybudzenia przez atak, ale nie przez zwykłą rozmowę"""
+        self._tick()
+        self.manager.add_world_event({"type": "npc_interaction", "location": "cela_1",
+                                      "participants": ["w1", "w2"]})
+        self._tick()
+        self.assertEqual(self._calls(), {"w1": 1, "w2": 1, "w3": 1})
+        
+        self.manager.add_world_event({"type": "attack", "location": "cela_1",
+                                      "participants": ["w3"]})
+        self._tick()
+        self.assertEqual(self._calls(), {"w1": 2, "w2": 2, "w3": 2})
+    
+    def test_event_bus_subscription(self):
+        """Test budzenia przez event_bus i anulowania subskrypcji"""
+        bus = EventBus()
+        self.manager.enable_wakeups(bus, max_dormant_ticks=1000)
+        self._tick()
+        
+        bus.emit(GameEvent(event_type="entity_moved", category=EventCategory.MOVEMENT,
+                           data={"from": "korytarz_centralny", "to": "cela_2"}, source="player"))
+        self._tick()
+        self.assertEqual(self._calls(), {"w1": 1, "w2": 1, "w3": 2})
+        
+        self.manager.disable_wakeups()
+        self.assertEqual(bus.category_listeners[EventCategory.MOVEMENT], [])
+        self.assertEqual(bus.category_listeners[EventCategory.COMBAT], [])
+
+
+class TestEpisodicMemoryIndex(unittest.TestCase):
+    """Testy indeksów i zapominania w pamięci epizodycznej"""
+    
+    def _event(self, i, **extra):
+        event = {"event_type": "routine", "participants": [f"p{i % 3}"],
+                 "location": "cell", "importance": 0.5, "timestamp": 1000.0 + i}
+        event.update(extra)
+        return event
+    
+    def test_eviction_removes_weakest_and_updates_indexes(self):
+        memory = EpisodicMemory(capacity=5)
+        for i in range(5):
+            memory.add_memory(self._event(i, importance=0.9))
+        weak = memory.memories[2]
+        memory.recall({"participant": "p0"})  # Wzmocnienie bez wpisu w kopcu
+        weak["importance"] = 0.05
+        memory._push_strength(weak)
+        
+        memory.add_memory(self._event(5, importance=0.9, location="yard"))
+        
+        self.assertEqual(len(memory), 5)
+        self.assertIsNone(memory.get_memory(weak["memory_id"]))
+        self.assertNotIn(weak["memory_id"], memory.memory_index["participant_p2"])
+        self.assertEqual(memory.memory_index["location_yard"], {5})
+        self.assertEqual(sorted(m["memory_id"] for m in memory.memories), [0, 1, 3, 4, 5])
+        for remaining in memory.memories:
+            for assoc in remaining["associations"]:
+                self.assertIsNotNone(memory.get_memory(assoc["memory_id"]))
+    
+    def test_eviction_matches_full_sort(self):
+        random.seed(7)
+        memory = EpisodicMemory(capacity=50)
+        reference = []
+        for i in range(200):
+            event = self._event(i, importance=random.uniform(0.1, 1.0))
+            memory.add_memory(event)
+            reference.append(event)
+            if i % 10 == 0:
+                memory.recall({"participant": f"p{i % 3}"}, limit=3)
+            # Stary algorytm: sortowanie po sile * ważności, starsze odpadają pierwsze
+            if len(reference) > 50:
+                reference.sort(key=lambda m: m["strength"] * m["importance"])
+                reference = reference[1:]
+                reference.sort(key=lambda m: m["memory_id"])
+        self.assertEqual([m["memory_id"] for m in memory.memories],
+                         [m["memory_id"] for m in reference])
+    
+    def test_recall_none_criteria_without_full_scan(self):
+        memory = EpisodicMemory()
+        memory.add_memory({"event_type": "talk", "participants": ["a"], "location": "cell"})
+        memory.add_memory({"event_type": "talk", "participants": ["b"]})
+        
+        self.assertEqual(memory.recall({}), [])
+        recalled = memory.recall({"participant": "nobody", "location": None, "event_type": None})
+        self.assertEqual([m["participants"] for m in recalled], [["b"]])
+    
+    def test_load_legacy_positions(self):
+        memory = EpisodicMemory()
+        memory.memories = [
+            {"event_type": "talk", "participants": ["a"], "strength": 0.5,
+             "associations": [{"memory_idx": 1, "strength": 0.8, "type": "similar"}]},
+            {"event_type": "talk", "participants": ["a"], "strength": 0.5, "associations": []},
+        ]
+        memory.add_memory({"event_type": "talk", "participants": ["a"]})
+        
+        self.assertEqual(memory.memories[0]["associations"][0]["memory_id"], 1)
+        self.assertEqual(memory.memories[-1]["memory_id"], 2)
+        self.assertEqual(memory.memory_index["participant_a"], {0, 1, 2})
+
+
+class TestLazyMemoryDecay(unittest.TestCase):
+    """Testy leniwego zaniku wspomnień i kolejki wygaśnięć"""
+    
+    def test_decay_queue_reschedule_and_cancel(self):
+        from npcs.memory_system import DecayQueue
+        queue = DecayQueue()
+        queue.schedule("a", 10.0)
+        queue.schedule("b", 5.0)
+        queue.schedule("c", 7.0)
+        queue.schedule("a", 3.0)  # Unieważnia wpis na 10.0
+        queue.cancel("c")
+        
+        self.assertEqual(queue.next_due(), 3.0)
+        self.assertEqual(queue.pop_due(6.0), ["a", "b"])
+        self.assertEqual(queue.pop_due(100.0), [])
+        self.assertEqual(len(queue), 0)
+    
+    def test_npc_expiry_matches_full_scan(self):
+        random.seed(3)
+        npc = NPC({"id": "pamiec", "name": "Pamięć", "role": "prisoner", "location": "cela_1",
+                   "personality": []})
+        start = time.time()
+        for i in range(200):
+            with patch("npcs.npc_manager.time.time", return_value=start + i * 0.5):
+                npc.add_memory("routine", f"zdarzenie {i}", [], "cela_1", random.uniform(0.01, 0.9))
+        
+        for step in range(100, 500, 7):
+            now = start + step
+            expected = [m for m in npc.episodic_memory if m.get_current_strength(now) > 0.05]
+            npc._process_memories(now)
+            self.assertEqual(npc.episodic_memory, expected)
+        self.assertTrue(all(m.importance > 0.5 for m in npc.episodic_memory))
+    
+    def test_npc_memory_limit_keeps_strongest(self):
+        npc = NPC({"id": "limit", "name": "Limit", "role": "prisoner", "location": "cela_1",
+                   "personality": []})
+        npc.MEMORY_LIMIT = 3
+        for importance in (0.9, 0.6, 0.95, 0.7, 0.8):
+            npc.add_memory("routine", "x", [], "cela_1", importance)
+        npc._process_memories(time.time())
+        
+        self.assertEqual([m.importance for m in npc.episodic_memory], [0.9, 0.95, 0.8])
+        self.assertEqual(len(npc._memory_expiry), 0)  # Ważne wspomnienia nigdy nie wygasają
+    
+    def test_memory_decay_uses_game_minutes(self):
+        from core.game_clock import GameClock
+        clock = GameClock(8 * 60)
+        npc = NPC({"id": "zegar", "name": "Zegar", "role": "prisoner", "location": "cela_1",
+                   "personality": []})
+        npc.clock = clock
+        npc.add_memory("routine", "rozmowa ze strażnikiem", [], "cela_1", 0.5)
+        memory = npc.episodic_memory[0]
+        
+        clock.advance(10)  # Zwykły tick gry
+        npc._process_memories(npc._now())
+        self.assertIn(memory, npc.episodic_memory)
+        self.assertAlmostEqual(memory.get_current_strength(npc._now()), 0.5 * (1 - 0.02 * 10))
+        
+        clock.advance(60)  # 0.02 na minutę gry - po 45 minutach zostaje minimum
+        npc._process_memories(npc._now())
+        self.assertNotIn(memory, npc.episodic_memory)
+    
+    def test_semantic_knowledge_expires_lazily(self):
+        semantic = SemanticMemory()
+        semantic.add_knowledge("guard_schedule", "zmiana o 6", strength=0.5)
+        semantic.add_knowledge("guard_weapon", "pałka", strength=1.0)
+        trace = semantic.knowledge["guard_schedule"]
+        
+        now = trace.last_update
+        self.assertAlmostEqual(trace.strength_at(now + 100), 0.5 * (1 - 0.001 * 100))
+        self.assertEqual(trace.strength, 0.5)  # Bez utrwalania przy odczycie
+        
+        expiry = trace.expiry_time(SemanticMemory.EXPIRY_THRESHOLD)
+        semantic.decay_all(expiry - 1)
+        self.assertIn("guard_schedule", semantic.knowledge)
+        semantic.decay_all(expiry + 1)
+        self.assertNotIn("guard_schedule", semantic.knowledge)
+        self.assertNotIn("guard_schedule", semantic.relationships.get("guard_weapon", {}))
+        self.assertNotIn("guard_schedule", semantic.categories["general"])
+
+
+class TestSemanticIndex(unittest.TestCase):
+    """Testy indeksu tokenów pamięci semantycznej"""
+    
+    WORDS = ["guard", "tunnel", "key", "cell", "food", "escape", "warden", "night", "rat", "door"]
+    
+    def _concepts(self, count):
+        rng = random.Random(11)
+        return ["_".join(rng.sample(self.WORDS, rng.randint(1, 3))) + f"_{i % 7}"
+                for i in range(count)]
+    
+    def test_links_match_full_comparison(self):
+        semantic = SemanticMemory()
+        concepts = self._concepts(150)
+        for concept in concepts:
+            semantic.add_knowledge(concept, concept)
+        
+        expected = defaultdict(dict)
+        known = list(dict.fromkeys(concepts))
+        for i, first in enumerate(known):
+            for second in known[:i]:
+                similarity = semantic._calculate_semantic_similarity(first, second)
+                if similarity > 0.3:
+                    expected[first][second] = similarity
+                    expected[second][first] = similarity
+        self.assertEqual({k: v for k, v in semantic.relationships.items() if v}, dict(expected))
+    
+    def test_similar_lookup_uses_index(self):
+        semantic = SemanticMemory()
+        semantic.add_knowledge("guard_night_shift", "zmiana nocna")
+        semantic.add_knowledge("tunnel_entrance", "pod pryczą")
+        
+        self.assertEqual(semantic.get("night_guard_shift_schedule"), "zmiana nocna")
+        self.assertIsNone(semantic.get("kitchen_knife"))
+        
+        semantic._forget_concept("guard_night_shift")
+        self.assertNotIn("guard", semantic._token_index)
+        self.assertIsNone(semantic.get("night_guard_shift_schedule"))
+    
+    def test_lsh_finds_close_concepts(self):
+        semantic = SemanticMemory(use_lsh=True)
+        for concept in self._concepts(150):
+            semantic.add_knowledge(concept, concept)
+        semantic.add_knowledge("guard_tunnel_key_door", "a")
+        
+        self.assertEqual(semantic.get("guard_tunnel_key_door_rat"), "a")
+        # Kandydaci LSH to podzbiór kandydatów indeksu tokenów
+        exact = SemanticMemory()
+        exact.knowledge = semantic.knowledge
+        self.assertLessEqual(set(semantic._candidates("guard_tunnel")),
+                             set(exact._candidates("guard_tunnel")))
+
+
 def run_tests():
     """Uruchom wszystkie testy"""
     loader = unittest.TestLoader()
@@ -746,6 +1440,15 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestEmotionalStates))
     suite.addTests(loader.loadTestsFromTestCase(TestGoalSystem))
     suite.addTests(loader.loadTestsFromTestCase(TestCombatIntegration))
+    suite.addTests(loader.loadTestsFromTestCase(TestSpatialIndex))
+    suite.addTests(loader.loadTestsFromTestCase(TestSocialInteractionPass))
+    suite.addTests(loader.loadTestsFromTestCase(TestSimulationLOD))
+    suite.addTests(loader.loadTestsFromTestCase(TestVectorizedState))
+    suite.addTests(loader.loadTestsFromTestCase(TestBehaviorCompiler))
+    suite.addTests(loader.loadTestsFromTestCase(TestWakeScheduler))
+    suite.addTests(loader.loadTestsFromTestCase(TestEpisodicMemoryIndex))
+    suite.addTests(loader.loadTestsFromTestCase(TestLazyMemoryDecay))
+    suite.addTests(loader.loadTestsFromTestCase(TestSemanticIndex))
     
     # Uruchom testy
     runner = unittest.TextTestRunner(verbosity=2)
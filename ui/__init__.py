@@ -1,8 +1,28 @@
 """UI module - user interface."""
 
+import importlib
+
 from .commands import CommandParser
 from .interface import GameInterface
-from .smart_interface import SmartInterface
+
+# Leniwe eksporty: nazwa -> moduł (smart interface tylko gdy jest używany)
+_LAZY_EXPORTS = {
+    'SmartInterface': 'ui.smart_interface',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     'CommandParser',
@@ -4,12 +4,14 @@ from typing import Dict, List, Tuple, Any, Optional, Callable
 from enum import Enum
 import re
 import json
+import os
 import random
 
 # Importy dla systemu walki
 from npcs.npc_manager import NPCState
 from player.character import CharacterState
 from core.game_state import GameMode
+from core.event_bus import event_bus
 from npcs.dialogue.dialogue_controller import DialogueResult  # Nowy system dialogów z pamięcią
 
 
@@ -391,6 +393,23 @@ class CommandParser:
             self._cmd_sleep,
             "Idź spać"
         ))
+        
+        # Debugowanie
+        self.register(Command(
+            "profil", ["profile"],
+            CommandCategory.DEBUG,
+            self._cmd_profile,
+            "Pokaż profil czasu ticku (podsystemy, NPCe, węzły drzew)",
+            "profil [zapisz [plik] | reset | wlacz | wylacz]"
+        ))
+        
+        self.register(Command(
+            "dziennik", ["journal"],
+            CommandCategory.DEBUG,
+            self._cmd_journal,
+            "Zapisuj wydarzenia do binarnego dziennika lub odtwórz dziennik",
+            "dziennik [start [plik] | stop | odtworz <plik>]"
+        ))
     
     def register(self, command: Command):
         """Zarejestruj nową komendę.
@@ -1689,4 +1708,59 @@ class CommandParser:
         # Regeneracja podczas snu
         self.game_state.player.rest(sleep_time)
         
-        return True, "Spałeś całą noc. Budzisz się wypoczęty o 6:00."
\ No newline at end of file
+        return True, "Spałeś całą noc. Budzisz się wypoczęty o 6:00."
+    
+    def _cmd_profile(self, args: List[str]) -> Tuple[bool, str]:
+        """Pokaż lub zapisz profil ticku gry."""
+        profiler = getattr(self.game_state, 'profiler', None)
+        if profiler is None:
+            return False, "Profiler jest niedostępny."
+        
+        action = args[0] if args else ""
+        if action in ("zapisz", "save"):
+            filepath = args[1] if len(args) > 1 else os.path.join("saves", "profil_ticku.json")
+            try:
+                profiler.dump_json(filepath)
+            except OSError as e:
+                return False, f"Nie udało się zapisać profilu: {e}"
+            return True, f"Profil zapisany do {filepath}."
+        if action == "reset":
+            profiler.reset()
+            return True, "Pomiary profilera wyczyszczone."
+        if action in ("wlacz", "włącz", "on"):
+            profiler.enabled = True
+            return True, "Profiler włączony."
+        if action in ("wylacz", "wyłącz", "off"):
+            profiler.enabled = False
+            return True, "Profiler wyłączony."
+        if action:
+            return False, "Użycie: profil [zapisz [plik] | reset | wlacz | wylacz]"
+        return True, profiler.format_report()
+    
+    def _cmd_journal(self, args: List[str]) -> Tuple[bool, str]:
+        """Steruj binarnym dziennikiem wydarzeń."""
+        action = args[0] if args else ""
+        if action == "start":
+            filepath = args[1] if len(args) > 1 else os.path.join("saves", "dziennik.evj")
+            try:
+                self.game_state.start_journal(filepath)
+            except (OSError, ValueError, RuntimeError) as e:
+                return False, f"Nie udało się otworzyć dziennika: {e}"
+            return True, f"Wydarzenia są zapisywane do {filepath}."
+        if action == "stop":
+            filepath = self.game_state.stop_journal()
+            if filepath is None:
+                return False, "Dziennik nie jest zapisywany."
+            return True, f"Dziennik zamknięty: {filepath}."
+        if action in ("odtworz", "odtwórz", "replay") and len(args) > 1:
+            try:
+                count = self.game_state.replay_journal(args[1])
+            except (OSError, ValueError, RuntimeError) as e:
+                return False, f"Nie udało się odtworzyć dziennika: {e}"
+            return True, f"Odtworzono {count} wydarzeń."
+        if action:
+            return False, "Użycie: dziennik [start [plik] | stop | odtworz <plik>]"
+        journal = event_bus.journal
+        if journal is None:
+            return True, "Dziennik wyłączony."
+        return True, f"Dziennik: {journal.filepath} ({journal.records} wydarzeń)."
\ No newline at end of file
@@ -2,8 +2,13 @@
 """
 Modul lokacji swiata gry Droga Szamana.
 Eksportuje glowne klasy lokacji.
+
+Regiony poza więzieniem (Czarny Las, Targowisko Trzech Dróg) są
+importowane leniwie - dopiero przy pierwszym odwołaniu do ich klas.
 """
 
+import importlib
+
 from world.locations.prison import (
     Prison,
     Location,
@@ -23,23 +28,37 @@ from world.locations.prison import (
     PrisonCanteen
 )
 
-from world.locations.dark_forest import (
-    CzarnyLas,
-    ForestLocation,
-    ForestLocationType,
-    DruidGrove,
-    AbandonedLoggingCamp,
-    DarkForestDepths
-)
+# Leniwe eksporty: nazwa -> moduł
+_LAZY_EXPORTS = {
+    # Dark Forest
+    'CzarnyLas': 'world.locations.dark_forest',
+    'ForestLocation': 'world.locations.dark_forest',
+    'ForestLocationType': 'world.locations.dark_forest',
+    'DruidGrove': 'world.locations.dark_forest',
+    'AbandonedLoggingCamp': 'world.locations.dark_forest',
+    'DarkForestDepths': 'world.locations.dark_forest',
+    # Market Town
+    'TargowiskoTrzechDrog': 'world.locations.market_town',
+    'MarketDistrict': 'world.locations.market_town',
+    'DistrictType': 'world.locations.market_town',
+    'MainMarketSquare': 'world.locations.market_town',
+    'SlumsDistrict': 'world.locations.market_town',
+    'NobleDistrict': 'world.locations.market_town',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
-from world.locations.market_town import (
-    TargowiskoTrzechDrog,
-    MarketDistrict,
-    DistrictType,
-    MainMarketSquare,
-    SlumsDistrict,
-    NobleDistrict
-)
 
 __all__ = [
     # Prison
@@ -4,7 +4,6 @@ Mroczne więzienie z którego gracz musi uciec, pełne sekretów i niebezpiecze
 """
 
 import random
-import json
 from typing import Dict, List, Optional, Tuple, Any
 from enum import Enum
 from dataclasses import dataclass, field
@@ -1435,10 +1434,10 @@ class Prison:
         self._setup_connections()
     
     def _load_locations_from_json(self) -> Dict:
-        """Wczytaj dane lokacji z pliku JSON."""
+        """Wczytaj dane lokacji z pliku JSON (współdzielony widok DataLoader)."""
+        from core.data_loader import data_loader
         try:
-            with open('data/locations.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return data_loader.load_file('data/locations.json')
         except FileNotFoundError:
             print("Ostrzeżenie: Nie znaleziono pliku locations.json")
             return {'locations': {}}